@@ -0,0 +1,51 @@
+"""add unique constraint for user_course_progress lesson
+
+Revision ID: 5b7c2e9d1a40
+Revises: 024e1f42c42f
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5b7c2e9d1a40"
+down_revision: Union[str, None] = "024e1f42c42f"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Xóa bản ghi trùng do select-rồi-insert cũ tạo ra, giữ bản đã hoàn thành / mới nhất
+    op.execute(
+        sa.text(
+            """
+            DELETE FROM user_course_progress
+            WHERE id IN (
+                SELECT id FROM (
+                    SELECT id, ROW_NUMBER() OVER (
+                        PARTITION BY user_course_id, topic_id, lesson_id
+                        ORDER BY (status = 'COMPLETED') DESC, updated_at DESC, id DESC
+                    ) AS row_number
+                    FROM user_course_progress
+                ) ranked
+                WHERE ranked.row_number > 1
+            )
+            """
+        )
+    )
+    op.create_unique_constraint(
+        "uq_user_course_progress_lesson",
+        "user_course_progress",
+        ["user_course_id", "topic_id", "lesson_id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint(
+        "uq_user_course_progress_lesson", "user_course_progress", type_="unique"
+    )
@@ -0,0 +1,32 @@
+"""add (created_at, id) indexes for keyset pagination
+
+Revision ID: 8d3a6f0c2b71
+Revises: 5b7c2e9d1a40
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8d3a6f0c2b71"
+down_revision: Union[str, None] = "5b7c2e9d1a40"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ("courses", "exercises", "users", "discussions")
+
+
+def upgrade() -> None:
+    for table in TABLES:
+        op.create_index(
+            f"ix_{table}_created_at_id", table, ["created_at", "id"], unique=False
+        )
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        op.drop_index(f"ix_{table}_created_at_id", table_name=table)
@@ -0,0 +1,65 @@
+"""add unlogged lesson_render_cache table (shared lesson render cache)
+
+Revision ID: a7d4e1c9b2f5
+Revises: f3c8b2e6d4a1
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a7d4e1c9b2f5"
+down_revision: Union[str, None] = "f3c8b2e6d4a1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "lesson_render_cache",
+        sa.Column("lesson_id", sa.Integer(), nullable=False),
+        sa.Column("version", sa.String(), nullable=False),
+        sa.Column("body", sa.LargeBinary(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(["lesson_id"], ["lessons.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("lesson_id"),
+        prefixes=["UNLOGGED"],
+    )
+    op.create_index(
+        op.f("ix_lesson_render_cache_created_at"),
+        "lesson_render_cache",
+        ["created_at"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_lesson_render_cache_updated_at"),
+        "lesson_render_cache",
+        ["updated_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        op.f("ix_lesson_render_cache_updated_at"), table_name="lesson_render_cache"
+    )
+    op.drop_index(
+        op.f("ix_lesson_render_cache_created_at"), table_name="lesson_render_cache"
+    )
+    op.drop_table("lesson_render_cache")
@@ -0,0 +1,61 @@
+"""add llm_cache_entries table (LLM response cache)
+
+Revision ID: b3e8f2a6c9d4
+Revises: a7d4e1c9b2f5
+Create Date: 2026-10-17 17:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b3e8f2a6c9d4"
+down_revision: Union[str, None] = "a7d4e1c9b2f5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "llm_cache_entries",
+        sa.Column("key", sa.String(length=64), nullable=False),
+        sa.Column("namespace", sa.String(), nullable=False),
+        sa.Column("llm_string_hash", sa.String(length=64), nullable=False),
+        sa.Column("response", sa.Text(), nullable=False),
+        sa.Column("embedding", sa.JSON(), nullable=True),
+        sa.Column("expires_at", sa.Float(), nullable=False),
+        sa.Column("last_hit_at", sa.Float(), nullable=False),
+        sa.Column("hit_count", sa.Integer(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("key"),
+    )
+    for column in ("llm_string_hash", "expires_at", "last_hit_at", "created_at", "updated_at"):
+        op.create_index(
+            op.f(f"ix_llm_cache_entries_{column}"),
+            "llm_cache_entries",
+            [column],
+            unique=False,
+        )
+
+
+def downgrade() -> None:
+    for column in ("updated_at", "created_at", "last_hit_at", "expires_at", "llm_string_hash"):
+        op.drop_index(
+            op.f(f"ix_llm_cache_entries_{column}"), table_name="llm_cache_entries"
+        )
+    op.drop_table("llm_cache_entries")
@@ -0,0 +1,31 @@
+"""add (user_id, course_id) index to user_courses
+
+Revision ID: b4e1c7a93d05
+Revises: 8d3a6f0c2b71
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b4e1c7a93d05"
+down_revision: Union[str, None] = "8d3a6f0c2b71"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_user_courses_user_id_course_id",
+        "user_courses",
+        ["user_id", "course_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_user_courses_user_id_course_id", table_name="user_courses")
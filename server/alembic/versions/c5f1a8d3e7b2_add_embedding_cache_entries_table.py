@@ -0,0 +1,60 @@
+"""add embedding_cache_entries table (embedding cache)
+
+Revision ID: c5f1a8d3e7b2
+Revises: b3e8f2a6c9d4
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c5f1a8d3e7b2"
+down_revision: Union[str, None] = "b3e8f2a6c9d4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "embedding_cache_entries",
+        sa.Column("key", sa.String(length=64), nullable=False),
+        sa.Column("model", sa.String(), nullable=False),
+        sa.Column("vector", sa.LargeBinary(), nullable=False),
+        sa.Column("scale", sa.Float(), nullable=True),
+        sa.Column("last_hit_at", sa.Float(), nullable=False),
+        sa.Column("hit_count", sa.Integer(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("key"),
+    )
+    for column in ("last_hit_at", "created_at", "updated_at"):
+        op.create_index(
+            op.f(f"ix_embedding_cache_entries_{column}"),
+            "embedding_cache_entries",
+            [column],
+            unique=False,
+        )
+
+
+def downgrade() -> None:
+    for column in ("updated_at", "created_at", "last_hit_at"):
+        op.drop_index(
+            op.f(f"ix_embedding_cache_entries_{column}"),
+            table_name="embedding_cache_entries",
+        )
+    op.drop_table("embedding_cache_entries")
@@ -0,0 +1,135 @@
+"""add progress counters to user_courses
+
+Revision ID: c6f2a8d41e97
+Revises: b4e1c7a93d05
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c6f2a8d41e97"
+down_revision: Union[str, None] = "b4e1c7a93d05"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "user_courses",
+        sa.Column(
+            "completed_lessons", sa.Integer(), nullable=False, server_default="0"
+        ),
+    )
+    op.add_column(
+        "user_courses",
+        sa.Column(
+            "in_progress_lessons", sa.Integer(), nullable=False, server_default="0"
+        ),
+    )
+    op.add_column(
+        "user_courses",
+        sa.Column(
+            "completion_percentage", sa.Float(), nullable=False, server_default="0"
+        ),
+    )
+    op.add_column(
+        "user_courses",
+        sa.Column("last_activity_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    # Khóa học chưa có lesson thì không có bài học hiện tại
+    op.alter_column(
+        "user_courses", "current_topic", existing_type=sa.Integer(), nullable=True
+    )
+    op.alter_column(
+        "user_courses", "current_lesson", existing_type=sa.Integer(), nullable=True
+    )
+
+    # Tính bộ đếm cho các lần đăng ký hiện có, giống
+    # UserCourseProgressService.recompute_progress_counters
+    op.execute(
+        """
+        WITH lessons AS (
+            SELECT
+                uc.id AS user_course_id,
+                t.id AS topic_id,
+                l.id AS lesson_id,
+                CASE WHEN p.status = 'COMPLETED' THEN 1 ELSE 0 END AS completed,
+                count(*) OVER w AS total_lessons,
+                sum(CASE WHEN p.status = 'COMPLETED' THEN 1 ELSE 0 END) OVER w
+                    AS completed_lessons,
+                sum(CASE WHEN p.status = 'IN_PROGRESS' THEN 1 ELSE 0 END) OVER w
+                    AS in_progress_lessons,
+                max(p.updated_at) OVER w AS last_activity_at,
+                row_number() OVER (
+                    PARTITION BY uc.id,
+                        CASE WHEN p.status = 'COMPLETED' THEN 1 ELSE 0 END
+                    ORDER BY t."order", l."order", l.id
+                ) AS position,
+                row_number() OVER (
+                    PARTITION BY uc.id
+                    ORDER BY t."order" DESC, l."order" DESC, l.id DESC
+                ) AS position_from_end
+            FROM lessons l
+            JOIN topics t ON t.id = l.topic_id
+            JOIN user_courses uc ON uc.course_id = t.course_id
+            LEFT JOIN user_course_progress p
+                ON p.user_course_id = uc.id
+                AND p.topic_id = t.id
+                AND p.lesson_id = l.id
+            WINDOW w AS (PARTITION BY uc.id)
+        ),
+        stats AS (
+            SELECT
+                user_course_id,
+                max(total_lessons) AS total_lessons,
+                max(completed_lessons) AS completed_lessons,
+                max(in_progress_lessons) AS in_progress_lessons,
+                coalesce(
+                    max(CASE WHEN completed = 0 AND position = 1 THEN topic_id END),
+                    max(CASE WHEN position_from_end = 1 THEN topic_id END)
+                ) AS current_topic_id,
+                coalesce(
+                    max(CASE WHEN completed = 0 AND position = 1 THEN lesson_id END),
+                    max(CASE WHEN position_from_end = 1 THEN lesson_id END)
+                ) AS current_lesson_id,
+                max(last_activity_at) AS last_activity_at
+            FROM lessons
+            GROUP BY user_course_id
+        )
+        UPDATE user_courses uc
+        SET completed_lessons = coalesce(stats.completed_lessons, 0),
+            in_progress_lessons = coalesce(stats.in_progress_lessons, 0),
+            completion_percentage = coalesce(
+                stats.completed_lessons * 100.0 / stats.total_lessons, 0
+            ),
+            current_topic = stats.current_topic_id,
+            current_lesson = stats.current_lesson_id,
+            last_activity_at = stats.last_activity_at
+        FROM user_courses target
+        LEFT JOIN stats ON stats.user_course_id = target.id
+        WHERE uc.id = target.id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute(
+        "UPDATE user_courses SET current_topic = coalesce(current_topic, 1), "
+        "current_lesson = coalesce(current_lesson, 1)"
+    )
+    op.alter_column(
+        "user_courses", "current_lesson", existing_type=sa.Integer(), nullable=False
+    )
+    op.alter_column(
+        "user_courses", "current_topic", existing_type=sa.Integer(), nullable=False
+    )
+    op.drop_column("user_courses", "last_activity_at")
+    op.drop_column("user_courses", "completion_percentage")
+    op.drop_column("user_courses", "in_progress_lessons")
+    op.drop_column("user_courses", "completed_lessons")
@@ -0,0 +1,50 @@
+"""drop user_courses.completion_percentage
+
+Phần trăm hoàn thành được tính lúc đọc từ completed_lessons và số bài hiện có của
+khóa học, cột lưu sẵn không còn được đọc.
+
+Revision ID: d2a7c4e91b08
+Revises: c5f1a8d3e7b2
+Create Date: 2026-10-17 20:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d2a7c4e91b08"
+down_revision: Union[str, None] = "c5f1a8d3e7b2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.drop_column("user_courses", "completion_percentage")
+
+
+def downgrade() -> None:
+    op.add_column(
+        "user_courses",
+        sa.Column(
+            "completion_percentage", sa.Float(), nullable=False, server_default="0"
+        ),
+    )
+    op.execute(
+        """
+        UPDATE user_courses
+        SET completion_percentage = coalesce(
+            user_courses.completed_lessons * 100.0 / nullif(totals.total_lessons, 0),
+            0
+        )
+        FROM (
+            SELECT topics.course_id, count(lessons.id) AS total_lessons
+            FROM lessons JOIN topics ON topics.id = lessons.topic_id
+            GROUP BY topics.course_id
+        ) AS totals
+        WHERE totals.course_id = user_courses.course_id
+        """
+    )
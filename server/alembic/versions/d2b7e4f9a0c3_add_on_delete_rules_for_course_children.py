@@ -0,0 +1,57 @@
+"""add ON DELETE rules for course children
+
+Revision ID: d2b7e4f9a0c3
+Revises: c6f2a8d41e97
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d2b7e4f9a0c3"
+down_revision: Union[str, None] = "c6f2a8d41e97"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (bảng, cột, bảng được tham chiếu, ON DELETE) - xóa khóa học bằng một câu DELETE
+# để database tự xóa topics, lessons, sections... thay vì ORM cascade
+FOREIGN_KEYS = [
+    ("topics", "course_id", "courses", "CASCADE"),
+    ("lessons", "topic_id", "topics", "CASCADE"),
+    ("lesson_sections", "lesson_id", "lessons", "CASCADE"),
+    ("exercises", "lesson_id", "lessons", "CASCADE"),
+    ("exercise_test_cases", "exercise_id", "exercises", "CASCADE"),
+    ("tests", "topic_id", "topics", "CASCADE"),
+    ("tests", "course_id", "courses", "CASCADE"),
+    ("test_sessions", "test_id", "tests", "CASCADE"),
+    ("lesson_generation_states", "topic_id", "topics", "CASCADE"),
+    ("lesson_generation_states", "lesson_id", "lessons", "SET NULL"),
+    ("user_states", "current_course_id", "courses", "SET NULL"),
+    ("user_states", "current_lesson_id", "lessons", "SET NULL"),
+    ("document_processing_jobs", "course_id", "courses", "SET NULL"),
+]
+
+
+def _constraint_name(table: str, column: str) -> str:
+    # Tên mặc định của PostgreSQL cho các foreign key không đặt tên
+    return f"{table}_{column}_fkey"
+
+
+def upgrade() -> None:
+    for table, column, referred_table, ondelete in FOREIGN_KEYS:
+        name = _constraint_name(table, column)
+        op.drop_constraint(name, table, type_="foreignkey")
+        op.create_foreign_key(
+            name, table, referred_table, [column], ["id"], ondelete=ondelete
+        )
+
+
+def downgrade() -> None:
+    for table, column, referred_table, _ in reversed(FOREIGN_KEYS):
+        name = _constraint_name(table, column)
+        op.drop_constraint(name, table, type_="foreignkey")
+        op.create_foreign_key(name, table, referred_table, [column], ["id"])
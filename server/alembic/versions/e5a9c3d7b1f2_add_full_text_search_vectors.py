@@ -0,0 +1,89 @@
+"""add full-text search vectors for courses, lessons and lesson sections
+
+Revision ID: e5a9c3d7b1f2
+Revises: d2b7e4f9a0c3
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e5a9c3d7b1f2"
+down_revision: Union[str, None] = "d2b7e4f9a0c3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Cấu hình text search bỏ dấu tiếng Việt khi tách từ, giữ nguyên văn bản gốc
+# để ts_headline vẫn trả về đoạn trích có dấu
+SEARCH_CONFIG = "vietnamese_unaccent"
+
+# bảng -> [(cột, trọng số)]
+SEARCH_COLUMNS = {
+    "courses": [("title", "A"), ("tags", "B"), ("description", "C")],
+    "lessons": [("title", "A"), ("description", "B")],
+    "lesson_sections": [("content", "C")],
+}
+
+
+def _search_vector_expression(columns, prefix: str = "") -> str:
+    return " || ".join(
+        f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce({prefix}{column}, '')), '{weight}')"
+        for column, weight in columns
+    )
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS unaccent")
+    op.execute(f"CREATE TEXT SEARCH CONFIGURATION {SEARCH_CONFIG} (COPY = simple)")
+    op.execute(
+        f"ALTER TEXT SEARCH CONFIGURATION {SEARCH_CONFIG} "
+        "ALTER MAPPING FOR asciiword, asciihword, hword_asciipart, word, hword, "
+        "hword_part WITH unaccent, simple"
+    )
+
+    for table, columns in SEARCH_COLUMNS.items():
+        op.add_column(
+            table,
+            sa.Column("search_vector", postgresql.TSVECTOR(), nullable=True),
+        )
+        op.execute(
+            f"""
+            CREATE FUNCTION {table}_search_vector_update() RETURNS trigger AS $$
+            BEGIN
+                NEW.search_vector := {_search_vector_expression(columns, "NEW.")};
+                RETURN NEW;
+            END
+            $$ LANGUAGE plpgsql
+            """
+        )
+        column_names = ", ".join(column for column, _ in columns)
+        op.execute(
+            f"CREATE TRIGGER {table}_search_vector_trigger "
+            f"BEFORE INSERT OR UPDATE OF {column_names} ON {table} "
+            f"FOR EACH ROW EXECUTE FUNCTION {table}_search_vector_update()"
+        )
+        op.execute(
+            f"UPDATE {table} SET search_vector = {_search_vector_expression(columns)}"
+        )
+        op.create_index(
+            f"ix_{table}_search_vector",
+            table,
+            ["search_vector"],
+            postgresql_using="gin",
+        )
+
+
+def downgrade() -> None:
+    for table in reversed(list(SEARCH_COLUMNS)):
+        op.drop_index(f"ix_{table}_search_vector", table_name=table)
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_search_vector_trigger ON {table}")
+        op.execute(f"DROP FUNCTION IF EXISTS {table}_search_vector_update()")
+        op.drop_column(table, "search_vector")
+
+    op.execute(f"DROP TEXT SEARCH CONFIGURATION IF EXISTS {SEARCH_CONFIG}")
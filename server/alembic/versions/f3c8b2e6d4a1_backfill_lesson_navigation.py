@@ -0,0 +1,49 @@
+"""backfill lesson navigation (next_lesson_id / prev_lesson_id)
+
+Revision ID: f3c8b2e6d4a1
+Revises: e5a9c3d7b1f2
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f3c8b2e6d4a1"
+down_revision: Union[str, None] = "e5a9c3d7b1f2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Từ nay được duy trì khi commit (app.database.lesson_navigation), tính cho
+    # dữ liệu hiện có theo cùng thứ tự bài học
+    op.execute(
+        """
+        UPDATE lessons
+        SET next_lesson_id = sequence.next_id::text,
+            prev_lesson_id = sequence.prev_id::text
+        FROM (
+            SELECT
+                l.id,
+                lead(l.id) OVER w AS next_id,
+                lag(l.id) OVER w AS prev_id
+            FROM lessons l
+            JOIN topics t ON t.id = l.topic_id
+            WINDOW w AS (
+                PARTITION BY t.course_id,
+                    CASE WHEN t.course_id IS NULL THEN t.id END
+                ORDER BY coalesce(t."order", 0), t.id, l."order", l.id
+            )
+        ) AS sequence
+        WHERE lessons.id = sequence.id
+        """
+    )
+
+
+def downgrade() -> None:
+    # Các cột đã có từ trước, chỉ dữ liệu được tính lại nên không cần hoàn tác
+    pass
@@ -1,10 +1,12 @@
 from typing import List, Optional
 from dotenv import load_dotenv
-from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.messages import HumanMessage, SystemMessage, AIMessage
 from langchain_core.chat_history import BaseChatMessageHistory
 from langchain_community.chat_message_histories import ChatMessageHistory
 
+from app.core.agents.components.llm_model import create_chat_model
+from app.core.agents.components.llm_scheduler import INTERACTIVE
+
 
 load_dotenv()
 
@@ -13,7 +15,9 @@ class AIChatAgent:
     def __init__(self, api_key: Optional[str] = None):
         self.api_key = api_key or "YOUR_DEFAULT_KEY"
         # Initialize LLM with newer API
-        self.llm = ChatGoogleGenerativeAI(model="gemini-2.5-flash-preview-05-20", temperature=0.7)
+        self.llm = create_chat_model(
+            INTERACTIVE, model="gemini-2.5-flash-preview-05-20", temperature=0.7
+        )
         # Initialize conversation memory
         self.conversation_history = ChatMessageHistory()
 
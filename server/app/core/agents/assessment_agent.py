@@ -7,6 +7,7 @@ from pydantic import BaseModel, Field
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.agents.base_agent import BaseAgent
+from app.core.agents.components.llm_scheduler import ASSESSMENT
 from app.core.tracing import trace_agent
 from app.database.database import get_async_db
 from app.services.course_service import CourseService, get_course_service
@@ -79,6 +80,8 @@ class AssessmentAgent(BaseAgent):
     và tạo lộ trình học tập cá nhân hóa
     """
 
+    llm_priority = ASSESSMENT
+
     def __init__(
         self,
         test_service: TestService,
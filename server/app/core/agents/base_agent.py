@@ -1,12 +1,20 @@
 from ..agents.components.llm_model import create_new_llm_model
+from ..agents.components.llm_scheduler import BACKGROUND
 from app.core.tracing import get_callback_manager
 
 
 class BaseAgent(object):
     """
     Base class for all agents.
+
+    Agent đặt ``llm_cache_namespace`` để bật cache response cho ``base_llm`` (và các
+    model khác của agent tạo với namespace này), xem components/llm_cache.py.
+    ``llm_priority`` là độ ưu tiên khi chờ quota LLM, xem components/llm_scheduler.py.
     """
 
+    llm_cache_namespace = None
+    llm_priority = BACKGROUND
+
     def __init__(self):
         self.available_args = []
         self._tools = []
@@ -22,7 +30,9 @@ class BaseAgent(object):
             ChatGoogleGenerativeAI: Instance của model LLM
         """
         if self._base_llm is None:
-            self._base_llm = create_new_llm_model()
+            self._base_llm = create_new_llm_model(
+                cache_namespace=self.llm_cache_namespace, priority=self.llm_priority
+            )
         return self._base_llm
 
     def act(self, *args, **kwargs):
@@ -0,0 +1,111 @@
+"""
+Agent dùng chung trong mỗi worker
+
+Tạo agent tốn kém (vector store, prompt, parser, AgentExecutor, client LLM) nên mỗi
+agent chỉ được tạo một lần khi dùng lần đầu rồi dùng lại cho mọi request. Trạng
+thái của request (session DB, session_id) được truyền khi gọi agent, không lưu
+trong instance.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from typing import Callable, Dict, Generic, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_registry: Dict[str, "AgentSingleton"] = {}
+
+
+class AgentSingleton(Generic[T]):
+    """
+    Hàm lấy agent dùng chung, tạo agent ở lần gọi đầu tiên
+
+    Dependency đồng bộ của FastAPI chạy trong thread pool nên việc tạo agent có khóa
+    để hai request đồng thời không cùng tạo agent.
+
+    Attributes:
+        name (str): Tên agent trong registry
+        factory (Callable[[], T]): Hàm tạo agent
+    """
+
+    def __init__(self, name: str, factory: Callable[[], T]):
+        self.name = name
+        self.factory = factory
+        self.__name__ = factory.__name__
+        self.__doc__ = factory.__doc__
+        self._instance: Optional[T] = None
+        self._lock = threading.Lock()
+
+    def __call__(self) -> T:
+        instance = self._instance
+        if instance is None:
+            with self._lock:
+                if self._instance is None:
+                    started = time.perf_counter()
+                    self._instance = self.factory()
+                    logger.info(
+                        f"Đã tạo agent {self.name} trong "
+                        f"{time.perf_counter() - started:.2f}s"
+                    )
+                instance = self._instance
+        return instance
+
+    @property
+    def built(self) -> bool:
+        """Agent đã được tạo hay chưa"""
+        return self._instance is not None
+
+    def cache_clear(self) -> None:
+        """Bỏ agent đã tạo, lần gọi sau tạo lại"""
+        with self._lock:
+            self._instance = None
+
+
+def agent_singleton(name: str) -> Callable[[Callable[[], T]], AgentSingleton[T]]:
+    """
+    Decorator biến hàm tạo agent thành hàm lấy agent dùng chung và đăng ký vào registry
+
+    Args:
+        name: Tên agent, dùng khi khởi tạo trước và trong log
+
+    Returns:
+        Callable: Decorator
+    """
+
+    def decorator(factory: Callable[[], T]) -> AgentSingleton[T]:
+        singleton = AgentSingleton(name, factory)
+        _registry[name] = singleton
+        return singleton
+
+    return decorator
+
+
+def registered_agents() -> Dict[str, AgentSingleton]:
+    """Các agent dùng chung đã đăng ký, theo tên"""
+    return dict(_registry)
+
+
+async def warm_up_agents() -> Dict[str, float]:
+    """
+    Tạo trước tất cả agent đã đăng ký, lần lượt trong thread pool
+
+    Tạo agent có gọi mạng (Pinecone) nên chạy ngoài event loop; agent lỗi chỉ được
+    ghi log và sẽ được tạo lại ở lần dùng đầu tiên.
+
+    Returns:
+        Dict[str, float]: Tên agent -> thời gian tạo (giây) của các agent tạo được
+    """
+    timings = {}
+    for name, singleton in registered_agents().items():
+        started = time.perf_counter()
+        try:
+            await asyncio.to_thread(singleton)
+        except Exception as e:
+            logger.warning(f"Không tạo trước được agent {name}: {e}")
+            continue
+        timings[name] = time.perf_counter() - started
+    return timings
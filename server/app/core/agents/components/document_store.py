@@ -1,5 +1,13 @@
-from typing import Literal
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from typing import Any, Callable, Dict, Iterable, Literal, Optional, Tuple
+
+from langchain_core.vectorstores import VectorStore
 from pinecone import ServerlessSpec
+from pinecone.exceptions import NotFoundException
 
 from app.core.config import settings
 
@@ -7,6 +15,14 @@ from functools import lru_cache
 
 from app.core.agents.components.embedding_model import get_embedding_model
 
+logger = logging.getLogger(__name__)
+
+EMBEDDING_DIMENSION = 768
+INDEX_METRIC = "cosine"
+INDEX_NAMES: Tuple[str, ...] = ("document", "exercise")
+BOOTSTRAP_COMMAND = "python -m scripts.bootstrap_vector_indexes"
+MAX_REFRESH_INTERVAL_SECONDS = 300.0
+
 
 @lru_cache(maxsize=1)
 def get_pinecone_client():
@@ -25,45 +41,365 @@ def get_pinecone_client():
 index_list = Literal["document", "exercise"]
 
 
-def create_index(index_name: index_list):
+class VectorStoreUnavailableError(RuntimeError):
+    """Index chưa dùng được (chưa tạo, sai cấu hình hoặc lỗi mạng)"""
+
+
+def validate_index(description: Any) -> None:
+    """
+    Kiểm tra index Pinecone khớp với model embedding đang dùng
+
+    Args:
+        description: Kết quả ``describe_index`` của index
+
+    Raises:
+        VectorStoreUnavailableError: Nếu số chiều hoặc metric không khớp
+    """
+    metric = str(getattr(description.metric, "value", description.metric))
+    if description.dimension != EMBEDDING_DIMENSION or metric != INDEX_METRIC:
+        raise VectorStoreUnavailableError(
+            f"Index '{description.name}' có dimension={description.dimension}, "
+            f"metric={metric}; cần dimension={EMBEDDING_DIMENSION}, metric={INDEX_METRIC}"
+        )
+
+
+class VectorStoreBackend(ABC):
+    """
+    Nơi lưu vector phía sau VectorStoreRegistry
+
+    Mỗi backend tạo vector store LangChain (``add_documents``, ``similarity_search``,
+    ``as_retriever``) cho một index và namespace; registry lo việc cache.
+
+    Attributes:
+        name (str): Tên backend, dùng trong cấu hình VECTOR_STORE_BACKEND
+    """
+
+    name: str
+
+    @abstractmethod
+    def create_vector_store(
+        self, index_name: str, namespace: Optional[str], embedding: Any
+    ) -> VectorStore:
+        """
+        Tạo vector store cho index và namespace
+
+        Args:
+            index_name: Tên index
+            namespace: Namespace trong index, None là namespace mặc định
+            embedding: Model embedding của vector store
+
+        Returns:
+            VectorStore: Vector store của index
+
+        Raises:
+            VectorStoreUnavailableError: Nếu index chưa dùng được
+        """
+
+    def invalidate(self, index_name: Optional[str] = None) -> None:
+        """Bỏ trạng thái đã cache của index (None là tất cả)"""
+
+    def stats(self) -> Dict[str, Any]:
+        """Trạng thái của backend"""
+        return {}
+
+
+class PineconeBackend(VectorStoreBackend):
+    """
+    Backend Pinecone, kiểm tra mỗi index một lần rồi dùng lại handle
+
+    Mỗi index chỉ được kiểm tra (``describe_index``) một lần rồi giữ lại handle
+    ``Index`` trỏ thẳng tới host của index. Khi kiểm tra lỗi, lỗi được ghi lại và một
+    thread nền thử lại với thời gian chờ tăng dần; trong lúc đó các lần gọi báo lỗi
+    ngay, không gọi mạng. Backend không tạo index: việc đó thuộc lệnh bootstrap.
+
+    Attributes:
+        client_factory (Callable): Hàm lấy Pinecone client
+        refresh_interval (float): Thời gian chờ (giây) trước lần thử lại đầu tiên
+    """
+
+    name = "pinecone"
+
+    def __init__(
+        self,
+        client_factory: Callable[[], Any] = get_pinecone_client,
+        refresh_interval: Optional[float] = None,
+    ):
+        self.client_factory = client_factory
+        self.refresh_interval = (
+            settings.PINECONE_REFRESH_INTERVAL_SECONDS
+            if refresh_interval is None
+            else refresh_interval
+        )
+        self._indexes: Dict[str, Any] = {}
+        self._errors: Dict[str, str] = {}
+        self._refreshing: set = set()
+        self._lock = threading.Lock()
+        self._index_locks: Dict[str, threading.Lock] = defaultdict(threading.Lock)
+        self.resolutions = 0
+
+    def create_vector_store(
+        self, index_name: str, namespace: Optional[str], embedding: Any
+    ) -> VectorStore:
+        from langchain_pinecone import PineconeVectorStore
+
+        return PineconeVectorStore(
+            index=self.get_index(index_name), embedding=embedding, namespace=namespace
+        )
+
+    def get_index(self, index_name: index_list):
+        """
+        Trả về handle ``Index`` của index, kiểm tra index ở lần gọi đầu tiên
+
+        Args:
+            index_name: Tên của index
+
+        Returns:
+            Index: Handle của index trong Pinecone
+
+        Raises:
+            VectorStoreUnavailableError: Nếu index chưa tồn tại, sai cấu hình hoặc
+                không kết nối được
+        """
+        index = self._indexes.get(index_name)
+        if index is not None:
+            return index
+
+        with self._lock:
+            index_lock = self._index_locks[index_name]
+        with index_lock:
+            index = self._indexes.get(index_name)
+            if index is not None:
+                return index
+            if index_name in self._refreshing:
+                raise VectorStoreUnavailableError(self._errors[index_name])
+            try:
+                index = self._resolve(index_name)
+            except Exception as e:
+                message = self._describe_error(index_name, e)
+                with self._lock:
+                    self._errors[index_name] = message
+                self._start_refresh(index_name)
+                raise VectorStoreUnavailableError(message) from e
+            with self._lock:
+                self._indexes[index_name] = index
+        return index
+
+    def invalidate(self, index_name: Optional[str] = None) -> None:
+        with self._lock:
+            for name in list(self._indexes):
+                if index_name in (None, name):
+                    del self._indexes[name]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "ready": sorted(self._indexes),
+                "errors": dict(self._errors),
+                "resolutions": self.resolutions,
+            }
+
+    def _resolve(self, index_name: str):
+        self.resolutions += 1
+        client = self.client_factory()
+        description = client.describe_index(index_name)
+        validate_index(description)
+        return client.Index(host=description.host)
+
+    @staticmethod
+    def _describe_error(index_name: str, error: Exception) -> str:
+        if isinstance(error, NotFoundException):
+            return (
+                f"Index '{index_name}' chưa tồn tại trong Pinecone, "
+                f"chạy `{BOOTSTRAP_COMMAND}` để tạo"
+            )
+        if isinstance(error, VectorStoreUnavailableError):
+            return str(error)
+        return f"Không kiểm tra được index '{index_name}': {error}"
+
+    def _start_refresh(self, index_name: str) -> None:
+        with self._lock:
+            if index_name in self._refreshing:
+                return
+            self._refreshing.add(index_name)
+        threading.Thread(
+            target=self._refresh,
+            args=(index_name,),
+            name=f"vector-store-refresh-{index_name}",
+            daemon=True,
+        ).start()
+
+    def _refresh(self, index_name: str) -> None:
+        delay = self.refresh_interval
+        while True:
+            time.sleep(delay)
+            try:
+                index = self._resolve(index_name)
+            except Exception as e:
+                message = self._describe_error(index_name, e)
+                with self._lock:
+                    self._errors[index_name] = message
+                delay = min(max(delay * 2, 0.01), MAX_REFRESH_INTERVAL_SECONDS)
+                logger.warning(f"{message}, thử lại sau {delay:.0f}s")
+                continue
+            with self._lock:
+                self._indexes[index_name] = index
+                self._errors.pop(index_name, None)
+                self._refreshing.discard(index_name)
+            logger.info(f"Index '{index_name}' đã sẵn sàng")
+            return
+
+
+class VectorStoreRegistry:
     """
-    Tạo một index mới trong Pinecone
+    Vector store dùng chung trong mỗi worker, cache theo ``(index_name, namespace)``
+
+    Attributes:
+        backend (VectorStoreBackend): Nơi lưu vector (Pinecone hoặc local)
+        embedding_factory (Callable): Hàm lấy model embedding cho vector store
+    """
+
+    def __init__(
+        self,
+        backend: Optional[VectorStoreBackend] = None,
+        embedding_factory: Callable[[], Any] = get_embedding_model,
+    ):
+        self.backend = backend or create_vector_store_backend()
+        self.embedding_factory = embedding_factory
+        self._stores: Dict[Tuple[str, Optional[str]], VectorStore] = {}
+        self._lock = threading.Lock()
+
+    def get_vector_store(
+        self, index_name: index_list, namespace: Optional[str] = None
+    ) -> VectorStore:
+        """
+        Trả về vector store dùng chung của index và namespace
+
+        Args:
+            index_name: Tên của index cần sử dụng
+            namespace: Namespace trong index, None là namespace mặc định
+
+        Returns:
+            VectorStore: Vector store được liên kết với index
+
+        Raises:
+            VectorStoreUnavailableError: Nếu index chưa dùng được
+        """
+        key = (index_name, namespace)
+        store = self._stores.get(key)
+        if store is not None:
+            return store
+
+        store = self.backend.create_vector_store(
+            index_name, namespace, self.embedding_factory()
+        )
+        with self._lock:
+            return self._stores.setdefault(key, store)
+
+    def invalidate(self, index_name: Optional[str] = None) -> None:
+        """
+        Bỏ vector store đã cache, lần gọi sau tạo lại (và kiểm tra lại index)
+
+        Args:
+            index_name: Index cần bỏ, None là tất cả
+        """
+        with self._lock:
+            for key in list(self._stores):
+                if index_name in (None, key[0]):
+                    del self._stores[key]
+        self.backend.invalidate(index_name)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Trạng thái của registry
+
+        Returns:
+            Dict[str, Any]: Tên backend, số vector store đã tạo và trạng thái của backend
+        """
+        with self._lock:
+            stores = len(self._stores)
+        return {"backend": self.backend.name, "stores": stores, **self.backend.stats()}
+
+
+def create_vector_store_backend(name: Optional[str] = None) -> VectorStoreBackend:
+    """
+    Tạo backend theo cấu hình VECTOR_STORE_BACKEND
 
     Args:
-        index_name: Tên của index cần tạo
+        name: Tên backend, mặc định lấy từ cấu hình
+
+    Returns:
+        VectorStoreBackend: Backend cho worker hiện tại
     """
-    pc = get_pinecone_client()
-    pc_index = pc.Index(index_name)
-    pc_index.create(dimension=768, metric="cosine")
+    name = name or settings.VECTOR_STORE_BACKEND
+    if name == "pinecone":
+        return PineconeBackend()
+    elif name == "local":
+        from app.core.agents.components.local_vector_store import LocalVectorStoreBackend
+
+        return LocalVectorStoreBackend(
+            settings.VECTOR_STORE_LOCAL_PATH,
+            dtype=settings.VECTOR_STORE_LOCAL_DTYPE,
+            ivf_min_vectors=settings.VECTOR_STORE_IVF_MIN_VECTORS,
+            ivf_probes=settings.VECTOR_STORE_IVF_PROBES,
+        )
+    raise ValueError(f"VECTOR_STORE_BACKEND không hợp lệ: {name}")
 
 
-def get_vector_store(index_name: index_list):
+vector_store_registry = VectorStoreRegistry()
+
+
+def get_vector_store(
+    index_name: index_list, namespace: Optional[str] = None
+) -> VectorStore:
     """
-    Trả về một vector store được liên kết với index được chỉ định
+    Trả về vector store dùng chung được liên kết với index được chỉ định
 
     Args:
         index_name: Tên của index cần sử dụng
+        namespace: Namespace trong index, None là namespace mặc định
 
     Returns:
-        PineconeVectorStore: Vector store được liên kết với index
+        VectorStore: Vector store được liên kết với index (Pinecone hoặc local tùy
+        VECTOR_STORE_BACKEND)
     """
-    from langchain_pinecone import PineconeVectorStore
+    return vector_store_registry.get_vector_store(index_name, namespace)
 
-    pc_index = get_index(index_name)
-    pc_vector_store = PineconeVectorStore(
-        index=pc_index, embedding=get_embedding_model()
-    )
-    return pc_vector_store
 
+def bootstrap_indexes(
+    index_names: Iterable[str] = INDEX_NAMES, client: Optional[Any] = None
+) -> Dict[str, str]:
+    """
+    Tạo các index Pinecone còn thiếu và kiểm tra các index đã có
 
-def get_index(index_name: index_list):
-    pc = get_pinecone_client()
-    if index_name not in [index.name for index in pc.list_indexes().indexes]:
-        pc.create_index(
+    Chỉ dùng khi triển khai (``python -m scripts.bootstrap_vector_indexes``), không
+    gọi trong request.
+
+    Args:
+        index_names: Các index cần có
+        client: Pinecone client, mặc định dùng client của ứng dụng
+
+    Returns:
+        Dict[str, str]: Tên index -> "created" hoặc "exists"
+
+    Raises:
+        VectorStoreUnavailableError: Nếu index đã có nhưng sai số chiều hoặc metric
+    """
+    client = client or get_pinecone_client()
+    existing = {index.name for index in client.list_indexes()}
+    result = {}
+    for index_name in index_names:
+        if index_name in existing:
+            validate_index(client.describe_index(index_name))
+            result[index_name] = "exists"
+            continue
+        # create_index chờ tới khi index sẵn sàng
+        client.create_index(
             name=index_name,
-            dimension=768,
-            metric="cosine",
-            spec=ServerlessSpec(cloud="aws", region="us-east-1"),
+            dimension=EMBEDDING_DIMENSION,
+            metric=INDEX_METRIC,
+            spec=ServerlessSpec(
+                cloud=settings.PINECONE_CLOUD, region=settings.PINECONE_REGION
+            ),
         )
-    pc_index = pc.Index(index_name)
-    return pc_index
+        result[index_name] = "created"
+    return result
@@ -0,0 +1,341 @@
+"""
+Cache embedding theo nội dung cho model embedding
+
+Bọc model embedding của LangChain: key là sha256 của model, loại embedding
+(query/document, Gemini dùng task type khác nhau) và nội dung; vector lưu dạng
+float32 hoặc int8 trong bảng ``embedding_cache_entries`` (database chính hoặc
+``EMBEDDING_CACHE_DATABASE_URL``), loại bớt entry ít dùng nhất khi vượt giới hạn.
+Mỗi lần gọi tra cứu cả lô bằng một câu truy vấn và gửi các nội dung còn thiếu
+cho model trong một lần gọi.
+"""
+
+import hashlib
+import logging
+import threading
+import time
+from array import array
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from langchain_core.embeddings import Embeddings
+from sqlalchemy import create_engine, delete, func, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_COUNTERS = ("hits", "misses", "writes", "evictions", "errors", "vectors", "embedded")
+
+
+def encode_vector(vector: Sequence[float], quantize: bool) -> Tuple[bytes, Optional[float]]:
+    """
+    Đóng gói vector thành bytes
+
+    Args:
+        vector: Vector embedding
+        quantize: Lượng tử hóa đối xứng về int8 (giá trị = int8 * scale)
+
+    Returns:
+        Tuple[bytes, Optional[float]]: Dữ liệu và scale (None với float32)
+    """
+    if not quantize:
+        return array("f", vector).tobytes(), None
+    peak = max((abs(value) for value in vector), default=0.0)
+    scale = peak / 127 if peak else 1.0
+    return array("b", (round(value / scale) for value in vector)).tobytes(), scale
+
+
+def decode_vector(data: bytes, scale: Optional[float]) -> List[float]:
+    """Giải nén vector từ ``encode_vector``"""
+    if scale is None:
+        return array("f", data).tolist()
+    return [value * scale for value in array("b", data)]
+
+
+class EmbeddingCacheStats:
+    """
+    Bộ đếm hit/miss và thông lượng của cache embedding trong worker hiện tại
+
+    Vector store của LangChain gọi embedding qua thread pool nên các bộ đếm có khóa.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = dict.fromkeys(_COUNTERS, 0)
+        self._seconds = 0.0
+        self._embed_seconds = 0.0
+
+    def record(
+        self,
+        seconds: float = 0.0,
+        embed_seconds: float = 0.0,
+        **counters: int,
+    ) -> None:
+        with self._lock:
+            self._seconds += seconds
+            self._embed_seconds += embed_seconds
+            for counter, amount in counters.items():
+                self._counters[counter] += amount
+
+    def clear(self) -> None:
+        with self._lock:
+            self._counters = dict.fromkeys(_COUNTERS, 0)
+            self._seconds = 0.0
+            self._embed_seconds = 0.0
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Thống kê cache embedding
+
+        Returns:
+            Dict[str, float]: Các bộ đếm, hit_rate, tổng thời gian, vectors_per_second
+                (vector trả về mỗi giây, tính cả cache) và embed_vectors_per_second
+                (vector model tạo mỗi giây)
+        """
+        with self._lock:
+            result: Dict[str, float] = dict(self._counters)
+            seconds, embed_seconds = self._seconds, self._embed_seconds
+
+        lookups = result["hits"] + result["misses"]
+        result["hit_rate"] = round(result["hits"] / lookups, 4) if lookups else 0.0
+        result["seconds"] = round(seconds, 4)
+        result["embed_seconds"] = round(embed_seconds, 4)
+        result["vectors_per_second"] = (
+            round(result["vectors"] / seconds, 2) if seconds else 0.0
+        )
+        result["embed_vectors_per_second"] = (
+            round(result["embedded"] / embed_seconds, 2) if embed_seconds else 0.0
+        )
+        return result
+
+
+embedding_cache_stats = EmbeddingCacheStats()
+
+
+class EmbeddingCacheStore:
+    """
+    Lưu vector trong bảng ``embedding_cache_entries`` bằng engine đồng bộ
+
+    Engine tạo khi dùng lần đầu; với SQLite bảng được tạo tự động, với PostgreSQL
+    bảng do migration tạo.
+    """
+
+    def __init__(
+        self,
+        url: Optional[str] = None,
+        engine: Optional[Engine] = None,
+        max_entries: int = settings.EMBEDDING_CACHE_MAX_ENTRIES,
+        quantize: bool = settings.EMBEDDING_CACHE_QUANTIZE,
+    ):
+        self.url = url
+        self.max_entries = max_entries
+        self.quantize = quantize
+        self._engine = engine
+        self._engine_lock = threading.Lock()
+
+    @property
+    def engine(self) -> Engine:
+        if self._engine is None:
+            with self._engine_lock:
+                if self._engine is None:
+                    self._engine = self._create_engine()
+        return self._engine
+
+    def _create_engine(self) -> Engine:
+        from app.models.embedding_cache_model import EmbeddingCacheEntry
+
+        engine = create_engine(self.url or settings.DATABASE_URI, pool_pre_ping=True)
+        if engine.dialect.name == "sqlite":
+            EmbeddingCacheEntry.metadata.create_all(
+                engine, tables=[EmbeddingCacheEntry.__table__]
+            )
+        return engine
+
+    def get_many(self, keys: Sequence[str]) -> Dict[str, List[float]]:
+        """
+        Lấy các vector đã cache và ghi nhận lượt dùng, cả lô trong một transaction
+
+        Args:
+            keys: Các key cần tra cứu
+
+        Returns:
+            Dict[str, List[float]]: key -> vector, thiếu các key chưa có
+        """
+        from app.models.embedding_cache_model import EmbeddingCacheEntry
+
+        if not keys:
+            return {}
+        with Session(self.engine) as session, session.begin():
+            rows = session.execute(
+                select(
+                    EmbeddingCacheEntry.key,
+                    EmbeddingCacheEntry.vector,
+                    EmbeddingCacheEntry.scale,
+                ).where(EmbeddingCacheEntry.key.in_(list(keys)))
+            ).all()
+            if rows:
+                session.execute(
+                    update(EmbeddingCacheEntry)
+                    .where(EmbeddingCacheEntry.key.in_([row.key for row in rows]))
+                    .values(
+                        last_hit_at=time.time(),
+                        hit_count=EmbeddingCacheEntry.hit_count + 1,
+                    )
+                )
+        return {row.key: decode_vector(row.vector, row.scale) for row in rows}
+
+    def put_many(self, model: str, vectors: Dict[str, Sequence[float]]) -> int:
+        """
+        Lưu các vector vừa tạo và loại bớt entry ít dùng nhất khi vượt giới hạn
+
+        Args:
+            model: Model embedding
+            vectors: key -> vector
+
+        Returns:
+            int: Số entry bị loại
+        """
+        from app.models.embedding_cache_model import EmbeddingCacheEntry
+
+        if not vectors:
+            return 0
+        now = time.time()
+        rows = []
+        for key, vector in vectors.items():
+            data, scale = encode_vector(vector, self.quantize)
+            rows.append(
+                {
+                    "key": key,
+                    "model": model,
+                    "vector": data,
+                    "scale": scale,
+                    "last_hit_at": now,
+                    "hit_count": 0,
+                }
+            )
+
+        # Worker khác có thể vừa ghi cùng nội dung: giữ bản đã có
+        dialect_insert = (
+            sqlite.insert if self.engine.dialect.name == "sqlite" else postgresql.insert
+        )
+        with Session(self.engine) as session, session.begin():
+            session.execute(
+                dialect_insert(EmbeddingCacheEntry).on_conflict_do_nothing(
+                    index_elements=[EmbeddingCacheEntry.key]
+                ),
+                rows,
+            )
+            overflow = (
+                session.scalar(select(func.count()).select_from(EmbeddingCacheEntry))
+                - self.max_entries
+            )
+            if overflow <= 0:
+                return 0
+            oldest = (
+                select(EmbeddingCacheEntry.key)
+                .order_by(EmbeddingCacheEntry.last_hit_at)
+                .limit(overflow)
+                .scalar_subquery()
+            )
+            return session.execute(
+                delete(EmbeddingCacheEntry).where(EmbeddingCacheEntry.key.in_(oldest))
+            ).rowcount
+
+    def clear(self) -> None:
+        """Xóa toàn bộ cache embedding"""
+        from app.models.embedding_cache_model import EmbeddingCacheEntry
+
+        with Session(self.engine) as session, session.begin():
+            session.execute(delete(EmbeddingCacheEntry))
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Model embedding có cache theo nội dung
+
+    Lỗi của cache chỉ được ghi log và đếm, nội dung được embedding bằng model như
+    bình thường. Bản async mặc định của ``Embeddings`` chạy các hàm đồng bộ trong
+    thread pool nên truy vấn cache không chặn event loop.
+
+    Attributes:
+        embeddings (Embeddings): Model embedding thật
+        model (str): Tên model, là một phần của key
+        store (EmbeddingCacheStore): Nơi lưu vector
+    """
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        model: str,
+        store: EmbeddingCacheStore,
+        stats: EmbeddingCacheStats = embedding_cache_stats,
+    ):
+        self.embeddings = embeddings
+        self.model = model
+        self.store = store
+        self.stats = stats
+
+    def make_key(self, kind: str, text: str) -> str:
+        return hashlib.sha256(f"{self.model}\n{kind}\n{text}".encode()).hexdigest()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embedding các đoạn văn bản, chỉ gửi cho model những đoạn chưa có trong cache
+
+        Args:
+            texts: Các đoạn văn bản
+
+        Returns:
+            List[List[float]]: Vector theo đúng thứ tự ``texts``
+        """
+        return self._embed("document", texts, self.embeddings.embed_documents)
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embedding câu truy vấn (task type khác với tài liệu)"""
+        return self._embed(
+            "query", [text], lambda texts: [self.embeddings.embed_query(texts[0])]
+        )[0]
+
+    def _embed(self, kind: str, texts: List[str], embed) -> List[List[float]]:
+        started = time.perf_counter()
+        keys = [self.make_key(kind, text) for text in texts]
+        unique = dict(zip(keys, texts))
+
+        try:
+            vectors = self.store.get_many(list(unique))
+        except Exception as e:
+            self.stats.record(errors=1)
+            logger.warning(f"Lỗi khi tra cứu cache embedding: {e}")
+            vectors = {}
+
+        hits = sum(1 for key in keys if key in vectors)
+        missing = [key for key in unique if key not in vectors]
+        embed_seconds = 0.0
+        evictions = writes = 0
+        if missing:
+            embed_started = time.perf_counter()
+            fresh = embed([unique[key] for key in missing])
+            embed_seconds = time.perf_counter() - embed_started
+            vectors.update(zip(missing, fresh))
+            try:
+                evictions = self.store.put_many(
+                    self.model, {key: vectors[key] for key in missing}
+                )
+                writes = len(missing)
+            except Exception as e:
+                self.stats.record(errors=1)
+                logger.warning(f"Lỗi khi lưu cache embedding: {e}")
+
+        self.stats.record(
+            seconds=time.perf_counter() - started,
+            embed_seconds=embed_seconds,
+            hits=hits,
+            misses=len(keys) - hits,
+            writes=writes,
+            evictions=evictions,
+            vectors=len(keys),
+            embedded=len(missing),
+        )
+        return [vectors[key] for key in keys]
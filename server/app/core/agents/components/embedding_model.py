@@ -8,12 +8,28 @@ def get_embedding_model():
     """
     Trả về một instance được cache của model embedding Gemini
 
+    Khi ``EMBEDDING_CACHE_ENABLED`` bật, model được bọc bởi cache embedding theo
+    nội dung nên query và tài liệu đã embedding không gọi lại Gemini.
+
     Returns:
-        GoogleGenerativeAIEmbeddings: Instance được cache của model embedding
+        Embeddings: GoogleGenerativeAIEmbeddings, hoặc CachedEmbeddings bọc nó
     """
     # Lazy import - chỉ import khi cần thiết
     from langchain_google_genai import GoogleGenerativeAIEmbeddings
 
-    return GoogleGenerativeAIEmbeddings(
+    embeddings = GoogleGenerativeAIEmbeddings(
         model=settings.EMBEDDING_MODEL, google_api_key=settings.GOOGLE_API_KEY
     )
+    if not settings.EMBEDDING_CACHE_ENABLED:
+        return embeddings
+
+    from app.core.agents.components.embedding_cache import (
+        CachedEmbeddings,
+        EmbeddingCacheStore,
+    )
+
+    return CachedEmbeddings(
+        embeddings,
+        settings.EMBEDDING_MODEL,
+        EmbeddingCacheStore(url=settings.EMBEDDING_CACHE_DATABASE_URL),
+    )
@@ -0,0 +1,471 @@
+"""
+Cache response của LLM cho các agent
+
+Gắn vào chat model qua tham số ``cache`` của LangChain: LangChain tự tra cứu trước
+khi gọi Gemini với prompt (messages đã serialize) và ``llm_string`` (model cùng
+tham số, kể cả tools/structured output đã bind), rồi lưu kết quả sau khi gọi.
+
+- Tầng exact: key là sha256 của ``llm_string`` và prompt, lưu trong bảng
+  ``llm_cache_entries`` (database chính hoặc ``LLM_CACHE_DATABASE_URL``), có TTL
+  và giới hạn số entry.
+- Tầng semantic (tùy chọn): embedding nội dung prompt, dùng lại response của
+  prompt cùng model/tham số có độ tương đồng cosine từ ngưỡng trở lên.
+"""
+
+import hashlib
+import json
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from langchain_core.caches import RETURN_VAL_TYPE, BaseCache
+from langchain_core.load import dumps, loads
+from sqlalchemy import create_engine, delete, func, select, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+Embedder = Callable[[str], List[float]]
+
+_COUNTERS = ("exact_hits", "semantic_hits", "misses", "writes", "evictions", "errors")
+
+
+def _sha256(value: str) -> str:
+    return hashlib.sha256(value.encode()).hexdigest()
+
+
+def prompt_text(prompt: str) -> str:
+    """
+    Lấy phần nội dung của các message trong prompt đã serialize để tính embedding
+
+    Bỏ phần cấu trúc JSON (id lớp, kiểu message) vốn giống nhau giữa mọi prompt và
+    làm độ tương đồng cao giả.
+
+    Args:
+        prompt: Prompt LangChain truyền cho cache (messages đã ``dumps``)
+
+    Returns:
+        str: Nội dung các message nối bằng xuống dòng
+    """
+    try:
+        messages = json.loads(prompt)
+    except (TypeError, ValueError):
+        return prompt
+
+    contents = []
+
+    def collect(node):
+        if isinstance(node, list):
+            for item in node:
+                collect(item)
+        elif isinstance(node, dict):
+            kwargs = node.get("kwargs")
+            if not isinstance(kwargs, dict) or "content" not in kwargs:
+                for value in node.values():
+                    collect(value)
+            elif isinstance(kwargs["content"], str):
+                contents.append(kwargs["content"])
+            else:
+                # Nội dung nhiều phần: chỉ lấy các phần text
+                contents.extend(
+                    part.get("text", "")
+                    for part in kwargs["content"]
+                    if isinstance(part, dict) and part.get("type") == "text"
+                )
+
+    collect(messages)
+    return "\n".join(contents) if contents else prompt
+
+
+def cosine_similarity(a: Sequence[float], b: Sequence[float]) -> float:
+    """Độ tương đồng cosine của hai vector"""
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
+
+
+class LLMCacheStats:
+    """
+    Bộ đếm hit/miss theo agent (namespace) trong worker hiện tại
+
+    Tra cứu cache chạy trong thread pool của LangChain nên các bộ đếm có khóa.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[str, int]] = {}
+
+    def increment(self, namespace: str, counter: str, amount: int = 1) -> None:
+        with self._lock:
+            counters = self._counters.setdefault(
+                namespace, dict.fromkeys(_COUNTERS, 0)
+            )
+            counters[counter] += amount
+
+    def clear(self) -> None:
+        with self._lock:
+            self._counters.clear()
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Thống kê theo agent và tổng
+
+        Returns:
+            Dict[str, Dict[str, float]]: namespace -> bộ đếm và hit_rate, thêm khóa
+                "total" cộng dồn mọi agent
+        """
+        with self._lock:
+            result = {
+                namespace: dict(counters)
+                for namespace, counters in self._counters.items()
+            }
+        total = dict.fromkeys(_COUNTERS, 0)
+        for counters in result.values():
+            for counter in _COUNTERS:
+                total[counter] += counters[counter]
+        result["total"] = total
+
+        for counters in result.values():
+            hits = counters["exact_hits"] + counters["semantic_hits"]
+            lookups = hits + counters["misses"]
+            counters["hit_rate"] = round(hits / lookups, 4) if lookups else 0.0
+        return result
+
+
+llm_cache_stats = LLMCacheStats()
+
+
+class LLMCacheStore:
+    """
+    Lưu response trong bảng ``llm_cache_entries`` bằng engine đồng bộ
+
+    LangChain gọi ``alookup``/``aupdate`` mặc định qua thread pool nên truy vấn
+    đồng bộ không chặn event loop. Engine tạo khi dùng lần đầu; với SQLite bảng
+    được tạo tự động, với PostgreSQL bảng do migration tạo.
+    """
+
+    def __init__(
+        self,
+        url: Optional[str] = None,
+        engine: Optional[Engine] = None,
+        ttl_seconds: int = settings.LLM_CACHE_TTL_SECONDS,
+        max_entries: int = settings.LLM_CACHE_MAX_ENTRIES,
+    ):
+        self.url = url
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._engine = engine
+        self._engine_lock = threading.Lock()
+
+    @property
+    def engine(self) -> Engine:
+        if self._engine is None:
+            with self._engine_lock:
+                if self._engine is None:
+                    self._engine = self._create_engine()
+        return self._engine
+
+    def _create_engine(self) -> Engine:
+        from app.models.llm_cache_model import LLMCacheEntry
+
+        engine = create_engine(self.url or settings.DATABASE_URI, pool_pre_ping=True)
+        if engine.dialect.name == "sqlite":
+            LLMCacheEntry.metadata.create_all(engine, tables=[LLMCacheEntry.__table__])
+        return engine
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Lấy response theo key exact và ghi nhận lượt dùng
+
+        Returns:
+            Optional[str]: Response đã serialize, None nếu không có hoặc đã hết hạn
+        """
+        from app.models.llm_cache_model import LLMCacheEntry
+
+        now = time.time()
+        with Session(self.engine) as session, session.begin():
+            response = session.scalar(
+                select(LLMCacheEntry.response).where(
+                    LLMCacheEntry.key == key, LLMCacheEntry.expires_at > now
+                )
+            )
+            if response is not None:
+                self._touch(session, key, now)
+            return response
+
+    def nearest(
+        self,
+        namespace: str,
+        llm_string_hash: str,
+        embedding: Sequence[float],
+        threshold: float,
+        candidates: int,
+    ) -> Optional[str]:
+        """
+        Response của prompt gần nhất cùng agent và model/tham số
+
+        Args:
+            namespace: Agent
+            llm_string_hash: sha256 của model và tham số
+            embedding: Embedding của prompt cần tra cứu
+            threshold: Độ tương đồng cosine tối thiểu
+            candidates: Số entry dùng gần nhất được so sánh
+
+        Returns:
+            Optional[str]: Response đã serialize, None nếu không có entry đủ gần
+        """
+        from app.models.llm_cache_model import LLMCacheEntry
+
+        now = time.time()
+        with Session(self.engine) as session, session.begin():
+            rows = session.execute(
+                select(LLMCacheEntry.key, LLMCacheEntry.embedding)
+                .where(
+                    LLMCacheEntry.namespace == namespace,
+                    LLMCacheEntry.llm_string_hash == llm_string_hash,
+                    LLMCacheEntry.expires_at > now,
+                    LLMCacheEntry.embedding.is_not(None),
+                )
+                .order_by(LLMCacheEntry.last_hit_at.desc())
+                .limit(candidates)
+            ).all()
+
+            best_key, best_score = None, threshold
+            for row in rows:
+                score = cosine_similarity(embedding, row.embedding)
+                if score >= best_score:
+                    best_key, best_score = row.key, score
+            if best_key is None:
+                return None
+
+            self._touch(session, best_key, now)
+            return session.scalar(
+                select(LLMCacheEntry.response).where(LLMCacheEntry.key == best_key)
+            )
+
+    def put(
+        self,
+        key: str,
+        namespace: str,
+        llm_string_hash: str,
+        response: str,
+        embedding: Optional[List[float]] = None,
+    ) -> int:
+        """
+        Lưu response, xóa entry hết hạn và loại bớt entry ít dùng nhất khi vượt giới hạn
+
+        Ghi chỉ xảy ra sau một lần gọi LLM (vài giây) nên dọn dẹp ngay trong lần ghi.
+
+        Returns:
+            int: Số entry bị xóa
+        """
+        from app.models.llm_cache_model import LLMCacheEntry
+
+        now = time.time()
+        with Session(self.engine) as session, session.begin():
+            session.execute(delete(LLMCacheEntry).where(LLMCacheEntry.key == key))
+            session.add(
+                LLMCacheEntry(
+                    key=key,
+                    namespace=namespace,
+                    llm_string_hash=llm_string_hash,
+                    response=response,
+                    embedding=embedding,
+                    expires_at=now + self.ttl_seconds,
+                    last_hit_at=now,
+                    hit_count=0,
+                )
+            )
+            session.flush()
+
+            removed = session.execute(
+                delete(LLMCacheEntry).where(LLMCacheEntry.expires_at <= now)
+            ).rowcount
+            overflow = (
+                session.scalar(select(func.count()).select_from(LLMCacheEntry))
+                - self.max_entries
+            )
+            if overflow > 0:
+                oldest = (
+                    select(LLMCacheEntry.key)
+                    .order_by(LLMCacheEntry.last_hit_at)
+                    .limit(overflow)
+                    .scalar_subquery()
+                )
+                removed += session.execute(
+                    delete(LLMCacheEntry).where(LLMCacheEntry.key.in_(oldest))
+                ).rowcount
+            return removed
+
+    def clear(self, namespace: Optional[str] = None) -> None:
+        """Xóa cache của một agent hoặc toàn bộ"""
+        from app.models.llm_cache_model import LLMCacheEntry
+
+        stmt = delete(LLMCacheEntry)
+        if namespace is not None:
+            stmt = stmt.where(LLMCacheEntry.namespace == namespace)
+        with Session(self.engine) as session, session.begin():
+            session.execute(stmt)
+
+    @staticmethod
+    def _touch(session: Session, key: str, now: float) -> None:
+        from app.models.llm_cache_model import LLMCacheEntry
+
+        session.execute(
+            update(LLMCacheEntry)
+            .where(LLMCacheEntry.key == key)
+            .values(last_hit_at=now, hit_count=LLMCacheEntry.hit_count + 1)
+        )
+
+
+class LLMResponseCache(BaseCache):
+    """
+    Cache LangChain cho chat model của một agent
+
+    Lỗi của cache chỉ được ghi log và đếm, agent vẫn gọi LLM như bình thường.
+
+    Attributes:
+        namespace (str): Tên agent, dùng để thống kê và bật/tắt theo agent
+        store (LLMCacheStore): Nơi lưu response
+        embedder (Optional[Embedder]): Hàm embedding, None để tắt tầng semantic
+        semantic_threshold (float): Độ tương đồng cosine tối thiểu của tầng semantic
+        semantic_candidates (int): Số entry được so sánh mỗi lần tra cứu semantic
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        store: LLMCacheStore,
+        embedder: Optional[Embedder] = None,
+        semantic_threshold: float = settings.LLM_CACHE_SEMANTIC_THRESHOLD,
+        semantic_candidates: int = settings.LLM_CACHE_SEMANTIC_CANDIDATES,
+        stats: LLMCacheStats = llm_cache_stats,
+    ):
+        self.namespace = namespace
+        self.store = store
+        self.embedder = embedder
+        self.semantic_threshold = semantic_threshold
+        self.semantic_candidates = semantic_candidates
+        self.stats = stats
+        # Embedding tính lúc tra cứu trượt, dùng lại khi lưu response của prompt đó
+        self._pending_embeddings: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._pending_lock = threading.Lock()
+
+    @staticmethod
+    def make_key(prompt: str, llm_string: str) -> str:
+        return _sha256(f"{llm_string}\n{prompt}")
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        key = self.make_key(prompt, llm_string)
+        try:
+            response = self.store.get(key)
+            if response is not None:
+                self.stats.increment(self.namespace, "exact_hits")
+                return loads(response)
+
+            if self.embedder is not None:
+                embedding = self.embedder(prompt_text(prompt))
+                self._remember_embedding(key, embedding)
+                response = self.store.nearest(
+                    self.namespace,
+                    _sha256(llm_string),
+                    embedding,
+                    self.semantic_threshold,
+                    self.semantic_candidates,
+                )
+                if response is not None:
+                    self.stats.increment(self.namespace, "semantic_hits")
+                    return loads(response)
+        except Exception as e:
+            self.stats.increment(self.namespace, "errors")
+            logger.warning(f"Lỗi khi tra cứu cache LLM ({self.namespace}): {e}")
+            return None
+
+        self.stats.increment(self.namespace, "misses")
+        return None
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        key = self.make_key(prompt, llm_string)
+        with self._pending_lock:
+            embedding = self._pending_embeddings.pop(key, None)
+        try:
+            if self.embedder is not None and embedding is None:
+                embedding = self.embedder(prompt_text(prompt))
+            removed = self.store.put(
+                key,
+                self.namespace,
+                _sha256(llm_string),
+                dumps(list(return_val)),
+                embedding,
+            )
+            self.stats.increment(self.namespace, "writes")
+            if removed:
+                self.stats.increment(self.namespace, "evictions", removed)
+        except Exception as e:
+            self.stats.increment(self.namespace, "errors")
+            logger.warning(f"Lỗi khi lưu cache LLM ({self.namespace}): {e}")
+
+    def clear(self, **kwargs: Any) -> None:
+        """Xóa response đã cache của agent này"""
+        self.store.clear(self.namespace)
+
+    def _remember_embedding(self, key: str, embedding: List[float]) -> None:
+        with self._pending_lock:
+            self._pending_embeddings[key] = embedding
+            while len(self._pending_embeddings) > 256:
+                self._pending_embeddings.popitem(last=False)
+
+
+_store: Optional[LLMCacheStore] = None
+_caches: Dict[str, LLMResponseCache] = {}
+_caches_lock = threading.Lock()
+
+
+def _embed_query(text: str) -> List[float]:
+    from app.core.agents.components.embedding_model import get_embedding_model
+
+    return get_embedding_model().embed_query(text)
+
+
+def get_llm_cache(
+    namespace: Optional[str], temperature: float = 0.0
+) -> Optional[LLMResponseCache]:
+    """
+    Cache cho chat model của một agent, None nếu không dùng cache
+
+    Không dùng cache khi agent không khai báo namespace, cache bị tắt (toàn bộ hoặc
+    riêng agent trong ``LLM_CACHE_DISABLED_AGENTS``) hoặc temperature vượt
+    ``LLM_CACHE_MAX_TEMPERATURE`` (gọi để lấy kết quả đa dạng).
+
+    Args:
+        namespace: Tên agent
+        temperature: Temperature của model
+
+    Returns:
+        Optional[LLMResponseCache]: Cache dùng chung cho mọi model của agent
+    """
+    global _store
+    if (
+        namespace is None
+        or not settings.LLM_CACHE_ENABLED
+        or namespace in settings.LLM_CACHE_DISABLED_AGENTS
+        or temperature > settings.LLM_CACHE_MAX_TEMPERATURE
+    ):
+        return None
+
+    with _caches_lock:
+        if _store is None:
+            _store = LLMCacheStore(url=settings.LLM_CACHE_DATABASE_URL)
+        if namespace not in _caches:
+            _caches[namespace] = LLMResponseCache(
+                namespace,
+                _store,
+                embedder=_embed_query if settings.LLM_CACHE_SEMANTIC_ENABLED else None,
+            )
+        return _caches[namespace]
@@ -1,7 +1,53 @@
+from typing import Optional
+
+from app.core.agents.components.llm_cache import get_llm_cache
+from app.core.agents.components.llm_scheduler import BACKGROUND
 from app.core.config import settings
 
+_scheduled_model_class = None
+
+
+def create_chat_model(priority: str = BACKGROUND, **kwargs):
+    """
+    Tạo model chat Gemini, đi qua LLMScheduler nếu LLM_SCHEDULER_ENABLED
+
+    Khi dùng scheduler, thử lại do scheduler đảm nhận (ngân sách thử lại dùng chung)
+    nên client Gemini không tự thử lại.
+
+    Args:
+        priority: Độ ưu tiên khi chờ quota (interactive, assessment, background)
+        **kwargs: Tham số của ChatGoogleGenerativeAI
+
+    Returns:
+        ChatGoogleGenerativeAI: Instance mới của model LLM
+    """
+    global _scheduled_model_class
+    from langchain_google_genai import ChatGoogleGenerativeAI
+
+    if not settings.LLM_SCHEDULER_ENABLED:
+        return ChatGoogleGenerativeAI(max_retries=6, **kwargs)
 
-def create_new_llm_model(thinking_budget: int = 0, top_k: int = 1, top_p: float = 0.95, temperature: float = 0.1):
+    if _scheduled_model_class is None:
+        from app.core.agents.components.llm_scheduler import ScheduledChatModelMixin
+
+        class ScheduledChatGoogleGenerativeAI(
+            ScheduledChatModelMixin, ChatGoogleGenerativeAI
+        ):
+            pass
+
+        _scheduled_model_class = ScheduledChatGoogleGenerativeAI
+
+    return _scheduled_model_class(max_retries=1, scheduler_priority=priority, **kwargs)
+
+
+def create_new_llm_model(
+    thinking_budget: int = 0,
+    top_k: int = 1,
+    top_p: float = 0.95,
+    temperature: float = 0.1,
+    cache_namespace: Optional[str] = None,
+    priority: str = BACKGROUND,
+):
     """
     Tạo một instance mới của model LLM Gemini với thinking_budget được chỉ định
 
@@ -14,47 +60,61 @@ def create_new_llm_model(thinking_budget: int = 0, top_k: int = 1, top_p: float
         :param thinking_budget: Số lượng token tối đa cho quá trình "suy nghĩ"
         :param top_p: Xác suất tích lũy tối đa cho các token được chọn
         :param top_k: Số lượng token hàng đầu được xem xét trong quá trình chọn lựa
+        :param cache_namespace: Tên agent để dùng cache response (None để không cache)
+        :param priority: Độ ưu tiên khi chờ quota LLM
     """
-    # Lazy import - chỉ import khi cần thiết
-    from langchain_google_genai import ChatGoogleGenerativeAI
-
-    return ChatGoogleGenerativeAI(
+    return create_chat_model(
+        priority,
         model=settings.AGENT_LLM_MODEL,
         google_api_key=settings.GOOGLE_API_KEY,
         thinking_budget=thinking_budget,
-        max_retries=6,
         top_k=top_k,
         top_p=top_p,
         temperature=temperature,
+        cache=get_llm_cache(cache_namespace, temperature) or False,
     )
 
 
-def create_new_creative_llm_model(thinking_budget: int = 200, temperature: float = 0.7, top_k: int = 1, top_p: float = 0.95):
+def create_new_creative_llm_model(
+    thinking_budget: int = 200,
+    temperature: float = 0.7,
+    top_k: int = 1,
+    top_p: float = 0.95,
+    cache_namespace: Optional[str] = None,
+    priority: str = BACKGROUND,
+):
     """
     Tạo một instance mới của model LLM Gemini với thinking_budget cao hơn
     cho các tác vụ sáng tạo
 
+    Args:
+        cache_namespace: Tên agent để dùng cache response (None để không cache)
+        priority: Độ ưu tiên khi chờ quota LLM
+
     Returns:
         ChatGoogleGenerativeAI: Instance mới của model LLM
     """
-    from langchain_google_genai import ChatGoogleGenerativeAI
-
-    return ChatGoogleGenerativeAI(
+    return create_chat_model(
+        priority,
         model=settings.CREATIVE_LLM_MODEL,
         google_api_key=settings.GOOGLE_API_KEY,
         thinking_budget=thinking_budget,
         top_k=top_k,
         top_p=top_p,
-        max_retries=6,
         temperature=temperature,  # Temperature cao hơn cho creativity
+        cache=get_llm_cache(cache_namespace, temperature) or False,
     )
 
 
-def get_llm_model():
+def get_llm_model(cache_namespace: Optional[str] = None, priority: str = BACKGROUND):
     """
     Trả về một instance được cache của model LLM Gemini
 
+    Args:
+        cache_namespace: Tên agent để dùng cache response (None để không cache)
+        priority: Độ ưu tiên khi chờ quota LLM
+
     Returns:
         ChatGoogleGenerativeAI: Instance được cache của model LLM
     """
-    return create_new_llm_model()
+    return create_new_llm_model(cache_namespace=cache_namespace, priority=priority)
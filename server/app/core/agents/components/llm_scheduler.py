@@ -0,0 +1,648 @@
+"""
+Điều phối các lần gọi LLM (Gemini) trong worker
+
+- Giới hạn tốc độ theo model bằng token bucket (số request mỗi phút, cho phép burst
+  khoảng 10 giây quota). Quota của cả deployment được chia đều cho
+  LLM_SCHEDULER_WORKERS worker.
+- Khi hết quota, request chờ theo độ ưu tiên: interactive (tutor, AI chat) trước
+  assessment (bài kiểm tra đầu vào, đánh giá) trước background (sinh bài học, bài
+  tập, soạn khóa học). Request chờ lâu được nâng dần ưu tiên
+  (LLM_PRIORITY_AGING_SECONDS mỗi bậc) để background không bị bỏ đói hoàn toàn.
+- Thử lại lỗi tạm thời (429, 5xx, timeout) với backoff có jitter, dùng chung một
+  ngân sách thử lại: mỗi request thành công nạp ``ratio`` lượt, mỗi lần thử lại tiêu
+  một lượt, nên khi Gemini lỗi diện rộng số request không bị nhân lên. Lỗi 429 làm
+  rỗng bucket của model để các request khác cũng chờ.
+
+Model LLM dùng scheduler qua ScheduledChatModelMixin (xem llm_model.py).
+"""
+
+import asyncio
+import contextvars
+import random
+import threading
+import time
+from collections import defaultdict
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+)
+
+from google.api_core.exceptions import (
+    DeadlineExceeded,
+    InternalServerError,
+    ResourceExhausted,
+    ServiceUnavailable,
+    TooManyRequests,
+)
+from pydantic import BaseModel, Field
+
+from app.core.config import settings
+
+T = TypeVar("T")
+
+INTERACTIVE = "interactive"
+ASSESSMENT = "assessment"
+BACKGROUND = "background"
+PRIORITIES: Dict[str, int] = {INTERACTIVE: 0, ASSESSMENT: 1, BACKGROUND: 2}
+
+RETRYABLE_ERRORS: Tuple[Type[BaseException], ...] = (
+    ResourceExhausted,
+    TooManyRequests,
+    ServiceUnavailable,
+    InternalServerError,
+    DeadlineExceeded,
+)
+QUOTA_ERRORS: Tuple[Type[BaseException], ...] = (ResourceExhausted, TooManyRequests)
+
+# Đang trong một lần gọi đã được scheduler cho phép (ví dụ _agenerate mặc định chạy
+# _generate trong thread pool) thì không xin quota lần nữa
+_scheduled_call: contextvars.ContextVar[bool] = contextvars.ContextVar(
+    "llm_scheduled_call", default=False
+)
+
+
+class TokenBucket:
+    """
+    Token bucket: nạp ``rate`` token mỗi giây, tối đa ``capacity`` token
+
+    Không tự khóa, LLMScheduler gọi trong lock của nó.
+    """
+
+    def __init__(self, rate: float, capacity: float, clock: Callable[[], float]):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self._clock = clock
+        self._updated = clock()
+
+    def refill(self) -> None:
+        now = self._clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def take(self) -> bool:
+        self.refill()
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+    def time_until_available(self) -> float:
+        self.refill()
+        return max(0.0, (1 - self.tokens) / self.rate)
+
+    def drain(self) -> None:
+        self.refill()
+        self.tokens = min(self.tokens, 0.0)
+
+
+class RetryBudget:
+    """
+    Ngân sách thử lại dùng chung cho mọi model
+
+    Mỗi request thành công nạp ``ratio`` lượt, ngoài ra luôn được nạp
+    ``min_per_minute`` lượt mỗi phút; mỗi lần thử lại tiêu một lượt. Số lượt tích lũy
+    tối đa là ``capacity``.
+    """
+
+    def __init__(
+        self,
+        ratio: float,
+        min_per_minute: float,
+        capacity: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ratio = ratio
+        self.min_per_second = min_per_minute / 60
+        self.capacity = capacity
+        self._balance = capacity
+        self._clock = clock
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    @property
+    def balance(self) -> float:
+        with self._lock:
+            self._refill()
+            return self._balance
+
+    def deposit(self) -> None:
+        with self._lock:
+            self._refill()
+            self._balance = min(self.capacity, self._balance + self.ratio)
+
+    def withdraw(self) -> bool:
+        with self._lock:
+            self._refill()
+            if self._balance >= 1:
+                self._balance -= 1
+                return True
+            return False
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._balance = min(
+            self.capacity, self._balance + (now - self._updated) * self.min_per_second
+        )
+        self._updated = now
+
+
+class _Waiter:
+    __slots__ = ("priority", "rank", "enqueued", "seq", "grant", "cancelled")
+
+    def __init__(self, priority: str, enqueued: float, seq: int, grant: Callable[[], None]):
+        self.priority = priority
+        self.rank = PRIORITIES[priority]
+        self.enqueued = enqueued
+        self.seq = seq
+        self.grant = grant
+        self.cancelled = False
+
+
+class LLMScheduler:
+    """
+    Hàng đợi ưu tiên và quota theo model cho các lần gọi LLM của worker
+
+    Request được cấp quota ngay nếu model còn token và không có ai chờ; ngược lại
+    được xếp hàng và một thread điều phối cấp quota khi bucket nạp lại. Dùng được cả
+    từ code đồng bộ (thread) và bất đồng bộ (event loop).
+
+    Attributes:
+        requests_per_minute (Dict[str, float]): Quota riêng của từng model
+        default_requests_per_minute (float): Quota của model không có trong
+            ``requests_per_minute``, 0 là không giới hạn
+        burst_seconds (float): Số giây quota được dồn lại cho burst
+        retry_budget (RetryBudget): Ngân sách thử lại dùng chung
+        max_attempts (int): Số lần gọi tối đa của một request (kể cả lần đầu)
+        base_delay (float): Thời gian chờ gốc (giây) của backoff
+        max_delay (float): Thời gian chờ tối đa (giây) giữa hai lần thử
+        aging_seconds (float): Thời gian chờ để request được nâng một bậc ưu tiên,
+            0 là không nâng
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: Optional[Dict[str, float]] = None,
+        default_requests_per_minute: float = 0,
+        burst_seconds: float = 10.0,
+        retry_budget: Optional[RetryBudget] = None,
+        max_attempts: int = 4,
+        base_delay: float = 1.0,
+        max_delay: float = 30.0,
+        aging_seconds: float = 60.0,
+        retryable: Tuple[Type[BaseException], ...] = RETRYABLE_ERRORS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.requests_per_minute = dict(requests_per_minute or {})
+        self.default_requests_per_minute = default_requests_per_minute
+        self.burst_seconds = burst_seconds
+        self.retry_budget = retry_budget or RetryBudget(0.2, 6, 10)
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.aging_seconds = aging_seconds
+        self.retryable = retryable
+        self._clock = clock
+
+        self._condition = threading.Condition()
+        self._buckets: Dict[str, Optional[TokenBucket]] = {}
+        self._waiters: Dict[str, List[_Waiter]] = defaultdict(list)
+        self._seq = 0
+        self._dispatcher: Optional[threading.Thread] = None
+
+        self._requests: Dict[Tuple[str, str], int] = defaultdict(int)
+        self._wait_seconds: Dict[Tuple[str, str], float] = defaultdict(float)
+        self._max_wait_seconds: Dict[Tuple[str, str], float] = defaultdict(float)
+        self.retries = 0
+        self.retries_denied = 0
+        self.errors = 0
+
+    # Quota
+
+    def acquire(self, model: str, priority: str = BACKGROUND) -> float:
+        """
+        Chờ (chặn thread) tới khi được gọi model
+
+        Args:
+            model: Tên model
+            priority: interactive, assessment hoặc background
+
+        Returns:
+            float: Thời gian đã chờ (giây)
+        """
+        event = threading.Event()
+        waiter = self._enqueue(model, priority, event.set)
+        if waiter is None:
+            return 0.0
+        event.wait()
+        return self._clock() - waiter.enqueued
+
+    async def aacquire(self, model: str, priority: str = BACKGROUND) -> float:
+        """
+        Chờ (không chặn event loop) tới khi được gọi model
+
+        Args:
+            model: Tên model
+            priority: interactive, assessment hoặc background
+
+        Returns:
+            float: Thời gian đã chờ (giây)
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        def grant() -> None:
+            loop.call_soon_threadsafe(
+                lambda: future.done() or future.set_result(None)
+            )
+
+        waiter = self._enqueue(model, priority, grant)
+        if waiter is None:
+            return 0.0
+        try:
+            await future
+        except asyncio.CancelledError:
+            waiter.cancelled = True
+            raise
+        return self._clock() - waiter.enqueued
+
+    # Gọi model
+
+    def call(self, model: str, priority: str, fn: Callable[[], T]) -> T:
+        """
+        Gọi ``fn`` khi có quota, thử lại lỗi tạm thời trong ngân sách thử lại
+
+        Args:
+            model: Tên model
+            priority: interactive, assessment hoặc background
+            fn: Hàm gọi model
+
+        Returns:
+            Kết quả của ``fn``
+        """
+        attempt = 0
+        while True:
+            self.acquire(model, priority)
+            try:
+                result = fn()
+            except self.retryable as e:
+                delay = self._retry_delay(model, e, attempt)
+                if delay is None:
+                    raise
+                attempt += 1
+                time.sleep(delay)
+                continue
+            self.retry_budget.deposit()
+            return result
+
+    async def acall(self, model: str, priority: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """Như ``call`` cho hàm bất đồng bộ"""
+        attempt = 0
+        while True:
+            await self.aacquire(model, priority)
+            try:
+                result = await fn()
+            except self.retryable as e:
+                delay = self._retry_delay(model, e, attempt)
+                if delay is None:
+                    raise
+                attempt += 1
+                await asyncio.sleep(delay)
+                continue
+            self.retry_budget.deposit()
+            return result
+
+    def stream(self, model: str, priority: str, fn: Callable[[], Iterator[T]]) -> Iterator[T]:
+        """
+        Như ``call`` cho stream: chỉ thử lại khi lỗi trước chunk đầu tiên
+
+        Args:
+            model: Tên model
+            priority: interactive, assessment hoặc background
+            fn: Hàm trả về iterator các chunk
+
+        Yields:
+            Các chunk của stream
+        """
+        attempt = 0
+        while True:
+            self.acquire(model, priority)
+            iterator = fn()
+            try:
+                first = next(iterator)
+            except StopIteration:
+                self.retry_budget.deposit()
+                return
+            except self.retryable as e:
+                delay = self._retry_delay(model, e, attempt)
+                if delay is None:
+                    raise
+                attempt += 1
+                time.sleep(delay)
+                continue
+            break
+        self.retry_budget.deposit()
+        yield first
+        yield from iterator
+
+    async def astream(
+        self, model: str, priority: str, fn: Callable[[], AsyncIterator[T]]
+    ) -> AsyncIterator[T]:
+        """Như ``stream`` cho async iterator"""
+        attempt = 0
+        while True:
+            await self.aacquire(model, priority)
+            iterator = fn()
+            try:
+                first = await iterator.__anext__()
+            except StopAsyncIteration:
+                self.retry_budget.deposit()
+                return
+            except self.retryable as e:
+                delay = self._retry_delay(model, e, attempt)
+                if delay is None:
+                    raise
+                attempt += 1
+                await asyncio.sleep(delay)
+                continue
+            break
+        self.retry_budget.deposit()
+        yield first
+        async for chunk in iterator:
+            yield chunk
+
+    def backoff(self, attempt: int) -> float:
+        """Thời gian chờ trước lần thử lại thứ ``attempt + 1`` (full jitter)"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+
+    # Metrics
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Số liệu của scheduler
+
+        Returns:
+            Dict[str, Any]: Theo model và độ ưu tiên: số request đang chờ, đã cấp
+            quota, tổng và lớn nhất thời gian chờ; số lần thử lại, bị từ chối do hết
+            ngân sách, lỗi và số lượt thử lại còn lại
+        """
+        with self._condition:
+            models = {}
+            for model in set(self._buckets) | {m for m, _ in self._requests}:
+                queue_depth = defaultdict(int)
+                for waiter in self._waiters.get(model, []):
+                    queue_depth[waiter.priority] += 1
+                bucket = self._buckets.get(model)
+                models[model] = {
+                    "requests_per_minute": self._rate_per_minute(model),
+                    "tokens": None if bucket is None else round(bucket.tokens, 2),
+                    "priorities": {
+                        priority: {
+                            "queue_depth": queue_depth[priority],
+                            "requests": self._requests[(model, priority)],
+                            "wait_seconds": self._wait_seconds[(model, priority)],
+                            "max_wait_seconds": self._max_wait_seconds[(model, priority)],
+                        }
+                        for priority in PRIORITIES
+                    },
+                }
+            return {
+                "models": models,
+                "retries": self.retries,
+                "retries_denied": self.retries_denied,
+                "errors": self.errors,
+                "retry_budget": round(self.retry_budget.balance, 2),
+            }
+
+    # Nội bộ
+
+    def _rate_per_minute(self, model: str) -> float:
+        return self.requests_per_minute.get(model, self.default_requests_per_minute)
+
+    def _bucket(self, model: str) -> Optional[TokenBucket]:
+        if model not in self._buckets:
+            rate = self._rate_per_minute(model)
+            self._buckets[model] = (
+                TokenBucket(
+                    rate / 60, max(1.0, rate / 60 * self.burst_seconds), self._clock
+                )
+                if rate > 0
+                else None
+            )
+        return self._buckets[model]
+
+    def _enqueue(
+        self, model: str, priority: str, grant: Callable[[], None]
+    ) -> Optional[_Waiter]:
+        """Cấp quota ngay (trả về None) hoặc xếp hàng chờ"""
+        if priority not in PRIORITIES:
+            raise ValueError(f"Độ ưu tiên không hợp lệ: {priority}")
+        with self._condition:
+            bucket = self._bucket(model)
+            waiters = self._waiters[model]
+            if bucket is None or (not waiters and bucket.take()):
+                self._record_grant(model, priority, 0.0)
+                return None
+            self._seq += 1
+            waiter = _Waiter(priority, self._clock(), self._seq, grant)
+            waiters.append(waiter)
+            if self._dispatcher is None or not self._dispatcher.is_alive():
+                self._dispatcher = threading.Thread(
+                    target=self._dispatch, name="llm-scheduler", daemon=True
+                )
+                self._dispatcher.start()
+            self._condition.notify()
+            return waiter
+
+    def _dispatch(self) -> None:
+        with self._condition:
+            while True:
+                timeout = None
+                for model, waiters in self._waiters.items():
+                    bucket = self._buckets[model]
+                    while waiters and bucket.take():
+                        waiter = self._next_waiter(waiters)
+                        if waiter is None:
+                            bucket.tokens += 1
+                            break
+                        self._record_grant(
+                            model, waiter.priority, self._clock() - waiter.enqueued
+                        )
+                        waiter.grant()
+                    if waiters:
+                        wait = bucket.time_until_available()
+                        timeout = wait if timeout is None else min(timeout, wait)
+                self._condition.wait(timeout)
+
+    def _next_waiter(self, waiters: List[_Waiter]) -> Optional[_Waiter]:
+        """Lấy request ưu tiên cao nhất (đã tính thời gian chờ), bỏ request đã hủy"""
+        waiters[:] = [waiter for waiter in waiters if not waiter.cancelled]
+        if not waiters:
+            return None
+        now = self._clock()
+
+        def key(waiter: _Waiter):
+            rank = waiter.rank
+            if self.aging_seconds > 0:
+                rank -= (now - waiter.enqueued) / self.aging_seconds
+            return (max(rank, 0), waiter.seq)
+
+        waiter = min(waiters, key=key)
+        waiters.remove(waiter)
+        return waiter
+
+    def _record_grant(self, model: str, priority: str, waited: float) -> None:
+        key = (model, priority)
+        self._requests[key] += 1
+        self._wait_seconds[key] += waited
+        self._max_wait_seconds[key] = max(self._max_wait_seconds[key], waited)
+
+    def _retry_delay(self, model: str, error: BaseException, attempt: int) -> Optional[float]:
+        """Thời gian chờ trước khi thử lại, None nếu không thử lại"""
+        with self._condition:
+            self.errors += 1
+            if isinstance(error, QUOTA_ERRORS):
+                bucket = self._bucket(model)
+                if bucket is not None:
+                    bucket.drain()
+        if attempt + 1 >= self.max_attempts:
+            return None
+        if not self.retry_budget.withdraw():
+            with self._condition:
+                self.retries_denied += 1
+            return None
+        with self._condition:
+            self.retries += 1
+        return self.backoff(attempt)
+
+
+def create_llm_scheduler() -> LLMScheduler:
+    """
+    Tạo scheduler theo cấu hình LLM_*
+
+    Returns:
+        LLMScheduler: Scheduler của worker hiện tại
+    """
+    workers = max(1, settings.LLM_SCHEDULER_WORKERS)
+    return LLMScheduler(
+        requests_per_minute={
+            model: rate / workers
+            for model, rate in settings.LLM_REQUESTS_PER_MINUTE_BY_MODEL.items()
+        },
+        default_requests_per_minute=settings.LLM_REQUESTS_PER_MINUTE / workers,
+        retry_budget=RetryBudget(
+            settings.LLM_RETRY_BUDGET_RATIO,
+            settings.LLM_RETRY_BUDGET_MIN_PER_MINUTE / workers,
+            capacity=max(1.0, settings.LLM_RETRY_BUDGET_MIN_PER_MINUTE / workers),
+        ),
+        max_attempts=settings.LLM_MAX_ATTEMPTS,
+        base_delay=settings.LLM_RETRY_BASE_DELAY_SECONDS,
+        max_delay=settings.LLM_RETRY_MAX_DELAY_SECONDS,
+        aging_seconds=settings.LLM_PRIORITY_AGING_SECONDS,
+    )
+
+
+llm_scheduler = create_llm_scheduler()
+
+
+class ScheduledChatModelMixin(BaseModel):
+    """
+    Mixin cho chat model LangChain: mọi lần gọi (generate, stream, sync và async) đi
+    qua LLMScheduler với độ ưu tiên ``scheduler_priority``
+
+    Response lấy từ cache LLM không đi qua scheduler (BaseChatModel kiểm tra cache
+    trước khi gọi ``_generate``).
+    """
+
+    scheduler_priority: str = BACKGROUND
+    scheduler: Optional[Any] = Field(default=None, exclude=True)
+
+    @property
+    def _scheduler(self) -> LLMScheduler:
+        return self.scheduler or llm_scheduler
+
+    @property
+    def _scheduler_model(self) -> str:
+        model = getattr(self, "model", None) or type(self).__name__
+        return str(model).removeprefix("models/")
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        parent = super()._generate
+        if _scheduled_call.get():
+            return parent(messages, stop=stop, run_manager=run_manager, **kwargs)
+
+        def generate():
+            token = _scheduled_call.set(True)
+            try:
+                return parent(messages, stop=stop, run_manager=run_manager, **kwargs)
+            finally:
+                _scheduled_call.reset(token)
+
+        return self._scheduler.call(self._scheduler_model, self.scheduler_priority, generate)
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        parent = super()._agenerate
+        if _scheduled_call.get():
+            return await parent(messages, stop=stop, run_manager=run_manager, **kwargs)
+
+        async def generate():
+            token = _scheduled_call.set(True)
+            try:
+                return await parent(messages, stop=stop, run_manager=run_manager, **kwargs)
+            finally:
+                _scheduled_call.reset(token)
+
+        return await self._scheduler.acall(
+            self._scheduler_model, self.scheduler_priority, generate
+        )
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        parent = super()._stream
+        if _scheduled_call.get():
+            yield from parent(messages, stop=stop, run_manager=run_manager, **kwargs)
+            return
+
+        def stream():
+            context = contextvars.copy_context()
+            context.run(_scheduled_call.set, True)
+            iterator = parent(messages, stop=stop, run_manager=run_manager, **kwargs)
+            while True:
+                try:
+                    yield context.run(next, iterator)
+                except StopIteration:
+                    return
+
+        yield from self._scheduler.stream(
+            self._scheduler_model, self.scheduler_priority, stream
+        )
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+        parent = super()._astream
+        if _scheduled_call.get():
+            async for chunk in parent(messages, stop=stop, run_manager=run_manager, **kwargs):
+                yield chunk
+            return
+
+        async def stream():
+            token = _scheduled_call.set(True)
+            try:
+                async for chunk in parent(
+                    messages, stop=stop, run_manager=run_manager, **kwargs
+                ):
+                    yield chunk
+            finally:
+                _scheduled_call.reset(token)
+
+        async for chunk in self._scheduler.astream(
+            self._scheduler_model, self.scheduler_priority, stream
+        ):
+            yield chunk
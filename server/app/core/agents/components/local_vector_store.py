@@ -0,0 +1,734 @@
+"""
+Vector store chạy trong process, thay thế Pinecone khi phát triển, test và benchmark
+
+Vector được chuẩn hóa (cosine) và lưu trong file ``.npy`` memory-mapped dạng float32
+hoặc int8 (kèm hệ số scale mỗi dòng). Tìm kiếm là brute-force bằng NumPy; khi số vector
+vượt ``ivf_min_vectors`` thì dựng thêm index IVF (k-means, chỉ quét ``ivf_probes``
+cụm gần truy vấn nhất). Metadata lọc theo cú pháp filter của Pinecone
+(``{"field": value}``, ``$eq``, ``$ne``, ``$gt``, ``$gte``, ``$lt``, ``$lte``, ``$in``,
+``$nin``, ``$exists``, ``$and``, ``$or``).
+
+Mỗi index/namespace là một thư mục:
+    vectors.npy     vector (capacity x dimension), chỉ ``count`` dòng đầu có dữ liệu
+    scales.npy      hệ số scale của từng dòng (int8)
+    records.jsonl   id và metadata, dòng thứ i ứng với vector thứ i
+    manifest.json   count, dòng đã xóa và cấu hình; ghi sau cùng nên dữ liệu ghi dở
+                    khi tiến trình dừng giữa chừng bị bỏ qua lúc mở lại
+    ivf.npz         centroid và cụm của từng dòng (nếu đã dựng IVF)
+"""
+
+import json
+import logging
+import math
+import os
+import threading
+import uuid
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import VectorStore
+from langchain_core.vectorstores.utils import maximal_marginal_relevance
+
+from app.core.agents.components.document_store import (
+    EMBEDDING_DIMENSION,
+    VectorStoreBackend,
+)
+
+logger = logging.getLogger(__name__)
+
+_INITIAL_CAPACITY = 1024
+_SCORE_CHUNK_ROWS = 65536
+# Khối int8 nhỏ để bản float32 tạm nằm gọn trong cache CPU
+_INT8_CHUNK_ROWS = 2048
+_KMEANS_ITERATIONS = 10
+_KMEANS_SAMPLE_PER_LIST = 64
+_MISSING = object()
+
+
+def _compare(metadata: Dict[str, Any], key: str, operator: str, operand: Any) -> bool:
+    """So sánh giá trị metadata ``key`` với toán tử filter của Pinecone"""
+    if operator == "$exists":
+        return (key in metadata) == bool(operand)
+    if key not in metadata:
+        return operator in ("$ne", "$nin")
+    value = metadata[key]
+    # Giống Pinecone: field dạng list khớp khi có phần tử khớp
+    values = value if isinstance(value, list) else [value]
+    if operator == "$eq":
+        return operand in values
+    if operator == "$ne":
+        return operand not in values
+    if operator == "$in":
+        return any(item in operand for item in values)
+    if operator == "$nin":
+        return not any(item in operand for item in values)
+    try:
+        if operator == "$gt":
+            return value > operand
+        if operator == "$gte":
+            return value >= operand
+        if operator == "$lt":
+            return value < operand
+        if operator == "$lte":
+            return value <= operand
+    except TypeError:
+        return False
+    raise ValueError(f"Toán tử filter không hỗ trợ: {operator}")
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+class LocalVectorIndex:
+    """
+    Index vector lưu trên đĩa (memory-mapped) với tìm kiếm brute-force/IVF
+
+    Ghi được khóa bằng lock; tìm kiếm đọc một snapshot (mảng và số dòng) nên chạy
+    song song với nhau và với việc ghi.
+
+    Attributes:
+        path (Path): Thư mục lưu index
+        dimension (int): Số chiều vector
+        dtype (str): 'float32' hoặc 'int8'
+        ivf_min_vectors (int): Số vector tối thiểu để dựng IVF, 0 là không dùng IVF
+        ivf_probes (int): Số cụm được quét mỗi truy vấn IVF
+    """
+
+    def __init__(
+        self,
+        path: Union[str, os.PathLike],
+        dimension: int = EMBEDDING_DIMENSION,
+        dtype: str = "float32",
+        ivf_min_vectors: int = 50000,
+        ivf_probes: int = 16,
+    ):
+        if dtype not in ("float32", "int8"):
+            raise ValueError(f"dtype không hợp lệ: {dtype}")
+        self.path = Path(path)
+        self.dimension = dimension
+        self.dtype = dtype
+        self.ivf_min_vectors = ivf_min_vectors
+        self.ivf_probes = ivf_probes
+        self._lock = threading.Lock()
+
+        self.count = 0
+        self._ids: List[str] = []
+        self._metadatas: List[Dict[str, Any]] = []
+        self._rows: Dict[str, int] = {}
+        self._alive = np.zeros(0, dtype=bool)
+        self._centroids: Optional[np.ndarray] = None
+        self._lists = np.zeros(0, dtype=np.int32)
+        self._trained_count = 0
+        self._columns: Dict[str, Tuple[np.ndarray, bool]] = {}
+        self._inverted: Optional[Tuple[int, np.ndarray, np.ndarray, np.ndarray]] = None
+
+        self.path.mkdir(parents=True, exist_ok=True)
+        if (self.path / "manifest.json").exists():
+            self._load()
+        else:
+            self._allocate(_INITIAL_CAPACITY)
+            (self.path / "records.jsonl").touch()
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    @property
+    def capacity(self) -> int:
+        return self._vectors.shape[0]
+
+    @property
+    def ivf_trained(self) -> bool:
+        return self._centroids is not None
+
+    def add(
+        self,
+        ids: Sequence[str],
+        vectors: np.ndarray,
+        metadatas: Sequence[Dict[str, Any]],
+    ) -> None:
+        """
+        Thêm (hoặc ghi đè theo id) các vector
+
+        Args:
+            ids: Id của từng vector; id đã có sẽ được thay bằng vector mới
+            vectors: Mảng (n x dimension)
+            metadatas: Metadata của từng vector (phải serialize được JSON)
+        """
+        vectors = _normalize(vectors).reshape(-1, self.dimension)
+        if not (len(ids) == len(vectors) == len(metadatas)):
+            raise ValueError("ids, vectors và metadatas phải cùng độ dài")
+        if not len(ids):
+            return
+
+        with self._lock:
+            start = self.count
+            end = start + len(ids)
+            self._ensure_capacity(end)
+            self._write_rows(start, vectors)
+
+            with open(self.path / "records.jsonl", "a", encoding="utf-8") as file:
+                for id, metadata in zip(ids, metadatas):
+                    file.write(
+                        json.dumps({"id": id, "metadata": metadata}, ensure_ascii=False)
+                        + "\n"
+                    )
+
+            alive = np.ones(end, dtype=bool)
+            alive[:start] = self._alive[:start]
+            for row, id in enumerate(ids, start):
+                previous = self._rows.get(id)
+                if previous is not None:
+                    alive[previous] = False
+                self._rows[id] = row
+            # Trong cùng một lô, id lặp lại chỉ giữ dòng cuối
+            for row, id in enumerate(ids, start):
+                alive[row] = self._rows[id] == row
+            self._ids.extend(ids)
+            self._metadatas.extend(metadatas)
+            self._alive = alive
+
+            if self.ivf_trained:
+                lists = np.empty(end, dtype=np.int32)
+                lists[:start] = self._lists[:start]
+                lists[start:] = self._assign(vectors)
+                self._lists = lists
+            self.count = end
+
+            if self.ivf_min_vectors and len(self._rows) >= self.ivf_min_vectors and (
+                not self.ivf_trained or len(self._rows) >= 2 * self._trained_count
+            ):
+                self._train_ivf()
+            self._save_manifest()
+
+    def delete(self, ids: Optional[Iterable[str]] = None) -> None:
+        """
+        Xóa vector theo id (None là xóa tất cả)
+
+        Args:
+            ids: Id cần xóa
+        """
+        with self._lock:
+            alive = self._alive.copy()
+            for id in list(self._rows) if ids is None else ids:
+                row = self._rows.pop(id, None)
+                if row is not None:
+                    alive[row] = False
+            self._alive = alive
+            self._save_manifest()
+
+    def get(self, ids: Sequence[str]) -> List[Tuple[str, Dict[str, Any]]]:
+        """Id và metadata của các id còn tồn tại, theo thứ tự truyền vào"""
+        rows = [self._rows[id] for id in ids if id in self._rows]
+        return [(self._ids[row], self._metadatas[row]) for row in rows]
+
+    def search(
+        self,
+        query: np.ndarray,
+        k: int = 4,
+        filter: Optional[Dict[str, Any]] = None,
+        probes: Optional[int] = None,
+        exact: bool = False,
+    ) -> List[Tuple[int, float]]:
+        """
+        Tìm ``k`` vector gần ``query`` nhất theo cosine
+
+        Args:
+            query: Vector truy vấn
+            k: Số kết quả
+            filter: Filter metadata (cú pháp Pinecone)
+            probes: Số cụm IVF cần quét, mặc định ``ivf_probes``
+            exact: True để luôn quét brute-force (ground truth)
+
+        Returns:
+            List[Tuple[int, float]]: (dòng, độ tương đồng cosine), giảm dần
+        """
+        count, vectors, scales, alive = self.count, self._vectors, self._scales, self._alive
+        centroids, lists = self._centroids, self._lists
+        if count == 0 or k <= 0:
+            return []
+        query = _normalize(query).reshape(self.dimension)
+
+        base = alive[:count]
+        if filter:
+            base = base & self._filter_mask(filter, count)
+
+        rows = None
+        if centroids is not None and not exact:
+            probes = min(probes or self.ivf_probes, len(centroids))
+            nearest = np.argpartition(-(centroids @ query), probes - 1)[:probes]
+            order, offsets = self._inverted_lists(lists, count, len(centroids))
+            rows = np.sort(
+                np.concatenate([order[offsets[i] : offsets[i + 1]] for i in nearest])
+            )
+            rows = rows[base[rows]]
+            # Filter chọn lọc có thể để lại ít hơn k dòng trong các cụm đã quét
+            if len(rows) < k:
+                rows = None
+        if rows is None and not base.all():
+            rows = np.flatnonzero(base)
+
+        if rows is None:
+            scores = self._score_range(vectors, scales, count, query)
+        else:
+            scores = self._score_rows(vectors, scales, rows, query)
+        if not len(scores):
+            return []
+
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        result_rows = top if rows is None else rows[top]
+        return [(int(row), float(scores[i])) for row, i in zip(result_rows, top)]
+
+    def vectors(self, rows: Sequence[int]) -> np.ndarray:
+        """Vector (float32, đã chuẩn hóa) của các dòng"""
+        rows = np.asarray(rows, dtype=np.int64)
+        vectors = self._vectors[rows].astype(np.float32)
+        if self.dtype == "int8":
+            vectors *= self._scales[rows, None]
+        return vectors
+
+    def record(self, row: int) -> Tuple[str, Dict[str, Any]]:
+        """Id và metadata của một dòng"""
+        return self._ids[row], self._metadatas[row]
+
+    def build_ivf(self) -> None:
+        """Dựng (lại) index IVF trên các vector hiện có"""
+        with self._lock:
+            self._train_ivf()
+            self._save_manifest()
+
+    def _inverted_lists(
+        self, lists: np.ndarray, count: int, n_lists: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Dòng của từng cụm IVF: ``order[offsets[i]:offsets[i + 1]]`` (cache theo count)"""
+        cached = self._inverted
+        if cached is None or cached[0] != count or cached[1] is not lists:
+            order = np.argsort(lists[:count], kind="stable")
+            offsets = np.searchsorted(
+                lists[:count][order], np.arange(n_lists + 1)
+            )
+            cached = self._inverted = (count, lists, order, offsets)
+        return cached[2], cached[3]
+
+    def _filter_mask(self, filter: Dict[str, Any], count: int) -> np.ndarray:
+        """Mask các dòng khớp filter; so sánh bằng/$in chạy vector hóa trên cột metadata"""
+        mask = np.ones(count, dtype=bool)
+        for key, condition in filter.items():
+            if key == "$and":
+                for clause in condition:
+                    mask &= self._filter_mask(clause, count)
+            elif key == "$or":
+                any_mask = np.zeros(count, dtype=bool)
+                for clause in condition:
+                    any_mask |= self._filter_mask(clause, count)
+                mask &= any_mask
+            else:
+                if not isinstance(condition, dict):
+                    condition = {"$eq": condition}
+                for operator, operand in condition.items():
+                    mask &= self._compare_column(key, operator, operand, count)
+        return mask
+
+    def _compare_column(self, key: str, operator: str, operand: Any, count: int) -> np.ndarray:
+        column, has_lists = self._column(key, count)
+        if not has_lists and operator in ("$eq", "$ne", "$in", "$nin"):
+            operands = operand if operator in ("$in", "$nin") else [operand]
+            matched = np.zeros(count, dtype=bool)
+            for value in operands:
+                matched |= column == value
+            return ~matched if operator in ("$ne", "$nin") else matched
+        metadatas = self._metadatas
+        return np.fromiter(
+            (_compare(metadatas[row], key, operator, operand) for row in range(count)),
+            dtype=bool,
+            count=count,
+        )
+
+    def _column(self, key: str, count: int) -> Tuple[np.ndarray, bool]:
+        """Giá trị metadata ``key`` của các dòng (cache, chỉ tính thêm cho dòng mới)"""
+        column, has_lists = self._columns.get(key, (np.empty(0, dtype=object), False))
+        if len(column) < count:
+            values = np.empty(count - len(column), dtype=object)
+            for i, metadata in enumerate(self._metadatas[len(column) : count]):
+                value = metadata.get(key, _MISSING)
+                has_lists = has_lists or isinstance(value, list)
+                values[i] = value
+            column = np.concatenate([column, values])
+            self._columns[key] = (column, has_lists)
+        return column[:count], has_lists
+
+    def _score_range(self, vectors, scales, count, query) -> np.ndarray:
+        scores = np.empty(count, dtype=np.float32)
+        chunk_rows = _INT8_CHUNK_ROWS if self.dtype == "int8" else _SCORE_CHUNK_ROWS
+        for start in range(0, count, chunk_rows):
+            end = min(start + chunk_rows, count)
+            block = vectors[start:end]
+            if self.dtype == "int8":
+                scores[start:end] = (block.astype(np.float32) @ query) * scales[start:end]
+            else:
+                scores[start:end] = block @ query
+        return scores
+
+    def _score_rows(self, vectors, scales, rows, query) -> np.ndarray:
+        scores = np.empty(len(rows), dtype=np.float32)
+        chunk_rows = _INT8_CHUNK_ROWS if self.dtype == "int8" else _SCORE_CHUNK_ROWS
+        for start in range(0, len(rows), chunk_rows):
+            chunk = rows[start : start + chunk_rows]
+            block = vectors[chunk]
+            if self.dtype == "int8":
+                scores[start : start + len(chunk)] = (
+                    block.astype(np.float32) @ query
+                ) * scales[chunk]
+            else:
+                scores[start : start + len(chunk)] = block @ query
+        return scores
+
+    def _write_rows(self, start: int, vectors: np.ndarray) -> None:
+        end = start + len(vectors)
+        if self.dtype == "int8":
+            scales = np.maximum(np.abs(vectors).max(axis=1), 1e-12) / 127.0
+            self._vectors[start:end] = np.round(vectors / scales[:, None]).astype(np.int8)
+            self._scales[start:end] = scales
+            self._scales.flush()
+        else:
+            self._vectors[start:end] = vectors
+        self._vectors.flush()
+
+    def _ensure_capacity(self, needed: int) -> None:
+        if needed <= self.capacity:
+            return
+        capacity = self.capacity
+        while capacity < needed:
+            capacity *= 2
+        old_vectors, old_scales = self._vectors, self._scales
+        self._allocate(capacity, suffix=".tmp")
+        self._vectors[: self.count] = old_vectors[: self.count]
+        self._scales[: self.count] = old_scales[: self.count]
+        self._vectors.flush()
+        self._scales.flush()
+        for name in ("vectors", "scales"):
+            os.replace(self.path / f"{name}.npy.tmp", self.path / f"{name}.npy")
+
+    def _allocate(self, capacity: int, suffix: str = "") -> None:
+        self._vectors = np.lib.format.open_memmap(
+            self.path / f"vectors.npy{suffix}",
+            mode="w+",
+            dtype=np.int8 if self.dtype == "int8" else np.float32,
+            shape=(capacity, self.dimension),
+        )
+        self._scales = np.lib.format.open_memmap(
+            self.path / f"scales.npy{suffix}",
+            mode="w+",
+            dtype=np.float32,
+            shape=(capacity,),
+        )
+
+    def _train_ivf(self) -> None:
+        rows = np.flatnonzero(self._alive[: self.count])
+        n_lists = max(1, int(math.sqrt(len(rows))))
+        rng = np.random.default_rng(0)
+        sample = rng.choice(
+            rows, size=min(len(rows), n_lists * _KMEANS_SAMPLE_PER_LIST), replace=False
+        )
+        sample_vectors = self.vectors(np.sort(sample))
+        centroids = sample_vectors[rng.choice(len(sample_vectors), n_lists, replace=False)]
+        # k-means cầu (cosine): gán theo tích vô hướng, centroid được chuẩn hóa lại
+        for _ in range(_KMEANS_ITERATIONS):
+            assignment = np.argmax(sample_vectors @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignment, sample_vectors)
+            empty = ~np.bincount(assignment, minlength=n_lists).astype(bool)
+            sums[empty] = centroids[empty]
+            centroids = _normalize(sums)
+        self._centroids = centroids
+
+        lists = np.empty(self.count, dtype=np.int32)
+        for start in range(0, self.count, _SCORE_CHUNK_ROWS):
+            end = min(start + _SCORE_CHUNK_ROWS, self.count)
+            lists[start:end] = self._assign(self.vectors(np.arange(start, end)))
+        self._lists = lists
+        self._trained_count = len(rows)
+        with open(self.path / "ivf.npz.tmp", "wb") as file:
+            np.savez(file, centroids=centroids, lists=lists)
+        os.replace(self.path / "ivf.npz.tmp", self.path / "ivf.npz")
+        logger.info(f"Đã dựng IVF {n_lists} cụm cho {len(rows)} vector ({self.path})")
+
+    def _assign(self, vectors: np.ndarray) -> np.ndarray:
+        return np.argmax(vectors @ self._centroids.T, axis=1).astype(np.int32)
+
+    def _save_manifest(self) -> None:
+        manifest = {
+            "dimension": self.dimension,
+            "dtype": self.dtype,
+            "count": self.count,
+            "deleted": np.flatnonzero(~self._alive[: self.count]).tolist(),
+            "ivf_rows": len(self._lists) if self.ivf_trained else 0,
+            "ivf_trained_count": self._trained_count,
+        }
+        tmp = self.path / "manifest.json.tmp"
+        tmp.write_text(json.dumps(manifest), encoding="utf-8")
+        os.replace(tmp, self.path / "manifest.json")
+
+    def _load(self) -> None:
+        manifest = json.loads((self.path / "manifest.json").read_text(encoding="utf-8"))
+        if manifest["dimension"] != self.dimension or manifest["dtype"] != self.dtype:
+            raise ValueError(
+                f"Index {self.path} có dimension={manifest['dimension']}, "
+                f"dtype={manifest['dtype']}; cần dimension={self.dimension}, dtype={self.dtype}"
+            )
+        self.count = manifest["count"]
+        self._vectors = np.load(self.path / "vectors.npy", mmap_mode="r+")
+        self._scales = np.load(self.path / "scales.npy", mmap_mode="r+")
+
+        with open(self.path / "records.jsonl", encoding="utf-8") as file:
+            for _, line in zip(range(self.count), file):
+                record = json.loads(line)
+                self._ids.append(record["id"])
+                self._metadatas.append(record["metadata"])
+        # Bỏ phần records ghi dở (manifest chưa kịp cập nhật)
+        self._rewrite_records()
+
+        self._alive = np.ones(self.count, dtype=bool)
+        self._alive[manifest["deleted"]] = False
+        for row, id in enumerate(self._ids):
+            if self._alive[row]:
+                self._rows[id] = row
+
+        if manifest["ivf_rows"] and (self.path / "ivf.npz").exists():
+            ivf = np.load(self.path / "ivf.npz")
+            self._centroids = ivf["centroids"]
+            lists = ivf["lists"][: manifest["ivf_rows"]]
+            if len(lists) < self.count:
+                lists = np.concatenate(
+                    [lists, self._assign(self.vectors(np.arange(len(lists), self.count)))]
+                )
+            self._lists = lists
+            self._trained_count = manifest["ivf_trained_count"]
+
+    def _rewrite_records(self) -> None:
+        size = (self.path / "records.jsonl").stat().st_size
+        with open(self.path / "records.jsonl", "rb") as file:
+            valid = sum(len(line) for _, line in zip(range(self.count), file))
+        if valid != size:
+            with open(self.path / "records.jsonl", "r+b") as file:
+                file.truncate(valid)
+
+
+class LocalVectorStore(VectorStore):
+    """
+    Vector store LangChain trên LocalVectorIndex, cùng ngữ nghĩa với PineconeVectorStore
+
+    Nội dung văn bản được lưu trong metadata với key ``text_key`` như Pinecone; điểm
+    của ``similarity_search_with_score`` là cosine, relevance là ``(score + 1) / 2``.
+
+    Attributes:
+        index (LocalVectorIndex): Index lưu vector
+        text_key (str): Key của nội dung văn bản trong metadata
+    """
+
+    def __init__(self, index: LocalVectorIndex, embedding: Embeddings, text_key: str = "text"):
+        self.index = index
+        self._embedding = embedding
+        self.text_key = text_key
+
+    @property
+    def embeddings(self) -> Embeddings:
+        return self._embedding
+
+    def add_texts(
+        self,
+        texts: Iterable[str],
+        metadatas: Optional[List[dict]] = None,
+        *,
+        ids: Optional[List[str]] = None,
+        **kwargs: Any,
+    ) -> List[str]:
+        texts = list(texts)
+        ids = [id or str(uuid.uuid4()) for id in (ids or [None] * len(texts))]
+        metadatas = [
+            {**(metadata or {}), self.text_key: text}
+            for metadata, text in zip(metadatas or [None] * len(texts), texts)
+        ]
+        vectors = np.asarray(self._embedding.embed_documents(texts), dtype=np.float32)
+        self.index.add(ids, vectors, metadatas)
+        return ids
+
+    def delete(
+        self, ids: Optional[List[str]] = None, delete_all: Optional[bool] = None, **kwargs: Any
+    ) -> None:
+        if delete_all:
+            self.index.delete()
+        elif ids is not None:
+            self.index.delete(ids)
+        else:
+            raise ValueError("Cần truyền ids hoặc delete_all")
+
+    def get_by_ids(self, ids: Sequence[str], /) -> List[Document]:
+        return [self._document(id, metadata) for id, metadata in self.index.get(ids)]
+
+    def similarity_search(
+        self, query: str, k: int = 4, filter: Optional[dict] = None, **kwargs: Any
+    ) -> List[Document]:
+        return [
+            document
+            for document, _ in self.similarity_search_with_score(query, k, filter, **kwargs)
+        ]
+
+    def similarity_search_with_score(
+        self, query: str, k: int = 4, filter: Optional[dict] = None, **kwargs: Any
+    ) -> List[Tuple[Document, float]]:
+        return self.similarity_search_by_vector_with_score(
+            self._embedding.embed_query(query), k, filter, **kwargs
+        )
+
+    def similarity_search_by_vector(
+        self, embedding: List[float], k: int = 4, filter: Optional[dict] = None, **kwargs: Any
+    ) -> List[Document]:
+        return [
+            document
+            for document, _ in self.similarity_search_by_vector_with_score(
+                embedding, k, filter, **kwargs
+            )
+        ]
+
+    def similarity_search_by_vector_with_score(
+        self, embedding: List[float], k: int = 4, filter: Optional[dict] = None, **kwargs: Any
+    ) -> List[Tuple[Document, float]]:
+        hits = self.index.search(np.asarray(embedding), k, filter, probes=kwargs.get("probes"))
+        return [(self._document(*self.index.record(row)), score) for row, score in hits]
+
+    def max_marginal_relevance_search_by_vector(
+        self,
+        embedding: List[float],
+        k: int = 4,
+        fetch_k: int = 20,
+        lambda_mult: float = 0.5,
+        filter: Optional[dict] = None,
+        **kwargs: Any,
+    ) -> List[Document]:
+        hits = self.index.search(np.asarray(embedding), fetch_k, filter)
+        if not hits:
+            return []
+        rows = [row for row, _ in hits]
+        selected = maximal_marginal_relevance(
+            np.asarray([embedding], dtype=np.float32),
+            self.index.vectors(rows),
+            k=k,
+            lambda_mult=lambda_mult,
+        )
+        return [self._document(*self.index.record(rows[i])) for i in selected]
+
+    def max_marginal_relevance_search(
+        self,
+        query: str,
+        k: int = 4,
+        fetch_k: int = 20,
+        lambda_mult: float = 0.5,
+        filter: Optional[dict] = None,
+        **kwargs: Any,
+    ) -> List[Document]:
+        return self.max_marginal_relevance_search_by_vector(
+            self._embedding.embed_query(query), k, fetch_k, lambda_mult, filter, **kwargs
+        )
+
+    def _select_relevance_score_fn(self) -> Callable[[float], float]:
+        return lambda score: (score + 1) / 2
+
+    @classmethod
+    def from_texts(
+        cls,
+        texts: List[str],
+        embedding: Embeddings,
+        metadatas: Optional[List[dict]] = None,
+        *,
+        ids: Optional[List[str]] = None,
+        path: Optional[str] = None,
+        **kwargs: Any,
+    ) -> "LocalVectorStore":
+        if path is None:
+            raise ValueError("Cần truyền path của thư mục lưu index")
+        store = cls(LocalVectorIndex(path, **kwargs), embedding)
+        store.add_texts(texts, metadatas, ids=ids)
+        return store
+
+    def _document(self, id: str, metadata: Dict[str, Any]) -> Document:
+        metadata = dict(metadata)
+        text = metadata.pop(self.text_key, "")
+        return Document(id=id, page_content=text, metadata=metadata)
+
+
+class LocalVectorStoreBackend(VectorStoreBackend):
+    """
+    Backend lưu vector trên đĩa của worker, mỗi index/namespace một thư mục
+
+    Mỗi thư mục chỉ được mở một lần trong process; các worker không chia sẻ việc ghi
+    nên chỉ dùng khi phát triển, test, benchmark hoặc triển khai một worker.
+
+    Attributes:
+        root (Path): Thư mục gốc chứa các index
+    """
+
+    name = "local"
+
+    def __init__(
+        self,
+        root: Union[str, os.PathLike],
+        dtype: str = "float32",
+        ivf_min_vectors: int = 50000,
+        ivf_probes: int = 16,
+    ):
+        self.root = Path(root)
+        self.dtype = dtype
+        self.ivf_min_vectors = ivf_min_vectors
+        self.ivf_probes = ivf_probes
+        self._indexes: Dict[Tuple[str, Optional[str]], LocalVectorIndex] = {}
+        self._lock = threading.Lock()
+
+    def get_index(self, index_name: str, namespace: Optional[str] = None) -> LocalVectorIndex:
+        """
+        Mở (hoặc tạo) index của index_name và namespace
+
+        Args:
+            index_name: Tên index
+            namespace: Namespace trong index, None là namespace mặc định
+
+        Returns:
+            LocalVectorIndex: Index dùng chung trong process
+        """
+        key = (index_name, namespace)
+        with self._lock:
+            index = self._indexes.get(key)
+            if index is None:
+                index = LocalVectorIndex(
+                    self.root / index_name / (namespace or "__default__"),
+                    dtype=self.dtype,
+                    ivf_min_vectors=self.ivf_min_vectors,
+                    ivf_probes=self.ivf_probes,
+                )
+                self._indexes[key] = index
+            return index
+
+    def create_vector_store(
+        self, index_name: str, namespace: Optional[str], embedding: Any
+    ) -> VectorStore:
+        return LocalVectorStore(self.get_index(index_name, namespace), embedding)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            indexes = dict(self._indexes)
+        return {
+            "indexes": {
+                f"{name}/{namespace or ''}": {
+                    "vectors": len(index),
+                    "ivf": index.ivf_trained,
+                }
+                for (name, namespace), index in indexes.items()
+            }
+        }
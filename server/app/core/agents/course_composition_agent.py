@@ -1,5 +1,7 @@
+import asyncio
 import json
 import uuid
+from typing import Dict, Optional, Sequence
 
 from langchain.output_parsers import OutputFixingParser
 from langchain_core.output_parsers import PydanticOutputParser
@@ -11,13 +13,17 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.agents.base_agent import BaseAgent
 from app.core.agents.components.document_store import get_vector_store
 from app.core.agents.lesson_generating_agent import LessonGeneratingAgent
+from app.core.config import settings
 from app.core.tracing import trace_agent
+from app.database.database import get_independent_db_session
 from app.models import Course
 from app.models.topic_model import Topic
 from app.schemas.course_schema import (
     CourseCompositionRequestSchema,
 )
+from app.schemas.lesson_schema import CreateLessonSchema
 from app.services.lesson_service import LessonService
+from app.services.topic_service import TopicService
 
 
 class CourseAgentResponse(BaseModel):
@@ -86,19 +92,141 @@ SYSTEM_PROMPT = SYSTEM_PROMPT.format(
 )
 
 
+class TopicLessonGenerator:
+    """
+    Sinh bài học cho các topic của khóa học song song, giới hạn số topic chạy cùng lúc
+
+    Mọi topic dùng chung một LessonGeneratingAgent (agent không giữ trạng thái của
+    từng lần gọi). Mỗi topic lưu bài học bằng session DB riêng nên các topic ghi
+    song song được. Lỗi của một topic được thử lại với thời gian chờ tăng dần và
+    không làm dừng các topic khác.
+
+    Attributes:
+        lesson_agent (LessonGeneratingAgent): Agent sinh bài học dùng chung
+        session_factory: Context manager tạo session DB độc lập
+        concurrency (int): Số topic chạy cùng lúc
+        retries (int): Số lần thử lại mỗi topic
+        retry_delay (float): Thời gian chờ (giây) trước lần thử lại đầu tiên
+    """
+
+    def __init__(
+        self,
+        lesson_agent: LessonGeneratingAgent,
+        session_factory=get_independent_db_session,
+        concurrency: int = settings.COURSE_COMPOSITION_LESSON_CONCURRENCY,
+        retries: int = settings.COURSE_COMPOSITION_LESSON_RETRIES,
+        retry_delay: float = settings.COURSE_COMPOSITION_LESSON_RETRY_DELAY_SECONDS,
+    ):
+        self.lesson_agent = lesson_agent
+        self.session_factory = session_factory
+        self.concurrency = max(1, concurrency)
+        self.retries = max(0, retries)
+        self.retry_delay = retry_delay
+
+    async def run(
+        self, topics: Sequence[Topic], course_level: str, session_id: str
+    ) -> Dict[int, str]:
+        """
+        Sinh và lưu bài học cho tất cả topic
+
+        Args:
+            topics: Các topic của khóa học
+            course_level: Cấp độ khóa học
+            session_id: Session lịch sử hội thoại của agent
+
+        Returns:
+            Dict[int, str]: topic_id -> lỗi cuối cùng của các topic không sinh được
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+        results = await asyncio.gather(
+            *(
+                self._run_topic(semaphore, topic, course_level, session_id)
+                for topic in topics
+            )
+        )
+        return {
+            topic.id: error
+            for topic, error in zip(topics, results)
+            if error is not None
+        }
+
+    async def _run_topic(
+        self,
+        semaphore: asyncio.Semaphore,
+        topic: Topic,
+        course_level: str,
+        session_id: str,
+    ) -> Optional[str]:
+        """
+        Sinh và lưu bài học của một topic, thử lại khi lỗi
+
+        Returns:
+            Optional[str]: Lỗi của lần thử cuối, None nếu thành công
+        """
+        async with semaphore:
+            for attempt in range(self.retries + 1):
+                try:
+                    lesson_data = await self.lesson_agent.act(
+                        topic_name=topic.name,
+                        lesson_title=f"Bài giảng {topic.name}",
+                        lesson_description=topic.description,
+                        difficulty_level=course_level,
+                        max_sections=5,
+                        session_id=session_id,
+                    )
+                    for lesson in lesson_data:
+                        lesson.topic_id = topic.id
+                    await self._save(lesson_data)
+                    return None
+                except Exception as e:
+                    error = str(e)
+                    print(
+                        f"❌ Lỗi khi sinh bài học cho topic {topic.id} "
+                        f"(lần {attempt + 1}/{self.retries + 1}): {e}"
+                    )
+                    if attempt < self.retries:
+                        await asyncio.sleep(self.retry_delay * 2**attempt)
+        return error
+
+    async def _save(self, lessons: Sequence[CreateLessonSchema]) -> None:
+        """Lưu tất cả bài học của một topic trong một lần, bằng session riêng"""
+        async with self.session_factory() as session:
+            lesson_service = LessonService(
+                session, TopicService(session), agent=self.lesson_agent
+            )
+            await lesson_service.create_lessons(lessons)
+
+
 class CourseCompositionAgent(BaseAgent):
     """
     Agent tự động soạn bài giảng cho khóa học
     """
 
-    def __init__(self, db_session: AsyncSession):
+    def __init__(
+        self,
+        db_session: AsyncSession,
+        lesson_agent: Optional[LessonGeneratingAgent] = None,
+    ):
         super().__init__()
         self.current_course_id = None
         self.db_session = db_session
+        self._lesson_agent = lesson_agent
         self.vector_store = get_vector_store("document")
         self._setup_tools()
         self._init_agent()
 
+    @property
+    def lesson_agent(self) -> LessonGeneratingAgent:
+        """
+        Lazy loading cho agent sinh bài học, dùng chung cho mọi topic
+
+        Returns:
+            LessonGeneratingAgent: Agent sinh bài học
+        """
+        if self._lesson_agent is None:
+            self._lesson_agent = LessonGeneratingAgent()
+        return self._lesson_agent
+
     def _setup_tools(self):
         """Khởi tạo các tools cho agent"""
         document_retriever = get_vector_store("document").as_retriever()
@@ -262,30 +390,16 @@ class CourseCompositionAgent(BaseAgent):
                     .values(duration=agent_response.duration)
                 )
 
+            # Lưu duration trước: bài học được ghi bằng các session khác
+            await self.db_session.commit()
             topics_from_db = await self._get_topics_by_course_id(request.course_id)
 
-            # Khởi tạo LessonService
-            from app.services.topic_service import TopicService
-
-            # Tạo topic_service trực tiếp vì không thể dùng Depends
-            topic_service = TopicService(self.db_session)
-            lesson_service = LessonService(self.db_session, topic_service)
-            session_id = str(uuid.uuid4())
-
-            for topic in topics_from_db:
-                lesson_data = await LessonGeneratingAgent().act(
-                    topic_name=topic.name,
-                    lesson_title=f"Bài giảng {topic.name}",
-                    lesson_description=topic.description,
-                    difficulty_level=request.course_level,
-                    max_sections=5,
-                    session_id=session_id,
-                )
-
-                # Lưu lesson vào database
-                for lesson in lesson_data:
-                    lesson.topic_id = topic.id
-                    await lesson_service.create_lesson(lesson)
+            # Các topic được sinh song song, mỗi topic ghi bằng session riêng
+            failed_topics = await TopicLessonGenerator(self.lesson_agent).run(
+                topics_from_db, request.course_level, str(uuid.uuid4())
+            )
+            for topic_id, error in failed_topics.items():
+                errors.append(f"Không thể tạo bài học cho topic {topic_id}: {error}")
 
         except Exception as e:
             print(f"❌ Lỗi khi soạn khóa học: {e}")
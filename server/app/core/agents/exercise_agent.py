@@ -1,6 +1,7 @@
 from typing import override
 
 from app.core.agents.base_agent import BaseAgent
+from app.core.agents.components.agent_registry import agent_singleton
 from app.core.agents.components.document_store import get_vector_store
 from app.core.agents.components.llm_model import get_llm_model, create_new_llm_model
 from app.core.config import settings
@@ -54,6 +55,8 @@ Hãy trả về kết quả theo đúng format JSON được yêu cầu.
 
 
 class GenerateExerciseQuestionAgent(BaseAgent):
+    llm_cache_namespace = "exercise_generating"
+
     def __init__(
             self,
             mongodb_db_name: str = "chat_history",
@@ -102,7 +105,10 @@ class GenerateExerciseQuestionAgent(BaseAgent):
         )
 
         self.generate_exercise = self.generate_exercise_prompt | create_new_llm_model(
-            top_p=0.9, temperature=0.7
+            top_p=0.9,
+            temperature=0.7,
+            cache_namespace=self.llm_cache_namespace,
+            priority=self.llm_priority,
         ).with_structured_output(ExerciseDetail)
 
     def _init_tools(self):
@@ -260,5 +266,6 @@ class GenerateExerciseQuestionAgent(BaseAgent):
             raise Exception(f"Lỗi khi tạo bài tập: {str(e)}")
 
 
+@agent_singleton("exercise_generating")
 def get_exercise_agent():
     return GenerateExerciseQuestionAgent()
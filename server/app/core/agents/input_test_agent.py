@@ -1,4 +1,7 @@
 from app.core.agents.base_agent import BaseAgent
+from app.core.agents.components.agent_registry import agent_singleton
+from app.core.agents.components.llm_scheduler import ASSESSMENT
+from app.core.config import settings
 from app.models.course_model import Course
 from app.utils.model_utils import model_to_dict
 from pydantic import BaseModel, Field, ValidationError
@@ -57,6 +60,9 @@ class InputTestAgentOutput(BaseModel):
 
 
 class InputTestAgent(BaseAgent):
+    llm_cache_namespace = "input_test"
+    llm_priority = ASSESSMENT
+
     def __init__(self):
         super().__init__()
         self.available_args = ["course_id"]
@@ -66,8 +72,8 @@ class InputTestAgent(BaseAgent):
         self._tool_calling_agent = None
         self._agent_executor = None
 
-        # Retry configuration
-        self.max_retries = 3
+        # Retry configuration (LLMScheduler đã thử lại lỗi Gemini trong ngân sách thử lại)
+        self.max_retries = 1 if settings.LLM_SCHEDULER_ENABLED else 3
         self.retry_delay = 2  # seconds
 
         # Khởi tạo tool với lazy import
@@ -285,5 +291,6 @@ class InputTestAgent(BaseAgent):
             raise Exception(f"Lỗi tạo bài kiểm tra: {str(e)}")
 
 
+@agent_singleton("input_test")
 def get_input_test_agent():
     return InputTestAgent()
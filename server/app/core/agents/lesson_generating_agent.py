@@ -10,6 +10,7 @@ from langchain_core.prompts import (
     HumanMessagePromptTemplate,
     MessagesPlaceholder,
 )
+from app.core.agents.components.agent_registry import agent_singleton
 from app.core.agents.components.document_store import get_vector_store
 from app.core.config import settings
 from app.core.tracing import trace_agent
@@ -83,6 +84,8 @@ class LessonGeneratingAgent(BaseAgent):
     tạo cấu trúc, soạn nội dung và đảm bảo định dạng đầu ra.
     """
 
+    llm_cache_namespace = "lesson_generating"
+
     def __init__(
         self,
         mongodb_db_name: str = "chat_history",
@@ -141,7 +144,9 @@ class LessonGeneratingAgent(BaseAgent):
                 HumanMessagePromptTemplate.from_template("{input}"),
             ]
         )
-        self.generate_structure_chain = self.generate_structure_prompt | get_llm_model()
+        self.generate_structure_chain = self.generate_structure_prompt | get_llm_model(
+            cache_namespace=self.llm_cache_namespace, priority=self.llm_priority
+        )
 
         # Chain for generating section content
         self.generate_content_prompt = ChatPromptTemplate.from_messages(
@@ -263,5 +268,6 @@ class LessonGeneratingAgent(BaseAgent):
             raise Exception(f"Không thể tạo bài giảng: {str(e)}")
 
 
+@agent_singleton("lesson_generating")
 def get_lesson_generating_agent():
     return LessonGeneratingAgent()
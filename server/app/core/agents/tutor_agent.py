@@ -1,6 +1,11 @@
+from contextvars import ContextVar
+from typing import Optional
+
 from langchain_core.tools import Tool
 
 from app.core.agents.base_agent import BaseAgent
+from app.core.agents.components.agent_registry import agent_singleton
+from app.core.agents.components.llm_scheduler import INTERACTIVE
 from app.core.config import settings
 from app.core.tracing import trace_agent
 from langchain_core.agents import AgentFinish
@@ -13,13 +18,32 @@ from app.utils.model_utils import model_to_dict
 
 
 class TutorAgent(BaseAgent):
+    """
+    Agent giáo viên trả lời câu hỏi của người học
+
+    Một instance dùng chung cho mọi request; session DB của request được truyền qua
+    tham số ``db`` của ``act``/``act_stream`` và được giữ trong ContextVar, nên mỗi
+    request (task) chỉ thấy session của chính nó.
+    """
 
-    def __init__(self, db: AsyncSession):
+    llm_priority = INTERACTIVE
+
+    def __init__(self):
         super().__init__()
         self.available_args = ["session_id", "question", "type", "context_id"]
         self._prompt = None
-        self.db = db
         self._agent = None
+        self._db: ContextVar[Optional[AsyncSession]] = ContextVar(
+            "tutor_agent_db", default=None
+        )
+
+    @property
+    def db(self) -> AsyncSession:
+        """Session DB của lần gọi hiện tại"""
+        db = self._db.get()
+        if db is None:
+            raise ValueError("Cần truyền 'db' khi gọi TutorAgent.")
+        return db
 
     @property
     def tools(self):
@@ -94,9 +118,10 @@ class TutorAgent(BaseAgent):
             )
         return self._agent
 
-    def act(self, *args, **kwargs):
+    def act(self, *args, db: Optional[AsyncSession] = None, **kwargs):
 
         super().act(*args, **kwargs)
+        self._db.set(db)
 
         session_id = kwargs.get("session_id")
         question = kwargs.get("question")
@@ -121,8 +146,9 @@ class TutorAgent(BaseAgent):
         print(response.output)
 
     @trace_agent("tutor_agent.act_stream")
-    async def act_stream(self, *args, **kwargs):
+    async def act_stream(self, *args, db: Optional[AsyncSession] = None, **kwargs):
         super().act(*args, **kwargs)
+        self._db.set(db)
 
         session_id = kwargs.get("session_id")
         question = kwargs.get("question")
@@ -160,6 +186,11 @@ class TutorAgent(BaseAgent):
                 yield chunk
 
 
+@agent_singleton("tutor")
+def get_tutor_agent():
+    return TutorAgent()
+
+
 SYSTEM_PROMPT = """
     Bạn là một giảng viên về bộ môn Công nghệ thông tin. Bạn có thể dạy các chủ đề về Công nghệ thông tin.
     Nếu history không có context về ngữ cảnh, hãy gọi tool để lấy context người dùng đang học dựa vào context_id, type.
@@ -1,5 +1,5 @@
 import json
-from typing import List, Optional, Union
+from typing import Dict, List, Optional, Union
 
 from pydantic import field_validator
 from pydantic_settings import BaseSettings
@@ -18,15 +18,66 @@ class Settings(BaseSettings):
         DB_HOST (str): Host database
         DB_PORT (str): Port database
         DB_NAME (str): Tên database
+        DB_POOL_SIZE (int): Số kết nối thường trực trong pool của mỗi worker
+        DB_MAX_OVERFLOW (int): Số kết nối mở thêm tối đa khi pool đã dùng hết
+        DB_POOL_TIMEOUT (int): Thời gian chờ tối đa (giây) để lấy kết nối từ pool
+        DB_POOL_RECYCLE (int): Thời gian (giây) trước khi kết nối được mở lại
+        DB_STATEMENT_CACHE_SIZE (int): Số prepared statement được cache mỗi kết nối (0 để tắt)
+        DB_COMMAND_TIMEOUT (float): Timeout (giây) phía client cho mỗi câu lệnh asyncpg
+        DB_STATEMENT_TIMEOUT_MS (int): statement_timeout phía Postgres (ms, 0 để tắt)
+        DB_REPLICA_HOST (Optional[str]): Host của read replica, để trống nếu không dùng replica
+        DB_REPLICA_PORT (Optional[str]): Port của read replica, mặc định dùng DB_PORT
+        DB_REPLICA_NAME (Optional[str]): Tên database trên replica, mặc định dùng DB_NAME
+        DB_REPLICA_MAX_LAG_SECONDS (float): Độ trễ tối đa của replica trước khi đọc về primary
+        DB_REPLICA_LAG_CHECK_INTERVAL_SECONDS (float): Chu kỳ kiểm tra độ trễ của replica
+        READ_YOUR_WRITES_WINDOW_SECONDS (int): Thời gian client đọc từ primary sau khi ghi
         SECRET_KEY (str): Key để mã hóa JWT token
+        METRICS_SCRAPE_TOKEN (Optional[str]): Bearer token Prometheus dùng để đọc
+            /admin/health/metrics, để trống để tắt endpoint
         AGENT_LLM_MODEL (str): Model LLM cho agent
         CREATIVE_LLM_MODEL (str): Model LLM cho creative
         EMBEDDING_MODEL (str): Model embedding
         PINECONE_API_KEY (str): API key cho Pinecone
+        PINECONE_CLOUD (str): Cloud của index Pinecone tạo bởi lệnh bootstrap
+        PINECONE_REGION (str): Region của index Pinecone tạo bởi lệnh bootstrap
+        PINECONE_REFRESH_INTERVAL_SECONDS (float): Thời gian chờ trước khi kiểm tra lại
+            index Pinecone bị lỗi, tăng gấp đôi sau mỗi lần lỗi
+        VECTOR_STORE_BACKEND (str): Nơi lưu vector cho RAG ('pinecone' hoặc 'local' -
+            vector store NumPy trên đĩa của worker, dùng khi phát triển, test, benchmark)
+        VECTOR_STORE_LOCAL_PATH (str): Thư mục lưu vector của backend local
+        VECTOR_STORE_LOCAL_DTYPE (str): Kiểu lưu vector của backend local ('float32'
+            hoặc 'int8' - nhỏ hơn 4 lần, điểm cosine lệch khoảng 1%)
+        VECTOR_STORE_IVF_MIN_VECTORS (int): Số vector tối thiểu để backend local dựng
+            index IVF thay vì chỉ quét brute-force, 0 là không dùng IVF
+        VECTOR_STORE_IVF_PROBES (int): Số cụm IVF được quét mỗi truy vấn
         MONGO_URI (str): URI cho MongoDB
         LANGSMITH_API_KEY (str): API key cho LangSmith
         LANGSMITH_TRACING (bool): Tracing cho LangSmith
         LANGSMITH_PROJECT (str): Project cho LangSmith
+        AGENT_WARMUP_ON_STARTUP (bool): Tạo trước các agent dùng chung khi worker khởi
+            động (chạy nền), thay vì ở request đầu tiên cần agent
+        COURSE_COMPOSITION_LESSON_CONCURRENCY (int): Số topic được sinh bài học cùng lúc
+            khi soạn khóa học
+        COURSE_COMPOSITION_LESSON_RETRIES (int): Số lần thử lại khi sinh bài học cho một
+            topic bị lỗi
+        COURSE_COMPOSITION_LESSON_RETRY_DELAY_SECONDS (float): Thời gian chờ trước lần thử
+            lại đầu tiên, tăng gấp đôi sau mỗi lần
+        LLM_SCHEDULER_ENABLED (bool): Cho mọi lần gọi Gemini đi qua scheduler (giới hạn
+            tốc độ theo model, hàng đợi ưu tiên, ngân sách thử lại dùng chung)
+        LLM_REQUESTS_PER_MINUTE (int): Quota mặc định (request/phút) của mỗi model cho
+            cả deployment, 0 là không giới hạn
+        LLM_REQUESTS_PER_MINUTE_BY_MODEL (Dict[str, int]): Quota riêng theo tên model
+            (JSON, ví dụ {"gemini-2.0-flash": 2000})
+        LLM_SCHEDULER_WORKERS (int): Số worker dùng chung quota, mỗi worker được chia đều
+        LLM_MAX_ATTEMPTS (int): Số lần gọi tối đa của một request LLM (kể cả lần đầu)
+        LLM_RETRY_BUDGET_RATIO (float): Số lượt thử lại được nạp sau mỗi request thành công
+        LLM_RETRY_BUDGET_MIN_PER_MINUTE (float): Số lượt thử lại luôn được nạp mỗi phút
+            (cũng là số lượt tích lũy tối đa)
+        LLM_RETRY_BASE_DELAY_SECONDS (float): Thời gian chờ gốc của backoff, tăng gấp đôi
+            sau mỗi lần thử (có jitter)
+        LLM_RETRY_MAX_DELAY_SECONDS (float): Thời gian chờ tối đa giữa hai lần thử
+        LLM_PRIORITY_AGING_SECONDS (float): Thời gian chờ để request được nâng một bậc ưu
+            tiên, 0 là không nâng
         ACCESS_TOKEN_EXPIRE_MINUTES (int): Thời gian hết hạn của token (phút)
         COOKIE_DOMAIN (str): Domain cho cookie
         COOKIE_SECURE (bool): Secure flag cho cookie
@@ -48,6 +99,37 @@ class Settings(BaseSettings):
         UVICORN_HOST (str): Host cho uvicorn
         UVICORN_PORT (int): Port cho uvicorn
         UVICORN_RELOAD (bool): Auto reload cho uvicorn
+        PRINCIPAL_CACHE_TTL_SECONDS (int): Thời gian cache thông tin user đã xác thực (0 để tắt)
+        PRINCIPAL_CACHE_MAX_SIZE (int): Số user tối đa trong cache xác thực của mỗi worker
+        LESSON_RENDER_CACHE_MAX_BYTES (int): Tổng số byte JSON bài học được cache ở mỗi
+            worker (0 để tắt)
+        LESSON_RENDER_CACHE_SHARED (bool): Dùng thêm bảng lesson_render_cache trong
+            PostgreSQL làm cache dùng chung giữa các worker
+        LLM_CACHE_ENABLED (bool): Cache response của LLM cho các agent có bật cache
+        LLM_CACHE_DATABASE_URL (Optional[str]): Database lưu cache LLM (ví dụ
+            sqlite:///llm_cache.db), mặc định dùng bảng llm_cache_entries của database chính
+        LLM_CACHE_TTL_SECONDS (int): Thời gian sống của một response trong cache
+        LLM_CACHE_MAX_ENTRIES (int): Số response tối đa, vượt quá sẽ loại entry ít dùng nhất
+        LLM_CACHE_MAX_TEMPERATURE (float): Model có temperature cao hơn không dùng cache
+        LLM_CACHE_DISABLED_AGENTS (List[str]): Các agent (namespace) tắt cache
+        LLM_CACHE_SEMANTIC_ENABLED (bool): Bật tầng semantic (so khớp prompt gần giống
+            bằng embedding)
+        LLM_CACHE_SEMANTIC_THRESHOLD (float): Độ tương đồng cosine tối thiểu để dùng lại
+        LLM_CACHE_SEMANTIC_CANDIDATES (int): Số entry gần nhất được so sánh mỗi lần tra cứu
+        EMBEDDING_CACHE_ENABLED (bool): Cache vector embedding theo nội dung
+        EMBEDDING_CACHE_DATABASE_URL (Optional[str]): Database lưu cache embedding (ví dụ
+            sqlite:///embedding_cache.db), mặc định dùng bảng embedding_cache_entries
+            của database chính
+        EMBEDDING_CACHE_MAX_ENTRIES (int): Số vector tối đa, vượt quá sẽ loại entry ít dùng nhất
+        EMBEDDING_CACHE_QUANTIZE (bool): Lưu vector dạng int8 thay vì float32 (nhỏ hơn 4 lần)
+        PASSWORD_BCRYPT_ROUNDS (int): Work factor của bcrypt; hash cũ yếu hơn được hash lại khi đăng nhập
+        PASSWORD_HASH_WORKERS (int): Số thread hash mật khẩu của mỗi worker
+        PASSWORD_HASH_MAX_QUEUE (int): Số tác vụ hash được chờ tối đa, vượt quá trả về 503
+        WEBSOCKET_REGISTRY_BACKEND (str): Backend pub/sub giữa các worker cho WebSocket
+            ('postgres' dùng LISTEN/NOTIFY, 'memory' chỉ dùng khi chạy 1 worker hoặc test)
+        WEBSOCKET_REGISTRY_CHANNEL (str): Tên kênh LISTEN/NOTIFY của registry WebSocket
+        CAMEL_CASE_MAX_BUFFER_BYTES (int): Kích thước tối đa (bytes) của body JSON được
+            CamelCaseMiddleware gom lại để chuyển đổi; lớn hơn sẽ được stream nguyên vẹn
     """
 
     PROJECT_NAME: str = "default"
@@ -85,10 +167,26 @@ class Settings(BaseSettings):
     DB_HOST: str
     DB_PORT: str
     DB_NAME: str
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 3600
+    DB_STATEMENT_CACHE_SIZE: int = 100
+    DB_COMMAND_TIMEOUT: float = 5
+    DB_STATEMENT_TIMEOUT_MS: int = 0
+
+    # Read replica
+    DB_REPLICA_HOST: Optional[str] = None
+    DB_REPLICA_PORT: Optional[str] = None
+    DB_REPLICA_NAME: Optional[str] = None
+    DB_REPLICA_MAX_LAG_SECONDS: float = 5
+    DB_REPLICA_LAG_CHECK_INTERVAL_SECONDS: float = 5
+    READ_YOUR_WRITES_WINDOW_SECONDS: int = 10
 
     # Security
     SECRET_KEY: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
+    METRICS_SCRAPE_TOKEN: Optional[str] = None
 
     # Cookie settings
     COOKIE_DOMAIN: Optional[str] = ""  # Sử dụng chuỗi rỗng thay vì None
@@ -98,16 +196,90 @@ class Settings(BaseSettings):
     COOKIE_HTTPONLY: bool = True
     COOKIE_MAX_AGE: int = 60 * 60 * 30 * 24  # 30 ngày
 
+    # Cache principal cho get_current_user
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 60
+    PRINCIPAL_CACHE_MAX_SIZE: int = 10000
+
+    # Cache JSON đã render của bài học
+    LESSON_RENDER_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    LESSON_RENDER_CACHE_SHARED: bool = False
+
+    # Cache response của LLM
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_DATABASE_URL: Optional[str] = None
+    LLM_CACHE_TTL_SECONDS: int = 7 * 24 * 60 * 60
+    LLM_CACHE_MAX_ENTRIES: int = 20000
+    LLM_CACHE_MAX_TEMPERATURE: float = 0.7
+    LLM_CACHE_DISABLED_AGENTS: List[str] = []
+    LLM_CACHE_SEMANTIC_ENABLED: bool = False
+    LLM_CACHE_SEMANTIC_THRESHOLD: float = 0.97
+    LLM_CACHE_SEMANTIC_CANDIDATES: int = 500
+
+    @field_validator("LLM_CACHE_DISABLED_AGENTS", mode="before")
+    @classmethod
+    def assemble_llm_cache_disabled_agents(cls, v: Union[str, List[str]]) -> List[str]:
+        """
+        Xử lý giá trị LLM_CACHE_DISABLED_AGENTS từ biến môi trường (JSON hoặc dấu phẩy)
+        """
+        if isinstance(v, str):
+            try:
+                return json.loads(v)
+            except json.JSONDecodeError:
+                return [i.strip() for i in v.split(",") if i.strip()]
+        return v
+
+    # Cache embedding
+    EMBEDDING_CACHE_ENABLED: bool = True
+    EMBEDDING_CACHE_DATABASE_URL: Optional[str] = None
+    EMBEDDING_CACHE_MAX_ENTRIES: int = 100000
+    EMBEDDING_CACHE_QUANTIZE: bool = False
+
+    # Hash mật khẩu
+    PASSWORD_BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_QUEUE: int = 64
+
+    # WebSocket registry giữa các worker
+    WEBSOCKET_REGISTRY_BACKEND: str = "postgres"  # 'postgres' hoặc 'memory'
+    WEBSOCKET_REGISTRY_CHANNEL: str = "ws_registry"
+
     # Agent
     GOOGLE_API_KEY: str
     AGENT_LLM_MODEL: str
     CREATIVE_LLM_MODEL: str
     EMBEDDING_MODEL: str
     PINECONE_API_KEY: str
+    PINECONE_CLOUD: str = "aws"
+    PINECONE_REGION: str = "us-east-1"
+    PINECONE_REFRESH_INTERVAL_SECONDS: float = 5.0
+    VECTOR_STORE_BACKEND: str = "pinecone"  # 'pinecone' hoặc 'local'
+    VECTOR_STORE_LOCAL_PATH: str = "vector_store"
+    VECTOR_STORE_LOCAL_DTYPE: str = "float32"  # 'float32' hoặc 'int8'
+    VECTOR_STORE_IVF_MIN_VECTORS: int = 50000
+    VECTOR_STORE_IVF_PROBES: int = 16
     MONGO_URI: str
     LANGSMITH_API_KEY: str
     LANGSMITH_TRACING: bool = False
     LANGSMITH_PROJECT: str = "default"
+    AGENT_WARMUP_ON_STARTUP: bool = False
+    COURSE_COMPOSITION_LESSON_CONCURRENCY: int = 4
+    COURSE_COMPOSITION_LESSON_RETRIES: int = 2
+    COURSE_COMPOSITION_LESSON_RETRY_DELAY_SECONDS: float = 2.0
+
+    # Điều phối gọi LLM
+    LLM_SCHEDULER_ENABLED: bool = True
+    LLM_REQUESTS_PER_MINUTE: int = 60
+    LLM_REQUESTS_PER_MINUTE_BY_MODEL: Dict[str, int] = {}
+    LLM_SCHEDULER_WORKERS: int = 1
+    LLM_MAX_ATTEMPTS: int = 4
+    LLM_RETRY_BUDGET_RATIO: float = 0.2
+    LLM_RETRY_BUDGET_MIN_PER_MINUTE: float = 6
+    LLM_RETRY_BASE_DELAY_SECONDS: float = 1.0
+    LLM_RETRY_MAX_DELAY_SECONDS: float = 30.0
+    LLM_PRIORITY_AGING_SECONDS: float = 60.0
+
+    # CamelCaseMiddleware
+    CAMEL_CASE_MAX_BUFFER_BYTES: int = 8 * 1024 * 1024  # 8 MB
 
     # File Upload Settings
     UPLOAD_DIR: str = "uploads"  # Thư mục lưu file tạm thời
@@ -194,6 +366,20 @@ class Settings(BaseSettings):
         # Sử dụng driver asyncpg cho SQLAlchemy bất đồng bộ
         return f"postgresql+asyncpg://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
 
+    @property
+    def ASYNC_REPLICA_DATABASE_URI(self) -> Optional[str]:
+        """
+        Tạo connection string bất đồng bộ cho read replica
+
+        Returns:
+            Optional[str]: Async connection string, None nếu không cấu hình replica
+        """
+        if not self.DB_REPLICA_HOST:
+            return None
+        port = self.DB_REPLICA_PORT or self.DB_PORT
+        name = self.DB_REPLICA_NAME or self.DB_NAME
+        return f"postgresql+asyncpg://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_REPLICA_HOST}:{port}/{name}"
+
     @property
     def S3_ENABLED(self) -> bool:
         """
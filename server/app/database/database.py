@@ -1,33 +1,83 @@
 from datetime import datetime
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Optional
 from contextlib import asynccontextmanager
 
+from fastapi import Depends, Request
 from sqlalchemy import func, create_engine
 from sqlalchemy.orm import (
     DeclarativeBase,
     Mapped,
+    Session,
     mapped_column,
     sessionmaker,
 )
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from app.core.config import settings
+from app.database.lesson_navigation import maintain_lesson_navigation
+from app.database.pool_metrics import PoolTelemetry, instrumented_pool_class
+from app.database.read_replica import (
+    ReplicaLagMonitor,
+    is_pinned_to_primary,
+    track_primary_writes,
+)
+
+# Telemetry của connection pool chính, xem tại /admin/health
+primary_pool_telemetry = PoolTelemetry("primary")
+
+
+def build_async_engine_kwargs(telemetry: PoolTelemetry) -> dict:
+    """
+    Tham số tạo async engine theo cấu hình DB_POOL_* / DB_*_TIMEOUT
+
+    Args:
+        telemetry (PoolTelemetry): Nơi ghi nhận số liệu của pool
+
+    Returns:
+        dict: Tham số cho create_async_engine
+    """
+    server_settings = {"application_name": "ai_agent_giai_thuat"}
+    if settings.DB_STATEMENT_TIMEOUT_MS > 0:
+        server_settings["statement_timeout"] = str(settings.DB_STATEMENT_TIMEOUT_MS)
+
+    return {
+        "poolclass": instrumented_pool_class(AsyncAdaptedQueuePool, telemetry),
+        "pool_pre_ping": True,  # Kiểm tra kết nối trước khi sử dụng
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,  # Timeout để lấy connection từ pool
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        # asyncpg không hỗ trợ connect_timeout, sử dụng server_settings
+        "connect_args": {
+            "server_settings": server_settings,
+            "command_timeout": settings.DB_COMMAND_TIMEOUT,  # Timeout phía client
+            # Cache prepared statement của asyncpg và của dialect SQLAlchemy,
+            # đặt 0 khi đi qua pgbouncer ở chế độ transaction
+            "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        },
+    }
+
 
 # Tạo engine bất đồng bộ với cấu hình tối ưu
-# asyncpg không hỗ trợ connect_timeout, sử dụng server_settings
 async_engine = create_async_engine(
-    settings.ASYNC_DATABASE_URI,
-    pool_pre_ping=True,  # Kiểm tra kết nối trước khi sử dụng
-    connect_args={
-        "server_settings": {
-            "application_name": "ai_agent_giai_thuat",
-        },
-        "command_timeout": 5,  # Timeout cho asyncpg commands
-    },
-    pool_timeout=30,  # Timeout để lấy connection từ pool
-    pool_recycle=3600,  # Recycle connections mỗi giờ
+    settings.ASYNC_DATABASE_URI, **build_async_engine_kwargs(primary_pool_telemetry)
 )
 
+
+class PrimarySession(Session):
+    """Session ghi vào primary, theo dõi commit để đảm bảo read-your-writes"""
+
+
+track_primary_writes(PrimarySession)
+maintain_lesson_navigation(PrimarySession)
+
 # Tạo AsyncSessionLocal class với tối ưu hóa
 AsyncSessionLocal = async_sessionmaker(
     async_engine,
@@ -35,8 +85,33 @@ AsyncSessionLocal = async_sessionmaker(
     autoflush=False,
     expire_on_commit=False,
     class_=AsyncSession,
+    sync_session_class=PrimarySession,
 )
 
+# Read replica (tùy chọn): dùng cho các truy vấn chỉ đọc qua get_async_read_db
+replica_pool_telemetry = PoolTelemetry("replica")
+replica_engine: Optional[AsyncEngine] = None
+AsyncReadSessionLocal: Optional[async_sessionmaker[AsyncSession]] = None
+replica_monitor: Optional[ReplicaLagMonitor] = None
+
+if settings.ASYNC_REPLICA_DATABASE_URI:
+    replica_engine = create_async_engine(
+        settings.ASYNC_REPLICA_DATABASE_URI,
+        **build_async_engine_kwargs(replica_pool_telemetry),
+    )
+    AsyncReadSessionLocal = async_sessionmaker(
+        replica_engine,
+        autocommit=False,
+        autoflush=False,
+        expire_on_commit=False,
+        class_=AsyncSession,
+    )
+    replica_monitor = ReplicaLagMonitor(
+        replica_engine,
+        max_lag_seconds=settings.DB_REPLICA_MAX_LAG_SECONDS,
+        check_interval_seconds=settings.DB_REPLICA_LAG_CHECK_INTERVAL_SECONDS,
+    )
+
 """
 Synchronous SQLAlchemy engine and Session for scripting utilities
 
@@ -82,6 +157,31 @@ async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
         yield session
 
 
+async def get_async_read_db(
+    request: Request, db: AsyncSession = Depends(get_async_db)
+) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Session cho truy vấn chỉ đọc: dùng read replica nếu có, ngược lại dùng lại
+    session primary của request
+
+    Đọc từ primary khi: không cấu hình replica, replica lỗi hoặc trễ quá
+    DB_REPLICA_MAX_LAG_SECONDS, hoặc client vừa ghi dữ liệu (cookie read-your-writes).
+
+    Yields:
+        AsyncSession: Async database session
+    """
+    if (
+        AsyncReadSessionLocal is None
+        or is_pinned_to_primary(request.cookies)
+        or not await replica_monitor.is_usable()
+    ):
+        yield db
+        return
+
+    async with AsyncReadSessionLocal() as session:
+        yield session
+
+
 @asynccontextmanager
 async def get_independent_db_session() -> AsyncGenerator[AsyncSession, None]:
     """
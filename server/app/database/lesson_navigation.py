@@ -0,0 +1,226 @@
+"""
+Chỉ mục điều hướng bài học: thứ tự bài học của từng khóa học được lưu sẵn
+trong ``lessons.next_lesson_id``/``prev_lesson_id`` và tính lại khi topic/lesson
+thay đổi, cùng với bộ đếm tiến độ của các lần đăng ký khóa học đó
+"""
+
+from typing import Iterable, Optional, Set
+
+from sqlalchemy import (
+    String,
+    and_,
+    case,
+    cast,
+    event,
+    func,
+    inspect,
+    or_,
+    select,
+    update,
+)
+from sqlalchemy.orm import Session
+
+# Khóa trong session.info chứa các khóa học/topic cần tính lại điều hướng
+_PENDING_KEY = "lesson_navigation_pending"
+
+# Thay đổi các cột này làm thay đổi thứ tự bài học
+_LESSON_ORDER_ATTRS = ("topic_id", "order")
+_TOPIC_ORDER_ATTRS = ("course_id", "order")
+
+
+def topic_sequence_order_by(topic=None):
+    """
+    Thứ tự topic trong khóa học: topic chưa có ``order`` đứng như ``order`` = 0,
+    cùng ``order`` thì theo id
+
+    Args:
+        topic: Alias của Topic, mặc định là Topic
+    """
+    # Import trong hàm: module này được nạp từ app.database.database trước các model
+    from app.models.topic_model import Topic
+
+    topic = topic if topic is not None else Topic
+    return (func.coalesce(topic.order, 0), topic.id)
+
+
+def lesson_sequence_order_by(lesson=None, topic=None):
+    """
+    Thứ tự bài học trong khóa học: theo topic rồi theo lesson, giống mục lục
+
+    Mọi nơi duyệt bài học theo thứ tự khóa học (điều hướng, bài học hiện tại, mục
+    lục) phải dùng thứ tự này để khớp với next_lesson_id/prev_lesson_id.
+
+    Args:
+        lesson: Alias của Lesson, mặc định là Lesson
+        topic: Alias của Topic chứa ``lesson``, mặc định là Topic
+    """
+    from app.models.lesson_model import Lesson
+
+    lesson = lesson if lesson is not None else Lesson
+    return (*topic_sequence_order_by(topic), lesson.order, lesson.id)
+
+
+def lesson_navigation_statement(
+    course_ids: Optional[Iterable[int]] = None,
+    topic_ids: Optional[Iterable[int]] = None,
+):
+    """
+    Câu UPDATE tính lại next_lesson_id/prev_lesson_id bằng lead/lag trên thứ tự bài học
+
+    Luôn tính trên toàn bộ khóa học chứa các topic được chỉ định để bài đầu/cuối
+    của topic nối đúng sang topic kề bên. Topic chưa thuộc khóa học nào là một
+    chuỗi riêng. Chỉ ghi các dòng có giá trị thay đổi.
+
+    Args:
+        course_ids: Các khóa học cần tính lại
+        topic_ids: Các topic có bài học thay đổi, None cả hai để tính lại tất cả
+
+    Returns:
+        Update: Câu UPDATE ... FROM
+    """
+    from app.models.lesson_model import Lesson
+    from app.models.topic_model import Topic
+
+    window = {
+        "partition_by": (
+            Topic.course_id,
+            case((Topic.course_id.is_(None), Topic.id)),
+        ),
+        "order_by": lesson_sequence_order_by(),
+    }
+    sequence = select(
+        Lesson.id.label("id"),
+        func.lead(Lesson.id).over(**window).label("next_id"),
+        func.lag(Lesson.id).over(**window).label("prev_id"),
+    ).join(Topic, Topic.id == Lesson.topic_id)
+
+    if course_ids is not None or topic_ids is not None:
+        course_ids = list(course_ids or ())
+        topic_ids = list(topic_ids or ())
+        sequence = sequence.where(
+            or_(
+                Topic.course_id.in_(course_ids),
+                Topic.course_id.in_(
+                    select(Topic.course_id).where(Topic.id.in_(topic_ids))
+                ),
+                and_(Topic.course_id.is_(None), Topic.id.in_(topic_ids)),
+            )
+        )
+    sequence = sequence.subquery("lesson_sequence")
+
+    next_id = cast(sequence.c.next_id, String)
+    prev_id = cast(sequence.c.prev_id, String)
+    return (
+        update(Lesson)
+        .where(
+            Lesson.id == sequence.c.id,
+            or_(
+                Lesson.next_lesson_id.is_distinct_from(next_id),
+                Lesson.prev_lesson_id.is_distinct_from(prev_id),
+            ),
+        )
+        .values(next_lesson_id=next_id, prev_lesson_id=prev_id)
+    )
+
+
+def _changed_values(instance, attrs) -> Optional[Set]:
+    """
+    Giá trị cũ và mới của các thuộc tính ``attrs[0]`` nếu một trong ``attrs`` đổi
+
+    Returns:
+        Optional[Set]: None nếu không thuộc tính nào thay đổi
+    """
+    state = inspect(instance)
+    histories = [state.attrs[attr].history for attr in attrs]
+    if not any(history.has_changes() for history in histories):
+        return None
+    return {value for value in histories[0].sum() if value is not None}
+
+
+def _collect_changes(session: Session) -> None:
+    from app.models.lesson_model import Lesson
+    from app.models.topic_model import Topic
+
+    # course_ids/topic_ids: phạm vi tính lại điều hướng; lesson_ids/moved_topic_ids:
+    # các lesson đổi vị trí, dùng để lọc lần đăng ký cần tính lại bộ đếm
+    pending = session.info.setdefault(
+        _PENDING_KEY,
+        {
+            "course_ids": set(),
+            "topic_ids": set(),
+            "lesson_ids": set(),
+            "moved_topic_ids": set(),
+        },
+    )
+
+    for instance in session.new | session.deleted:
+        if isinstance(instance, Lesson) and instance.topic_id is not None:
+            pending["topic_ids"].add(instance.topic_id)
+            pending["lesson_ids"].add(instance.id)
+        elif isinstance(instance, Topic) and instance.course_id is not None:
+            pending["course_ids"].add(instance.course_id)
+
+    for instance in session.dirty:
+        if isinstance(instance, Lesson):
+            topic_ids = _changed_values(instance, _LESSON_ORDER_ATTRS)
+            if topic_ids is not None:
+                pending["topic_ids"].update(topic_ids)
+                pending["lesson_ids"].add(instance.id)
+        elif isinstance(instance, Topic):
+            course_ids = _changed_values(instance, _TOPIC_ORDER_ATTRS)
+            if course_ids is not None:
+                pending["course_ids"].update(course_ids)
+                pending["topic_ids"].add(instance.id)
+                pending["moved_topic_ids"].add(instance.id)
+
+    if not any(pending.values()):
+        session.info.pop(_PENDING_KEY)
+
+
+def maintain_lesson_navigation(session_class: type[Session]) -> None:
+    """
+    Gắn event vào session class để tính lại điều hướng bài học trước khi commit
+
+    Sau mỗi lần flush, ghi nhận các khóa học/topic có lesson hoặc topic được
+    thêm, xóa hoặc đổi thứ tự/cha. Trước khi commit, chạy một câu UPDATE cho các
+    khóa học đó trong cùng transaction, nên mọi đường ghi qua ORM (service,
+    router admin, agent) đều giữ điều hướng đúng. Bộ đếm tiến độ trên
+    user_courses (số bài đã hoàn thành, bài hiện tại) cũng được tính lại trong
+    cùng transaction, chỉ cho các lần đăng ký bị ảnh hưởng bởi các lesson thay đổi.
+
+    Args:
+        session_class (type[Session]): sync_session_class của session primary
+    """
+
+    @event.listens_for(session_class, "after_flush")
+    def _after_flush(session, flush_context):
+        _collect_changes(session)
+
+    @event.listens_for(session_class, "before_commit")
+    def _before_commit(session):
+        # Commit sẽ flush sau event này, flush trước để ghi nhận đủ thay đổi
+        session.flush()
+        pending = session.info.pop(_PENDING_KEY, None)
+        if pending:
+            # Import trong hàm: service import app.database.database
+            from app.services.user_course_progress_service import (
+                progress_counters_statement,
+            )
+
+            session.execute(
+                lesson_navigation_statement(
+                    pending["course_ids"], pending["topic_ids"]
+                ),
+                execution_options={"synchronize_session": "fetch"},
+            )
+            if pending["lesson_ids"] or pending["moved_topic_ids"]:
+                session.execute(
+                    progress_counters_statement(
+                        lesson_ids=pending["lesson_ids"],
+                        topic_ids=pending["moved_topic_ids"],
+                    )
+                )
+
+    @event.listens_for(session_class, "after_rollback")
+    def _after_rollback(session):
+        session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,231 @@
+"""
+Phân trang keyset (cursor) theo ``(created_at, id)``
+
+Thay vì ``OFFSET n`` (database phải đọc rồi bỏ qua n dòng, càng trang sâu càng chậm),
+mỗi trang bắt đầu ngay sau bản ghi cuối của trang trước bằng điều kiện
+``(created_at, id) < (:created_at, :id)``, đi thẳng vào index ``(created_at, id)``.
+"""
+
+import base64
+import binascii
+import json
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import (
+    Any,
+    Callable,
+    Generic,
+    List,
+    Literal,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
+
+from fastapi import HTTPException, Response, status
+from sqlalchemy import Select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+T = TypeVar("T")
+
+Direction = Literal["next", "prev"]
+
+# Header chứa cursor cho các endpoint trả về mảng (không có chỗ trong body)
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+PREV_CURSOR_HEADER = "X-Prev-Cursor"
+
+
+@dataclass
+class KeysetPage(Generic[T]):
+    """
+    Một trang kết quả phân trang keyset
+
+    Attributes:
+        items (List[T]): Các bản ghi của trang, theo thứ tự sắp xếp của danh sách
+        next_cursor (Optional[str]): Cursor của trang sau, None nếu là trang cuối
+        prev_cursor (Optional[str]): Cursor của trang trước, None nếu là trang đầu
+    """
+
+    items: List[T] = field(default_factory=list)
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+
+
+def encode_cursor(created_at: datetime, id: int, direction: Direction = "next") -> str:
+    """
+    Mã hóa vị trí ``(created_at, id)`` thành cursor gửi cho client
+
+    Args:
+        created_at (datetime): created_at của bản ghi biên
+        id (int): id của bản ghi biên
+        direction (Direction): "next" lấy các bản ghi sau biên, "prev" lấy trước biên
+
+    Returns:
+        str: Cursor dạng base64 an toàn cho URL
+    """
+    payload = json.dumps(
+        {"c": created_at.isoformat(), "i": id, "d": direction},
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int, Direction]:
+    """
+    Giải mã cursor do ``encode_cursor`` tạo ra
+
+    Args:
+        cursor (str): Cursor client gửi lên
+
+    Returns:
+        Tuple[datetime, int, Direction]: created_at, id và hướng phân trang
+
+    Raises:
+        HTTPException: 400 nếu cursor không hợp lệ
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        direction = payload["d"]
+        if direction not in ("next", "prev"):
+            raise ValueError(direction)
+        return datetime.fromisoformat(payload["c"]), int(payload["i"]), direction
+    except (binascii.Error, ValueError, KeyError, TypeError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Cursor không hợp lệ"
+        ) from e
+
+
+def keyset_statement(
+    stmt: Select,
+    model: Any,
+    *,
+    limit: int,
+    cursor: Optional[str] = None,
+    descending: bool = True,
+) -> Select:
+    """
+    Thêm điều kiện keyset, ORDER BY và LIMIT vào câu truy vấn
+
+    Lấy dư một bản ghi để biết còn trang tiếp theo hay không. Với cursor "prev",
+    câu truy vấn sắp xếp ngược lại; ``build_keyset_page`` đảo lại kết quả.
+
+    Args:
+        stmt (Select): Câu truy vấn đã có các điều kiện lọc, chưa ORDER BY/OFFSET/LIMIT
+        model: Model có cột ``created_at`` và ``id``
+        limit (int): Số bản ghi mỗi trang
+        cursor (Optional[str]): Cursor từ trang trước, None để lấy trang đầu
+        descending (bool): True nếu danh sách xếp mới nhất trước
+
+    Returns:
+        Select: Câu truy vấn đã phân trang
+    """
+    direction: Direction = "next"
+    if cursor:
+        created_at, id, direction = decode_cursor(cursor)
+        key = tuple_(model.created_at, model.id)
+        boundary = tuple_(created_at, id)
+        # Đi tới (next) theo chiều sắp xếp, hoặc lùi lại (prev) ngược chiều
+        if descending == (direction == "next"):
+            stmt = stmt.where(key < boundary)
+        else:
+            stmt = stmt.where(key > boundary)
+
+    ascending = descending == (direction == "prev")
+    order = (
+        (model.created_at.asc(), model.id.asc())
+        if ascending
+        else (model.created_at.desc(), model.id.desc())
+    )
+    return stmt.order_by(*order).limit(limit + 1)
+
+
+def _model_key(item: Any) -> Tuple[datetime, int]:
+    return item.created_at, item.id
+
+
+def build_keyset_page(
+    rows: Sequence[T],
+    *,
+    limit: int,
+    cursor: Optional[str] = None,
+    key: Callable[[T], Tuple[datetime, int]] = _model_key,
+) -> KeysetPage[T]:
+    """
+    Tạo KeysetPage từ kết quả của câu truy vấn ``keyset_statement``
+
+    Args:
+        rows (Sequence[T]): Các bản ghi đã lấy (tối đa ``limit + 1``)
+        limit (int): Số bản ghi mỗi trang
+        cursor (Optional[str]): Cursor đã dùng cho câu truy vấn
+        key (Callable[[T], Tuple[datetime, int]]): Lấy ``(created_at, id)`` của một
+            bản ghi, mặc định đọc thuộc tính của object model
+
+    Returns:
+        KeysetPage[T]: Trang kết quả kèm cursor trang trước/sau
+    """
+    direction: Direction = decode_cursor(cursor)[2] if cursor else "next"
+    has_more = len(rows) > limit
+    items = list(rows[:limit])
+
+    if direction == "prev":
+        items.reverse()
+        has_next, has_prev = True, has_more
+    else:
+        has_next, has_prev = has_more, cursor is not None
+
+    if not items:
+        return KeysetPage(items=items)
+
+    return KeysetPage(
+        items=items,
+        next_cursor=encode_cursor(*key(items[-1]), "next") if has_next else None,
+        prev_cursor=encode_cursor(*key(items[0]), "prev") if has_prev else None,
+    )
+
+
+async def paginate_keyset(
+    db: AsyncSession,
+    stmt: Select,
+    model: Any,
+    *,
+    limit: int,
+    cursor: Optional[str] = None,
+    descending: bool = True,
+) -> KeysetPage:
+    """
+    Thực thi câu truy vấn với phân trang keyset
+
+    Args:
+        db (AsyncSession): Session database
+        stmt (Select): Câu truy vấn ``select(model)`` đã có các điều kiện lọc
+        model: Model có cột ``created_at`` và ``id``
+        limit (int): Số bản ghi mỗi trang
+        cursor (Optional[str]): Cursor từ trang trước, None để lấy trang đầu
+        descending (bool): True nếu danh sách xếp mới nhất trước
+
+    Returns:
+        KeysetPage: Trang kết quả kèm cursor trang trước/sau
+    """
+    result = await db.execute(
+        keyset_statement(
+            stmt, model, limit=limit, cursor=cursor, descending=descending
+        )
+    )
+    rows = result.unique().scalars().all()
+    return build_keyset_page(rows, limit=limit, cursor=cursor)
+
+
+def set_cursor_headers(response: Response, page: KeysetPage) -> None:
+    """
+    Gắn cursor trang sau/trước vào header của response
+
+    Args:
+        response (Response): Response của endpoint
+        page (KeysetPage): Trang kết quả
+    """
+    if page.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+    if page.prev_cursor:
+        response.headers[PREV_CURSOR_HEADER] = page.prev_cursor
@@ -0,0 +1,186 @@
+"""
+Telemetry cho connection pool của SQLAlchemy: số kết nối đang dùng, overflow,
+thời gian chờ lấy kết nối và kết nối bị giữ lâu nhất theo route
+"""
+
+import bisect
+import time
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import Pool
+
+from app.middleware.request_context_middleware import get_current_route_label
+
+# Cận trên (ms) của các bucket histogram thời gian chờ lấy kết nối
+WAIT_BUCKETS_MS: Tuple[float, ...] = (
+    1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000
+)
+
+
+class PoolTelemetry:
+    """
+    Số liệu của một connection pool
+
+    Attributes:
+        name (str): Tên pool, dùng làm label của metrics
+        checkouts (int): Tổng số lần lấy kết nối
+        timeouts (int): Số lần lấy kết nối bị quá ``pool_timeout``
+        wait_count (int): Số lần đo thời gian chờ
+        wait_sum (float): Tổng thời gian chờ (giây)
+        wait_buckets (List[int]): Số lần chờ rơi vào từng bucket của WAIT_BUCKETS_MS
+            (phần tử cuối là +Inf), không cộng dồn
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_count = 0
+        self.wait_sum = 0.0
+        self.wait_buckets: List[int] = [0] * (len(WAIT_BUCKETS_MS) + 1)
+        # id(connection record) -> (thời điểm checkout, route)
+        self._held: Dict[int, Tuple[float, str]] = {}
+
+    def observe_wait(self, seconds: float) -> None:
+        self.wait_count += 1
+        self.wait_sum += seconds
+        self.wait_buckets[bisect.bisect_left(WAIT_BUCKETS_MS, seconds * 1000)] += 1
+
+    def on_checkout(self, connection_record) -> None:
+        self.checkouts += 1
+        self._held[id(connection_record)] = (time.monotonic(), get_current_route_label())
+
+    def on_checkin(self, connection_record) -> None:
+        self._held.pop(id(connection_record), None)
+
+    def longest_held(self) -> Optional[Dict[str, Any]]:
+        """
+        Kết nối đang bị giữ lâu nhất
+
+        Returns:
+            Optional[Dict[str, Any]]: route và thời gian giữ (ms), None nếu không có
+        """
+        if not self._held:
+            return None
+        started_at, route = min(self._held.values())
+        return {
+            "route": route,
+            "held_ms": round((time.monotonic() - started_at) * 1000, 2),
+        }
+
+    def snapshot(self, pool: Pool) -> Dict[str, Any]:
+        """
+        Trạng thái hiện tại của pool
+
+        Args:
+            pool (Pool): Pool đang được đo (``engine.pool``)
+
+        Returns:
+            Dict[str, Any]: Số liệu pool dạng JSON
+        """
+        cumulative = 0
+        buckets = {}
+        for bound, count in zip((*WAIT_BUCKETS_MS, float("inf")), self.wait_buckets):
+            cumulative += count
+            buckets["+Inf" if bound == float("inf") else str(bound)] = cumulative
+
+        return {
+            "pool_size": _call(pool, "size"),
+            "checked_out": _call(pool, "checkedout"),
+            "checked_in": _call(pool, "checkedin"),
+            "overflow": max(_call(pool, "overflow"), 0),
+            "checkouts_total": self.checkouts,
+            "timeouts_total": self.timeouts,
+            "wait_ms": {
+                "count": self.wait_count,
+                "sum": round(self.wait_sum * 1000, 3),
+                "buckets": buckets,
+            },
+            "longest_held": self.longest_held(),
+        }
+
+    def render_prometheus(
+        self, pool: Pool, labels: Optional[Dict[str, str]] = None
+    ) -> str:
+        """
+        Xuất số liệu theo định dạng text của Prometheus
+
+        Args:
+            pool (Pool): Pool đang được đo (``engine.pool``)
+            labels (Optional[Dict[str, str]]): Label bổ sung, ví dụ pid của worker
+
+        Returns:
+            str: Các dòng metrics (không có dòng HELP/TYPE)
+        """
+        snapshot = self.snapshot(pool)
+        all_labels = {"pool": self.name, **(labels or {})}
+        label = ",".join(f'{key}="{value}"' for key, value in all_labels.items())
+        lines = [
+            f"db_pool_size{{{label}}} {snapshot['pool_size']}",
+            f"db_pool_checked_out{{{label}}} {snapshot['checked_out']}",
+            f"db_pool_checked_in{{{label}}} {snapshot['checked_in']}",
+            f"db_pool_overflow{{{label}}} {snapshot['overflow']}",
+            f"db_pool_checkouts_total{{{label}}} {snapshot['checkouts_total']}",
+            f"db_pool_timeouts_total{{{label}}} {snapshot['timeouts_total']}",
+        ]
+        for bound, count in snapshot["wait_ms"]["buckets"].items():
+            le = bound if bound == "+Inf" else str(float(bound) / 1000)
+            lines.append(f'db_pool_wait_seconds_bucket{{{label},le="{le}"}} {count}')
+        lines.append(f"db_pool_wait_seconds_sum{{{label}}} {self.wait_sum}")
+        lines.append(f"db_pool_wait_seconds_count{{{label}}} {self.wait_count}")
+
+        longest = snapshot["longest_held"]
+        if longest is not None:
+            route = longest["route"].replace("\\", "\\\\").replace('"', '\\"')
+            lines.append(
+                f'db_pool_longest_held_seconds{{{label},route="{route}"}} '
+                f"{longest['held_ms'] / 1000}"
+            )
+        return "\n".join(lines)
+
+
+def _call(pool: Pool, method: str) -> int:
+    # Pool không phải QueuePool (NullPool, StaticPool...) không có các hàm đếm
+    func = getattr(pool, method, None)
+    return func() if callable(func) else 0
+
+
+def instrumented_pool_class(base: Type[Pool], telemetry: PoolTelemetry) -> Type[Pool]:
+    """
+    Tạo lớp pool con ghi nhận số liệu vào telemetry
+
+    Thời gian chờ được đo quanh ``_do_get`` (chờ trong hàng đợi của pool và mở kết
+    nối mới nếu cần); kết nối được tính là đang giữ từ ``_do_get`` tới
+    ``_do_return_conn``. Không dùng pool events vì listener ở mức lớp không áp dụng
+    được cho pool của async engine.
+
+    Args:
+        base (Type[Pool]): Lớp pool gốc, ví dụ AsyncAdaptedQueuePool
+        telemetry (PoolTelemetry): Nơi lưu số liệu
+
+    Returns:
+        Type[Pool]: Lớp pool dùng cho tham số ``poolclass`` của engine
+    """
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection_record = base._do_get(self)
+        except PoolTimeoutError:
+            telemetry.timeouts += 1
+            raise
+        finally:
+            telemetry.observe_wait(time.perf_counter() - start)
+        telemetry.on_checkout(connection_record)
+        return connection_record
+
+    def _do_return_conn(self, connection_record):
+        telemetry.on_checkin(connection_record)
+        base._do_return_conn(self, connection_record)
+
+    return type(
+        f"Instrumented{base.__name__}",
+        (base,),
+        {"_do_get": _do_get, "_do_return_conn": _do_return_conn},
+    )
@@ -0,0 +1,192 @@
+"""
+Định tuyến truy vấn chỉ đọc sang read replica: kiểm tra độ trễ replica,
+đánh dấu method chỉ đọc và đảm bảo read-your-writes sau khi ghi
+"""
+
+import asyncio
+import copy
+import functools
+import logging
+import time
+from typing import Callable, Mapping, Optional, TypeVar
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import Session
+
+from app.middleware.request_context_middleware import get_current_scope
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable)
+
+# Cookie ghi thời điểm (epoch giây) mà client còn phải đọc từ primary
+READ_YOUR_WRITES_COOKIE = "db_primary_until"
+
+# Khóa trong scope["state"] đánh dấu request đã commit thay đổi lên primary
+_REQUEST_WROTE_KEY = "db_wrote"
+
+# Độ trễ replay của replica (giây). Replica đã replay hết WAL nhận được thì coi như
+# không trễ, tránh báo trễ giả khi primary không có giao dịch mới.
+REPLICA_LAG_QUERY = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+    """
+)
+
+
+class ReplicaLagMonitor:
+    """
+    Theo dõi độ trễ của read replica, kết quả được cache trong ``check_interval_seconds``
+
+    Attributes:
+        engine (AsyncEngine): Engine kết nối tới replica
+        max_lag_seconds (float): Độ trễ tối đa còn được dùng replica
+        check_interval_seconds (float): Khoảng thời gian giữa hai lần kiểm tra
+        lag_seconds (Optional[float]): Độ trễ đo được lần gần nhất, None nếu lỗi
+    """
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        max_lag_seconds: float,
+        check_interval_seconds: float,
+    ):
+        self.engine = engine
+        self.max_lag_seconds = max_lag_seconds
+        self.check_interval_seconds = check_interval_seconds
+        self.lag_seconds: Optional[float] = None
+        self._usable = False
+        self._checked_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+
+    def _is_fresh(self) -> bool:
+        return (
+            self._checked_at is not None
+            and time.monotonic() - self._checked_at < self.check_interval_seconds
+        )
+
+    async def is_usable(self) -> bool:
+        """
+        Replica có đang kết nối được và trễ không quá ``max_lag_seconds`` hay không
+
+        Returns:
+            bool: True nếu có thể đọc từ replica
+        """
+        if self._is_fresh():
+            return self._usable
+
+        async with self._lock:
+            if self._is_fresh():
+                return self._usable
+            try:
+                async with self.engine.connect() as conn:
+                    lag = (await conn.execute(REPLICA_LAG_QUERY)).scalar()
+                self.lag_seconds = float(lag or 0)
+                self._usable = self.lag_seconds <= self.max_lag_seconds
+                if not self._usable:
+                    logger.warning(
+                        "Read replica trễ %.1fs, chuyển truy vấn đọc về primary",
+                        self.lag_seconds,
+                    )
+            except Exception as e:
+                logger.warning("Không kiểm tra được read replica: %s", e)
+                self.lag_seconds = None
+                self._usable = False
+            self._checked_at = time.monotonic()
+
+        return self._usable
+
+
+def read_only(method: F) -> F:
+    """
+    Đánh dấu method của service chỉ đọc dữ liệu
+
+    Method được chạy trên một bản sao nông của service với ``db`` là session đọc
+    (``self.read_db``). Nếu service không có session đọc riêng thì chạy như cũ.
+    Method chỉ đọc phải trả về schema/dữ liệu đã tách khỏi session, không trả về
+    ORM object để ghi tiếp bằng session chính.
+    """
+
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        read_db = getattr(self, "read_db", None)
+        if read_db is None or read_db is self.db:
+            return await method(self, *args, **kwargs)
+
+        replica_bound = copy.copy(self)
+        replica_bound.db = read_db
+        return await method(replica_bound, *args, **kwargs)
+
+    wrapper.__read_only__ = True
+    return wrapper
+
+
+def is_pinned_to_primary(cookies: Mapping[str, str]) -> bool:
+    """
+    Client vừa ghi dữ liệu và vẫn còn trong cửa sổ read-your-writes
+
+    Args:
+        cookies (Mapping[str, str]): Cookie của request
+
+    Returns:
+        bool: True nếu phải đọc từ primary
+    """
+    value = cookies.get(READ_YOUR_WRITES_COOKIE)
+    if not value:
+        return False
+    try:
+        return float(value) > time.time()
+    except ValueError:
+        return False
+
+
+def request_wrote(scope) -> bool:
+    """
+    Request đã commit thay đổi lên primary hay chưa
+
+    Args:
+        scope: ASGI scope của request
+    """
+    return bool(scope.get("state", {}).get(_REQUEST_WROTE_KEY))
+
+
+def _mark_request_wrote() -> None:
+    scope = get_current_scope()
+    if scope is not None:
+        scope.setdefault("state", {})[_REQUEST_WROTE_KEY] = True
+
+
+def track_primary_writes(session_class: type[Session]) -> None:
+    """
+    Gắn event vào session class của primary để ghi nhận request nào đã commit thay đổi
+
+    Args:
+        session_class (type[Session]): sync_session_class của session primary
+    """
+
+    @event.listens_for(session_class, "after_flush")
+    def _after_flush(session, flush_context):
+        session.info["wrote"] = True
+
+    @event.listens_for(session_class, "do_orm_execute")
+    def _do_orm_execute(orm_execute_state):
+        if (
+            orm_execute_state.is_insert
+            or orm_execute_state.is_update
+            or orm_execute_state.is_delete
+        ):
+            orm_execute_state.session.info["wrote"] = True
+
+    @event.listens_for(session_class, "after_commit")
+    def _after_commit(session):
+        if session.info.pop("wrote", False):
+            _mark_request_wrote()
+
+    @event.listens_for(session_class, "after_rollback")
+    def _after_rollback(session):
+        session.info.pop("wrote", None)
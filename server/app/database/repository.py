@@ -1,6 +1,19 @@
-from typing import Any, Generic, List, Optional, Type, TypeVar
+from contextlib import asynccontextmanager
+from typing import (
+    Any,
+    AsyncIterator,
+    Generic,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Type,
+    TypeVar,
+    Union,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import insert, select
 from fastapi import HTTPException, Depends
 
 from app.core.config import settings
@@ -8,6 +21,9 @@ from app.database.database import Base, get_async_db
 
 ModelType = TypeVar("ModelType", bound=Base)
 
+# Khóa trong session.info đếm số unit_of_work đang mở trên session
+_UNIT_OF_WORK_DEPTH = "unit_of_work_depth"
+
 
 class BaseRepository(Generic[ModelType]):
     def __init__(self, model: Type[ModelType], db: AsyncSession = Depends(get_async_db)):
@@ -31,12 +47,12 @@ class BaseRepository(Generic[ModelType]):
         if not obj:
             raise HTTPException(status_code=404, detail="Object not found")
         await self.db.delete(obj)
-        await self.db.commit()
+        await self._commit()
         return obj
 
     async def save(self, obj: ModelType) -> ModelType:
         self.db.add(obj)
-        await self.db.commit()
+        await self._commit()
         await self.db.refresh(obj)
         return obj
 
@@ -59,27 +75,207 @@ class BaseRepository(Generic[ModelType]):
             raise HTTPException(status_code=404, detail="Object not found")
         try:
             await self.db.delete(obj)
-            await self.db.commit()
+            await self._commit()
             return obj
         except Exception as e:
-            if self.setting.DEV_MODE:
-                raise HTTPException(status_code=500, detail=str(e))
-            else:
-                await self.db.rollback()
-                raise HTTPException(status_code=500, detail="Có lỗi xảy ra")
+            await self._handle_error(e)
 
     async def save_async(self, obj: ModelType) -> ModelType:
         try:
             self.db.add(obj)
-            await self.db.commit()
+            await self._commit()
             await self.db.refresh(obj)
             return obj
         except Exception as e:
-            if self.setting.DEV_MODE:
-                raise HTTPException(status_code=500, detail=str(e))
+            await self._handle_error(e)
+
+
+    @property
+    def in_unit_of_work(self) -> bool:
+        """Session đang nằm trong một unit_of_work hay không"""
+        return self.db.info.get(_UNIT_OF_WORK_DEPTH, 0) > 0
+
+    @property
+    def excluded(self):
+        """
+        Bảng ``excluded`` của INSERT ... ON CONFLICT, dùng để viết biểu thức cập nhật
+        cho ``bulk_upsert``, ví dụ ``{"score": repo.excluded.score + 1}``
+        """
+        return pg_insert(self.model).excluded
+
+    async def _commit(self) -> None:
+        # Trong unit_of_work chỉ flush, việc commit do unit_of_work ngoài cùng đảm nhận
+        if self.in_unit_of_work:
+            await self.db.flush()
+        else:
+            await self.db.commit()
+
+    async def _handle_error(self, e: Exception) -> None:
+        # Lỗi trong unit_of_work được để unit_of_work ngoài cùng rollback và báo lỗi
+        if self.in_unit_of_work:
+            raise e
+        await self.db.rollback()
+        if isinstance(e, HTTPException):
+            raise e
+        if self.setting.DEV_MODE:
+            raise HTTPException(status_code=500, detail=str(e))
+        raise HTTPException(status_code=500, detail="Có lỗi xảy ra")
+
+    @asynccontextmanager
+    async def unit_of_work(self) -> AsyncIterator["BaseRepository[ModelType]"]:
+        """
+        Gom nhiều thao tác ghi vào một transaction duy nhất
+
+        Bên trong khối, ``save``/``create``/``remove``/``bulk_insert``/``bulk_upsert``
+        của mọi repository dùng chung session chỉ flush; transaction được commit
+        một lần khi thoát khối, hoặc rollback nếu có lỗi. Có thể lồng nhau, chỉ khối
+        ngoài cùng commit.
+
+        Returns:
+            AsyncIterator[BaseRepository[ModelType]]: Chính repository này
+
+        Raises:
+            HTTPException: 500 nếu transaction lỗi (chi tiết lỗi khi DEV_MODE)
+        """
+        depth = self.db.info.get(_UNIT_OF_WORK_DEPTH, 0)
+        self.db.info[_UNIT_OF_WORK_DEPTH] = depth + 1
+        try:
+            yield self
+            if depth == 0:
+                await self.db.commit()
+        except Exception as e:
+            self.db.info[_UNIT_OF_WORK_DEPTH] = depth
+            await self._handle_error(e)
+        finally:
+            self.db.info[_UNIT_OF_WORK_DEPTH] = depth
+
+    async def _execute_many(
+        self,
+        stmt,
+        rows: Sequence[Mapping[str, Any]],
+        returning: Union[Sequence[Any], Type[ModelType], None],
+    ) -> List[Any]:
+        try:
+            if returning is None:
+                await self.db.execute(stmt, list(rows))
+                result: List[Any] = []
+            elif returning is self.model:
+                scalars = await self.db.scalars(
+                    stmt.returning(self.model, sort_by_parameter_order=True),
+                    list(rows),
+                    execution_options={"populate_existing": True},
+                )
+                result = list(scalars.all())
             else:
-                await self.db.rollback()
-                raise HTTPException(status_code=500, detail="Có lỗi xảy ra")
+                rows_result = await self.db.execute(
+                    stmt.returning(*returning, sort_by_parameter_order=True),
+                    list(rows),
+                )
+                result = list(rows_result.all())
+            await self._commit()
+            return result
+        except Exception as e:
+            await self._handle_error(e)
+
+    async def bulk_insert(
+        self,
+        rows: Sequence[Mapping[str, Any]],
+        *,
+        returning: Union[Sequence[Any], Type[ModelType], None] = None,
+    ) -> List[Any]:
+        """
+        Chèn nhiều bản ghi bằng một câu INSERT nhiều VALUES
+
+        Args:
+            rows (Sequence[Mapping[str, Any]]): Dữ liệu từng bản ghi, khóa là tên thuộc tính
+            returning: Cột cần RETURNING, hoặc chính model để nhận lại các object
+
+        Returns:
+            List[Any]: Kết quả RETURNING theo thứ tự ``rows``, rỗng nếu không dùng RETURNING
+        """
+        if not rows:
+            return []
+        return await self._execute_many(insert(self.model), rows, returning)
+
+    def build_upsert_statement(
+        self,
+        *,
+        conflict_columns: Optional[Sequence[str]] = None,
+        constraint: Optional[str] = None,
+        update_columns: Union[Sequence[str], Mapping[str, Any], None] = None,
+        columns: Sequence[str] = (),
+    ):
+        """
+        Tạo câu INSERT ... ON CONFLICT cho ``bulk_upsert``
+
+        Args:
+            conflict_columns (Optional[Sequence[str]]): Các cột của unique index xác định xung đột
+            constraint (Optional[str]): Tên unique constraint, dùng thay cho ``conflict_columns``
+            update_columns: Danh sách cột lấy giá trị mới từ ``excluded``, hoặc mapping
+                cột -> biểu thức. None thì cập nhật mọi cột trong ``columns`` trừ
+                ``conflict_columns``; rỗng thì DO NOTHING
+            columns (Sequence[str]): Các cột có trong dữ liệu chèn
+
+        Returns:
+            Insert: Câu lệnh upsert của PostgreSQL
+        """
+        if not conflict_columns and not constraint:
+            raise ValueError("Cần conflict_columns hoặc constraint cho bulk_upsert")
+
+        stmt = pg_insert(self.model)
+        target = (
+            {"constraint": constraint}
+            if constraint
+            else {"index_elements": list(conflict_columns)}
+        )
+
+        if update_columns is None:
+            update_columns = [c for c in columns if c not in (conflict_columns or ())]
+        if isinstance(update_columns, Mapping):
+            set_ = dict(update_columns)
+        else:
+            set_ = {column: stmt.excluded[column] for column in update_columns}
+
+        if not set_:
+            return stmt.on_conflict_do_nothing(**target)
+        return stmt.on_conflict_do_update(**target, set_=set_)
+
+    async def bulk_upsert(
+        self,
+        rows: Sequence[Mapping[str, Any]],
+        *,
+        conflict_columns: Optional[Sequence[str]] = None,
+        constraint: Optional[str] = None,
+        update_columns: Union[Sequence[str], Mapping[str, Any], None] = None,
+        returning: Union[Sequence[Any], Type[ModelType], None] = None,
+    ) -> List[Any]:
+        """
+        Chèn hoặc cập nhật nhiều bản ghi bằng một câu INSERT ... ON CONFLICT
+
+        Thao tác nguyên tử ở phía database nên không còn cảnh hai request cùng
+        SELECT không thấy bản ghi rồi cùng INSERT. Lưu ý ``onupdate`` của model
+        không tự áp dụng, cần đưa vào ``update_columns`` nếu muốn cập nhật.
+
+        Args:
+            rows (Sequence[Mapping[str, Any]]): Dữ liệu từng bản ghi, khóa là tên thuộc tính
+            conflict_columns (Optional[Sequence[str]]): Các cột của unique index xác định xung đột
+            constraint (Optional[str]): Tên unique constraint, dùng thay cho ``conflict_columns``
+            update_columns: Xem ``build_upsert_statement``
+            returning: Cột cần RETURNING, hoặc chính model để nhận lại các object
+
+        Returns:
+            List[Any]: Kết quả RETURNING, rỗng nếu không dùng RETURNING. Với DO NOTHING,
+                bản ghi bị bỏ qua không có trong kết quả
+        """
+        if not rows:
+            return []
+        stmt = self.build_upsert_statement(
+            conflict_columns=conflict_columns,
+            constraint=constraint,
+            update_columns=update_columns,
+            columns=list(dict.fromkeys(key for row in rows for key in row)),
+        )
+        return await self._execute_many(stmt, rows, returning)
 
 
 class Repository(BaseRepository[ModelType], Generic[ModelType]):
@@ -102,15 +298,11 @@ class Repository(BaseRepository[ModelType], Generic[ModelType]):
     async def create(self, data: ModelType) -> ModelType:
         try:
             self.db.add(data)
-            await self.db.commit()
+            await self._commit()
             await self.db.refresh(data)
             return data
         except Exception as e:
-            if self.setting.DEV_MODE:
-                raise HTTPException(status_code=500, detail=str(e))
-            else:
-                await self.db.rollback()
-                raise HTTPException(status_code=500, detail="Có lỗi xảy ra")
+            await self._handle_error(e)
 
     async def create_async(self, data: ModelType) -> ModelType:
         """
@@ -124,12 +316,8 @@ class Repository(BaseRepository[ModelType], Generic[ModelType]):
         """
         try:
             self.db.add(data)
-            await self.db.commit()
+            await self._commit()
             await self.db.refresh(data)
             return data
         except Exception as e:
-            if self.setting.DEV_MODE:
-                raise HTTPException(status_code=500, detail=str(e))
-            else:
-                await self.db.rollback()
-                raise HTTPException(status_code=500, detail="Có lỗi xảy ra")
+            await self._handle_error(e)
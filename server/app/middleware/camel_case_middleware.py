@@ -1,49 +1,106 @@
-import json
-from fastapi import Request
+from typing import Optional, Tuple
+
+from fastapi.routing import APIRoute
 from starlette.datastructures import MutableHeaders
 from starlette.types import Message, Scope, Receive, Send
 
-from app.utils.case_utils import convert_dict_to_camel_case, convert_dict_to_snake_case
+from app.core.config import settings
+from app.schemas.base_schema import CamelCaseModel, is_camel_case_native
+from app.utils.case_utils import (
+    convert_dict_to_camel_case,
+    convert_dict_to_snake_case,
+    transform_json_bytes,
+)
+
+# Thuộc tính cache (response_native, request_native) gắn trên từng route,
+# chỉ tính một lần cho mỗi worker
+_ROUTE_FLAGS_ATTR = "_camel_case_flags"
+
+
+def _is_response_native(route: APIRoute) -> bool:
+    """Response của route đã được FastAPI serialize ra camelCase qua alias"""
+    if route.response_model is None or not route.response_model_by_alias:
+        return False
+    return is_camel_case_native(route.response_model)
+
+
+def _is_request_native(route: APIRoute) -> bool:
+    """Body của route là một CamelCaseModel duy nhất, FastAPI tự parse camelCase"""
+    body_params = route.dependant.body_params
+    if len(body_params) != 1:
+        return False
 
+    field_info = body_params[0].field_info
+    if getattr(field_info, "embed", False):
+        return False
 
-async def _process_request(request: Request) -> Request:
-    if request.headers.get("content-type") == "application/json":
-        body_bytes = await request.body()
-        if body_bytes:
-            try:
-                body_dict = json.loads(body_bytes)
-                snake_case_body = convert_dict_to_snake_case(body_dict)
+    annotation = field_info.annotation
+    return (
+        isinstance(annotation, type)
+        and issubclass(annotation, CamelCaseModel)
+        and is_camel_case_native(annotation)
+    )
 
-                # Store the original receive function
-                original_receive = request._receive
-                body_sent = False
 
-                async def receive():
-                    nonlocal body_sent
+def get_route_case_flags(scope: Scope) -> Tuple[bool, bool]:
+    """
+    Lấy cờ camelCase của route đã match với request
 
-                    # If body hasn't been sent yet, send the processed body
-                    if not body_sent:
-                        body_sent = True
-                        return {
-                            "type": "http.request",
-                            "body": json.dumps(snake_case_body).encode(),
-                            "more_body": False,
-                        }
+    Args:
+        scope: ASGI scope (sau khi router đã match, FastAPI gán scope["route"])
 
-                    # For subsequent calls, delegate to original receive
-                    # This allows disconnect and other events to be handled properly
-                    return await original_receive()
+    Returns:
+        Tuple[bool, bool]: (response đã camelCase, request body được parse camelCase)
+    """
+    route = scope.get("route")
+    if not isinstance(route, APIRoute):
+        return False, False
 
-                request._receive = receive
+    flags = getattr(route, _ROUTE_FLAGS_ATTR, None)
+    if flags is None:
+        try:
+            flags = (_is_response_native(route), _is_request_native(route))
+        except Exception:
+            flags = (False, False)
+        setattr(route, _ROUTE_FLAGS_ATTR, flags)
+    return flags
 
-            except json.JSONDecodeError:
-                pass
-    return request
+
+def _get_header(headers, name: bytes) -> str:
+    for key, value in headers:
+        if key == name:
+            return value.decode("latin-1")
+    return ""
+
+
+_STREAMING_CONTENT_TYPES = (
+    "text/event-stream",
+    "text/plain",
+    "application/octet-stream",
+    "text/stream",
+)
 
 
 class CamelCaseMiddleware:
-    def __init__(self, app):
+    """
+    Chuyển đổi key JSON giữa camelCase (client) và snake_case (server)
+
+    Route có schema kế thừa CamelCaseModel đã tự serialize/parse camelCase,
+    nên body của chúng được chuyển thẳng mà không cần decode/encode lại.
+    Các route còn lại (trả về dict, nhận Body dict...) vẫn được chuyển đổi như cũ.
+
+    Body JSON có thể đến thành nhiều message (``more_body``); middleware gom lại
+    tối đa ``max_buffer_bytes`` rồi mới chuyển đổi. Body vượt quá giới hạn được
+    stream nguyên vẹn, không chuyển đổi.
+    """
+
+    def __init__(self, app, max_buffer_bytes: Optional[int] = None):
         self.app = app
+        self.max_buffer_bytes = (
+            max_buffer_bytes
+            if max_buffer_bytes is not None
+            else settings.CAMEL_CASE_MAX_BUFFER_BYTES
+        )
 
     async def __call__(self, scope: Scope, receive: Receive, send: Send):
         if scope["type"] == "lifespan":
@@ -54,84 +111,125 @@ class CamelCaseMiddleware:
             await self._handle_websocket(scope, receive, send)
             return
 
-        request = Request(scope, receive)
-        request = await _process_request(request)
-
-        initial_message = {}
+        max_buffer_bytes = self.max_buffer_bytes
+        request_content_type = _get_header(scope.get("headers", []), b"content-type")
+        body_consumed = False
+
+        async def receive_wrapper() -> Message:
+            nonlocal body_consumed
+
+            # Router đã match khi endpoint đọc body nên scope["route"] có sẵn ở đây
+            if body_consumed or request_content_type != "application/json":
+                return await receive()
+
+            body_consumed = True
+            _, request_native = get_route_case_flags(scope)
+            if request_native:
+                return await receive()
+
+            chunks = []
+            size = 0
+            more_body = True
+            while more_body:
+                message = await receive()
+                if message["type"] != "http.request":
+                    return message
+                chunk = message.get("body", b"")
+                chunks.append(chunk)
+                size += len(chunk)
+                more_body = message.get("more_body", False)
+
+            body = b"".join(chunks)
+            if body and size <= max_buffer_bytes:
+                body = transform_json_bytes(body, convert_dict_to_snake_case) or body
+
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        start_message: Optional[Message] = None
+        chunks: list[bytes] = []
+        buffered = 0
+        passthrough = False
 
         async def send_wrapper(message: Message):
-            nonlocal initial_message
+            nonlocal start_message, buffered, passthrough
+
+            if passthrough:
+                await send(message)
+                return
 
             if message["type"] == "http.response.start":
-                initial_message = message
+                response_native, _ = get_route_case_flags(scope)
+                content_type = _get_header(message.get("headers", []), b"content-type")
+                if (
+                    (response_native and message["status"] < 400)
+                    or "application/json" not in content_type
+                    or any(t in content_type for t in _STREAMING_CONTENT_TYPES)
+                ):
+                    passthrough = True
+                    await send(message)
+                    return
+                start_message = message
                 return
 
-            if message["type"] == "http.response.body":
-                # Đảm bảo header đã gửi
-                if initial_message:
-                    content_type = ""
-                    for key, value in initial_message["headers"]:
-                        if key == b"content-type":
-                            content_type = value.decode()
-                            break
-
-                    is_streaming = any(
-                        stream_type in content_type
-                        for stream_type in [
-                            "text/event-stream",
-                            "text/plain",
-                            "application/octet-stream",
-                            "text/stream",
-                        ]
-                    )
-
-                    if is_streaming:
-                        await send(initial_message)
-                        initial_message = None
-                        await send(message)
-                        return
-
-                    # Nếu là JSON response thì chuyển snake_case -> camelCase
-                    if "application/json" in content_type and message.get("body"):
-                        try:
-                            body_dict = json.loads(message["body"])
-                            camel_case_body = convert_dict_to_camel_case(body_dict)
-                            new_body = json.dumps(camel_case_body).encode()
-                            message["body"] = new_body
-
-                            headers = MutableHeaders(raw=initial_message["headers"])
-                            del headers["content-length"]
-
-                        except (json.JSONDecodeError, UnicodeDecodeError):
-                            pass  # Không phải JSON hợp lệ thì bỏ qua
-
-                    await send(initial_message)
-                    initial_message = None
+            if message["type"] != "http.response.body" or start_message is None:
+                await send(message)
+                return
 
-            await send(message)
+            chunk = message.get("body", b"")
+            chunks.append(chunk)
+            buffered += len(chunk)
+            more_body = message.get("more_body", False)
+
+            if buffered > max_buffer_bytes:
+                # Quá giới hạn: gửi nguyên vẹn phần đã gom và stream phần còn lại
+                passthrough = True
+                await send(start_message)
+                await send(
+                    {
+                        "type": "http.response.body",
+                        "body": b"".join(chunks),
+                        "more_body": more_body,
+                    }
+                )
+                chunks.clear()
+                return
 
-        await self.app(scope, request._receive, send_wrapper)
+            if more_body:
+                return
+
+            # Đã nhận đủ body JSON, chuyển snake_case -> camelCase
+            body = b"".join(chunks)
+            chunks.clear()
+            if body:
+                new_body = transform_json_bytes(body, convert_dict_to_camel_case)
+                if new_body is not None:
+                    body = new_body
+                    headers = MutableHeaders(raw=start_message["headers"])
+                    headers["content-length"] = str(len(body))
+
+            await send(start_message)
+            await send({"type": "http.response.body", "body": body, "more_body": False})
+
+        await self.app(scope, receive_wrapper, send_wrapper)
 
     async def _handle_websocket(self, scope: Scope, receive: Receive, send: Send):
         async def receive_wrapper():
             message = await receive()
-            if message["type"] == "websocket.receive" and "text" in message:
-                try:
-                    data = json.loads(message["text"])
-                    snake_case_data = convert_dict_to_snake_case(data)
-                    message["text"] = json.dumps(snake_case_data)
-                except (json.JSONDecodeError, TypeError):
-                    pass
+            if message["type"] == "websocket.receive" and message.get("text"):
+                new_text = transform_json_bytes(
+                    message["text"].encode(), convert_dict_to_snake_case
+                )
+                if new_text is not None:
+                    message["text"] = new_text.decode()
             return message
 
         async def send_wrapper(message: Message):
-            if message["type"] == "websocket.send" and "text" in message:
-                try:
-                    data = json.loads(message["text"])
-                    camel_case_data = convert_dict_to_camel_case(data)
-                    message["text"] = json.dumps(camel_case_data)
-                except (json.JSONDecodeError, TypeError):
-                    pass
+            if message["type"] == "websocket.send" and message.get("text"):
+                new_text = transform_json_bytes(
+                    message["text"].encode(), convert_dict_to_camel_case
+                )
+                if new_text is not None:
+                    message["text"] = new_text.decode()
             await send(message)
 
         await self.app(scope, receive_wrapper, send_wrapper)
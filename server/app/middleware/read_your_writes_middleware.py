@@ -0,0 +1,56 @@
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.database.read_replica import READ_YOUR_WRITES_COOKIE, request_wrote
+
+
+def _build_cookie_header(window_seconds: int) -> str:
+    """Tạo header Set-Cookie cho cookie read-your-writes, cùng thuộc tính với cookie xác thực"""
+    response = Response()
+    cookie_params = {
+        "key": READ_YOUR_WRITES_COOKIE,
+        "value": f"{time.time() + window_seconds:.3f}",
+        "httponly": True,
+        "max_age": window_seconds,
+        "samesite": settings.COOKIE_SAMESITE,
+        "secure": settings.COOKIE_SECURE,
+    }
+    if settings.COOKIE_DOMAIN:
+        cookie_params["domain"] = settings.COOKIE_DOMAIN
+    response.set_cookie(**cookie_params)
+    return response.headers["set-cookie"]
+
+
+class ReadYourWritesMiddleware:
+    """
+    Gắn cookie ``db_primary_until`` vào response của request đã commit thay đổi,
+    để các request tiếp theo của client (ở bất kỳ worker nào) đọc từ primary
+    trong READ_YOUR_WRITES_WINDOW_SECONDS giây
+
+    Cần đặt bên trong RequestContextMiddleware để session biết request hiện tại.
+    """
+
+    def __init__(self, app: ASGIApp, window_seconds: int | None = None):
+        self.app = app
+        self.window_seconds = (
+            window_seconds
+            if window_seconds is not None
+            else settings.READ_YOUR_WRITES_WINDOW_SECONDS
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or self.window_seconds <= 0:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message: Message):
+            if message["type"] == "http.response.start" and request_wrote(scope):
+                headers = MutableHeaders(scope=message)
+                headers.append("set-cookie", _build_cookie_header(self.window_seconds))
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,60 @@
+from contextvars import ContextVar
+from typing import Optional
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+# Scope của request đang được xử lý trong task hiện tại
+_current_scope: ContextVar[Optional[Scope]] = ContextVar(
+    "current_request_scope", default=None
+)
+
+
+def get_current_scope() -> Optional[Scope]:
+    """
+    Lấy ASGI scope của request đang được xử lý
+
+    Returns:
+        Optional[Scope]: Scope, hoặc None nếu không nằm trong request nào
+    """
+    return _current_scope.get()
+
+
+def get_current_route_label() -> str:
+    """
+    Lấy nhãn route của request hiện tại, ví dụ ``GET /courses/{course_id}``
+
+    Dùng path template của route đã match (nếu có) để gom số liệu theo route
+    thay vì theo từng URL cụ thể.
+
+    Returns:
+        str: Nhãn route, hoặc "background" nếu không nằm trong request nào
+    """
+    scope = _current_scope.get()
+    if scope is None:
+        return "background"
+
+    route = scope.get("route")
+    path = getattr(route, "path", None) or scope.get("path", "")
+    method = scope.get("method", "WS" if scope["type"] == "websocket" else "")
+    return f"{method} {path}".strip()
+
+
+class RequestContextMiddleware:
+    """
+    Lưu ASGI scope của request vào ContextVar để các tầng bên dưới
+    (ví dụ telemetry của connection pool) biết đang phục vụ route nào
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+
+        token = _current_scope.set(scope)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _current_scope.reset(token)
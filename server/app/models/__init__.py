@@ -13,6 +13,9 @@ from app.models.badge_model import Badge
 from app.models.course_model import Course
 from app.models.user_badge_model import UserBadge
 from app.models.lesson_generation_state_model import LessonGenerationState
+from app.models.lesson_render_cache_model import LessonRenderCacheEntry
+from app.models.llm_cache_model import LLMCacheEntry
+from app.models.embedding_cache_model import EmbeddingCacheEntry
 from app.models.document_processing_job_model import DocumentProcessingJob
 from app.models.discussion_model import Discussion
 from app.models.reply_model import Reply
@@ -1,8 +1,9 @@
 from __future__ import annotations
-from typing import List, TYPE_CHECKING
+from typing import List, Optional, TYPE_CHECKING
 from enum import Enum
 
-from sqlalchemy import Boolean, Integer, String, Float, Text
+from sqlalchemy import Boolean, Integer, String, Float, Text, Index
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database.database import Base
@@ -46,6 +47,11 @@ class Course(Base):
     """
 
     __tablename__ = "courses"
+    __table_args__ = (
+        # Index cho phân trang keyset theo (created_at, id)
+        Index("ix_courses_created_at_id", "created_at", "id"),
+        Index("ix_courses_search_vector", "search_vector", postgresql_using="gin"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     title: Mapped[str] = mapped_column(String(255), nullable=False)
@@ -74,16 +80,29 @@ class Course(Base):
         Text, nullable=True
     )  # Lưu dưới dạng JSON string
 
+    # Vector tìm kiếm toàn văn (title, tags, description), do trigger trong database
+    # cập nhật; deferred để các truy vấn Course không nạp cột này
+    search_vector: Mapped[Optional[str]] = mapped_column(
+        TSVECTOR, nullable=True, deferred=True
+    )
+
     # Relationships
     topics: Mapped[List["Topic"]] = relationship(
-        "Topic", back_populates="course", cascade="all, delete-orphan"
+        "Topic",
+        back_populates="course",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
     )
+    # Xóa khóa học chỉ bỏ current_course_id của user_states (ON DELETE SET NULL)
     user_states: Mapped[List["UserState"]] = relationship(
-        back_populates="current_course", cascade="all, delete-orphan"
+        back_populates="current_course", passive_deletes=True
     )
     tests: Mapped[List["Test"]] = relationship(
-        "Test", back_populates="course", cascade="all, delete-orphan"
+        "Test",
+        back_populates="course",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
     )
     document_processing_jobs: Mapped[List["DocumentProcessingJob"]] = relationship(
-        back_populates="course"
+        back_populates="course", passive_deletes=True
     )
@@ -1,7 +1,7 @@
 from typing import List, TYPE_CHECKING
 
 from app.database.database import Base
-from sqlalchemy import Integer, String, Text, ForeignKey
+from sqlalchemy import Integer, String, Text, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 if TYPE_CHECKING:
@@ -11,6 +11,8 @@ if TYPE_CHECKING:
 
 class Discussion(Base):
     __tablename__ = "discussions"
+    # Index cho phân trang keyset theo (created_at, id)
+    __table_args__ = (Index("ix_discussions_created_at_id", "created_at", "id"),)
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     title: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
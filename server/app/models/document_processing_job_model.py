@@ -21,7 +21,7 @@ class DocumentProcessingJob(Base):
         Text, nullable=True
     )  # JSON result from Runpod
     course_id: Mapped[Optional[int]] = mapped_column(
-        Integer, ForeignKey("courses.id"), nullable=True
+        Integer, ForeignKey("courses.id", ondelete="SET NULL"), nullable=True
     )  # Nếu thuộc về course
     error_message: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     processed_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
@@ -0,0 +1,30 @@
+from typing import Optional
+
+from sqlalchemy import Float, Integer, LargeBinary, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database.database import Base
+
+
+class EmbeddingCacheEntry(Base):
+    """
+    Vector embedding được cache theo (model, loại embedding, nội dung)
+
+    Attributes:
+        key (str): sha256 của model, loại embedding (query/document) và nội dung
+        model (str): Model embedding đã tạo vector
+        vector (bytes): Vector float32, hoặc int8 nếu có ``scale``
+        scale (Optional[float]): Hệ số của vector int8 (giá trị = int8 * scale),
+            None với vector float32
+        last_hit_at (float): Lần dùng gần nhất (epoch giây), dùng để loại bớt entry
+        hit_count (int): Số lần được dùng lại
+    """
+
+    __tablename__ = "embedding_cache_entries"
+
+    key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    model: Mapped[str] = mapped_column(String, nullable=False)
+    vector: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    scale: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    last_hit_at: Mapped[float] = mapped_column(Float, nullable=False, index=True)
+    hit_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
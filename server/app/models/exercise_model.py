@@ -1,4 +1,4 @@
-from sqlalchemy import JSON, ForeignKey, Integer, String, Text, Boolean
+from sqlalchemy import JSON, ForeignKey, Integer, String, Text, Boolean, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from typing import TYPE_CHECKING
 from app.database.database import Base
@@ -32,6 +32,8 @@ class Exercise(Base):
     """
 
     __tablename__ = "exercises"
+    # Index cho phân trang keyset theo (created_at, id)
+    __table_args__ = (Index("ix_exercises_created_at_id", "created_at", "id"),)
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     # New fields aligned with frontend `ExerciseItem`
@@ -47,7 +49,7 @@ class Exercise(Base):
     content: Mapped[str | None] = mapped_column(Text, nullable=True)
     code_template: Mapped[str | None] = mapped_column(Text, nullable=True)
     lesson_id: Mapped[int] = mapped_column(
-        ForeignKey("lessons.id"), index=True, nullable=True
+        ForeignKey("lessons.id", ondelete="CASCADE"), index=True, nullable=True
     )
     case: Mapped[str] = mapped_column(JSON, nullable=True)
 
@@ -57,6 +59,7 @@ class Exercise(Base):
         "ExerciseTestCase",
         back_populates="exercise",
         cascade="all, delete-orphan",
+        passive_deletes=True,
         lazy="selectin",
     )
 
@@ -18,7 +18,9 @@ class ExerciseTestCase(Base):
     __tablename__ = "exercise_test_cases"
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
-    exercise_id: Mapped[int] = mapped_column(ForeignKey("exercises.id"), index=True)
+    exercise_id: Mapped[int] = mapped_column(
+        ForeignKey("exercises.id", ondelete="CASCADE"), index=True
+    )
 
     # Nội dung test case
     input_data: Mapped[str] = mapped_column(Text)
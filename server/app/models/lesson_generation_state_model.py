@@ -12,10 +12,10 @@ class LessonGenerationState(Base):
         String, unique=True, index=True, nullable=False
     )
     topic_id: Mapped[int] = mapped_column(
-        Integer, ForeignKey("topics.id"), nullable=False
+        Integer, ForeignKey("topics.id", ondelete="CASCADE"), nullable=False
     )
     lesson_id: Mapped[Optional[int]] = mapped_column(
-        Integer, ForeignKey("lessons.id"), nullable=True
+        Integer, ForeignKey("lessons.id", ondelete="SET NULL"), nullable=True
     )
     status: Mapped[str] = mapped_column(
         String, nullable=False, default="in_progress"
@@ -1,7 +1,17 @@
 from datetime import datetime
 from typing import TYPE_CHECKING, List, Optional
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, Integer, JSON, String, Text
+from sqlalchemy import (
+    Boolean,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    JSON,
+    String,
+    Text,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database.database import Base
@@ -15,10 +25,17 @@ if TYPE_CHECKING:
 
 class LessonSection(Base):
     __tablename__ = "lesson_sections"
+    __table_args__ = (
+        Index(
+            "ix_lesson_sections_search_vector",
+            "search_vector",
+            postgresql_using="gin",
+        ),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     lesson_id: Mapped[int] = mapped_column(
-        Integer, ForeignKey("lessons.id"), index=True
+        Integer, ForeignKey("lessons.id", ondelete="CASCADE"), index=True
     )
     type: Mapped[str] = mapped_column(String)  # "text", "code", "image", "quiz"
     content: Mapped[str] = mapped_column(Text)
@@ -32,6 +49,10 @@ class LessonSection(Base):
     explanation: Mapped[Optional[str]] = mapped_column(
         Text, nullable=True
     )  # Giải thích cho quiz
+    # Vector tìm kiếm toàn văn của content, do trigger trong database cập nhật
+    search_vector: Mapped[Optional[str]] = mapped_column(
+        TSVECTOR, nullable=True, deferred=True
+    )
 
     # Relationship
     lesson: Mapped["Lesson"] = relationship("Lesson", back_populates="sections")
@@ -39,6 +60,9 @@ class LessonSection(Base):
 
 class Lesson(Base):
     __tablename__ = "lessons"
+    __table_args__ = (
+        Index("ix_lessons_search_vector", "search_vector", postgresql_using="gin"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     external_id: Mapped[str] = mapped_column(
@@ -46,16 +70,28 @@ class Lesson(Base):
     )  # ID hiển thị cho người dùng (ví dụ: "1", "2")
     title: Mapped[str] = mapped_column(String)
     description: Mapped[str] = mapped_column(String)
-    topic_id: Mapped[int] = mapped_column(Integer, ForeignKey("topics.id"), index=True)
+    topic_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("topics.id", ondelete="CASCADE"), index=True
+    )
     order: Mapped[int] = mapped_column(Integer)  # Thứ tự bài học trong chủ đề
     next_lesson_id: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     prev_lesson_id: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    # Vector tìm kiếm toàn văn (title, description), do trigger trong database cập nhật
+    search_vector: Mapped[Optional[str]] = mapped_column(
+        TSVECTOR, nullable=True, deferred=True
+    )
 
     # Relationships
     sections: Mapped[List[LessonSection]] = relationship(
-        "LessonSection", back_populates="lesson", cascade="all, delete-orphan"
+        "LessonSection",
+        back_populates="lesson",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
     )
     topic: Mapped["Topic"] = relationship("Topic", back_populates="lessons")
     exercises: Mapped[List["Exercise"]] = relationship(
-        "Exercise", back_populates="lesson", cascade="all, delete-orphan"
+        "Exercise",
+        back_populates="lesson",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
     )
@@ -0,0 +1,27 @@
+from sqlalchemy import ForeignKey, Integer, LargeBinary, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database.database import Base
+
+
+class LessonRenderCacheEntry(Base):
+    """
+    JSON đã render của bài học, tầng cache dùng chung giữa các worker
+
+    Bảng UNLOGGED: không ghi WAL nên ghi nhanh, không được replicate và bị xóa
+    trắng khi PostgreSQL khởi động lại sau sự cố, phù hợp với dữ liệu cache.
+
+    Attributes:
+        lesson_id (int): ID của bài học
+        version (str): Phiên bản bài học lúc render (xem LessonRenderService)
+        body (bytes): JSON của LessonWithChildSchema
+    """
+
+    __tablename__ = "lesson_render_cache"
+    __table_args__ = {"prefixes": ["UNLOGGED"]}
+
+    lesson_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("lessons.id", ondelete="CASCADE"), primary_key=True
+    )
+    version: Mapped[str] = mapped_column(String, nullable=False)
+    body: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
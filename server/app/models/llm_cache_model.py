@@ -0,0 +1,34 @@
+from typing import Optional
+
+from sqlalchemy import JSON, Float, Integer, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database.database import Base
+
+
+class LLMCacheEntry(Base):
+    """
+    Response của LLM được cache theo (model, tham số, messages)
+
+    Attributes:
+        key (str): sha256 của llm_string và prompt (tầng exact)
+        namespace (str): Agent đã gọi LLM
+        llm_string_hash (str): sha256 của model và tham số, tầng semantic chỉ so
+            sánh các entry cùng model/tham số
+        response (str): Danh sách generation đã serialize bằng langchain dumps
+        embedding (Optional[list]): Embedding của nội dung prompt (tầng semantic)
+        expires_at (float): Thời điểm hết hạn (epoch giây)
+        last_hit_at (float): Lần dùng gần nhất (epoch giây), dùng để loại bớt entry
+        hit_count (int): Số lần được dùng lại
+    """
+
+    __tablename__ = "llm_cache_entries"
+
+    key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    namespace: Mapped[str] = mapped_column(String, nullable=False)
+    llm_string_hash: Mapped[str] = mapped_column(String(64), nullable=False, index=True)
+    response: Mapped[str] = mapped_column(Text, nullable=False)
+    embedding: Mapped[Optional[list]] = mapped_column(JSON, nullable=True)
+    expires_at: Mapped[float] = mapped_column(Float, nullable=False, index=True)
+    last_hit_at: Mapped[float] = mapped_column(Float, nullable=False, index=True)
+    hit_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
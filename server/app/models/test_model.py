@@ -16,10 +16,10 @@ class Test(Base):
 
     # Test có thể thuộc về topic hoặc course
     topic_id: Mapped[Optional[int]] = mapped_column(
-        Integer, ForeignKey("topics.id"), nullable=True
+        Integer, ForeignKey("topics.id", ondelete="CASCADE"), nullable=True
     )
     course_id: Mapped[Optional[int]] = mapped_column(
-        Integer, ForeignKey("courses.id"), nullable=True
+        Integer, ForeignKey("courses.id", ondelete="CASCADE"), nullable=True
     )
 
     duration_minutes: Mapped[Optional[int]] = mapped_column(
@@ -33,5 +33,5 @@ class Test(Base):
     topic: Mapped[Optional["Topic"]] = relationship("Topic", back_populates="tests")
     course: Mapped[Optional["Course"]] = relationship("Course", back_populates="tests")
     sessions: Mapped[List["TestSession"]] = relationship(
-        "TestSession", back_populates="test"
+        "TestSession", back_populates="test", passive_deletes=True
     )
@@ -18,7 +18,9 @@ class TestSession(Base):
         String, primary_key=True, index=True, default=lambda: str(uuid.uuid4())
     )
     user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"), index=True)
-    test_id: Mapped[int] = mapped_column(Integer, ForeignKey("tests.id"), index=True)
+    test_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("tests.id", ondelete="CASCADE"), index=True
+    )
 
     # Thông tin thời gian
     start_time: Mapped[Optional[datetime]] = mapped_column(
@@ -17,7 +17,7 @@ class Topic(Base):
     __tablename__ = "topics"
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     course_id: Mapped[Optional[int]] = mapped_column(
-        ForeignKey("courses.id"), nullable=True, index=True
+        ForeignKey("courses.id", ondelete="CASCADE"), nullable=True, index=True
     )
     external_id: Mapped[str] = mapped_column(
         String, index=True, unique=True, nullable=True
@@ -29,9 +29,15 @@ class Topic(Base):
     )
     course: Mapped[Optional["Course"]] = relationship("Course", back_populates="topics")
     lessons: Mapped[List[Lesson]] = relationship(
-        "Lesson", back_populates="topic", cascade="all, delete-orphan"
+        "Lesson",
+        back_populates="topic",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
     )
     tests: Mapped[List[Test]] = relationship(
-        "Test", back_populates="topic", cascade="all, delete-orphan"
+        "Test",
+        back_populates="topic",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
     )
     order: Mapped[int] = mapped_column(Integer, nullable=True)
@@ -1,6 +1,7 @@
-from sqlalchemy import Integer, ForeignKey
+from datetime import datetime
+from sqlalchemy import DateTime, Integer, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from typing import List, TYPE_CHECKING
+from typing import List, Optional, TYPE_CHECKING
 from app.database.database import Base
 
 if TYPE_CHECKING:
@@ -11,13 +12,32 @@ if TYPE_CHECKING:
 
 class UserCourse(Base):
     __tablename__ = "user_courses"
+    # Tra cứu các khóa học người dùng đã đăng ký (catalog, my courses)
+    __table_args__ = (Index("ix_user_courses_user_id_course_id", "user_id", "course_id"),)
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"))
     course_id: Mapped[int] = mapped_column(Integer, ForeignKey("courses.id"))
     # Cache fields for quick access to current progress
-    current_topic: Mapped[int] = mapped_column(Integer, default=1)
-    current_lesson: Mapped[int] = mapped_column(Integer, default=1)
+    current_topic: Mapped[Optional[int]] = mapped_column(
+        Integer, nullable=True, default=1
+    )
+    current_lesson: Mapped[Optional[int]] = mapped_column(
+        Integer, nullable=True, default=1
+    )
     current_section: Mapped[int] = mapped_column(Integer, default=1)
+    # Bộ đếm tiến độ, cập nhật cùng transaction với user_course_progress
+    # (UserCourseProgressService.update_progress), sửa lại bằng
+    # UserCourseProgressService.recompute_progress_counters. Phần trăm hoàn thành
+    # không được lưu, tính lúc đọc bằng completion_percentage()
+    completed_lessons: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+    in_progress_lessons: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+    last_activity_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
 
     # Relationships
     user: Mapped["User"] = relationship("User")
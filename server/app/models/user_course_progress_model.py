@@ -1,6 +1,6 @@
 from datetime import datetime
 from typing import Optional, TYPE_CHECKING
-from sqlalchemy import Integer, ForeignKey, DateTime, Enum
+from sqlalchemy import Integer, ForeignKey, DateTime, Enum, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
 import enum
@@ -39,6 +39,14 @@ class UserCourseProgress(Base):
     """
 
     __tablename__ = "user_course_progress"
+    __table_args__ = (
+        UniqueConstraint(
+            "user_course_id",
+            "topic_id",
+            "lesson_id",
+            name="uq_user_course_progress_lesson",
+        ),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     user_course_id: Mapped[int] = mapped_column(
@@ -1,7 +1,7 @@
 from typing import List, Optional, TYPE_CHECKING
 
 from app.database.database import Base
-from sqlalchemy import Boolean, Integer, String
+from sqlalchemy import Boolean, Integer, String, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 if TYPE_CHECKING:
@@ -13,6 +13,8 @@ if TYPE_CHECKING:
 
 class User(Base):
     __tablename__ = "users"
+    # Index cho phân trang keyset theo (created_at, id)
+    __table_args__ = (Index("ix_users_created_at_id", "created_at", "id"),)
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     email: Mapped[str] = mapped_column(String, unique=True, index=True)
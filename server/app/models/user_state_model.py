@@ -41,10 +41,10 @@ class UserState(Base):
         DateTime(timezone=True), server_default=func.now()
     )
     current_course_id: Mapped[int] = mapped_column(
-        Integer, ForeignKey("courses.id"), nullable=True
+        Integer, ForeignKey("courses.id", ondelete="SET NULL"), nullable=True
     )
     current_lesson_id: Mapped[int] = mapped_column(
-        Integer, ForeignKey("lessons.id"), nullable=True
+        Integer, ForeignKey("lessons.id", ondelete="SET NULL"), nullable=True
     )
     streak_last_date: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), nullable=True
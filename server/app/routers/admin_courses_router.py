@@ -20,7 +20,7 @@ from app.services.test_generation_service import (
 from app.utils.utils import get_current_user
 from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
 from fastapi.params import Query
-from pydantic import BaseModel
+from app.schemas.base_schema import CamelCaseModel
 from sqlalchemy import func, select
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -33,7 +33,7 @@ router = APIRouter(
 )
 
 
-class ThumbnailUpdateRequest(BaseModel):
+class ThumbnailUpdateRequest(CamelCaseModel):
     thumbnail_url: str
 
     class Config:
@@ -0,0 +1,189 @@
+import os
+import secrets
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import PlainTextResponse
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+
+from app.database.database import (
+    async_engine,
+    check_async_db_connection,
+    primary_pool_telemetry,
+    replica_engine,
+    replica_monitor,
+    replica_pool_telemetry,
+)
+from app.schemas.user_profile_schema import UserExcludeSecret
+from app.core.agents.components.document_store import vector_store_registry
+from app.core.agents.components.embedding_cache import embedding_cache_stats
+from app.core.agents.components.llm_cache import llm_cache_stats
+from app.core.agents.components.llm_scheduler import llm_scheduler
+from app.core.config import settings
+from app.socket.connection_registry import connection_registry
+from app.utils.lesson_render_cache import lesson_render_cache
+from app.utils.password_hasher import password_hasher
+from app.utils.principal_cache import principal_cache
+from app.utils.utils import get_current_user
+
+router = APIRouter(
+    prefix="/admin/health",
+    tags=["Health - Admin"],
+)
+
+
+def get_admin_user(current_user: UserExcludeSecret = Depends(get_current_user)):
+    """Kiểm tra quyền admin"""
+    if not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Bạn không có quyền truy cập chức năng này",
+        )
+    return current_user
+
+
+scrape_bearer = HTTPBearer(auto_error=False)
+
+
+def verify_scrape_token(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(scrape_bearer),
+):
+    """
+    Kiểm tra bearer token của Prometheus (METRICS_SCRAPE_TOKEN)
+
+    Scraper không có phiên đăng nhập admin nên metrics dùng token riêng. Chưa cấu
+    hình token thì endpoint bị tắt.
+    """
+    token = settings.METRICS_SCRAPE_TOKEN
+    if not token:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Metrics chưa được bật"
+        )
+    if credentials is None or not secrets.compare_digest(
+        credentials.credentials.encode(), token.encode()
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Scrape token không hợp lệ",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+@router.get(
+    "",
+    summary="Tình trạng worker hiện tại (Admin)",
+    responses={
+        200: {"description": "OK"},
+        403: {"description": "Không có quyền truy cập"},
+    },
+)
+async def get_health(admin_user: UserExcludeSecret = Depends(get_admin_user)):
+    """
+    Trạng thái database, connection pool và các cache của worker đang xử lý request
+
+    Số liệu là của từng worker (pid), cần gọi nhiều lần hoặc dùng /metrics
+    để xem tất cả worker.
+    """
+    replica = None
+    if replica_engine is not None:
+        replica = {
+            "usable": await replica_monitor.is_usable(),
+            "lag_seconds": replica_monitor.lag_seconds,
+            "pool": replica_pool_telemetry.snapshot(replica_engine.pool),
+        }
+
+    return {
+        "pid": os.getpid(),
+        "database": await check_async_db_connection(),
+        "pool": primary_pool_telemetry.snapshot(async_engine.pool),
+        "replica": replica,
+        "principal_cache": principal_cache.stats(),
+        "lesson_render_cache": lesson_render_cache.stats(),
+        "llm_cache": llm_cache_stats.stats(),
+        "embedding_cache": embedding_cache_stats.stats(),
+        "vector_stores": vector_store_registry.stats(),
+        "llm_scheduler": llm_scheduler.stats(),
+        "password_hasher": password_hasher.stats(),
+        "websocket_connections": len(connection_registry.connections),
+    }
+
+
+@router.get(
+    "/metrics",
+    response_class=PlainTextResponse,
+    summary="Metrics định dạng Prometheus",
+    dependencies=[Depends(verify_scrape_token)],
+    responses={
+        401: {"description": "Thiếu hoặc sai scrape token"},
+        404: {"description": "Chưa cấu hình METRICS_SCRAPE_TOKEN"},
+    },
+)
+async def get_metrics():
+    """
+    Metrics của connection pool và các cache theo định dạng text của Prometheus
+
+    Xác thực bằng header ``Authorization: Bearer <METRICS_SCRAPE_TOKEN>`` (cấu hình
+    ``authorization.credentials`` của scrape job), không dùng phiên đăng nhập admin.
+    """
+    pid = str(os.getpid())
+    label = f'pid="{pid}"'
+    cache = principal_cache.stats()
+    hasher = password_hasher.stats()
+    render = lesson_render_cache.stats()
+    embedding = embedding_cache_stats.stats()
+    scheduler = llm_scheduler.stats()
+    lines = [
+        primary_pool_telemetry.render_prometheus(async_engine.pool, {"pid": pid}),
+        f"principal_cache_hits_total{{{label}}} {cache['hits']}",
+        f"principal_cache_misses_total{{{label}}} {cache['misses']}",
+        f"principal_cache_size{{{label}}} {cache['size']}",
+        f"lesson_render_cache_hits_total{{{label}}} {render['hits']}",
+        f"lesson_render_cache_misses_total{{{label}}} {render['misses']}",
+        f"lesson_render_cache_shared_hits_total{{{label}}} {render['shared_hits']}",
+        f"lesson_render_cache_renders_total{{{label}}} {render['renders']}",
+        f"lesson_render_cache_evictions_total{{{label}}} {render['evictions']}",
+        f"lesson_render_cache_bytes{{{label}}} {render['bytes']}",
+        f"embedding_cache_hits_total{{{label}}} {embedding['hits']}",
+        f"embedding_cache_misses_total{{{label}}} {embedding['misses']}",
+        f"embedding_cache_evictions_total{{{label}}} {embedding['evictions']}",
+        f"embedding_cache_errors_total{{{label}}} {embedding['errors']}",
+        f"embedding_vectors_total{{{label}}} {embedding['vectors']}",
+        f"embedding_seconds_total{{{label}}} {embedding['seconds']}",
+        f"embedding_model_vectors_total{{{label}}} {embedding['embedded']}",
+        f"embedding_model_seconds_total{{{label}}} {embedding['embed_seconds']}",
+        f"llm_scheduler_retries_total{{{label}}} {scheduler['retries']}",
+        f"llm_scheduler_retries_denied_total{{{label}}} {scheduler['retries_denied']}",
+        f"llm_scheduler_errors_total{{{label}}} {scheduler['errors']}",
+        f"llm_scheduler_retry_budget{{{label}}} {scheduler['retry_budget']}",
+        f"password_hasher_pending{{{label}}} {hasher['pending']}",
+        f"password_hasher_rejected_total{{{label}}} {hasher['rejected']}",
+        f"websocket_connections{{{label}}} {len(connection_registry.connections)}",
+    ]
+    for agent, counters in llm_cache_stats.stats().items():
+        if agent == "total":
+            continue
+        agent_label = f'{label},agent="{agent}"'
+        lines += [
+            f'llm_cache_hits_total{{{agent_label},tier="exact"}} {counters["exact_hits"]}',
+            f'llm_cache_hits_total{{{agent_label},tier="semantic"}} {counters["semantic_hits"]}',
+            f"llm_cache_misses_total{{{agent_label}}} {counters['misses']}",
+            f"llm_cache_writes_total{{{agent_label}}} {counters['writes']}",
+            f"llm_cache_evictions_total{{{agent_label}}} {counters['evictions']}",
+            f"llm_cache_errors_total{{{agent_label}}} {counters['errors']}",
+        ]
+    for model, model_stats in scheduler["models"].items():
+        for priority, counters in model_stats["priorities"].items():
+            queue_label = f'{label},model="{model}",priority="{priority}"'
+            lines += [
+                f"llm_scheduler_queue_depth{{{queue_label}}} {counters['queue_depth']}",
+                f"llm_scheduler_requests_total{{{queue_label}}} {counters['requests']}",
+                f"llm_scheduler_wait_seconds_total{{{queue_label}}} {counters['wait_seconds']}",
+                f"llm_scheduler_max_wait_seconds{{{queue_label}}} {counters['max_wait_seconds']}",
+            ]
+    if replica_engine is not None:
+        lines.append(
+            replica_pool_telemetry.render_prometheus(replica_engine.pool, {"pid": pid})
+        )
+        if replica_monitor.lag_seconds is not None:
+            lines.append(f"db_replica_lag_seconds{{{label}}} {replica_monitor.lag_seconds}")
+    return "\n".join(lines) + "\n"
@@ -1,5 +1,5 @@
 from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, status
-from pydantic import BaseModel
+from app.schemas.base_schema import CamelCaseModel
 
 from app.services.storage_service import StorageService, get_storage_service
 from app.services.course_service import CourseService, get_course_service
@@ -13,7 +13,7 @@ router = APIRouter(
 )
 
 
-class FileUploadResponse(BaseModel):
+class FileUploadResponse(CamelCaseModel):
     key: str
     url: str
     content_type: str
@@ -1,5 +1,6 @@
 from fastapi import APIRouter
-from pydantic import BaseModel, Field
+from pydantic import Field
+from app.schemas.base_schema import CamelCaseModel
 from typing import List, Optional
 from app.core.agents.ai_chat_agent import AIChatAgent
 
@@ -25,7 +26,7 @@ async def get_ai_chat():
     return {"message": "AI Chat endpoint"}
 
 
-class AIChatRequest(BaseModel):
+class AIChatRequest(CamelCaseModel):
     code: str
     results: List[dict] = Field(default_factory=list, description="Test case results")
     title: str
@@ -33,7 +34,7 @@ class AIChatRequest(BaseModel):
     all_tests_passed: Optional[bool] = None
 
 
-class AIChatResponse(BaseModel):
+class AIChatResponse(CamelCaseModel):
     reply: str
 
 
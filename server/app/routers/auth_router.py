@@ -7,7 +7,9 @@ from app.models.user_model import User as UserModel
 from app.schemas.auth_schema import UserRegister, UserLogin, LoginResponse
 from app.database.database import get_async_db
 from app.utils.utils import (
-    verify_password,
+    verify_password_async,
+    password_hash_async,
+    password_needs_rehash,
     create_access_token,
     set_auth_cookie,
     clear_auth_cookie,
@@ -98,7 +100,7 @@ async def login(
             detail="Tài khoản không tồn tại",
         )
 
-    if not verify_password(data.password, str(user.hashed_password)):
+    if not await verify_password_async(data.password, str(user.hashed_password)):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Mật khẩu không chính xác",
@@ -111,6 +113,11 @@ async def login(
             detail="Tài khoản đã bị vô hiệu hóa",
         )
 
+    # Hash lại mật khẩu nếu được tạo với work factor cũ (yếu hơn cấu hình hiện tại)
+    if password_needs_rehash(str(user.hashed_password)):
+        user.hashed_password = await password_hash_async(data.password)
+        await db.commit()
+
     # Tạo access token - Sử dụng email nếu username là null
     token_data = {"sub": str(user.id)}
     access_token = create_access_token(
@@ -1,11 +1,10 @@
-from typing import List
+from typing import List, Literal, Optional, Union
 
-from app.database.database import get_async_db
-from app.models.course_model import Course
 from app.schemas.course_schema import (
+    CourseDetailResponse,
     CourseDetailWithProgressResponse,
-    CourseListItem,
     CourseListResponse,
+    CourseOutlineResponse,
 )
 from app.schemas.test_schema import TestRead, TestSessionRead
 from app.schemas.topic_schema import TopicWithUserState
@@ -16,8 +15,6 @@ from app.services.test_service import TestService, get_test_service
 from app.services.topic_service import TopicService, get_topic_service
 from app.utils.utils import get_current_user, get_current_user_optional
 from fastapi import APIRouter, Body, Depends, HTTPException, Query, status
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
 
 router = APIRouter(
     prefix="/courses",
@@ -35,71 +32,33 @@ router = APIRouter(
 async def get_courses(
     page: int = Query(1, gt=0, description="Số trang"),
     limit: int = Query(10, gt=0, le=100, description="Số item mỗi trang"),
-    db: AsyncSession = Depends(get_async_db),
+    cursor: Optional[str] = Query(
+        None, description="Cursor trang trước/sau, dùng thay cho page"
+    ),
     current_user: UserExcludeSecret = Depends(get_current_user_optional),
     course_service: CourseService = Depends(get_course_service),
 ):
     """
     Lấy danh sách khóa học với phân trang (chỉ hiển thị khóa học được công khai)
 
+    Trang đầu và các trang lấy bằng ``cursor`` dùng phân trang keyset, trả về
+    ``nextCursor``/``prevCursor``; ``page`` > 1 vẫn dùng OFFSET như cũ.
+
     Args:
         page: Số trang, bắt đầu từ 1
         limit: Số lượng item mỗi trang
-        db: Session database
+        cursor: Cursor lấy từ ``nextCursor``/``prevCursor`` của trang trước
         current_user: Thông tin người dùng hiện tại (nếu đã đăng nhập)
         course_service: Service để xử lý logic course
 
     Returns:
         CourseListResponse: Danh sách khóa học cơ bản và thông tin phân trang
     """
-    # Tính toán offset
-    offset = (page - 1) * limit
-
-    # Chỉ hiển thị khóa học được công khai cho user
-    result = await db.execute(
-        select(Course)
-        .filter(Course.is_published == True)
-        .order_by(Course.created_at.desc())
-        .offset(offset)
-        .limit(limit)
-    )
-    courses = result.scalars().all()
-    if current_user:
-        enrolled_courses = await course_service.get_user_courses(current_user.id)
-    else:
-        enrolled_courses = []
-
-    # Chuyển đổi Course thành CourseListItem và kiểm tra trạng thái enrolled
-    course_items = []
-    for course in courses:
-        is_enrolled = False
-        if course.id in [enrolled_course.id for enrolled_course in enrolled_courses]:
-            is_enrolled = True
-
-        course_item = CourseListItem(
-            id=course.id,
-            title=course.title,
-            description=course.description,
-            thumbnail_url=course.thumbnail_url,
-            level=course.level,
-            duration=course.duration,
-            price=course.price,
-            tags=course.tags,
-            created_at=course.created_at,
-            updated_at=course.updated_at,
-            is_enrolled=is_enrolled,
-        )
-        course_items.append(course_item)
-    course_total = len(courses)
-    # Tính tổng số trang
-    total_pages = (course_total + limit - 1) // limit
-
-    return CourseListResponse(
-        items=course_items,
-        total=course_total,
+    return await course_service.get_course_catalog(
+        user_id=current_user.id if current_user else None,
         page=page,
         limit=limit,
-        totalPages=total_pages,
+        cursor=cursor,
     )
 
 
@@ -162,6 +121,42 @@ async def get_course_by_id(
     return course
 
 
+@router.get(
+    "/{course_id}/outline",
+    response_model=Union[CourseOutlineResponse, CourseDetailResponse],
+    summary="Lấy mục lục khóa học",
+    responses={
+        200: {"description": "OK"},
+        404: {"description": "Không tìm thấy khóa học"},
+    },
+)
+async def get_course_outline(
+    course_id: int,
+    include: Optional[Literal["sections"]] = Query(
+        None, description="sections để lấy kèm nội dung section của mọi lesson"
+    ),
+    current_user: UserExcludeSecret = Depends(get_current_user_optional),
+    course_service: CourseService = Depends(get_course_service),
+):
+    """
+    Lấy mục lục của khóa học: topics và lessons chỉ gồm id, tiêu đề, thứ tự và
+    số lượng. Client cần toàn bộ nội dung section thì truyền ``include=sections``.
+
+    Args:
+        course_id: ID của khóa học
+        include: "sections" để trả về dạng đầy đủ kèm sections
+        current_user: Thông tin người dùng hiện tại (nếu đã đăng nhập)
+        course_service: Service để xử lý logic course
+
+    Returns:
+        CourseOutlineResponse | CourseDetailResponse: Mục lục hoặc chi tiết đầy đủ
+    """
+    user_id = current_user.id if current_user else None
+    return await course_service.get_course(
+        course_id, user_id, include_sections=include == "sections"
+    )
+
+
 # Hàm tiện ích chuyển đổi Course ORM sang CourseDetailResponse schema
 
 
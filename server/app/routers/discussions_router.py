@@ -38,6 +38,9 @@ async def get_discussions(
     ),
     page: Optional[int] = Query(1, ge=1, description="Page number"),
     limit: Optional[int] = Query(10, ge=1, le=100, description="Items per page"),
+    cursor: Optional[str] = Query(
+        None, description="Keyset cursor (nextCursor/prevCursor), replaces page"
+    ),
     db: AsyncSession = Depends(get_async_db),
 ):
     """Get discussions with filters and pagination"""
@@ -47,6 +50,7 @@ async def get_discussions(
         sort_by=sort_by,
         page=page,
         limit=limit,
+        cursor=cursor,
     )
     return await DiscussionService.get_discussions(db, filters)
 
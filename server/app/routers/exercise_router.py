@@ -1,4 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException, Body, Query
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Body, Query, Response
+
+from app.database.pagination import set_cursor_headers
 
 from app.schemas.exercise_schema import (
     CreateExerciseSchema,
@@ -44,10 +48,21 @@ async def create_exercise(
     summary="Lấy danh sách bài tập",
 )
 async def list_exercises(
+    response: Response,
     page: int = Query(1, gt=0, description="Số trang"),
     limit: int = Query(12, gt=1, le=100, description="Số item mỗi trang"),
+    cursor: Optional[str] = Query(
+        None, description="Cursor trang trước/sau, dùng thay cho page"
+    ),
     exercise_service: ExerciseService = Depends(get_exercise_service),
 ):
+    # Trang đầu và trang theo cursor dùng keyset, cursor trả về qua header
+    if cursor or page == 1:
+        exercise_page = await exercise_service.list_exercises_page(
+            limit=limit, cursor=cursor
+        )
+        set_cursor_headers(response, exercise_page)
+        return exercise_page.items
     return await exercise_service.list_exercises(page=page, limit=limit)
 
 
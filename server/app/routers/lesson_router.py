@@ -11,7 +11,11 @@ from app.schemas.lesson_schema import (
 from app.utils.utils import get_current_user, get_current_user_optional
 from app.schemas.user_profile_schema import UserExcludeSecret
 from app.services.lesson_service import LessonService, get_lesson_service
-from fastapi import APIRouter, Depends, HTTPException, status
+from app.services.lesson_render_service import (
+    LessonRenderService,
+    get_lesson_render_service,
+)
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 
 router = APIRouter(prefix="/lessons", tags=["Bài học"])
 
@@ -54,6 +58,23 @@ async def create_lesson(
         )
 
 
+@router.post("/batch", response_model=list[LessonWithChildSchema])
+async def create_lessons(
+    lessons_data: list[CreateLessonSchema],
+    lesson_service: LessonService = Depends(get_lesson_service),
+):
+    """
+    Tạo nhiều bài học (ví dụ toàn bộ bài học của một topic) trong một lần gọi
+    """
+    try:
+        return await lesson_service.create_lessons(lessons_data)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error creating lessons: {str(e)}",
+        )
+
+
 @router.post("/{lesson_id}/complete", response_model=LessonCompleteResponseSchema)
 async def complete_lesson(
     lesson_id: int,
@@ -89,19 +110,22 @@ async def get_lesson(
 
 @router.get("/{lesson_id}/basic", response_model=LessonWithChildSchema)
 async def get_lesson_basic_info(
-    lesson_id: int, lesson_service: LessonService = Depends(get_lesson_service)
+    lesson_id: int,
+    render_service: LessonRenderService = Depends(get_lesson_render_service),
 ):
     """
     Get basic lesson info without progress (backward compatibility)
+
+    Trả thẳng JSON đã render trong cache bài học
     """
-    lesson = await lesson_service.get_lesson_by_id(lesson_id)
+    lesson_json = await render_service.get_lesson_json(lesson_id)
 
-    if not lesson:
+    if lesson_json is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Lesson not found"
         )
 
-    return lesson
+    return Response(content=lesson_json, media_type="application/json")
 
 
 @router.get("/external/{external_id}", response_model=LessonWithChildSchema)
@@ -123,13 +147,14 @@ async def get_lesson_by_external_id(
 
 @router.get("/topic/{topic_id}", response_model=list[LessonWithChildSchema])
 async def get_lessons_by_topic(
-    topic_id: int, lesson_service: LessonService = Depends(get_lesson_service)
+    topic_id: int,
+    render_service: LessonRenderService = Depends(get_lesson_render_service),
 ):
     """
     Get all lessons for a topic.
     """
-    lessons = await lesson_service.get_lessons_by_topic(topic_id)
-    return lessons
+    lessons_json = await render_service.get_topic_lessons_json(topic_id)
+    return Response(content=lessons_json, media_type="application/json")
 
 
 @router.put("/{lesson_id}", response_model=LessonWithChildSchema)
@@ -6,6 +6,7 @@ def register_router(app: FastAPI):
 
     from app.routers import (
         admin_courses_router,
+        admin_health_router,
         admin_topics_router,
         admin_upload_router,
         ai_chat_router,
@@ -19,6 +20,7 @@ def register_router(app: FastAPI):
         lesson_plan_router,
         lesson_router,
         replies_router,
+        search_router,
         test_generation_router,
         test_router,
         topic_router,
@@ -45,6 +47,7 @@ def register_router(app: FastAPI):
     app.include_router(lesson_router.router)
     app.include_router(courses_router.router)
     app.include_router(courses_router.router)
+    app.include_router(search_router.router)
 
     # WebSocket routes
     app.include_router(websocket_router.router)
@@ -55,6 +58,7 @@ def register_router(app: FastAPI):
     app.include_router(admin_courses_router.router)
     app.include_router(admin_topics_router.router)
     app.include_router(admin_upload_router.router)
+    app.include_router(admin_health_router.router)
 
     # Test generation routes
     app.include_router(test_generation_router.router)
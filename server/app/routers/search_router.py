@@ -0,0 +1,35 @@
+from fastapi import APIRouter, Depends, Query, status
+
+from app.schemas.search_schema import SearchResponse
+from app.services.search_service import SearchService, get_search_service
+
+router = APIRouter(prefix="/search", tags=["Tìm kiếm"])
+
+
+@router.get(
+    "",
+    response_model=SearchResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Tìm kiếm khóa học và nội dung bài học",
+)
+async def search(
+    q: str = Query(..., min_length=1, max_length=200, description="Chuỗi tìm kiếm"),
+    limit: int = Query(10, gt=0, le=50, description="Số kết quả mỗi nhóm"),
+    search_service: SearchService = Depends(get_search_service),
+):
+    """
+    Tìm kiếm toàn văn trong khóa học, bài học và nội dung bài học đã công khai
+
+    Không phân biệt dấu tiếng Việt và hoa thường, mỗi từ được tìm theo tiền tố.
+    Kết quả nhóm theo loại nội dung, mỗi kết quả có đoạn trích đánh dấu từ khớp
+    bằng ``<mark>``.
+
+    Args:
+        q: Chuỗi tìm kiếm
+        limit: Số kết quả tối đa của mỗi nhóm
+        search_service: Service xử lý tìm kiếm
+
+    Returns:
+        SearchResponse: Kết quả nhóm theo courses, lessons, sections
+    """
+    return await search_service.search(q, limit=limit)
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Response, status
 from typing import List
 
 from app.schemas.topic_schema import (
@@ -10,6 +10,10 @@ from app.schemas.topic_schema import (
 
 from app.schemas.lesson_schema import LessonWithChildSchema
 from app.schemas.user_profile_schema import UserExcludeSecret
+from app.services.lesson_render_service import (
+    LessonRenderService,
+    get_lesson_render_service,
+)
 from app.services.topic_service import TopicService, get_topic_service
 from app.utils.utils import get_current_user_optional
 
@@ -28,11 +32,12 @@ async def create_topic(
 
 @router.get("/course/{course_id}", response_model=List[TopicResponse])
 async def list_topics_for_course(
-    course_id: int, topic_service: TopicService = Depends(get_topic_service)
+    course_id: int,
+    render_service: LessonRenderService = Depends(get_lesson_render_service),
 ):
     """Lấy danh sách topics theo course ID"""
-    topics = await topic_service.get_topics_by_course_id(course_id)
-    return topics
+    topics_json = await render_service.get_course_topics_json(course_id)
+    return Response(content=topics_json, media_type="application/json")
 
 
 @router.get("/{topic_id}", response_model=TopicDetailWithProgressResponse)
@@ -101,22 +106,22 @@ async def delete_topic(
 @router.get("/", response_model=List[TopicResponse])
 async def get_topics_by_course(
     course_id: int,
-    topic_service: TopicService = Depends(get_topic_service),
+    render_service: LessonRenderService = Depends(get_lesson_render_service),
 ):
     """
     Lấy danh sách các chủ đề của một khóa học.
     """
-    topics = await topic_service.get_topics_by_course_id(course_id)
-    return topics
+    topics_json = await render_service.get_course_topics_json(course_id)
+    return Response(content=topics_json, media_type="application/json")
 
 
 @router.get("/{topic_id}/lessons", response_model=List[LessonWithChildSchema])
 async def get_lessons_by_topic(
     topic_id: int,
-    topic_service: TopicService = Depends(get_topic_service),
+    render_service: LessonRenderService = Depends(get_lesson_render_service),
 ):
     """
     Lấy danh sách bài học của một chủ đề.
     """
-    lessons = await topic_service.get_lessons_by_topic_id(topic_id)
-    return lessons
+    lessons_json = await render_service.get_topic_lessons_json(topic_id)
+    return Response(content=lessons_json, media_type="application/json")
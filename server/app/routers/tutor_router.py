@@ -6,7 +6,7 @@ from starlette.responses import StreamingResponse
 from app.database.database import AsyncSessionLocal
 from app.schemas.tutor_schema import AskTutorSchema
 from app.utils.utils import get_current_user
-from app.core.agents.tutor_agent import TutorAgent
+from app.core.agents.tutor_agent import get_tutor_agent
 from app.schemas.user_profile_schema import UserExcludeSecret
 
 
@@ -18,25 +18,27 @@ async def post_tutor(
     data: AskTutorSchema,
     user: UserExcludeSecret = Depends(get_current_user),
 ):
-    async with AsyncSessionLocal() as db:
-        tutor_agent = TutorAgent(db)
+    tutor_agent = get_tutor_agent()
 
     if data.session_id is None:
         data.session_id = str(uuid.uuid4())
 
     async def tutor_data_streamer():
         try:
-            async for chunk in tutor_agent.act_stream(
-                type=data.type,
-                context_id=data.context_id,
-                session_id=data.session_id,
-                question=data.question,
-            ):
-                if chunk:  # Chỉ yield khi chunk có giá trị
-                    if isinstance(chunk, str):
-                        yield chunk.encode("utf-8")
-                    else:
-                        yield str(chunk).encode("utf-8")
+            # Session sống suốt thời gian stream để tool lấy context dùng được
+            async with AsyncSessionLocal() as db:
+                async for chunk in tutor_agent.act_stream(
+                    db=db,
+                    type=data.type,
+                    context_id=data.context_id,
+                    session_id=data.session_id,
+                    question=data.question,
+                ):
+                    if chunk:  # Chỉ yield khi chunk có giá trị
+                        if isinstance(chunk, str):
+                            yield chunk.encode("utf-8")
+                        else:
+                            yield str(chunk).encode("utf-8")
         except Exception as e:
             error_message = f"Error: {str(e)}"
             yield error_message.encode("utf-8")
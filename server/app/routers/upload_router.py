@@ -1,5 +1,5 @@
 from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, status
-from pydantic import BaseModel
+from app.schemas.base_schema import CamelCaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
@@ -15,7 +15,7 @@ router = APIRouter(
 )
 
 
-class FileUploadResponse(BaseModel):
+class FileUploadResponse(CamelCaseModel):
     key: str
     url: str
     content_type: str
@@ -1,19 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from typing import List, Optional
-from pydantic import BaseModel
+from ..schemas.base_schema import CamelCaseModel
 
+from ..database.pagination import set_cursor_headers
 from ..schemas.password_schema import ChangePasswordSchema
 from ..models.user_model import User
 from ..schemas.user_profile_schema import UserUpdate, UserResponse, UserProfileResponse, UserExcludeSecret
 from ..services.user_service import UserService, get_user_service
 from ..services.profile_service import ProfileService, get_profile_service
-from ..utils.utils import get_current_user, verify_password
+from ..utils.utils import get_current_user, verify_password_async
 
 router = APIRouter(prefix="/users", tags=["Người dùng"])
 
 
 # Admin schemas
-class AdminUserCreate(BaseModel):
+class AdminUserCreate(CamelCaseModel):
     """Schema cho việc tạo người dùng mới (Admin)"""
     email: str
     username: str
@@ -26,7 +27,7 @@ class AdminUserCreate(BaseModel):
     avatar_url: Optional[str] = None
 
 
-class AdminUserUpdate(BaseModel):
+class AdminUserUpdate(CamelCaseModel):
     """Schema cho việc cập nhật thông tin người dùng (Admin)"""
     email: Optional[str] = None
     username: Optional[str] = None
@@ -38,7 +39,7 @@ class AdminUserUpdate(BaseModel):
     avatar_url: Optional[str] = None
 
 
-class AdminUserResponse(BaseModel):
+class AdminUserResponse(CamelCaseModel):
     """Schema cho response thông tin người dùng (Admin)"""
     id: int
     email: str
@@ -56,12 +57,12 @@ class AdminUserResponse(BaseModel):
         from_attributes = True
 
 
-class BulkDeleteUsersRequest(BaseModel):
+class BulkDeleteUsersRequest(CamelCaseModel):
     """Schema cho việc xóa nhiều người dùng cùng lúc"""
     user_ids: List[int]
 
 
-class BulkDeleteUsersResponse(BaseModel):
+class BulkDeleteUsersResponse(CamelCaseModel):
     """Schema cho response xóa nhiều người dùng"""
     deleted_count: int
     failed_count: int
@@ -179,15 +180,27 @@ async def create_user_admin(
     },
 )
 async def get_all_users_admin(
+    response: Response,
     skip: int = Query(default=0, ge=0, description="Số bản ghi bỏ qua"),
     limit: int = Query(default=100, ge=1, le=1000, description="Số bản ghi trả về"),
+    cursor: Optional[str] = Query(
+        default=None, description="Cursor trang trước/sau, dùng thay cho skip"
+    ),
     user_service: UserService = Depends(get_user_service),
     admin_user: UserExcludeSecret = Depends(get_admin_user),
 ):
     """
     Lấy danh sách tất cả người dùng (chỉ admin)
+
+    Trang đầu và trang theo ``cursor`` dùng phân trang keyset, cursor trang
+    sau/trước trả về qua header X-Next-Cursor/X-Prev-Cursor.
     """
-    users = await user_service.get_all_users(skip=skip, limit=limit)
+    if cursor or skip == 0:
+        user_page = await user_service.get_users_page(limit=limit, cursor=cursor)
+        set_cursor_headers(response, user_page)
+        users = user_page.items
+    else:
+        users = await user_service.get_all_users(skip=skip, limit=limit)
     
     return [
         AdminUserResponse(
@@ -640,7 +653,9 @@ async def change_user_password(
     Thay đổi mật khẩu người dùng hiện tại
     """
     # Kiểm tra mật khẩu hiện tại
-    if not verify_password(data.current_password, current_user.hashed_password):
+    if not await verify_password_async(
+        data.current_password, current_user.hashed_password
+    ):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Mật khẩu hiện tại không đúng",
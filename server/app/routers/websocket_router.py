@@ -1,13 +1,12 @@
-from bidict import bidict
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, status
 from jose import JWTError, jwt
 
 from app.core.config import settings
+from app.socket.connection_registry import connection_registry
 from app.socket.socker_chain import process_message
 from app.utils.utils import ALGORITHM
 
 router = APIRouter()
-active_connections: bidict[str, WebSocket] = bidict()
 
 
 def get_current_user_ws(token: str):
@@ -27,24 +26,14 @@ async def websocket_endpoint(websocket: WebSocket, token: str | None = None):
         await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
         return
     user_id = token
-    # Đảm bảo mỗi user chỉ có 1 kết nối
-    if user_id in active_connections:
-        try:
-            await active_connections[user_id].close(
-                code=status.WS_1000_NORMAL_CLOSURE,
-                reason="New connection from same user",
-            )
-            active_connections.pop(user_id)
-        except Exception as e:
-            print(e)
-            pass
-    active_connections.put(user_id, websocket)
+    # Đảm bảo mỗi user chỉ có 1 kết nối trên tất cả các worker
+    await connection_registry.connect(user_id, websocket)
     await websocket.accept()
     try:
         while True:
             data = await websocket.receive_json()
             await process_message(websocket, data)
     except WebSocketDisconnect:
-        if user_id in active_connections:
-            active_connections.pop(user_id)
         pass
+    finally:
+        connection_registry.disconnect(user_id, websocket)
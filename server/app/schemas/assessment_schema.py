@@ -1,8 +1,9 @@
 from typing import List
-from pydantic import BaseModel, Field
+from pydantic import Field
+from app.schemas.base_schema import CamelCaseModel
 
 
-class TopicAssessmentResponse(BaseModel):
+class TopicAssessmentResponse(CamelCaseModel):
     """Response schema cho đánh giá từng chủ đề"""
 
     topic_id: int = Field(description="ID của chủ đề")
@@ -16,7 +17,7 @@ class TopicAssessmentResponse(BaseModel):
     recommendations: List[str] = Field(description="Gợi ý cải thiện cụ thể")
 
 
-class LearningPathItemResponse(BaseModel):
+class LearningPathItemResponse(CamelCaseModel):
     """Response schema cho một mục trong lộ trình học tập"""
 
     topic_id: int = Field(description="ID của chủ đề")
@@ -30,7 +31,7 @@ class LearningPathItemResponse(BaseModel):
     )
 
 
-class AssessmentResultResponse(BaseModel):
+class AssessmentResultResponse(CamelCaseModel):
     """Response schema cho kết quả đánh giá toàn diện"""
 
     test_session_id: str = Field(description="ID phiên làm bài")
@@ -59,7 +60,7 @@ class AssessmentResultResponse(BaseModel):
         from_attributes = True
 
 
-class AssessmentRequest(BaseModel):
+class AssessmentRequest(CamelCaseModel):
     """Request schema cho đánh giá trình độ"""
 
     test_session_id: str = Field(description="ID phiên làm bài kiểm tra đã hoàn thành")
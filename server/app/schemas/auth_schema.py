@@ -1,9 +1,10 @@
 from typing import Optional
 
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import EmailStr, Field
+from app.schemas.base_schema import CamelCaseModel
 
 
-class UserBase(BaseModel):
+class UserBase(CamelCaseModel):
     """
     Schema cơ bản cho User
 
@@ -19,7 +20,7 @@ class UserBase(BaseModel):
     last_name: Optional[str] = None
 
 
-class UserRegister(BaseModel):
+class UserRegister(CamelCaseModel):
     """
     Schema cho việc tạo User mới, kế thừa từ UserBase
 
@@ -33,7 +34,7 @@ class UserRegister(BaseModel):
     last_name: str = Field(..., min_length=1)
 
 
-class UserLogin(BaseModel):
+class UserLogin(CamelCaseModel):
     """
     Schema cho việc đăng nhập
 
@@ -47,7 +48,7 @@ class UserLogin(BaseModel):
     remember_me: bool
 
 
-class LoginResponse(BaseModel):
+class LoginResponse(CamelCaseModel):
     """
     Schema cho token trả về khi đăng nhập thành công
 
@@ -56,7 +57,7 @@ class LoginResponse(BaseModel):
         token_type (str): Loại token (Bearer)
     """
 
-    class User(BaseModel):
+    class User(CamelCaseModel):
         id: int
         email: EmailStr
         username: str
@@ -1,10 +1,11 @@
 from datetime import datetime
 from typing import List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import Field
+from app.schemas.base_schema import CamelCaseModel
 
 
-class BadgeBase(BaseModel):
+class BadgeBase(CamelCaseModel):
     """
     Schema cơ bản cho huy hiệu, chứa các trường cơ bản nhất
     """
@@ -63,7 +64,7 @@ class Badge(BadgeInDB):
     pass
 
 
-class UserBadge(BaseModel):
+class UserBadge(CamelCaseModel):
     """
     Schema cho huy hiệu của người dùng
     """
@@ -75,7 +76,7 @@ class UserBadge(BaseModel):
         from_attributes = True
 
 
-class BadgeList(BaseModel):
+class BadgeList(CamelCaseModel):
     """
     Schema danh sách huy hiệu
     """
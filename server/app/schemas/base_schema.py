@@ -0,0 +1,111 @@
+"""
+Schema gốc cho toàn bộ API: serialize/parse camelCase trực tiếp qua alias
+"""
+
+import types
+from datetime import date, datetime, time
+from decimal import Decimal
+from enum import Enum
+from typing import Annotated, Any, Dict, Literal, Union, get_args, get_origin
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict
+
+from app.utils.case_utils import to_camel_case
+
+
+class PreserveKeys:
+    """
+    Đánh dấu một field dict có key là dữ liệu (không phải tên field),
+    ví dụ key đáp án quiz "A", "B", "C", "D". Các key này không cần đổi case
+    nên field vẫn được coi là đã camelCase sẵn.
+    """
+
+
+# Dict mà key được giữ nguyên khi trả về client
+PreservedKeysDict = Annotated[Dict[str, Any], PreserveKeys()]
+
+_SCALAR_TYPES = (str, int, float, bool, bytes, datetime, date, time, Decimal, UUID)
+
+
+class CamelCaseModel(BaseModel):
+    """
+    Base model cho mọi schema của API
+
+    - Serialize với ``by_alias`` sẽ ra key camelCase (FastAPI mặc định dùng ``by_alias``
+      khi có ``response_model``)
+    - Chấp nhận input ở cả camelCase (alias) lẫn snake_case (tên field)
+    """
+
+    model_config = ConfigDict(
+        alias_generator=to_camel_case,
+        populate_by_name=True,
+    )
+
+
+def is_camel_case_native(annotation: Any, _seen: set | None = None) -> bool:
+    """
+    Kiểm tra một kiểu dữ liệu có được serialize ra camelCase trực tiếp hay không
+
+    Kiểu được coi là "native" nếu toàn bộ cây kiểu chỉ gồm các CamelCaseModel,
+    kiểu vô hướng, Enum, và list/tuple/set/Optional/Union của chúng.
+    Mọi dict, ``Any`` hoặc BaseModel thường đều làm kết quả là False, vì key
+    bên trong có thể vẫn ở dạng snake_case.
+
+    Args:
+        annotation: Kiểu cần kiểm tra (thường là response_model của route)
+
+    Returns:
+        bool: True nếu JSON sinh ra từ kiểu này đã là camelCase
+    """
+    if _seen is None:
+        _seen = set()
+
+    if annotation is None or annotation is type(None):
+        return True
+
+    origin = get_origin(annotation)
+
+    if origin is Annotated:
+        base, *metadata = get_args(annotation)
+        if any(isinstance(item, PreserveKeys) for item in metadata):
+            return True
+        return is_camel_case_native(base, _seen)
+
+    if origin in (Union, types.UnionType):
+        return all(is_camel_case_native(arg, _seen) for arg in get_args(annotation))
+
+    if origin in (list, tuple, set, frozenset):
+        return all(
+            arg is Ellipsis or is_camel_case_native(arg, _seen)
+            for arg in get_args(annotation)
+        )
+
+    if origin is Literal:
+        return True
+
+    if origin is not None:
+        # dict, Mapping... không kiểm soát được key
+        return False
+
+    if not isinstance(annotation, type):
+        return False
+
+    if issubclass(annotation, (Enum, *_SCALAR_TYPES)):
+        return True
+
+    if issubclass(annotation, CamelCaseModel):
+        if annotation in _seen:
+            return True
+        _seen.add(annotation)
+        return all(
+            is_camel_case_native(field.annotation, _seen)
+            or _has_preserve_keys(field.metadata)
+            for field in annotation.model_fields.values()
+        )
+
+    return False
+
+
+def _has_preserve_keys(metadata: list) -> bool:
+    return any(isinstance(item, PreserveKeys) for item in metadata)
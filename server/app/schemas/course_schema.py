@@ -2,11 +2,16 @@ from datetime import datetime
 from typing import List, Optional
 
 from app.models.course_model import TestGenerationStatus
-from app.schemas.topic_schema import TopicResponse, TopicWithProgressResponse
-from pydantic import BaseModel, Field
+from app.schemas.topic_schema import (
+    TopicOutlineResponse,
+    TopicResponse,
+    TopicWithProgressResponse,
+)
+from pydantic import Field
+from app.schemas.base_schema import CamelCaseModel
 
 
-class CourseBase(BaseModel):
+class CourseBase(CamelCaseModel):
     """
     Schema cơ bản cho khóa học
 
@@ -59,7 +64,7 @@ class CourseCreate(CourseBase):
     pass
 
 
-class CourseUpdate(BaseModel):
+class CourseUpdate(CamelCaseModel):
     """
     Schema cho việc cập nhật khóa học
 
@@ -144,7 +149,18 @@ class CourseDetailResponse(CourseResponse):
         from_attributes = True
 
 
-class CourseListItem(BaseModel):
+class CourseOutlineResponse(CourseResponse):
+    """
+    Schema cho mục lục khóa học: topics và lessons chỉ gồm id, tiêu đề, thứ tự
+    và số lượng; nội dung section được tải khi mở từng lesson
+    """
+
+    topics: list[TopicOutlineResponse] = Field(
+        default_factory=list, description="Mục lục topics và lessons"
+    )
+
+
+class CourseListItem(CamelCaseModel):
     """
     Schema cơ bản cho item trong danh sách khóa học (không bao gồm chi tiết topics)
 
@@ -184,7 +200,7 @@ class CourseListItem(BaseModel):
         from_attributes = True
 
 
-class UserCourseListItem(BaseModel):
+class UserCourseListItem(CamelCaseModel):
     """
     Schema cho item trong danh sách khóa học đã đăng ký của user, kèm progress
     """
@@ -225,7 +241,7 @@ class UserCourseListItem(BaseModel):
         from_attributes = True
 
 
-class CourseListResponse(BaseModel):
+class CourseListResponse(CamelCaseModel):
     """
     Schema cho response khi lấy danh sách khóa học với phân trang
 
@@ -235,6 +251,8 @@ class CourseListResponse(BaseModel):
         page: Số trang hiện tại
         limit: Số lượng item mỗi trang
         totalPages: Tổng số trang
+        next_cursor: Cursor của trang sau (phân trang keyset), None nếu hết
+        prev_cursor: Cursor của trang trước (phân trang keyset), None nếu là trang đầu
     """
 
     items: list[CourseListItem]
@@ -242,6 +260,8 @@ class CourseListResponse(BaseModel):
     page: int
     limit: int
     totalPages: int
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
 
     class Config:
         """Cấu hình cho Pydantic model"""
@@ -258,7 +278,7 @@ def rebuild_course_models():
         pass
 
 
-class CourseCompositionRequestSchema(BaseModel):
+class CourseCompositionRequestSchema(CamelCaseModel):
     """Schema cho request tạo khóa học tự động"""
 
     course_id: int = Field(..., description="ID của khóa học")
@@ -269,7 +289,7 @@ class CourseCompositionRequestSchema(BaseModel):
     lessons_per_topic: int = Field(default=5, description="Số lessons cho mỗi topic")
 
 
-class TopicGenerationResult(BaseModel):
+class TopicGenerationResult(CamelCaseModel):
     """Kết quả tạo topic"""
 
     name: str
@@ -278,7 +298,7 @@ class TopicGenerationResult(BaseModel):
     order: int
 
 
-class CourseCompositionResponseSchema(BaseModel):
+class CourseCompositionResponseSchema(CamelCaseModel):
     """Schema cho response của CourseCompositionAgent"""
 
     course_id: int
@@ -287,7 +307,7 @@ class CourseCompositionResponseSchema(BaseModel):
     errors: List[str]
 
 
-class BulkDeleteCoursesRequest(BaseModel):
+class BulkDeleteCoursesRequest(CamelCaseModel):
     """Schema cho request xóa nhiều khóa học"""
 
     course_ids: list[int] = Field(..., description="Danh sách ID các khóa học cần xóa")
@@ -299,7 +319,7 @@ class BulkDeleteCoursesRequest(BaseModel):
         return v
 
 
-class BulkDeleteCoursesResponse(BaseModel):
+class BulkDeleteCoursesResponse(CamelCaseModel):
     """Schema cho response xóa nhiều khóa học"""
 
     deleted_count: int = Field(..., description="Số lượng khóa học đã xóa thành công")
@@ -317,6 +337,19 @@ class BulkDeleteCoursesResponse(BaseModel):
     )
 
 
+class CurrentLessonSummary(CamelCaseModel):
+    """
+    Schema tóm tắt bài học hiện tại của người dùng trong khóa học
+    """
+
+    id: int = Field(..., description="ID của lesson")
+    external_id: Optional[str] = Field(None, description="External ID của lesson")
+    title: str = Field(..., description="Tiêu đề lesson")
+    description: Optional[str] = Field(None, description="Mô tả lesson")
+    order: int = Field(..., description="Thứ tự lesson trong topic")
+    topic_id: int = Field(..., description="ID của topic chứa lesson")
+
+
 class CourseDetailWithProgressResponse(CourseResponse):
     """
     Schema cho course detail với topics, lessons và progress nested
@@ -346,7 +379,7 @@ class CourseDetailWithProgressResponse(CourseResponse):
     current_lesson_id: Optional[int] = Field(
         None, description="Lesson hiện tại đang học"
     )
-    current_lesson: Optional[dict] = Field(
+    current_lesson: Optional[CurrentLessonSummary] = Field(
         None, description="Chi tiết lesson hiện tại đang học"
     )
     last_activity_at: Optional[datetime] = Field(None, description="Hoạt động gần nhất")
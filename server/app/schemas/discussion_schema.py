@@ -1,9 +1,9 @@
 from typing import List, Optional
 
-from pydantic import BaseModel
+from app.schemas.base_schema import CamelCaseModel
 
 
-class DiscussionBase(BaseModel):
+class DiscussionBase(CamelCaseModel):
     """Base schema for discussion data"""
 
     title: str
@@ -17,7 +17,7 @@ class DiscussionCreate(DiscussionBase):
     pass
 
 
-class DiscussionUpdate(BaseModel):
+class DiscussionUpdate(CamelCaseModel):
     """Schema for updating a discussion"""
 
     title: Optional[str] = None
@@ -25,7 +25,7 @@ class DiscussionUpdate(BaseModel):
     category: Optional[str] = None
 
 
-class DiscussionFilters(BaseModel):
+class DiscussionFilters(CamelCaseModel):
     """Schema for discussion filters"""
 
     search: Optional[str] = None
@@ -33,6 +33,7 @@ class DiscussionFilters(BaseModel):
     sort_by: Optional[str] = "newest"  # newest, oldest, most-replies
     page: Optional[int] = 1
     limit: Optional[int] = 10
+    cursor: Optional[str] = None  # keyset cursor, dùng thay cho page
 
 
 class DiscussionResponse(DiscussionBase):
@@ -48,13 +49,15 @@ class DiscussionResponse(DiscussionBase):
         from_attributes = True
 
 
-class DiscussionListResponse(BaseModel):
+class DiscussionListResponse(CamelCaseModel):
     """Schema for paginated discussion list response"""
 
     discussions: List[DiscussionResponse]
     total: int
     page: int
     totalPages: int
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
 
     class Config:
         from_attributes = True
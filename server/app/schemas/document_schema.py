@@ -1,9 +1,9 @@
 from typing import Optional, Any, Dict, List
-from pydantic import BaseModel
+from app.schemas.base_schema import CamelCaseModel
 from datetime import datetime
 
 
-class DocumentStatus(BaseModel):
+class DocumentStatus(CamelCaseModel):
     id: str
     filename: str
     status: str  # "processing", "completed", "failed"
@@ -12,7 +12,7 @@ class DocumentStatus(BaseModel):
     chunks_count: Optional[int] = None
 
 
-class DocumentResponse(BaseModel):
+class DocumentResponse(CamelCaseModel):
     id: str
     filename: str
     status: str
@@ -21,7 +21,7 @@ class DocumentResponse(BaseModel):
     course_id: Optional[int] = None
 
 
-class DocumentProcessingJobResponse(BaseModel):
+class DocumentProcessingJobResponse(CamelCaseModel):
     id: str
     job_id: str
     filename: str
@@ -33,7 +33,7 @@ class DocumentProcessingJobResponse(BaseModel):
     processed_at: Optional[datetime] = None
 
 
-class RunpodWebhookRequest(BaseModel):
+class RunpodWebhookRequest(CamelCaseModel):
     """Schema for Runpod webhook request"""
 
     id: str  # Job ID
@@ -44,19 +44,19 @@ class RunpodWebhookRequest(BaseModel):
     delayTime: Optional[int] = None
 
 
-class DocumentSearchResult(BaseModel):
+class DocumentSearchResult(CamelCaseModel):
     content: str
     metadata: Dict[str, Any]
     score: float
 
 
-class DocumentSearchResponse(BaseModel):
+class DocumentSearchResponse(CamelCaseModel):
     results: List[DocumentSearchResult]
     total: int
     query: str
 
 
-class DocumentStatistics(BaseModel):
+class DocumentStatistics(CamelCaseModel):
     total_documents: int
     processing_documents: int
     completed_documents: int
@@ -64,6 +64,6 @@ class DocumentStatistics(BaseModel):
     total_chunks: int
 
 
-class StoreByTextRequest(BaseModel):
+class StoreByTextRequest(CamelCaseModel):
     text: str
     course_id: Optional[int] = None
@@ -1,20 +1,21 @@
 from typing import List, Optional
-from pydantic import BaseModel, Field
+from pydantic import Field
+from app.schemas.base_schema import CamelCaseModel
 
 
-class GetExerciseSchema(BaseModel):
+class GetExerciseSchema(CamelCaseModel):
     lesson_id: int
     session_id: str
     difficulty: Optional[str] = None
 
 
-class TestCase(BaseModel):
+class TestCase(CamelCaseModel):
     input_data: str = Field(..., description="Dữ liệu đầu vào cho trường hợp thử nghiệm.")
     output_data: str = Field(..., description="Kết quả đầu ra mong đợi.")
     explain: Optional[str] = Field(None, description="Giải thích cho trường hợp thử nghiệm.")
 
 
-class ExerciseDetail(BaseModel):
+class ExerciseDetail(CamelCaseModel):
     """
     Mô tả chi tiết một bài tập giải thuật được tạo ra.
 
@@ -46,20 +47,20 @@ class ExerciseDetail(BaseModel):
     )
 
 
-class UpdateExerciseSchema(BaseModel):
+class UpdateExerciseSchema(CamelCaseModel):
     lesson_id: Optional[int] = None
     session_id: Optional[str] = None
     difficulty: Optional[str] = None
 
 
-class CreateExerciseSchema(BaseModel):
+class CreateExerciseSchema(CamelCaseModel):
     lesson_id: int
     session_id: str
     difficulty: str
     topic_id: int
 
 
-class ExerciseResponse(BaseModel):
+class ExerciseResponse(CamelCaseModel):
     """
     Schema cho response khi truy vấn thông tin bài tập
 
@@ -92,12 +93,12 @@ class ExerciseResponse(BaseModel):
         from_attributes = True
 
 
-class CodeSubmissionRequest(BaseModel):
+class CodeSubmissionRequest(CamelCaseModel):
     code: str = Field(..., description="User's submitted code")
     language: str = Field(..., description="Programming language (e.g., python, javascript, java, cpp, etc.)")
 
 
-class TestCaseResult(BaseModel):
+class TestCaseResult(CamelCaseModel):
     input: str
     expected_output: str
     actual_output: str
@@ -105,12 +106,12 @@ class TestCaseResult(BaseModel):
     error: str | None = None
 
 
-class CodeSubmissionResponse(BaseModel):
+class CodeSubmissionResponse(CamelCaseModel):
     results: list[TestCaseResult]
     all_passed: bool
 
 
-class ExerciseUpdate(BaseModel):
+class ExerciseUpdate(CamelCaseModel):
     """Schema cập nhật bài tập (partial update)."""
 
     title: Optional[str] = None
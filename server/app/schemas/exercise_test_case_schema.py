@@ -2,10 +2,11 @@ from __future__ import annotations
 
 from typing import Optional
 
-from pydantic import BaseModel, Field
+from pydantic import Field
+from app.schemas.base_schema import CamelCaseModel
 
 
-class ExerciseTestCaseBase(BaseModel):
+class ExerciseTestCaseBase(CamelCaseModel):
     input_data: str = Field(..., description="Dữ liệu đầu vào cho test case")
     output_data: str = Field(..., description="Kết quả mong đợi của test case")
     explain: Optional[str] = Field(None, description="Giải thích test case")
@@ -15,7 +16,7 @@ class ExerciseTestCaseCreate(ExerciseTestCaseBase):
     exercise_id: int = Field(..., description="ID bài tập")
 
 
-class ExerciseTestCaseUpdate(BaseModel):
+class ExerciseTestCaseUpdate(CamelCaseModel):
     input_data: Optional[str] = None
     output_data: Optional[str] = None
     explain: Optional[str] = None
@@ -1,10 +1,11 @@
 from datetime import datetime
 from typing import List, Optional, Dict, Any
 
-from pydantic import BaseModel, Field
+from pydantic import Field
+from app.schemas.base_schema import CamelCaseModel
 
 
-class LearningProgressBase(BaseModel):
+class LearningProgressBase(CamelCaseModel):
     """
     Schema cơ bản cho tiến độ học tập, chứa các trường cơ bản nhất
     """
@@ -22,7 +23,7 @@ class LearningProgressCreate(LearningProgressBase):
     completed_lessons: Optional[List[int]] = Field(default_factory=list)
     quiz_scores: Optional[Dict[str, Any]] = Field(default_factory=dict)
 
-class LearningProgressUpdate(BaseModel):
+class LearningProgressUpdate(CamelCaseModel):
     """
     Schema dùng để cập nhật tiến độ học tập
     """
@@ -55,7 +56,7 @@ class LearningProgress(LearningProgressInDB):
     """
     pass
 
-class LearningProgressList(BaseModel):
+class LearningProgressList(CamelCaseModel):
     """
     Schema danh sách tiến độ học tập
     """
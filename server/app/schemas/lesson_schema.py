@@ -1,18 +1,19 @@
-from pydantic import BaseModel, Field
-from typing import Optional, List, Dict, Any
+from pydantic import Field
+from app.schemas.base_schema import CamelCaseModel, PreservedKeysDict
+from typing import Optional, List
 from app.models.user_course_progress_model import ProgressStatus
 from datetime import datetime
 
 from app.schemas.exercise_schema import ExerciseDetail  # noqa: F401 - used by other modules
 
 
-class LessonCompleteResponseSchema(BaseModel):
+class LessonCompleteResponseSchema(CamelCaseModel):
     lesson_id: int
     next_lesson_id: Optional[int] = None
     is_completed: bool
 
 
-class LessonBase(BaseModel):
+class LessonBase(CamelCaseModel):
     """
     Schema cơ bản cho lesson
 
@@ -39,7 +40,7 @@ class LessonResponseSchema(LessonBase):
     is_completed: Optional[bool] = False
 
 
-class ExerciseBase(BaseModel):
+class ExerciseBase(CamelCaseModel):
     """
     Schema cơ bản cho bài tập
 
@@ -79,7 +80,7 @@ class ExerciseResponse(ExerciseBase):
     lesson_id: int
 
 
-class LessonSectionResponse(BaseModel):
+class LessonSectionResponse(CamelCaseModel):
     """
     Schema cho phản hồi thông tin section của lesson
     """
@@ -90,7 +91,7 @@ class LessonSectionResponse(BaseModel):
     )
     content: str = Field(..., description="Nội dung của section")
     order: int = Field(..., description="Thứ tự section trong lesson")
-    options: Optional[Dict[str, Any]] = Field(None, description="Tùy chọn cho quiz")
+    options: Optional[PreservedKeysDict] = Field(None, description="Tùy chọn cho quiz")
     answer: Optional[str] = Field(None, description="Đáp án đúng cho quiz (A, B, C, D)")
     explanation: Optional[str] = Field(None, description="Giải thích cho quiz")
 
@@ -98,14 +99,14 @@ class LessonSectionResponse(BaseModel):
         from_attributes = True
 
 
-class Options(BaseModel):
+class Options(CamelCaseModel):
     A: str
     B: str
     C: str
     D: str
 
 
-class LessonSectionSchema(BaseModel):
+class LessonSectionSchema(CamelCaseModel):
     type: str  # "text", "code", "image", "quiz", "teaching"
     content: str
     order: int = Field(..., description="Thứ tự section trong lesson")
@@ -145,6 +146,25 @@ class LessonWithChildSchema(LessonResponseSchema):
         from_attributes = True
 
 
+class LessonOutlineSchema(CamelCaseModel):
+    """
+    Schema rút gọn của lesson trong mục lục khóa học (không có nội dung section)
+
+    Attributes:
+        id: ID của lesson
+        external_id: External ID của lesson
+        title: Tiêu đề lesson
+        order: Thứ tự lesson trong topic
+        section_count: Số section của lesson
+    """
+
+    id: int = Field(..., description="ID của lesson")
+    external_id: str = Field(..., description="External ID của lesson")
+    title: str = Field(..., description="Tiêu đề lesson")
+    order: int = Field(..., description="Thứ tự lesson trong topic")
+    section_count: int = Field(0, description="Số section của lesson")
+
+
 class LessonDetailWithProgressResponse(LessonWithChildSchema):
     """
     Schema cho lesson detail với progress
@@ -186,7 +206,7 @@ class LessonWithProgressResponse(LessonWithChildSchema):
         from_attributes = True
 
 
-class GenerateLessonRequestSchema(BaseModel):
+class GenerateLessonRequestSchema(CamelCaseModel):
     topic_name: str
     lesson_title: str
     lesson_description: str
@@ -6,12 +6,13 @@ sau đó gắn progress status cho từng lesson
 
 from datetime import datetime
 from typing import List, Optional
-from pydantic import BaseModel, Field
+from pydantic import Field
+from app.schemas.base_schema import CamelCaseModel
 
 from app.models.user_course_progress_model import ProgressStatus
 
 
-class LessonWithProgressSchema(BaseModel):
+class LessonWithProgressSchema(CamelCaseModel):
     """
     Schema cho lesson với thông tin progress
     """
@@ -36,7 +37,7 @@ class LessonWithProgressSchema(BaseModel):
         from_attributes = True
 
 
-class TopicWithProgressSchema(BaseModel):
+class TopicWithProgressSchema(CamelCaseModel):
     """
     Schema cho topic với danh sách lessons và progress
     """
@@ -59,7 +60,7 @@ class TopicWithProgressSchema(BaseModel):
         from_attributes = True
 
 
-class CourseWithNestedProgressSchema(BaseModel):
+class CourseWithNestedProgressSchema(CamelCaseModel):
     """
     Schema cho course với topics và lessons nested, bao gồm progress
     """
@@ -93,7 +94,7 @@ class CourseWithNestedProgressSchema(BaseModel):
         from_attributes = True
 
 
-class ProgressMapResponse(BaseModel):
+class ProgressMapResponse(CamelCaseModel):
     """
     Schema cho progress map - mapping lesson_id -> status
     Dùng để optimize performance khi cần query nhanh
@@ -110,7 +111,7 @@ class ProgressMapResponse(BaseModel):
         from_attributes = True
 
 
-class LessonProgressMap(BaseModel):
+class LessonProgressMap(CamelCaseModel):
     """
     Schema chi tiết cho từng item trong progress map
     """
@@ -1,6 +1,6 @@
-from pydantic import BaseModel
+from app.schemas.base_schema import CamelCaseModel
 
 
-class ChangePasswordSchema(BaseModel):
+class ChangePasswordSchema(CamelCaseModel):
     current_password: str
     new_password: str
@@ -1,10 +1,10 @@
 from datetime import datetime
 from typing import List, Optional
 
-from pydantic import BaseModel
+from app.schemas.base_schema import CamelCaseModel
 
 
-class ReplyBase(BaseModel):
+class ReplyBase(CamelCaseModel):
     """Base schema for reply data"""
     content: str
 
@@ -14,7 +14,7 @@ class ReplyCreate(ReplyBase):
     discussion_id: int
 
 
-class ReplyUpdate(BaseModel):
+class ReplyUpdate(CamelCaseModel):
     """Schema for updating a reply"""
     content: Optional[str] = None
 
@@ -32,7 +32,7 @@ class ReplyResponse(ReplyBase):
         from_attributes = True
 
 
-class ReplyListResponse(BaseModel):
+class ReplyListResponse(CamelCaseModel):
     """Schema for reply list response"""
     replies: List[ReplyResponse]
     total: int
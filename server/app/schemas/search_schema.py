@@ -0,0 +1,41 @@
+from typing import List, Optional
+
+from app.schemas.base_schema import CamelCaseModel
+
+
+class SearchHit(CamelCaseModel):
+    """
+    Một kết quả tìm kiếm
+
+    Attributes:
+        id (int): ID của khóa học/bài học/section
+        title (str): Tiêu đề khóa học hoặc bài học chứa kết quả
+        snippet (str): Đoạn trích có đánh dấu từ khớp bằng <mark>
+        rank (float): Điểm xếp hạng ts_rank_cd
+        course_id (Optional[int]): ID khóa học chứa kết quả
+        lesson_id (Optional[int]): ID bài học chứa kết quả (với section)
+    """
+
+    id: int
+    title: str
+    snippet: str
+    rank: float
+    course_id: Optional[int] = None
+    lesson_id: Optional[int] = None
+
+
+class SearchResponse(CamelCaseModel):
+    """
+    Kết quả tìm kiếm toàn văn nhóm theo loại nội dung
+
+    Attributes:
+        query (str): Chuỗi tìm kiếm
+        courses (List[SearchHit]): Khóa học khớp
+        lessons (List[SearchHit]): Bài học khớp theo tiêu đề/mô tả
+        sections (List[SearchHit]): Nội dung bài học khớp
+    """
+
+    query: str
+    courses: List[SearchHit] = []
+    lessons: List[SearchHit] = []
+    sections: List[SearchHit] = []
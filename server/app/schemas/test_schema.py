@@ -1,15 +1,16 @@
 from datetime import datetime
 from typing import Dict, List, Optional, Any, Union
 
-from pydantic import BaseModel, Field
+from pydantic import Field
+from app.schemas.base_schema import CamelCaseModel
 
 
-class TestQuestionOption(BaseModel):
+class TestQuestionOption(CamelCaseModel):
     id: str
     text: str
 
 
-class TestQuestion(BaseModel):
+class TestQuestion(CamelCaseModel):
     id: str
     title: str
     content: str
@@ -18,7 +19,7 @@ class TestQuestion(BaseModel):
     code_template: Optional[str] = None
 
 
-class TestBase(BaseModel):
+class TestBase(CamelCaseModel):
     topic_id: Optional[int] = None
     course_id: Optional[int] = None
     duration_minutes: int = 60
@@ -28,7 +29,7 @@ class TestCreate(TestBase):
     questions: List[Any] = []
 
 
-class TestUpdate(BaseModel):
+class TestUpdate(CamelCaseModel):
     duration_minutes: Optional[int] = None
     questions: Optional[List[Any]] = None
 
@@ -45,7 +46,7 @@ class TestRead(TestInDB):
     pass
 
 
-class TestSessionBase(BaseModel):
+class TestSessionBase(CamelCaseModel):
     user_id: int
     test_id: int
 
@@ -54,7 +55,7 @@ class TestSessionCreate(TestSessionBase):
     pass
 
 
-class TestSessionUpdate(BaseModel):
+class TestSessionUpdate(CamelCaseModel):
     current_question_index: Optional[int] = None
     answers: Optional[Dict[str, Any]] = None
     time_remaining_seconds: Optional[int] = None
@@ -92,28 +93,28 @@ class TestSessionWithTest(TestSessionRead):
     test: TestRead
 
 
-class TestAnswerSubmit(BaseModel):
+class TestAnswerSubmit(CamelCaseModel):
     question_id: str
     answer: Union[str, List[str], Dict[str, Any]]
 
 
-class TestSubmission(BaseModel):
+class TestSubmission(CamelCaseModel):
     answers: Dict[str, Any]
 
 
-class QuestionFeedback(BaseModel):
+class QuestionFeedback(CamelCaseModel):
     is_correct: bool
     feedback: Optional[str] = None
 
 
-class TestResult(BaseModel):
+class TestResult(CamelCaseModel):
     score: float
     total_questions: int
     correct_answers: int
     feedback: Dict[str, QuestionFeedback] = {}
 
 
-class TestHistorySummary(BaseModel):
+class TestHistorySummary(CamelCaseModel):
     """Schema cho lịch sử làm bài - chỉ thông tin cơ bản"""
 
     session_id: str
@@ -1,13 +1,15 @@
 from typing import List, Optional
 from datetime import datetime
-from pydantic import BaseModel, Field
+from pydantic import Field
+from app.schemas.base_schema import CamelCaseModel
 from app.schemas.lesson_schema import (
     LessonWithChildSchema,
     LessonDetailWithProgressResponse,
+    LessonOutlineSchema,
 )
 
 
-class TopicBase(BaseModel):
+class TopicBase(CamelCaseModel):
     """
     Schema cơ bản cho chủ đề
 
@@ -37,7 +39,7 @@ class CreateTopicSchema(TopicBase):
     external_id: Optional[str] = Field(None, description="ID hiển thị cho người dùng")
 
 
-class UpdateTopicSchema(BaseModel):
+class UpdateTopicSchema(CamelCaseModel):
     """
     Schema cho việc cập nhật chủ đề
 
@@ -93,6 +95,29 @@ class TopicResponse(TopicBase):
         from_attributes = True
 
 
+class TopicOutlineResponse(CamelCaseModel):
+    """
+    Schema rút gọn của topic trong mục lục khóa học
+
+    Attributes:
+        id: ID của chủ đề
+        external_id: ID hiển thị cho người dùng
+        name: Tên chủ đề
+        order: Thứ tự của chủ đề trong khóa học
+        lesson_count: Số lesson của chủ đề
+        lessons: Danh sách lessons (chỉ tiêu đề, thứ tự và số section)
+    """
+
+    id: int = Field(..., description="ID của chủ đề")
+    external_id: Optional[str] = Field(None, description="ID hiển thị cho người dùng")
+    name: str = Field(..., description="Tên chủ đề")
+    order: Optional[int] = Field(None, description="Thứ tự của chủ đề trong khóa học")
+    lesson_count: int = Field(0, description="Số lesson của chủ đề")
+    lessons: List[LessonOutlineSchema] = Field(
+        default_factory=list, description="Danh sách lessons"
+    )
+
+
 class TopicWithLessonsResponse(TopicResponse):
     """
     Schema cho response topic kèm lessons
@@ -114,7 +139,7 @@ class TopicCreate(TopicBase):
     )
 
 
-class TopicUpdate(BaseModel):
+class TopicUpdate(CamelCaseModel):
     """Schema cho việc cập nhật topic (admin)"""
 
     name: Optional[str] = Field(None, min_length=1, max_length=255)
@@ -122,7 +147,7 @@ class TopicUpdate(BaseModel):
     course_id: Optional[int] = None
 
 
-class TopicCourseAssignment(BaseModel):
+class TopicCourseAssignment(CamelCaseModel):
     """Schema cho việc gán topic vào course"""
 
     course_id: Optional[int] = Field(
@@ -130,7 +155,7 @@ class TopicCourseAssignment(BaseModel):
     )
 
 
-class UserTopic(BaseModel):
+class UserTopic(CamelCaseModel):
     """Schema cho trạng thái topic của user"""
 
     user_id: int
@@ -143,7 +168,7 @@ class UserTopic(BaseModel):
         from_attributes = True
 
 
-class TopicWithUserState(BaseModel):
+class TopicWithUserState(CamelCaseModel):
     """Schema cho topic với trạng thái user"""
 
     id: int
@@ -156,7 +181,7 @@ class TopicWithUserState(BaseModel):
         from_attributes = True
 
 
-class TopicWithProgressResponse(BaseModel):
+class TopicWithProgressResponse(CamelCaseModel):
     """
     Schema cho topic với lessons và progress nested
     """
@@ -183,7 +208,7 @@ class TopicWithProgressResponse(BaseModel):
         from_attributes = True
 
 
-class TopicDetailWithProgressResponse(BaseModel):
+class TopicDetailWithProgressResponse(CamelCaseModel):
     """
     Schema cho topic detail với lessons và progress nested
     """
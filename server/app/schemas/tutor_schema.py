@@ -1,8 +1,8 @@
-from pydantic import BaseModel
+from app.schemas.base_schema import CamelCaseModel
 from typing import Optional
 
 
-class AskTutorSchema(BaseModel):
+class AskTutorSchema(CamelCaseModel):
     """
     Schema cho việc gửi yêu cầu hỏi gia sư
     """
@@ -13,7 +13,7 @@ class AskTutorSchema(BaseModel):
     context_id: Optional[str] = None
 
 
-class TutorResponseSchema(BaseModel):
+class TutorResponseSchema(CamelCaseModel):
     """
     Schema cho phản hồi từ gia sư
     """
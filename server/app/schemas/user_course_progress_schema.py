@@ -1,11 +1,12 @@
 from datetime import datetime
 from typing import Optional
-from pydantic import BaseModel, Field
+from pydantic import Field
+from app.schemas.base_schema import CamelCaseModel
 
 from app.models.user_course_progress_model import ProgressStatus
 
 
-class UserCourseProgressBase(BaseModel):
+class UserCourseProgressBase(CamelCaseModel):
     """
     Schema cơ bản cho UserCourseProgress
 
@@ -32,7 +33,7 @@ class UserCourseProgressCreate(UserCourseProgressBase):
     pass
 
 
-class UserCourseProgressUpdate(BaseModel):
+class UserCourseProgressUpdate(CamelCaseModel):
     """
     Schema cho việc cập nhật progress record
     """
@@ -68,7 +69,7 @@ class UserCourseProgressResponse(UserCourseProgressBase):
         from_attributes = True
 
 
-class LessonProgressSummary(BaseModel):
+class LessonProgressSummary(CamelCaseModel):
     """
     Schema tóm tắt tiến độ học lesson
     """
@@ -82,7 +83,7 @@ class LessonProgressSummary(BaseModel):
     )
 
 
-class CourseProgressSummary(BaseModel):
+class CourseProgressSummary(CamelCaseModel):
     """
     Schema tóm tắt tiến độ học khóa học
     """
@@ -1,11 +1,12 @@
 from datetime import datetime
 from typing import Optional
-from pydantic import BaseModel, Field
+from pydantic import Field
+from app.schemas.base_schema import CamelCaseModel
 
 from app.schemas.user_course_progress_schema import CourseProgressSummary
 
 
-class UserCourseBase(BaseModel):
+class UserCourseBase(CamelCaseModel):
     """
     Schema cơ bản cho việc đăng ký khóa học
 
@@ -35,14 +36,22 @@ class UserCourseResponse(UserCourseBase):
         current_topic: Topic hiện tại (cached field)
         current_lesson: Lesson hiện tại (cached field)
         current_section: Section hiện tại (cached field)
+        completed_lessons: Số lesson đã hoàn thành (cached field)
+        in_progress_lessons: Số lesson đang học (cached field)
+        last_activity_at: Hoạt động gần nhất (cached field)
         created_at: Thời điểm đăng ký
         updated_at: Thời điểm cập nhật gần nhất
     """
 
     id: int = Field(..., description="ID của đăng ký")
-    current_topic: int = Field(..., description="Topic hiện tại")
-    current_lesson: int = Field(..., description="Lesson hiện tại")
+    current_topic: Optional[int] = Field(None, description="Topic hiện tại")
+    current_lesson: Optional[int] = Field(None, description="Lesson hiện tại")
     current_section: int = Field(..., description="Section hiện tại")
+    completed_lessons: int = Field(0, description="Số lesson đã hoàn thành")
+    in_progress_lessons: int = Field(0, description="Số lesson đang học")
+    last_activity_at: Optional[datetime] = Field(
+        None, description="Hoạt động gần nhất"
+    )
     created_at: datetime = Field(..., description="Thời điểm đăng ký")
     updated_at: datetime = Field(..., description="Thời điểm cập nhật gần nhất")
 
@@ -62,7 +71,7 @@ class UserCourseWithProgressResponse(UserCourseResponse):
     )
 
 
-class CourseEnrollmentResponse(BaseModel):
+class CourseEnrollmentResponse(CamelCaseModel):
     """
     Schema cho response khi đăng ký khóa học
 
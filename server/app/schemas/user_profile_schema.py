@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import List, Optional
 
-from pydantic import BaseModel
+from app.schemas.base_schema import CamelCaseModel
 
 from app.schemas.auth_schema import UserBase
 from app.schemas.badge_schema import Badge
@@ -13,7 +13,7 @@ from app.schemas.user_stats_schema import (
 )
 
 
-class ProfileBadge(BaseModel):
+class ProfileBadge(CamelCaseModel):
     """
     Schema cho huy hiệu trong profile response
     """
@@ -27,7 +27,7 @@ class ProfileBadge(BaseModel):
         from_attributes = True
 
 
-class UserUpdate(BaseModel):
+class UserUpdate(CamelCaseModel):
     """
     Schema cho việc cập nhật thông tin người dùng
 
@@ -82,13 +82,13 @@ class User(UserBase):
         from_attributes = True
 
 
-class UserResponse(BaseModel):
+class UserResponse(CamelCaseModel):
     id: int
     username: str
     email: str
 
 
-class UserExcludeSecret(BaseModel):
+class UserExcludeSecret(CamelCaseModel):
     """
     Schema cho thông tin User trả về, không bao gồm mật khẩu
 
@@ -114,7 +114,7 @@ class UserExcludeSecret(BaseModel):
         from_attributes = True
 
 
-class UserProfileResponse(BaseModel):
+class UserProfileResponse(CamelCaseModel):
     id: int
     username: str
     fullName: str
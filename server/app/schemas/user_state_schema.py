@@ -1,10 +1,11 @@
 from datetime import datetime
 from typing import Optional, Dict, Any
 
-from pydantic import BaseModel, Field
+from pydantic import Field
+from app.schemas.base_schema import CamelCaseModel
 
 
-class UserStateBase(BaseModel):
+class UserStateBase(CamelCaseModel):
     """
     Schema cơ bản cho trạng thái người dùng, chứa các trường cơ bản nhất
     """
@@ -27,7 +28,7 @@ class UserStateCreate(UserStateBase):
     notifications: Optional[Dict[str, Any]] = None
 
 
-class UserStateUpdate(BaseModel):
+class UserStateUpdate(CamelCaseModel):
     """
     Schema dùng để cập nhật trạng thái người dùng
     """
@@ -1,9 +1,9 @@
 from typing import Optional
 
-from pydantic import BaseModel
+from app.schemas.base_schema import CamelCaseModel
 
 
-class Activity(BaseModel):
+class Activity(CamelCaseModel):
     """
     Schema cho hoạt động của người dùng
     
@@ -23,7 +23,7 @@ class Activity(BaseModel):
     progress: Optional[str] = None
 
 
-class UserStats(BaseModel):
+class UserStats(CamelCaseModel):
     """
     Schema cho thống kê người dùng
     
@@ -43,7 +43,7 @@ class UserStats(BaseModel):
     problems_solved: int = 0
 
 
-class LearningProgress(BaseModel):
+class LearningProgress(CamelCaseModel):
     """
     Schema cho tiến độ học tập của người dùng
     
@@ -60,7 +60,7 @@ class LearningProgress(BaseModel):
         from_attributes = True
 
 
-class CourseProgress(BaseModel):
+class CourseProgress(CamelCaseModel):
     """
     Schema cho tiến độ khóa học
     
@@ -1,29 +1,56 @@
 from fastapi import HTTPException, status, Depends
-from sqlalchemy import and_, func, select, text
+from sqlalchemy import (
+    ARRAY,
+    Integer,
+    and_,
+    any_,
+    bindparam,
+    delete,
+    distinct,
+    exists,
+    func,
+    literal,
+    select,
+    text,
+)
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from app.database.database import get_async_db
+from app.database.database import get_async_db, get_async_read_db
+from app.database.lesson_navigation import lesson_sequence_order_by
+from app.database.pagination import build_keyset_page, keyset_statement
+from app.database.read_replica import read_only
+from app.database.repository import Repository
 
 from app.models.user_course_model import UserCourse
 from app.models.user_course_progress_model import UserCourseProgress, ProgressStatus
 from app.models.topic_model import Topic
+from app.models.lesson_model import Lesson, LessonSection
 from app.models.course_model import Course
 from app.schemas.course_schema import (
     BulkDeleteCoursesResponse,
     CourseCreate,
     CourseDetailResponse,
     CourseDetailWithProgressResponse,
+    CourseListItem,
+    CourseListResponse,
+    CourseOutlineResponse,
     TopicWithProgressResponse,
     UserCourseListItem,
 )
 from app.schemas.lesson_schema import (
+    LessonOutlineSchema,
+    LessonSectionResponse,
     LessonWithChildSchema,
-    LessonSectionSchema,
     LessonWithProgressResponse,
 )
-from app.schemas.topic_schema import TopicResponse
+from app.schemas.topic_schema import TopicOutlineResponse, TopicResponse
+from app.services.user_course_progress_service import (
+    UserCourseProgressService,
+    completion_percentage,
+    total_lessons_subquery,
+)
 from typing import Optional
 
 
@@ -31,9 +58,12 @@ class CourseService:
     def __init__(
         self,
         db: AsyncSession,
+        read_db: Optional[AsyncSession] = None,
     ):
         self.db = db
+        self.read_db = read_db
 
+    @read_only
     async def get_courses(self, skip: int = 0, limit: int = 10):
         """
         Lấy danh sách khóa học với phân trang
@@ -48,41 +78,258 @@ class CourseService:
         result = await self.db.execute(
             select(Course)
             .filter(Course.is_published == True)
-            .order_by(Course.created_at.desc())
+            .order_by(Course.created_at.desc(), Course.id.desc())
             .offset(skip)
             .limit(limit)
         )
         return result.scalars().all()
 
-    async def get_course(self, course_id: int, user_id: int | None = None):
+    @read_only
+    async def get_course_catalog(
+        self,
+        user_id: Optional[int] = None,
+        page: int = 1,
+        limit: int = 10,
+        cursor: Optional[str] = None,
+    ) -> CourseListResponse:
+        """
+        Lấy một trang khóa học đã công khai kèm tổng số và trạng thái đăng ký
+
+        Trang khóa học, tổng số (window count) và ``is_enrolled`` được lấy trong một
+        câu truy vấn: LEFT JOIN với các khóa học người dùng đã đăng ký, nên chi phí
+        chỉ phụ thuộc kích thước trang. Trang đầu và trang theo ``cursor`` dùng
+        phân trang keyset, ``page`` > 1 dùng OFFSET.
+
+        Args:
+            user_id: ID người dùng hiện tại, None nếu chưa đăng nhập
+            page: Số trang, bắt đầu từ 1 (bỏ qua khi có ``cursor``)
+            limit: Số lượng item mỗi trang
+            cursor: Cursor lấy từ ``nextCursor``/``prevCursor`` của trang trước
+
+        Returns:
+            CourseListResponse: Danh sách khóa học và thông tin phân trang
+        """
+        published = Course.is_published == True
+        if cursor:
+            # Điều kiện keyset làm window count chỉ đếm phần còn lại, đếm riêng
+            total_column = (
+                select(func.count(Course.id)).where(published).scalar_subquery()
+            )
+        else:
+            total_column = func.count().over()
+
+        if user_id is not None:
+            enrolled_course_ids = (
+                select(UserCourse.course_id)
+                .where(UserCourse.user_id == user_id)
+                .distinct()
+                .subquery()
+            )
+            is_enrolled = enrolled_course_ids.c.course_id.is_not(None)
+        else:
+            is_enrolled = literal(False)
+
+        stmt = select(
+            Course, is_enrolled.label("is_enrolled"), total_column.label("total")
+        ).where(published)
+        if user_id is not None:
+            stmt = stmt.outerjoin(
+                enrolled_course_ids, enrolled_course_ids.c.course_id == Course.id
+            )
+
+        course_page = None
+        if cursor or page == 1:
+            result = await self.db.execute(
+                keyset_statement(stmt, Course, limit=limit, cursor=cursor)
+            )
+            course_page = build_keyset_page(
+                result.all(),
+                limit=limit,
+                cursor=cursor,
+                key=lambda row: (row.Course.created_at, row.Course.id),
+            )
+            rows = course_page.items
+        else:
+            result = await self.db.execute(
+                stmt.order_by(Course.created_at.desc(), Course.id.desc())
+                .offset((page - 1) * limit)
+                .limit(limit)
+            )
+            rows = result.all()
+
+        if rows:
+            total = rows[0].total
+        elif page == 1 and not cursor:
+            total = 0
+        else:
+            # Trang vượt quá cuối danh sách không có dòng nào để đọc window count
+            total = (
+                await self.db.execute(select(func.count(Course.id)).where(published))
+            ).scalar_one()
+
+        return CourseListResponse(
+            items=[
+                CourseListItem(
+                    id=row.Course.id,
+                    title=row.Course.title,
+                    description=row.Course.description,
+                    thumbnail_url=row.Course.thumbnail_url,
+                    level=row.Course.level,
+                    duration=row.Course.duration,
+                    price=row.Course.price,
+                    tags=row.Course.tags,
+                    created_at=row.Course.created_at,
+                    updated_at=row.Course.updated_at,
+                    is_enrolled=bool(row.is_enrolled),
+                )
+                for row in rows
+            ],
+            total=total,
+            page=page,
+            limit=limit,
+            totalPages=(total + limit - 1) // limit,
+            next_cursor=course_page.next_cursor if course_page else None,
+            prev_cursor=course_page.prev_cursor if course_page else None,
+        )
+
+    # Các cột của Course trong CourseDetailResponse/CourseOutlineResponse
+    _DETAIL_COLUMNS = (
+        Course.id,
+        Course.title,
+        Course.description,
+        Course.thumbnail_url,
+        Course.level,
+        Course.duration,
+        Course.price,
+        Course.is_published,
+        Course.tags,
+        Course.requirements,
+        Course.what_you_will_learn,
+        Course.test_generation_status,
+        Course.created_at,
+        Course.updated_at,
+    )
+
+    @read_only
+    async def get_course(
+        self,
+        course_id: int,
+        user_id: int | None = None,
+        include_sections: bool = False,
+    ) -> CourseOutlineResponse | CourseDetailResponse:
         """
         Lấy thông tin chi tiết của một khóa học
 
+        Mặc định trả về mục lục (outline): chỉ chọn các cột cần thiết của topic và
+        lesson kèm số section, không nạp ORM entity hay nội dung section. Nội dung
+        section được tải khi mở từng lesson, hoặc khi ``include_sections`` = True.
+
         Args:
             course_id: ID của khóa học
+            user_id: ID người dùng hiện tại để xác định is_enrolled (nếu có)
+            include_sections: True để trả về đầy đủ topics, lessons và sections
 
         Returns:
-            Course: Thông tin chi tiết của khóa học
+            CourseOutlineResponse | CourseDetailResponse: Mục lục khóa học, hoặc
+            chi tiết đầy đủ khi ``include_sections`` = True
         """
+        if user_id is None:
+            is_enrolled = literal(False)
+        else:
+            is_enrolled = (
+                select(UserCourse.id)
+                .where(
+                    UserCourse.user_id == user_id,
+                    UserCourse.course_id == Course.id,
+                )
+                .exists()
+            )
         result = await self.db.execute(
-            select(Course)
-            .options(selectinload(Course.topics).selectinload(Topic.lessons))
-            .filter(Course.id == course_id)
+            select(*self._DETAIL_COLUMNS, is_enrolled.label("is_enrolled")).where(
+                Course.id == course_id
+            )
         )
-        course = result.scalar_one_or_none()
+        course = result.mappings().one_or_none()
         if course is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Không tìm thấy khóa học với ID {course_id}",
             )
-        list_topic_response = []
 
-        for topic in course.topics:
-            is_completed = False
-            progress = 0
-            completed_lessons = 0
+        if include_sections:
+            topics = await self._get_topics_with_sections(course_id)
+            return CourseDetailResponse(**course, topics=topics)
+
+        result = await self.db.execute(self._outline_statement(course_id))
+        topics: dict[int, TopicOutlineResponse] = {}
+        for row in result.all():
+            topic = topics.get(row.topic_id)
+            if topic is None:
+                topic = topics[row.topic_id] = TopicOutlineResponse(
+                    id=row.topic_id,
+                    external_id=row.topic_external_id,
+                    name=row.topic_name,
+                    order=row.topic_order,
+                )
+            if row.lesson_id is not None:
+                topic.lessons.append(
+                    LessonOutlineSchema(
+                        id=row.lesson_id,
+                        external_id=row.lesson_external_id,
+                        title=row.lesson_title,
+                        order=row.lesson_order,
+                        section_count=row.section_count,
+                    )
+                )
+                topic.lesson_count += 1
+
+        return CourseOutlineResponse(**course, topics=list(topics.values()))
+
+    @staticmethod
+    def _outline_statement(course_id: int):
+        """
+        Câu truy vấn mục lục: mỗi dòng là một lesson (hoặc topic chưa có lesson)
+        kèm số section, xếp theo thứ tự topic rồi lesson
+        """
+        return (
+            select(
+                Topic.id.label("topic_id"),
+                Topic.external_id.label("topic_external_id"),
+                Topic.name.label("topic_name"),
+                Topic.order.label("topic_order"),
+                Lesson.id.label("lesson_id"),
+                Lesson.external_id.label("lesson_external_id"),
+                Lesson.title.label("lesson_title"),
+                Lesson.order.label("lesson_order"),
+                func.count(LessonSection.id).label("section_count"),
+            )
+            .select_from(Topic)
+            .outerjoin(Lesson, Lesson.topic_id == Topic.id)
+            .outerjoin(LessonSection, LessonSection.lesson_id == Lesson.id)
+            .where(Topic.course_id == course_id)
+            .group_by(Topic.id, Lesson.id)
+            .order_by(*lesson_sequence_order_by())
+        )
+
+    async def _get_topics_with_sections(self, course_id: int) -> list[TopicResponse]:
+        """
+        Lấy đầy đủ topics, lessons và sections của khóa học (dạng nặng)
+
+        Args:
+            course_id: ID của khóa học
+
+        Returns:
+            list[TopicResponse]: Topics kèm lessons và sections
+        """
+        result = await self.db.execute(
+            select(Topic)
+            .options(selectinload(Topic.lessons).selectinload(Lesson.sections))
+            .where(Topic.course_id == course_id)
+        )
+        topics = sorted(result.scalars().all(), key=lambda x: (x.order or 0, x.id))
 
-            topic_response = TopicResponse(
+        return [
+            TopicResponse(
                 id=topic.id,
                 lessons=[
                     LessonWithChildSchema(
@@ -92,22 +339,17 @@ class CourseService:
                         order=lesson.order,
                         external_id=lesson.external_id,
                         sections=[
-                            LessonSectionSchema(
-                                type=section.type,
-                                content=section.content,
-                                order=section.order,
-                                options=section.options,
-                                answer=section.answer,
-                                explanation=section.explanation,
+                            LessonSectionResponse.model_validate(section)
+                            for section in sorted(
+                                lesson.sections, key=lambda x: x.order
                             )
-                            for section in lesson.sections
                         ],
                         exercises=[],
                         is_completed=False,
                         next_lesson_id=None,
                         prev_lesson_id=None,
                     )
-                    for lesson in topic.lessons
+                    for lesson in sorted(topic.lessons, key=lambda x: x.order)
                 ],
                 name=topic.name,
                 description=topic.description,
@@ -117,50 +359,12 @@ class CourseService:
                 updated_at=topic.updated_at,
                 external_id=topic.external_id,
                 course_id=topic.course_id,
-                is_completed=is_completed,
-                progress=progress,
-                completed_lessons=completed_lessons,
-            )
-            list_topic_response.append(topic_response)
-
-        if not course:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Không tìm thấy khóa học với ID {course_id}",
+                is_completed=False,
+                progress=0,
+                completed_lessons=0,
             )
-        is_enrolled = False
-
-        if user_id is not None:
-            result = await self.db.execute(
-                select(UserCourse).filter(
-                    and_(
-                        UserCourse.user_id == user_id,
-                        UserCourse.course_id == course_id,
-                    )
-                )
-            )
-            user_course = result.scalar_one_or_none()
-            if user_course is not None:
-                is_enrolled = True
-
-        return CourseDetailResponse(
-            description=course.description,
-            thumbnail_url=course.thumbnail_url,
-            id=course.id,
-            created_at=course.created_at,
-            updated_at=course.updated_at,
-            test_generation_status=course.test_generation_status,
-            is_enrolled=is_enrolled,
-            title=course.title,
-            level=course.level,
-            topics=list_topic_response,
-            duration=course.duration,
-            price=course.price,
-            is_published=course.is_published,
-            tags=course.tags,
-            requirements=course.requirements,
-            what_you_will_learn=course.what_you_will_learn,
-        )
+            for topic in topics
+        ]
 
     async def create_course(self, course_data: CourseCreate):
         """
@@ -274,6 +478,9 @@ class CourseService:
         """
         Xóa nhiều khóa học cùng lúc, bao gồm tất cả topics, lessons, và lesson sections
 
+        Số lượng câu truy vấn không phụ thuộc số ID: một câu thống kê cho tất cả
+        khóa học và một câu DELETE, database tự xóa dữ liệu con (ON DELETE CASCADE).
+
         Args:
             course_ids: Danh sách ID các khóa học cần xóa
 
@@ -286,93 +493,66 @@ class CourseService:
                 - errors: Danh sách lỗi chi tiết
                 - deleted_items: Thống kê chi tiết số lượng items đã xóa
         """
-        from app.models.topic_model import Topic
-        from app.models.lesson_model import Lesson, LessonSection
+        course_ids = list(dict.fromkeys(course_ids))
+        ids_param = bindparam("course_ids", course_ids, type_=ARRAY(Integer))
 
         deleted_courses = []
         failed_courses = []
         errors = []
         deleted_items = {"courses": 0, "topics": 0, "lessons": 0, "lesson_sections": 0}
 
-        for course_id in course_ids:
-            try:
-                # Tìm khóa học cần xóa
-                result = await self.db.execute(
-                    select(Course).filter(Course.id == course_id)
-                )
-                course = result.scalars().first()
-                if not course:
+        try:
+            result = await self.db.execute(self._bulk_delete_stats_statement(ids_param))
+            stats = {row.id: row for row in result.all()}
+
+            deletable_ids = []
+            for course_id in course_ids:
+                row = stats.get(course_id)
+                if row is None:
                     failed_courses.append(course_id)
                     errors.append(f"Không tìm thấy khóa học với ID {course_id}")
-                    continue
-
-                result = await self.db.execute(
-                    select(func.count())
-                    .select_from(UserCourse)
-                    .where(UserCourse.course_id == course_id)
-                )
-                enrollment_count = result.scalar_one()
-
-                if enrollment_count > 0:
+                elif row.enrollment_count > 0:
                     failed_courses.append(course_id)
                     errors.append(
-                        f"Khóa học {course_id} đang có {enrollment_count} học viên đăng ký, không thể xóa"
+                        f"Khóa học {course_id} đang có {row.enrollment_count} học viên đăng ký, không thể xóa"
                     )
-                    continue
+                else:
+                    deletable_ids.append(course_id)
 
-                # Đếm số lượng items sẽ bị xóa để logging
-                topics_count_result = await self.db.execute(
-                    select(func.count())
-                    .select_from(Topic)
-                    .where(Topic.course_id == course_id)
+            if deletable_ids:
+                # Điều kiện NOT EXISTS được kiểm tra lại khi xóa, khóa học có người
+                # đăng ký sau câu thống kê sẽ không bị xóa
+                result = await self.db.execute(
+                    delete(Course)
+                    .where(
+                        Course.id == any_(ids_param),
+                        ~exists().where(UserCourse.course_id == Course.id),
+                    )
+                    .returning(Course.id)
+                    .execution_options(synchronize_session=False)
                 )
-                topics_count = topics_count_result.scalar_one()
+                removed_ids = set(result.scalars().all())
 
-                lessons_count_result = await self.db.execute(
-                    select(func.count())
-                    .select_from(Lesson)
-                    .join(Topic, Lesson.topic_id == Topic.id)
-                    .where(Topic.course_id == course_id)
-                )
-                lessons_count = lessons_count_result.scalar_one()
-                sections_count_result = await self.db.execute(
-                    select(func.count())
-                    .select_from(LessonSection)
-                    .join(Lesson, LessonSection.lesson_id == Lesson.id)
-                    .join(Topic, Lesson.topic_id == Topic.id)
-                    .where(Topic.course_id == course_id)
-                )
-                sections_count = sections_count_result.scalar_one()
-
-                # Xóa khóa học (cascade sẽ tự động xóa topics, lessons, sections)
-                await self.db.delete(course)
-                deleted_courses.append(course_id)
-
-                # Cập nhật thống kê
-                deleted_items["courses"] += 1
-                deleted_items["topics"] += topics_count
-                deleted_items["lessons"] += lessons_count
-                deleted_items["lesson_sections"] += sections_count
-
-            except SQLAlchemyError as e:
-                failed_courses.append(course_id)
-                errors.append(f"Lỗi khi xóa khóa học {course_id}: {str(e)}")
-                continue
-            except Exception as e:
-                failed_courses.append(course_id)
-                errors.append(
-                    f"Lỗi không xác định khi xóa khóa học {course_id}: {str(e)}"
-                )
-                continue
+                for course_id in deletable_ids:
+                    if course_id not in removed_ids:
+                        failed_courses.append(course_id)
+                        errors.append(
+                            f"Khóa học {course_id} đang có học viên đăng ký, không thể xóa"
+                        )
+                        continue
+
+                    row = stats[course_id]
+                    deleted_courses.append(course_id)
+                    deleted_items["courses"] += 1
+                    deleted_items["topics"] += row.topic_count
+                    deleted_items["lessons"] += row.lesson_count
+                    deleted_items["lesson_sections"] += row.section_count
 
-        try:
-            # Commit tất cả các thay đổi
-            if deleted_courses:
                 await self.db.commit()
         except SQLAlchemyError as e:
             await self.db.rollback()
-            # Nếu commit thất bại, tất cả courses đều failed
-            failed_courses.extend(deleted_courses)
+            # Lỗi trong transaction, không khóa học nào bị xóa
+            failed_courses = list(course_ids)
             deleted_courses = []
             deleted_items = {
                 "courses": 0,
@@ -380,7 +560,7 @@ class CourseService:
                 "lessons": 0,
                 "lesson_sections": 0,
             }
-            errors.append(f"Lỗi khi commit transaction: {str(e)}")
+            errors.append(f"Lỗi khi xóa khóa học: {str(e)}")
 
         return BulkDeleteCoursesResponse(
             deleted_count=len(deleted_courses),
@@ -391,6 +571,59 @@ class CourseService:
             deleted_items=deleted_items,
         )
 
+    @staticmethod
+    def _bulk_delete_stats_statement(ids_param):
+        """
+        Câu truy vấn đếm số học viên đăng ký, topics, lessons và lesson sections
+        của tất cả khóa học cần xóa
+
+        Args:
+            ids_param: Tham số mảng ID khóa học
+
+        Returns:
+            Select: Mỗi dòng là một khóa học tồn tại (id, enrollment_count,
+                topic_count, lesson_count, section_count)
+        """
+        enrollments = (
+            select(UserCourse.course_id, func.count().label("enrollment_count"))
+            .where(UserCourse.course_id == any_(ids_param))
+            .group_by(UserCourse.course_id)
+            .cte("course_enrollments")
+        )
+        topics = (
+            select(Topic.course_id, func.count().label("topic_count"))
+            .where(Topic.course_id == any_(ids_param))
+            .group_by(Topic.course_id)
+            .cte("course_topics")
+        )
+        lessons = (
+            select(
+                Topic.course_id,
+                func.count(distinct(Lesson.id)).label("lesson_count"),
+                func.count(LessonSection.id).label("section_count"),
+            )
+            .join(Lesson, Lesson.topic_id == Topic.id)
+            .outerjoin(LessonSection, LessonSection.lesson_id == Lesson.id)
+            .where(Topic.course_id == any_(ids_param))
+            .group_by(Topic.course_id)
+            .cte("course_lessons")
+        )
+        return (
+            select(
+                Course.id,
+                func.coalesce(enrollments.c.enrollment_count, 0).label(
+                    "enrollment_count"
+                ),
+                func.coalesce(topics.c.topic_count, 0).label("topic_count"),
+                func.coalesce(lessons.c.lesson_count, 0).label("lesson_count"),
+                func.coalesce(lessons.c.section_count, 0).label("section_count"),
+            )
+            .outerjoin(enrollments, enrollments.c.course_id == Course.id)
+            .outerjoin(topics, topics.c.course_id == Course.id)
+            .outerjoin(lessons, lessons.c.course_id == Course.id)
+            .where(Course.id == any_(ids_param))
+        )
+
     async def enroll_course(self, user_id: int, course_id: int):
         """
         Đăng ký khóa học cho người dùng
@@ -431,10 +664,14 @@ class CourseService:
                     detail="Người dùng đã đăng ký khóa học này",
                 )
 
-            # Tạo đăng ký mới
+            # Tạo đăng ký mới, bài học hiện tại là bài đầu tiên của khóa học
             enrollment = UserCourse(user_id=user_id, course_id=course_id)
-            self.db.add(enrollment)
-            await self.db.commit()
+            async with Repository(UserCourse, self.db).unit_of_work():
+                self.db.add(enrollment)
+                await self.db.flush()
+                await UserCourseProgressService(
+                    self.db
+                ).recompute_progress_counters([enrollment.id])
             await self.db.refresh(enrollment)
 
             # Kiểm tra xem có test đầu vào cho khóa học này không
@@ -463,6 +700,11 @@ class CourseService:
         """
         Lấy danh sách khóa học mà người dùng đã đăng ký, kèm progress
 
+        Dùng một câu truy vấn bất kể số khóa học đã đăng ký: progress và bài học
+        hiện tại (bài đầu tiên chưa hoàn thành theo thứ tự topic/lesson, hoặc bài
+        cuối cùng nếu đã hoàn thành hết) đọc từ bộ đếm trên user_courses, phần trăm
+        tính theo số bài hiện có của khóa học.
+
         Args:
             user_id: ID của người dùng
 
@@ -470,113 +712,51 @@ class CourseService:
             List[UserCourseListItem]: Danh sách khóa học với trường progress
         """
         try:
-
-            # Lấy danh sách khóa học mà người dùng đã đăng ký
-            enrollments = await self.db.execute(
-                select(UserCourse).filter(UserCourse.user_id == user_id)
-            )
-            enrollments = enrollments.scalars().all()
-            course_ids = [enrollment.course_id for enrollment in enrollments]
-
-            courses = await self.db.execute(
-                select(Course)
-                .options(selectinload(Course.topics).selectinload(Topic.lessons))
-                .filter(Course.id.in_(course_ids))
+            # Mỗi khóa học lấy một lần đăng ký (user_course) của người dùng
+            enrollments = (
+                select(func.min(UserCourse.id).label("user_course_id"))
+                .where(UserCourse.user_id == user_id)
+                .group_by(UserCourse.course_id)
+                .subquery()
             )
-            courses = courses.scalars().all()
 
-            # Tính progress cho từng khóa học
-            result = []
-            for course in courses:
-                # Lấy user_course_id
-                user_course = next(
-                    (e for e in enrollments if e.course_id == course.id), None
-                )
-                user_course_id = user_course.id if user_course else None
-
-                # Đếm tổng số bài học
-                total_lessons = 0
-                for topic in course.topics:
-                    total_lessons += len(topic.lessons)
-
-                # Đếm số bài đã hoàn thành bằng một query duy nhất
-                completed_lessons = 0
-                if user_course_id:
-                    progress_records = await self.db.execute(
-                        select(func.count(UserCourseProgress.id)).filter(
-                            UserCourseProgress.user_course_id == user_course_id,
-                            UserCourseProgress.status == ProgressStatus.COMPLETED,
-                        )
+            rows = (
+                await self.db.execute(
+                    select(
+                        Course,
+                        UserCourse,
+                        total_lessons_subquery(Course.id).label("total_lessons"),
                     )
-                    completed_lessons = progress_records.scalar() or 0
-
-                progress = (
-                    (completed_lessons / total_lessons * 100)
-                    if total_lessons > 0
-                    else 0.0
+                    .join(UserCourse, UserCourse.course_id == Course.id)
+                    .join(enrollments, enrollments.c.user_course_id == UserCourse.id)
+                    .order_by(UserCourse.id)
                 )
-
-                # Tìm bài học hiện tại (bài học đầu tiên chưa hoàn thành)
-                current_topic_id = None
-                current_lesson_id = None
-
-                if user_course_id and total_lessons > 0:
-                    # Tìm tất cả các bài học đã hoàn thành
-                    completed_lesson_records = await self.db.execute(
-                        select(UserCourseProgress.lesson_id).filter(
-                            UserCourseProgress.user_course_id == user_course_id,
-                            UserCourseProgress.status == ProgressStatus.COMPLETED,
-                        )
-                    )
-                    completed_lesson_ids = set(completed_lesson_records.scalars().all())
-
-                    # Tìm bài học đầu tiên chưa hoàn thành
-                    found_current = False
-                    for topic in sorted(course.topics, key=lambda t: t.order):
-                        if found_current:
-                            break
-                        for lesson in sorted(
-                            topic.lessons, key=lambda lesson: lesson.order
-                        ):
-                            if lesson.id not in completed_lesson_ids:
-                                current_topic_id = topic.id
-                                current_lesson_id = lesson.id
-                                found_current = True
-                                break
-
-                    # Nếu tất cả bài học đã hoàn thành, lấy bài học cuối cùng
-                    if not found_current and course.topics:
-                        last_topic = max(course.topics, key=lambda t: t.order)
-                        if last_topic.lessons:
-                            last_lesson = max(
-                                last_topic.lessons, key=lambda lesson: lesson.order
-                            )
-                            current_topic_id = last_topic.id
-                            current_lesson_id = last_lesson.id
-
-                result.append(
-                    UserCourseListItem(
-                        id=course.id,
-                        title=course.title,
-                        description=course.description,
-                        thumbnail_url=course.thumbnail_url,
-                        level=course.level,
-                        duration=course.duration,
-                        price=course.price,
-                        is_published=course.is_published,
-                        tags=course.tags,
-                        requirements=course.requirements,
-                        what_you_will_learn=course.what_you_will_learn,
-                        created_at=course.created_at,
-                        updated_at=course.updated_at,
-                        test_generation_status=course.test_generation_status,
-                        progress=round(progress, 2),
-                        current_topic_id=current_topic_id,
-                        current_lesson_id=current_lesson_id,
-                    )
+            ).all()
+
+            return [
+                UserCourseListItem(
+                    id=course.id,
+                    title=course.title,
+                    description=course.description,
+                    thumbnail_url=course.thumbnail_url,
+                    level=course.level,
+                    duration=course.duration,
+                    price=course.price,
+                    is_published=course.is_published,
+                    tags=course.tags,
+                    requirements=course.requirements,
+                    what_you_will_learn=course.what_you_will_learn,
+                    created_at=course.created_at,
+                    updated_at=course.updated_at,
+                    test_generation_status=course.test_generation_status,
+                    progress=completion_percentage(
+                        user_course.completed_lessons, total_lessons
+                    ),
+                    current_topic_id=user_course.current_topic,
+                    current_lesson_id=user_course.current_lesson,
                 )
-
-            return result
+                for course, user_course, total_lessons in rows
+            ]
         except SQLAlchemyError as e:
             raise HTTPException(
                 status_code=500,
@@ -688,7 +868,13 @@ class CourseService:
     async def get_course_with_progress(
         self, course_id: int, user_id: Optional[int] = None
     ) -> CourseDetailWithProgressResponse:
-        """Lấy course với nested progress data"""
+        """
+        Lấy course với nested progress data
+
+        Trạng thái từng lesson lấy từ user_course_progress, còn tóm tắt cấp khóa
+        học (số bài đã hoàn thành, phần trăm, bài hiện tại, hoạt động gần nhất)
+        đọc từ bộ đếm trên user_courses.
+        """
         # Get course with topics and lessons
         course = await self.db.execute(
             select(Course)
@@ -701,6 +887,7 @@ class CourseService:
             raise HTTPException(status_code=404, detail="Course not found")
 
         # Check enrollment
+        user_course = None
         user_course_id = None
         is_enrolled = False
         if user_id:
@@ -729,12 +916,6 @@ class CourseService:
         # Build topics with progress
         topics = []
         total_lessons = 0
-        completed_lessons = 0
-        in_progress_lessons = 0
-        not_started_lessons = 0
-        current_topic_id = None
-        current_lesson_id = None
-        last_activity_at = None
 
         for topic in sorted(course.topics, key=lambda x: x.order or 0):
             # Build lessons for this topic
@@ -769,24 +950,8 @@ class CourseService:
                         )
                     )
 
-                    # Track current position and last activity
-                    if progress.status == ProgressStatus.IN_PROGRESS:
-                        current_topic_id = topic.id
-                        current_lesson_id = lesson.id
-
-                    if not last_activity_at or (
-                        progress.updated_at and progress.updated_at > last_activity_at
-                    ):
-                        last_activity_at = progress.updated_at
-
-                # Count lesson status
                 if lesson_status == ProgressStatus.COMPLETED:
-                    completed_lessons += 1
                     topic_completed += 1
-                elif lesson_status == ProgressStatus.IN_PROGRESS:
-                    in_progress_lessons += 1
-                else:
-                    not_started_lessons += 1
 
                 total_lessons += 1
 
@@ -828,10 +993,18 @@ class CourseService:
                 )
             )
 
-        # Calculate overall completion percentage
-        overall_completion_percentage = (
-            (completed_lessons / total_lessons * 100) if total_lessons > 0 else 0.0
+        # Course-level summary from the enrollment counters
+        completed_lessons = user_course.completed_lessons if user_course else 0
+        in_progress_lessons = user_course.in_progress_lessons if user_course else 0
+        not_started_lessons = max(
+            total_lessons - completed_lessons - in_progress_lessons, 0
+        )
+        overall_completion_percentage = completion_percentage(
+            completed_lessons, total_lessons
         )
+        current_topic_id = user_course.current_topic if user_course else None
+        current_lesson_id = user_course.current_lesson if user_course else None
+        last_activity_at = user_course.last_activity_at if user_course else None
 
         # Get current lesson details if exists
         current_lesson = None
@@ -885,9 +1058,12 @@ class CourseService:
         return CourseDetailWithProgressResponse(**course_dict)
 
 
-def get_course_service(db: AsyncSession = Depends(get_async_db)):
+def get_course_service(
+    db: AsyncSession = Depends(get_async_db),
+    read_db: AsyncSession = Depends(get_async_read_db),
+):
     """
     Factory function to get CourseService instance with database session and optional test generation service
     Note: Do NOT use Session as a response_model or return type in FastAPI routes. Only use Pydantic schemas or serializable types.
     """
-    return CourseService(db)
+    return CourseService(db, read_db)
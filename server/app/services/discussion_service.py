@@ -2,6 +2,9 @@ from typing import Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import func, desc, asc, select
 from sqlalchemy.orm import joinedload
+from fastapi import HTTPException, status
+
+from app.database.pagination import KeysetPage, paginate_keyset
 
 from app.models.discussion_model import Discussion
 from app.models.user_model import User
@@ -68,26 +71,45 @@ class DiscussionService:
         total_result = await db.execute(count_query)
         total = total_result.scalar() or 0
         
-        # Apply sorting
-        if filters.sort_by == "oldest":
-            query = query.order_by(asc(Discussion.created_at))
-        elif filters.sort_by == "most-replies":
+        page = filters.page or 1
+        limit = filters.limit or 10
+        keyset_page: Optional[KeysetPage] = None
+
+        if filters.sort_by == "most-replies":
+            if filters.cursor:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Cursor không hỗ trợ sắp xếp most-replies",
+                )
             # For most-replies, we need a more complex query
             query = query.outerjoin(Reply).group_by(Discussion.id).order_by(
                 desc(func.count(Reply.id))
             )
+        elif filters.cursor or page == 1:
+            # Keyset pagination theo (created_at, id) cho newest/oldest
+            keyset_page = await paginate_keyset(
+                db,
+                query,
+                Discussion,
+                limit=limit,
+                cursor=filters.cursor,
+                descending=filters.sort_by != "oldest",
+            )
+        elif filters.sort_by == "oldest":
+            query = query.order_by(asc(Discussion.created_at), asc(Discussion.id))
         else:  # newest (default)
-            query = query.order_by(desc(Discussion.created_at))
-        
-        # Apply pagination
-        page = filters.page or 1
-        limit = filters.limit or 10
-        offset = (page - 1) * limit
-        query = query.offset(offset).limit(limit)
-        
-        result = await db.execute(query)
-        discussions = result.scalars().all()
-        
+            query = query.order_by(desc(Discussion.created_at), desc(Discussion.id))
+
+        if keyset_page is not None:
+            discussions = keyset_page.items
+        else:
+            # Apply pagination
+            offset = (page - 1) * limit
+            query = query.offset(offset).limit(limit)
+
+            result = await db.execute(query)
+            discussions = result.scalars().all()
+
         # Convert to response format
         discussion_responses = []
         for discussion in discussions:
@@ -114,6 +136,8 @@ class DiscussionService:
             total=total,
             page=page,
             totalPages=(total + limit - 1) // limit,
+            next_cursor=keyset_page.next_cursor if keyset_page else None,
+            prev_cursor=keyset_page.prev_cursor if keyset_page else None,
         )
 
     @staticmethod
@@ -1,4 +1,5 @@
 import asyncio
+from typing import Optional
 
 import requests
 from app.core.agents.exercise_agent import ExerciseDetail as ExerciseSchema
@@ -7,6 +8,7 @@ from app.core.agents.exercise_agent import (
     get_exercise_agent,
 )
 from app.database.database import get_async_db
+from app.database.pagination import KeysetPage, paginate_keyset
 from app.core.config import settings
 from app.models import Exercise, ExerciseTestCase
 from app.models.exercise_model import Exercise as ExerciseModel
@@ -60,21 +62,28 @@ class ExerciseService:
     Service xử lý các thao tác liên quan đến bài tập
 
     Attributes:
-        exercise_agent (GenerateExerciseQuestionAgent): Agent tạo bài tập
+        exercise_agent (GenerateExerciseQuestionAgent): Agent tạo bài tập, mặc định là
+            agent dùng chung của worker, chỉ lấy khi tạo bài tập
         topic_service (TopicService): Service xử lý chủ đề
         repository (Repository): Repository xử lý dữ liệu bài tập
     """
 
     def __init__(
         self,
-        exercise_agent: GenerateExerciseQuestionAgent,
+        exercise_agent: Optional[GenerateExerciseQuestionAgent],
         topic_service: TopicService,
         session: AsyncSession,
     ):
-        self.exercise_agent = exercise_agent
+        self._exercise_agent = exercise_agent
         self.db = session
         self.topic_service = topic_service
 
+    @property
+    def exercise_agent(self) -> GenerateExerciseQuestionAgent:
+        if self._exercise_agent is None:
+            self._exercise_agent = get_exercise_agent()
+        return self._exercise_agent
+
     async def get_exercise(self, exercise_id: int) -> Exercise:
         """
         Lấy thông tin bài tập theo ID
@@ -101,10 +110,30 @@ class ExerciseService:
     async def list_exercises(self, page: int = 1, limit: int = 12) -> list[ExerciseModel]:
         offset = max(0, (page - 1) * limit)
         result = await self.db.execute(
-            select(ExerciseModel).order_by(ExerciseModel.created_at.desc()).offset(offset).limit(limit)
+            select(ExerciseModel)
+            .order_by(ExerciseModel.created_at.desc(), ExerciseModel.id.desc())
+            .offset(offset)
+            .limit(limit)
         )
         return list(result.scalars().all())
 
+    async def list_exercises_page(
+        self, limit: int = 12, cursor: Optional[str] = None
+    ) -> KeysetPage[ExerciseModel]:
+        """
+        Lấy danh sách bài tập mới nhất trước với phân trang keyset
+
+        Args:
+            limit (int): Số bài tập mỗi trang
+            cursor (Optional[str]): Cursor từ trang trước, None để lấy trang đầu
+
+        Returns:
+            KeysetPage[ExerciseModel]: Trang bài tập kèm cursor trang trước/sau
+        """
+        return await paginate_keyset(
+            self.db, select(ExerciseModel), ExerciseModel, limit=limit, cursor=cursor
+        )
+
     async def update_exercise(self, exercise_id: int, data: ExerciseUpdate) -> ExerciseModel:
         exercise = await self.db.get(ExerciseModel, exercise_id)
         if not exercise:
@@ -350,6 +379,7 @@ class ExerciseService:
 def get_exercise_service(
     db: AsyncSession = Depends(get_async_db),
     topic_service: TopicService = Depends(get_topic_service),
-    exercise_agent: GenerateExerciseQuestionAgent = Depends(get_exercise_agent),
 ):
-    return ExerciseService(exercise_agent, topic_service, db)
+    return ExerciseService(
+        exercise_agent=None, topic_service=topic_service, session=db
+    )
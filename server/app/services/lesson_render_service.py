@@ -0,0 +1,349 @@
+"""
+Render JSON của bài học (LessonWithChildSchema) qua cache theo phiên bản
+"""
+
+import logging
+from typing import Dict, Iterable, Optional, Sequence
+
+from fastapi import Depends
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.core.config import settings
+from app.database.database import async_engine, get_async_db, get_async_read_db
+from app.database.lesson_navigation import topic_sequence_order_by
+from app.database.read_replica import read_only
+from app.models.exercise_model import Exercise
+from app.models.lesson_model import Lesson, LessonSection
+from app.models.lesson_render_cache_model import LessonRenderCacheEntry
+from app.models.topic_model import Topic
+from app.schemas.topic_schema import TopicResponse
+from app.utils.lesson_render_cache import LessonRenderCache, lesson_render_cache
+from app.utils.model_utils import convert_lesson_to_schema
+
+logger = logging.getLogger(__name__)
+
+
+def lesson_version_columns():
+    """
+    Các cột tạo nên phiên bản của bài học
+
+    ``updated_at`` của bài học cùng ``updated_at`` lớn nhất và số lượng của
+    section/bài tập, vì section và bài tập được sửa ở bảng riêng mà không chạm
+    vào ``lessons.updated_at``; số lượng bắt được trường hợp xóa bớt.
+
+    Returns:
+        tuple: Các cột (kèm ``Lesson.id``) dùng trong SELECT
+    """
+
+    def child_aggregate(model, aggregate):
+        return (
+            select(aggregate)
+            .where(model.lesson_id == Lesson.id)
+            .correlate(Lesson)
+            .scalar_subquery()
+        )
+
+    return (
+        Lesson.id,
+        Lesson.updated_at,
+        child_aggregate(LessonSection, func.max(LessonSection.updated_at)),
+        child_aggregate(LessonSection, func.count()),
+        child_aggregate(Exercise, func.max(Exercise.updated_at)),
+        child_aggregate(Exercise, func.count()),
+    )
+
+
+def format_lesson_version(row: Sequence) -> str:
+    """
+    Ghép một dòng của ``lesson_version_columns`` (bỏ id) thành chuỗi phiên bản
+    """
+    return "|".join(
+        value.isoformat() if hasattr(value, "isoformat") else str(value or 0)
+        for value in row[1:]
+    )
+
+
+def render_lesson(lesson: Lesson) -> bytes:
+    """
+    Serialize bài học thành JSON camelCase, giống response của LessonWithChildSchema
+
+    Args:
+        lesson: Bài học đã nạp sections và exercises
+
+    Returns:
+        bytes: JSON UTF-8
+    """
+    return convert_lesson_to_schema(lesson).model_dump_json(by_alias=True).encode()
+
+
+def json_array(items: Iterable[bytes]) -> bytes:
+    """Ghép các JSON đã serialize thành một mảng JSON"""
+    return b"[" + b",".join(items) + b"]"
+
+
+class SharedLessonRenderStore:
+    """
+    Tầng cache dùng chung giữa các worker: bảng UNLOGGED ``lesson_render_cache``
+
+    Dùng kết nối riêng từ engine primary thay vì session của request: bảng
+    UNLOGGED không có trên replica, và ghi cache không phải là thay đổi dữ liệu
+    nên không được ghim client sang primary (read-your-writes). Lỗi chỉ được ghi
+    log, request vẫn render bình thường.
+    """
+
+    def __init__(self, engine: AsyncEngine):
+        self.engine = engine
+
+    @staticmethod
+    def select_statement(versions: Dict[int, str]):
+        entry = LessonRenderCacheEntry
+        return select(entry.lesson_id, entry.body).where(
+            tuple_(entry.lesson_id, entry.version).in_(list(versions.items()))
+        )
+
+    @staticmethod
+    def upsert_statement(entries: Dict[int, tuple]):
+        stmt = insert(LessonRenderCacheEntry).values(
+            [
+                {"lesson_id": lesson_id, "version": version, "body": body}
+                for lesson_id, (version, body) in entries.items()
+            ]
+        )
+        return stmt.on_conflict_do_update(
+            index_elements=[LessonRenderCacheEntry.lesson_id],
+            set_={
+                "version": stmt.excluded.version,
+                "body": stmt.excluded.body,
+                "updated_at": func.now(),
+            },
+        )
+
+    async def get_many(self, versions: Dict[int, str]) -> Dict[int, bytes]:
+        """
+        Lấy JSON của các bài học có đúng phiên bản
+
+        Args:
+            versions: lesson_id -> phiên bản hiện tại
+
+        Returns:
+            Dict[int, bytes]: lesson_id -> JSON, thiếu các bài chưa có trong cache
+        """
+        if not versions:
+            return {}
+        try:
+            async with self.engine.connect() as connection:
+                result = await connection.execute(self.select_statement(versions))
+                return {row.lesson_id: bytes(row.body) for row in result}
+        except SQLAlchemyError as e:
+            logger.warning(f"Không đọc được cache bài học dùng chung: {e}")
+            return {}
+
+    async def put_many(self, entries: Dict[int, tuple]) -> None:
+        """
+        Lưu JSON vừa render, ghi đè phiên bản cũ
+
+        Args:
+            entries: lesson_id -> (phiên bản, JSON)
+        """
+        if not entries:
+            return
+        try:
+            async with self.engine.begin() as connection:
+                await connection.execute(self.upsert_statement(entries))
+        except SQLAlchemyError as e:
+            logger.warning(f"Không ghi được cache bài học dùng chung: {e}")
+
+
+class LessonRenderService:
+    """
+    Trả về JSON đã serialize của bài học, chỉ render lại khi bài học đổi phiên bản
+
+    Mỗi lần gọi chạy một câu truy vấn lấy phiên bản hiện tại của các bài học, lấy
+    JSON từ cache của worker, rồi tới tầng dùng chung (nếu bật), và chỉ nạp
+    sections/exercises cho những bài còn thiếu. Kết quả là bytes để router trả
+    thẳng, không qua validate/serialize của FastAPI.
+    """
+
+    def __init__(
+        self,
+        db: AsyncSession,
+        read_db: Optional[AsyncSession] = None,
+        cache: LessonRenderCache = lesson_render_cache,
+        shared_store: Optional[SharedLessonRenderStore] = None,
+    ):
+        self.db = db
+        self.read_db = read_db
+        self.cache = cache
+        self.shared_store = shared_store
+
+    @read_only
+    async def get_lesson_json(self, lesson_id: int) -> Optional[bytes]:
+        """
+        JSON của một bài học
+
+        Args:
+            lesson_id: ID của bài học
+
+        Returns:
+            Optional[bytes]: JSON, None nếu không tìm thấy
+        """
+        rendered = await self._render(
+            select(*lesson_version_columns()).where(Lesson.id == lesson_id)
+        )
+        return rendered.get(lesson_id)
+
+    @read_only
+    async def get_topic_lessons_json(self, topic_id: int) -> bytes:
+        """
+        Mảng JSON các bài học của topic, theo thứ tự bài học
+
+        Args:
+            topic_id: ID của topic
+
+        Returns:
+            bytes: Mảng JSON
+        """
+        stmt = (
+            select(*lesson_version_columns())
+            .where(Lesson.topic_id == topic_id)
+            .order_by(Lesson.order, Lesson.id)
+        )
+        rendered = await self._render(stmt)
+        return json_array(rendered.values())
+
+    @read_only
+    async def get_course_topics_json(self, course_id: int) -> bytes:
+        """
+        Mảng JSON các topic (TopicResponse) của khóa học kèm bài học đã render
+
+        Args:
+            course_id: ID của khóa học
+
+        Returns:
+            bytes: Mảng JSON
+        """
+        topics_result = await self.db.execute(
+            select(Topic)
+            .where(Topic.course_id == course_id)
+            .order_by(*topic_sequence_order_by())
+        )
+        topics = topics_result.scalars().all()
+        if not topics:
+            return b"[]"
+
+        rendered = await self._render(
+            select(*lesson_version_columns(), Lesson.topic_id)
+            .where(Lesson.topic_id.in_([topic.id for topic in topics]))
+            .order_by(Lesson.order, Lesson.id),
+            group_by_topic=True,
+        )
+
+        items = []
+        for topic in topics:
+            # Bỏ lessons khi validate để không lazy load, ghép JSON đã render vào sau
+            topic_json = (
+                TopicResponse.model_validate(
+                    {
+                        field: getattr(topic, field, None)
+                        for field in TopicResponse.model_fields
+                        if field != "lessons"
+                    }
+                )
+                .model_dump_json(by_alias=True, exclude={"lessons"})
+                .encode()
+            )
+            lessons_json = json_array(rendered.get(topic.id, {}).values())
+            items.append(topic_json[:-1] + b',"lessons":' + lessons_json + b"}")
+        return json_array(items)
+
+    async def _render(self, version_stmt, group_by_topic: bool = False) -> Dict:
+        """
+        Lấy JSON cho các bài học trong ``version_stmt`` theo đúng thứ tự
+
+        Args:
+            version_stmt: SELECT ``lesson_version_columns()`` (thêm topic_id nếu
+                ``group_by_topic``)
+            group_by_topic: Trả về topic_id -> (lesson_id -> JSON)
+
+        Returns:
+            Dict: lesson_id -> JSON, hoặc nhóm theo topic_id
+        """
+        rows = (await self.db.execute(version_stmt)).all()
+        versions = {row[0]: format_lesson_version(row[:6]) for row in rows}
+
+        bodies: Dict[int, bytes] = {}
+        for lesson_id, version in versions.items():
+            body = self.cache.get(lesson_id, version)
+            if body is not None:
+                bodies[lesson_id] = body
+
+        missing = {
+            lesson_id: version
+            for lesson_id, version in versions.items()
+            if lesson_id not in bodies
+        }
+        if missing and self.shared_store is not None:
+            shared = await self.shared_store.get_many(missing)
+            self.cache.shared_hits += len(shared)
+            for lesson_id, body in shared.items():
+                self.cache.set(lesson_id, missing.pop(lesson_id), body)
+            bodies.update(shared)
+
+        if missing:
+            fresh = await self._render_missing(missing)
+            for lesson_id, (version, body) in fresh.items():
+                self.cache.set(lesson_id, version, body)
+                bodies[lesson_id] = body
+            if self.shared_store is not None:
+                await self.shared_store.put_many(fresh)
+
+        if not group_by_topic:
+            return {row[0]: bodies[row[0]] for row in rows if row[0] in bodies}
+
+        grouped: Dict[int, Dict[int, bytes]] = {}
+        for row in rows:
+            if row[0] in bodies:
+                grouped.setdefault(row[-1], {})[row[0]] = bodies[row[0]]
+        return grouped
+
+    async def _render_missing(self, versions: Dict[int, str]) -> Dict[int, tuple]:
+        """
+        Nạp và render các bài học chưa có trong cache bằng một lần truy vấn
+
+        Returns:
+            Dict[int, tuple]: lesson_id -> (phiên bản, JSON)
+        """
+        result = await self.db.execute(
+            select(Lesson)
+            .where(Lesson.id.in_(list(versions)))
+            .options(selectinload(Lesson.sections), selectinload(Lesson.exercises))
+        )
+        lessons = result.scalars().all()
+        self.cache.renders += len(lessons)
+        return {
+            lesson.id: (versions[lesson.id], render_lesson(lesson))
+            for lesson in lessons
+        }
+
+
+def get_shared_lesson_render_store() -> Optional[SharedLessonRenderStore]:
+    """Tầng cache dùng chung nếu được bật trong cấu hình"""
+    if not settings.LESSON_RENDER_CACHE_SHARED:
+        return None
+    return SharedLessonRenderStore(async_engine)
+
+
+def get_lesson_render_service(
+    db: AsyncSession = Depends(get_async_db),
+    read_db: AsyncSession = Depends(get_async_read_db),
+) -> LessonRenderService:
+    """
+    Factory function để tạo LessonRenderService với session chính và session đọc
+    """
+    return LessonRenderService(
+        db, read_db, shared_store=get_shared_lesson_render_store()
+    )
@@ -1,5 +1,5 @@
-from typing import List, Optional
-from sqlalchemy import update
+from typing import List, Optional, Sequence
+from sqlalchemy import delete, insert, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from fastapi import Depends
@@ -7,11 +7,13 @@ from sqlalchemy.orm import selectinload
 import uuid
 from fastapi import HTTPException, status
 
-from app.database.database import get_async_db
+from app.database.database import get_async_db, get_async_read_db
+from app.database.lesson_navigation import lesson_navigation_statement
+from app.database.read_replica import read_only
 from app.models.lesson_model import Lesson, LessonSection
 from app.models.lesson_generation_state_model import LessonGenerationState
+from app.models.lesson_render_cache_model import LessonRenderCacheEntry
 from app.models.user_course_model import UserCourse
-from app.schemas import AgentCreateLessonSchema
 from app.schemas.lesson_schema import (
     CreateLessonSchema,
     LessonDetailWithProgressResponse,
@@ -20,23 +22,51 @@ from app.schemas.lesson_schema import (
     GenerateLessonRequestSchema,
     LessonCompleteResponseSchema,
     LessonSectionSchema,
+    LessonSectionResponse,
+)
+from app.core.agents.lesson_generating_agent import (
+    LessonGeneratingAgent,
+    get_lesson_generating_agent,
 )
-from app.core.agents.lesson_generating_agent import get_lesson_generating_agent
 from app.utils.model_utils import convert_lesson_to_schema
+from app.utils.lesson_render_cache import lesson_render_cache
+from app.core.config import settings
 
 
 from app.services.topic_service import get_topic_service, TopicService
 from app.models.user_course_progress_model import ProgressStatus, UserCourseProgress
+from app.services.user_course_progress_service import (
+    UserCourseProgressService,
+    progress_counters_statement,
+)
 from app.models.topic_model import Topic
-from datetime import datetime
 
 
 class LessonService:
-    def __init__(self, db: AsyncSession, topic_service: TopicService):
+    def __init__(
+        self,
+        db: AsyncSession,
+        topic_service: TopicService,
+        read_db: Optional[AsyncSession] = None,
+        agent: Optional[LessonGeneratingAgent] = None,
+    ):
         self.db = db
-        self.agent = get_lesson_generating_agent()
+        self.read_db = read_db
+        self._agent = agent
         self.topic_service = topic_service
 
+    @property
+    def agent(self) -> LessonGeneratingAgent:
+        """
+        Agent sinh bài học, lấy agent dùng chung của worker khi cần đến
+
+        Phần lớn request (xem, hoàn thành bài học) không sinh bài học nên không lấy
+        agent khi khởi tạo service.
+        """
+        if self._agent is None:
+            self._agent = get_lesson_generating_agent()
+        return self._agent
+
     async def generate_lesson(
         self, request: GenerateLessonRequestSchema, topic_id: int, order: int
     ) -> Optional[LessonWithChildSchema]:
@@ -68,12 +98,10 @@ class LessonService:
             list_lesson_data = await self.agent.act(**request.model_dump())
 
             # Create the lessons in database
-            created_lessons = []
             for lesson_data in list_lesson_data:
                 lesson_data.topic_id = topic_id
                 lesson_data.order = order  # This might need adjustment if agent returns multiple lessons with their own intended order
-                lesson = await self.create_lesson(lesson_data)
-                created_lessons.append(lesson)
+            created_lessons = await self.create_lessons(list_lesson_data)
 
             # Update state to completed
             generation_state.status = "completed"  # type: ignore
@@ -97,49 +125,108 @@ class LessonService:
         """
         Create a new lesson with sections.
         """
-        # Create lesson
-        if isinstance(lesson_data, AgentCreateLessonSchema):
-            exercises = lesson_data.exercises
-
-        lesson = Lesson(
-            external_id=lesson_data.external_id,
-            title=lesson_data.title,
-            description=lesson_data.description,
-            topic_id=lesson_data.topic_id,
-            order=lesson_data.order,
-            next_lesson_id=lesson_data.next_lesson_id,
-            prev_lesson_id=lesson_data.prev_lesson_id,
-        )
+        lessons = await self.create_lessons([lesson_data])
+        return lessons[0]
 
-        self.db.add(lesson)
-        await self.db.flush()  # Get the lesson ID
-
-        # Create lesson sections
-        for section_data in lesson_data.sections:
-            # Chuyển đổi options từ Pydantic model sang dict nếu tồn tại
-            options_dict = None
-            if section_data.options:
-                options_dict = section_data.options.model_dump()
-
-            section = LessonSection(
-                lesson_id=lesson.id,
-                type=section_data.type,
-                content=section_data.content,
-                order=section_data.order,
-                options=options_dict,
-                answer=section_data.answer,
-                explanation=section_data.explanation,
-            )
-            self.db.add(section)
+    async def create_lessons(
+        self, lessons_data: Sequence[CreateLessonSchema]
+    ) -> List[LessonWithChildSchema]:
+        """
+        Tạo nhiều bài học cùng toàn bộ sections trong một transaction
+
+        Bài học và sections được chèn bằng hai câu INSERT ... RETURNING (executemany),
+        điều hướng next/prev của các topic liên quan được tính lại bằng một câu
+        UPDATE ... RETURNING, bộ đếm tiến độ của các lần đăng ký bị ảnh hưởng bằng một
+        câu UPDATE ... FROM. Response được dựng từ dữ liệu vừa chèn, không đọc lại
+        bài học. Bài tập trong AgentCreateLessonSchema không được lưu, giống trước đây.
+
+        Args:
+            lessons_data: Danh sách bài học, có thể thuộc nhiều topic
 
+        Returns:
+            List[LessonWithChildSchema]: Bài học đã tạo, cùng thứ tự với đầu vào
+        """
+        if not lessons_data:
+            return []
+
+        lesson_result = await self.db.execute(
+            insert(Lesson).returning(Lesson.id, sort_by_parameter_order=True),
+            [
+                {
+                    "external_id": lesson_data.external_id,
+                    "title": lesson_data.title,
+                    "description": lesson_data.description,
+                    "topic_id": lesson_data.topic_id,
+                    "order": lesson_data.order,
+                    "next_lesson_id": lesson_data.next_lesson_id,
+                    "prev_lesson_id": lesson_data.prev_lesson_id,
+                }
+                for lesson_data in lessons_data
+            ],
+        )
+        lesson_ids = lesson_result.scalars().all()
+
+        section_rows = [
+            {
+                "lesson_id": lesson_id,
+                "type": section_data.type,
+                "content": section_data.content,
+                "order": section_data.order,
+                # Chuyển đổi options từ Pydantic model sang dict nếu tồn tại
+                "options": (
+                    section_data.options.model_dump() if section_data.options else None
+                ),
+                "answer": section_data.answer,
+                "explanation": section_data.explanation,
+            }
+            for lesson_id, lesson_data in zip(lesson_ids, lessons_data)
+            for section_data in lesson_data.sections
+        ]
+        section_ids = []
+        if section_rows:
+            section_result = await self.db.execute(
+                insert(LessonSection).returning(
+                    LessonSection.id, sort_by_parameter_order=True
+                ),
+                section_rows,
+            )
+            section_ids = section_result.scalars().all()
+
+        # INSERT dạng Core không qua flush nên tự tính lại điều hướng ở đây
+        navigation_result = await self.db.execute(
+            lesson_navigation_statement(
+                topic_ids={lesson_data.topic_id for lesson_data in lessons_data}
+            ).returning(Lesson.id, Lesson.next_lesson_id, Lesson.prev_lesson_id),
+            execution_options={"synchronize_session": "fetch"},
+        )
+        navigation = {row.id: row for row in navigation_result}
+        # Bộ đếm tiến độ (bài hiện tại) của các lần đăng ký bị ảnh hưởng cũng vậy
+        await self.db.execute(progress_counters_statement(lesson_ids=lesson_ids))
         await self.db.commit()
-        await self.db.refresh(lesson)
 
-        # Tải rõ ràng các mối quan hệ trước khi chuyển đổi
-        await self.db.refresh(lesson, ["sections", "exercises"])
+        sections_by_lesson = {lesson_id: [] for lesson_id in lesson_ids}
+        for section_id, row in zip(section_ids, section_rows):
+            sections_by_lesson[row["lesson_id"]].append(
+                LessonSectionResponse(id=section_id, **row)
+            )
 
-        # Sử dụng hàm tiện ích để chuyển đổi từ model sang schema
-        return convert_lesson_to_schema(lesson)
+        lessons = []
+        for lesson_id, lesson_data in zip(lesson_ids, lessons_data):
+            lesson = LessonWithChildSchema(
+                id=lesson_id,
+                external_id=lesson_data.external_id,
+                title=lesson_data.title,
+                description=lesson_data.description,
+                order=lesson_data.order,
+                next_lesson_id=lesson_data.next_lesson_id,
+                prev_lesson_id=lesson_data.prev_lesson_id,
+                sections=sections_by_lesson[lesson_id],
+            )
+            if lesson_id in navigation:
+                lesson.next_lesson_id = navigation[lesson_id].next_lesson_id
+                lesson.prev_lesson_id = navigation[lesson_id].prev_lesson_id
+            lessons.append(lesson)
+        return lessons
 
     async def get_lesson_by_id(self, lesson_id: int) -> Optional[LessonWithChildSchema]:
         """
@@ -195,6 +282,7 @@ class LessonService:
         # Sử dụng hàm tiện ích để chuyển đổi từ model sang schema
         return convert_lesson_to_schema(lesson)
 
+    @read_only
     async def get_lessons_by_topic(self, topic_id: int) -> List[LessonWithChildSchema]:
         """
         Get all lessons for a topic.
@@ -214,94 +302,11 @@ class LessonService:
     async def complete_lesson(
         self, lesson_id: int, user_id: int
     ) -> LessonCompleteResponseSchema:
-        # Lấy bài học hiện tại
-        current_lesson = await self.db.execute(
-            select(Lesson)
-            .options(selectinload(Lesson.topic))
-            .where(Lesson.id == lesson_id)
-        )
-        current_lesson = current_lesson.scalar_one_or_none()
-        if not current_lesson:
-            raise HTTPException(status_code=404, detail="Lesson not found")
-
-        # Tìm bài học tiếp theo trong cùng một chủ đề
-        next_lesson_stmt = (
-            select(Lesson)
-            .where(
-                Lesson.topic_id == current_lesson.topic_id,
-                Lesson.order == current_lesson.order + 1,
-            )
-            .limit(1)
-        )
-        next_lesson = (await self.db.execute(next_lesson_stmt)).scalar_one_or_none()
-        user_course = await self.db.execute(
-            select(UserCourse).where(
-                UserCourse.user_id == user_id,
-                UserCourse.course_id == current_lesson.topic.course_id,
-            )
-        )
-        user_course = user_course.scalar_one_or_none()
-        if user_course is None:
-            raise HTTPException(status_code=404, detail="User state not found")
-
-        # Lưu thông tin hoàn thành bài học vào UserCourseProgress
-        progress_stmt = select(UserCourseProgress).where(
-            UserCourseProgress.user_course_id == user_course.id,
-            UserCourseProgress.topic_id == current_lesson.topic_id,
-            UserCourseProgress.lesson_id == lesson_id,
-        )
-        progress = (await self.db.execute(progress_stmt)).scalar_one_or_none()
-        if progress:
-            progress.status = ProgressStatus.COMPLETED
-            progress.completed_at = datetime.now()
-        else:
-            progress = UserCourseProgress(
-                user_course_id=user_course.id,
-                topic_id=current_lesson.topic_id,
-                lesson_id=lesson_id,
-                status=ProgressStatus.COMPLETED,
-                completed_at=datetime.now(),
-            )
-            self.db.add(progress)
-        await self.db.commit()
-
-        if next_lesson:
-            # Nếu có bài học tiếp theo, cập nhật trạng thái người dùng
-            user_course.current_lesson = next_lesson.id
-            user_course.current_topic = next_lesson.topic_id
-            await self.db.commit()
-            return LessonCompleteResponseSchema(
-                lesson_id=next_lesson.id,
-                next_lesson_id=next_lesson.id,
-                is_completed=True,
-            )
-        else:
-            # Nếu không có bài học tiếp theo, tìm chủ đề tiếp theo
-            topic = await self.topic_service.get_next_topic(current_lesson.topic_id)
-            if topic:
-                # Tìm bài học đầu tiên của chủ đề tiếp theo
-                first_lesson_stmt = (
-                    select(Lesson)
-                    .where(Lesson.topic_id == topic.id)
-                    .order_by(Lesson.order)
-                    .limit(1)
-                )
-                first_lesson_of_next_topic = (
-                    await self.db.execute(first_lesson_stmt)
-                ).scalar_one_or_none()
-
-                if first_lesson_of_next_topic:
-                    user_course.current_lesson = first_lesson_of_next_topic.id
-                    user_course.current_topic = first_lesson_of_next_topic.topic_id
-                    await self.db.commit()
-                    return LessonCompleteResponseSchema(
-                        lesson_id=first_lesson_of_next_topic.id,
-                        next_lesson_id=first_lesson_of_next_topic.id,
-                        is_completed=True,
-                    )
-
-        return LessonCompleteResponseSchema(
-            lesson_id=lesson_id, next_lesson_id=None, is_completed=True
+        """
+        Đánh dấu hoàn thành bài học, bài học tiếp theo lấy từ chỉ mục điều hướng
+        """
+        return await UserCourseProgressService(self.db).complete_lesson(
+            user_id, lesson_id
         )
 
     async def update_lesson(
@@ -321,7 +326,15 @@ class LessonService:
         for field, value in lesson_data.model_dump(exclude_unset=True).items():
             setattr(lesson, field, value)
 
+        if settings.LESSON_RENDER_CACHE_SHARED:
+            await self.db.execute(
+                delete(LessonRenderCacheEntry).where(
+                    LessonRenderCacheEntry.lesson_id == lesson_id
+                )
+            )
         await self.db.commit()
+        # Worker khác tự bỏ bản cũ vì updated_at (phiên bản) đã đổi
+        lesson_render_cache.invalidate(lesson_id)
         await self.db.refresh(lesson)
 
         # Tải rõ ràng các mối quan hệ
@@ -357,6 +370,8 @@ class LessonService:
 
         await self.db.delete(lesson)
         await self.db.commit()
+        # Bản trong bảng lesson_render_cache bị xóa theo ON DELETE CASCADE
+        lesson_render_cache.invalidate(lesson_id)
 
         return True
 
@@ -457,6 +472,7 @@ class LessonService:
 def get_lesson_service(
     db: AsyncSession = Depends(get_async_db),
     topic_service: TopicService = Depends(get_topic_service),
+    read_db: AsyncSession = Depends(get_async_read_db),
 ) -> LessonService:
     """
     Dependency injection for LessonService
@@ -464,8 +480,9 @@ def get_lesson_service(
     Args:
         db: Async database session
         topic_service: Topic service instance
+        read_db: Session chỉ đọc (read replica hoặc chính db)
 
     Returns:
         LessonService: Service instance
     """
-    return LessonService(db=db, topic_service=topic_service)
+    return LessonService(db=db, topic_service=topic_service, read_db=read_db)
@@ -10,9 +10,14 @@ from sqlalchemy.orm import selectinload
 from fastapi import Depends, HTTPException, status
 
 from app.database.database import get_async_db
+from app.database.lesson_navigation import topic_sequence_order_by
 from app.models.user_course_model import UserCourse
 from app.models.topic_model import Topic
 from app.models.user_course_progress_model import UserCourseProgress, ProgressStatus
+from app.services.user_course_progress_service import (
+    UserCourseProgressService,
+    completion_percentage,
+)
 from app.schemas.nested_course_progress_schema import (
     CourseWithNestedProgressSchema,
     TopicWithProgressSchema,
@@ -47,6 +52,9 @@ class NestedCourseProgressService:
         2. Query tất cả topics với lessons (eager loading)
         3. Query progress map riêng biệt
         4. Map progress status cho từng lesson
+
+        Tóm tắt cấp khóa học (số bài đã hoàn thành, phần trăm, bài hiện tại,
+        hoạt động gần nhất) đọc từ bộ đếm trên user_courses.
         """
         # Step 1: Query UserCourse với course info
         user_course_stmt = (
@@ -68,7 +76,7 @@ class NestedCourseProgressService:
             select(Topic)
             .options(selectinload(Topic.lessons))
             .where(Topic.course_id == user_course.course_id)
-            .order_by(Topic.order.asc().nulls_last(), Topic.id)
+            .order_by(*topic_sequence_order_by())
         )
 
         topics_result = await self.db.execute(topics_stmt)
@@ -80,12 +88,6 @@ class NestedCourseProgressService:
         # Step 4: Build nested response với progress mapping
         nested_topics = []
         total_lessons = 0
-        completed_lessons = 0
-        in_progress_lessons = 0
-        not_started_lessons = 0
-        last_activity_at = None
-        current_topic_id = None
-        current_lesson_id = None
 
         for topic in topics:
             # Sort lessons by order
@@ -107,7 +109,7 @@ class NestedCourseProgressService:
                 )
 
                 # Tính completion percentage
-                completion_percentage = {
+                lesson_completion = {
                     ProgressStatus.NOT_STARTED: 0.0,
                     ProgressStatus.IN_PROGRESS: 50.0,
                     ProgressStatus.COMPLETED: 100.0,
@@ -122,32 +124,14 @@ class NestedCourseProgressService:
                     status=lesson_progress["status"],
                     last_viewed_at=lesson_progress["last_viewed_at"],
                     completed_at=lesson_progress["completed_at"],
-                    completion_percentage=completion_percentage,
+                    completion_percentage=lesson_completion,
                 )
 
                 lessons_with_progress.append(lesson_with_progress)
 
-                # Update counters
                 total_lessons += 1
                 if lesson_progress["status"] == ProgressStatus.COMPLETED:
-                    completed_lessons += 1
                     topic_completed += 1
-                elif lesson_progress["status"] == ProgressStatus.IN_PROGRESS:
-                    in_progress_lessons += 1
-                    # Track current lesson
-                    if not current_lesson_id:
-                        current_topic_id = topic.id
-                        current_lesson_id = lesson.id
-                else:
-                    not_started_lessons += 1
-
-                # Track last activity
-                if lesson_progress["last_viewed_at"]:
-                    if (
-                        not last_activity_at
-                        or lesson_progress["last_viewed_at"] > last_activity_at
-                    ):
-                        last_activity_at = lesson_progress["last_viewed_at"]
 
             # Calculate topic completion percentage
             topic_completion_percentage = (
@@ -168,9 +152,11 @@ class NestedCourseProgressService:
 
             nested_topics.append(topic_with_progress)
 
-        # Calculate overall completion percentage
-        overall_completion_percentage = (
-            (completed_lessons / total_lessons) * 100 if total_lessons > 0 else 0.0
+        not_started_lessons = max(
+            total_lessons
+            - user_course.completed_lessons
+            - user_course.in_progress_lessons,
+            0,
         )
 
         return CourseWithNestedProgressSchema(
@@ -181,13 +167,15 @@ class NestedCourseProgressService:
             topics=nested_topics,
             total_topics=len(nested_topics),
             total_lessons=total_lessons,
-            completed_lessons=completed_lessons,
-            in_progress_lessons=in_progress_lessons,
+            completed_lessons=user_course.completed_lessons,
+            in_progress_lessons=user_course.in_progress_lessons,
             not_started_lessons=not_started_lessons,
-            overall_completion_percentage=round(overall_completion_percentage, 2),
-            current_topic_id=current_topic_id,
-            current_lesson_id=current_lesson_id,
-            last_activity_at=last_activity_at,
+            overall_completion_percentage=completion_percentage(
+                user_course.completed_lessons, total_lessons
+            ),
+            current_topic_id=user_course.current_topic,
+            current_lesson_id=user_course.current_lesson,
+            last_activity_at=user_course.last_activity_at,
         )
 
     async def _get_progress_map(self, user_course_id: int) -> Dict[int, Dict]:
@@ -231,32 +219,17 @@ class NestedCourseProgressService:
         """
         progress_map = await self._get_progress_map(user_course_id)
 
-        # Calculate summary stats
-        total_lessons = len(progress_map)
-        completed = sum(
-            1 for p in progress_map.values() if p["status"] == ProgressStatus.COMPLETED
-        )
-        in_progress = sum(
-            1
-            for p in progress_map.values()
-            if p["status"] == ProgressStatus.IN_PROGRESS
-        )
-        not_started = sum(
-            1
-            for p in progress_map.values()
-            if p["status"] == ProgressStatus.NOT_STARTED
-        )
-
-        completion_percentage = (
-            (completed / total_lessons * 100) if total_lessons > 0 else 0.0
-        )
+        # Summary đọc từ bộ đếm trên user_courses
+        counters = await UserCourseProgressService(
+            self.db
+        ).get_user_course_progress_summary(user_course_id)
 
         summary = {
-            "total_lessons": total_lessons,
-            "completed_lessons": completed,
-            "in_progress_lessons": in_progress,
-            "not_started_lessons": not_started,
-            "completion_percentage": round(completion_percentage, 2),
+            "total_lessons": counters.total_lessons,
+            "completed_lessons": counters.completed_lessons,
+            "in_progress_lessons": counters.in_progress_lessons,
+            "not_started_lessons": counters.not_started_lessons,
+            "completion_percentage": counters.completion_percentage,
         }
 
         return ProgressMapResponse(
@@ -3,7 +3,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from app.database.database import get_async_db
 from app.models.user_model import User
-from app.utils.utils import password_hash
+from app.utils.utils import password_hash_async
 
 
 def get_password_service(db: AsyncSession = Depends(get_async_db)):
@@ -19,7 +19,7 @@ class PasswordService:
         user = result.scalar_one_or_none()
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
-        user.hashed_password = password_hash(new_password)
+        user.hashed_password = await password_hash_async(new_password)
         await self.db.commit()
         await self.db.refresh(user)
         return user
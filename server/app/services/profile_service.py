@@ -2,18 +2,20 @@ from typing import Dict, Any
 
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select
 
 from ..database.database import get_async_db
+from ..services.user_course_progress_service import (
+    completion_percentage,
+    total_lessons_subquery,
+)
 from ..models import (
     Badge,
     User,
     UserBadge,
     UserCourse,
     Course,
-    UserCourseProgress,
 )
-from ..models.user_course_progress_model import ProgressStatus
 
 
 class ProfileService:
@@ -36,7 +38,11 @@ class ProfileService:
 
         # Lấy danh sách khóa học đã đăng ký với progress
         enrolled_courses_result = await self.db.execute(
-            select(Course, UserCourse)
+            select(
+                Course,
+                UserCourse,
+                total_lessons_subquery(Course.id).label("total_lessons"),
+            )
             .join(UserCourse, UserCourse.course_id == Course.id)
             .where(UserCourse.user_id == user_id)
         )
@@ -94,30 +100,12 @@ class ProfileService:
 
         # Chuyển đổi dữ liệu khóa học
         courses = []
-        for course, user_course in enrolled_courses:
-            # Tính progress dựa trên UserCourseProgress
-            # First get total lessons
-            total_result = await self.db.execute(
-                select(func.count())
-                .select_from(UserCourseProgress)
-                .where(UserCourseProgress.user_course_id == user_course.id)
+        for course, user_course, total_lessons in enrolled_courses:
+            # Progress đọc từ bộ đếm trên user_courses, theo số bài hiện có
+            progress = int(
+                completion_percentage(user_course.completed_lessons, total_lessons)
             )
-            total_lessons = total_result.scalar() or 0
-            
-            # Then get completed lessons
-            completed_result = await self.db.execute(
-                select(func.count())
-                .select_from(UserCourseProgress)
-                .where(
-                    UserCourseProgress.user_course_id == user_course.id,
-                    UserCourseProgress.status == ProgressStatus.COMPLETED
-                )
-            )
-            completed_lessons = completed_result.scalar() or 0
-            
-            # Calculate progress percentage
-            progress = int((completed_lessons / total_lessons * 100) if total_lessons > 0 else 0)
-            
+
             courses.append(
                 {
                     "id": str(course.id),
@@ -0,0 +1,201 @@
+import re
+from typing import Optional
+
+from fastapi import Depends
+from sqlalchemy import func, literal, literal_column, null, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.database import get_async_db, get_async_read_db
+from app.database.read_replica import read_only
+from app.models.course_model import Course
+from app.models.lesson_model import Lesson, LessonSection
+from app.models.topic_model import Topic
+from app.schemas.search_schema import SearchHit, SearchResponse
+from app.utils.string import remove_vi_accents
+
+# Cấu hình text search bỏ dấu tiếng Việt (tạo trong migration e5a9c3d7b1f2)
+SEARCH_CONFIG = literal_column("'vietnamese_unaccent'::regconfig")
+
+HEADLINE_OPTIONS = (
+    "StartSel=<mark>, StopSel=</mark>, MaxWords=35, MinWords=15, "
+    "MaxFragments=2, FragmentDelimiter=\" … \""
+)
+
+# Giới hạn số từ trong chuỗi tìm kiếm
+MAX_QUERY_TERMS = 8
+
+_TERM_PATTERN = re.compile(r"[0-9a-z]+")
+
+
+def build_prefix_tsquery(query: str) -> Optional[str]:
+    """
+    Chuyển chuỗi người dùng nhập thành tsquery dạng tiền tố, bỏ dấu tiếng Việt
+
+    Ví dụ: ``"Thuật toán sắp"`` -> ``"thuat:* & toan:* & sap:*"``. Chỉ giữ chữ và số
+    nên kết quả luôn là cú pháp tsquery hợp lệ.
+
+    Args:
+        query: Chuỗi tìm kiếm
+
+    Returns:
+        Optional[str]: tsquery, None nếu không còn từ nào để tìm
+    """
+    terms = _TERM_PATTERN.findall(remove_vi_accents(query).lower())
+    if not terms:
+        return None
+    terms = list(dict.fromkeys(terms))[:MAX_QUERY_TERMS]
+    return " & ".join(f"{term}:*" for term in terms)
+
+
+class SearchService:
+    def __init__(
+        self,
+        db: AsyncSession,
+        read_db: Optional[AsyncSession] = None,
+    ):
+        self.db = db
+        self.read_db = read_db
+
+    @read_only
+    async def search(self, query: str, limit: int = 10) -> SearchResponse:
+        """
+        Tìm kiếm toàn văn trong khóa học, bài học và nội dung bài học đã công khai
+
+        Dùng cột ``search_vector`` (GIN index) nên không quét toàn bảng như ILIKE.
+        Ba nhóm kết quả được lấy bằng một câu truy vấn, mỗi nhóm sắp xếp theo
+        ``ts_rank_cd`` và chỉ tạo đoạn trích cho các dòng được trả về.
+
+        Args:
+            query: Chuỗi tìm kiếm, không phân biệt dấu và hoa thường
+            limit: Số kết quả tối đa của mỗi nhóm
+
+        Returns:
+            SearchResponse: Kết quả nhóm theo courses, lessons, sections
+        """
+        response = SearchResponse(query=query)
+        tsquery_text = build_prefix_tsquery(query)
+        if tsquery_text is None:
+            return response
+
+        result = await self.db.execute(self._search_statement(tsquery_text, limit))
+        groups = {
+            "course": response.courses,
+            "lesson": response.lessons,
+            "section": response.sections,
+        }
+        for row in result.all():
+            groups[row.kind].append(
+                SearchHit(
+                    id=row.id,
+                    title=row.title,
+                    snippet=row.snippet,
+                    rank=row.rank,
+                    course_id=row.course_id,
+                    lesson_id=row.lesson_id,
+                )
+            )
+        for hits in groups.values():
+            hits.sort(key=lambda hit: (-hit.rank, hit.id))
+        return response
+
+    @staticmethod
+    def _search_statement(tsquery_text: str, limit: int):
+        """
+        Câu truy vấn UNION ALL ba nhóm kết quả
+
+        Mỗi nhóm lấy ``limit`` id có rank cao nhất trong subquery trước, sau đó mới
+        join lấy tiêu đề và gọi ``ts_headline`` (tốn kém) cho các dòng đó.
+
+        Args:
+            tsquery_text: tsquery đã chuẩn hóa bởi ``build_prefix_tsquery``
+            limit: Số kết quả tối đa của mỗi nhóm
+
+        Returns:
+            Select: Các cột kind, id, title, snippet, rank, course_id, lesson_id
+        """
+        tsquery = func.to_tsquery(SEARCH_CONFIG, tsquery_text)
+
+        def headline(document):
+            return func.ts_headline(
+                SEARCH_CONFIG, func.coalesce(document, ""), tsquery, HEADLINE_OPTIONS
+            )
+
+        def top_matches(*columns, vector, joins=()):
+            rank = func.ts_rank_cd(vector, tsquery)
+            statement = select(*columns, rank.label("rank"))
+            for target, onclause in joins:
+                statement = statement.join(target, onclause)
+            return (
+                statement.where(
+                    vector.bool_op("@@")(tsquery), Course.is_published.is_(True)
+                )
+                .order_by(rank.desc(), columns[0])
+                .limit(limit)
+                .subquery()
+            )
+
+        course_matches = top_matches(
+            Course.id.label("id"), vector=Course.search_vector
+        )
+        lesson_matches = top_matches(
+            Lesson.id.label("id"),
+            Topic.course_id.label("course_id"),
+            vector=Lesson.search_vector,
+            joins=[
+                (Topic, Topic.id == Lesson.topic_id),
+                (Course, Course.id == Topic.course_id),
+            ],
+        )
+        section_matches = top_matches(
+            LessonSection.id.label("id"),
+            Topic.course_id.label("course_id"),
+            vector=LessonSection.search_vector,
+            joins=[
+                (Lesson, Lesson.id == LessonSection.lesson_id),
+                (Topic, Topic.id == Lesson.topic_id),
+                (Course, Course.id == Topic.course_id),
+            ],
+        )
+
+        courses = select(
+            literal("course").label("kind"),
+            Course.id,
+            Course.title,
+            headline(Course.description).label("snippet"),
+            course_matches.c.rank,
+            Course.id.label("course_id"),
+            null().label("lesson_id"),
+        ).join(course_matches, course_matches.c.id == Course.id)
+        lessons = select(
+            literal("lesson").label("kind"),
+            Lesson.id,
+            Lesson.title,
+            headline(Lesson.description).label("snippet"),
+            lesson_matches.c.rank,
+            lesson_matches.c.course_id,
+            Lesson.id.label("lesson_id"),
+        ).join(lesson_matches, lesson_matches.c.id == Lesson.id)
+        sections = (
+            select(
+                literal("section").label("kind"),
+                LessonSection.id,
+                Lesson.title,
+                headline(LessonSection.content).label("snippet"),
+                section_matches.c.rank,
+                section_matches.c.course_id,
+                LessonSection.lesson_id,
+            )
+            .join(section_matches, section_matches.c.id == LessonSection.id)
+            .join(Lesson, Lesson.id == LessonSection.lesson_id)
+        )
+        return union_all(courses, lessons, sections)
+
+
+def get_search_service(
+    db: AsyncSession = Depends(get_async_db),
+    read_db: AsyncSession = Depends(get_async_read_db),
+):
+    """
+    Factory function để tạo SearchService với session chính và session đọc
+    """
+    return SearchService(db, read_db)
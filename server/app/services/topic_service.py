@@ -4,7 +4,9 @@ from sqlalchemy.future import select
 from fastapi import Depends, HTTPException
 from sqlalchemy.orm import selectinload
 
-from app.database.database import get_async_db
+from app.database.database import get_async_db, get_async_read_db
+from app.database.lesson_navigation import topic_sequence_order_by
+from app.database.read_replica import read_only
 from app.models.topic_model import Topic
 from app.models.lesson_model import Lesson
 from app.schemas.topic_schema import (
@@ -20,8 +22,9 @@ from app.models.user_course_progress_model import ProgressStatus, UserCourseProg
 
 
 class TopicService:
-    def __init__(self, db: AsyncSession):
+    def __init__(self, db: AsyncSession, read_db: Optional[AsyncSession] = None):
         self.db = db
+        self.read_db = read_db
 
     async def create_topic(self, topic_data: CreateTopicSchema) -> TopicResponse:
         """
@@ -96,6 +99,7 @@ class TopicService:
         await self.db.delete(topic)
         await self.db.commit()
 
+    @read_only
     async def get_topics_by_course_id(self, course_id: int) -> List[TopicResponse]:
         """
         Lấy danh sách topics theo course_id
@@ -109,7 +113,7 @@ class TopicService:
                 selectinload(Topic.lessons)
                 .selectinload(Lesson.exercises),
             )
-            .order_by(Topic.order.asc().nulls_last(), Topic.id.asc())
+            .order_by(*topic_sequence_order_by())
         )
 
         result = await self.db.execute(stmt)
@@ -261,14 +265,18 @@ class TopicService:
         return [convert_lesson_to_schema(lesson) for lesson in lessons]
 
 
-def get_topic_service(db: AsyncSession = Depends(get_async_db)) -> TopicService:
+def get_topic_service(
+    db: AsyncSession = Depends(get_async_db),
+    read_db: AsyncSession = Depends(get_async_read_db),
+) -> TopicService:
     """
     Dependency injection for TopicService
 
     Args:
         db: Async database session
+        read_db: Session chỉ đọc (read replica hoặc chính db)
 
     Returns:
         TopicService: Service instance
     """
-    return TopicService(db)
+    return TopicService(db, read_db)
@@ -1,11 +1,18 @@
 from datetime import datetime
-from typing import List, Optional
+from typing import Iterable, List, Optional, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, func
+from sqlalchemy import select, and_, case, exists, func, or_, tuple_, update
+from sqlalchemy.orm import aliased
 from fastapi import Depends, HTTPException, status
 
 from app.database.database import get_async_db
+from app.database.lesson_navigation import lesson_sequence_order_by
+from app.database.repository import Repository
+from app.models.lesson_model import Lesson
+from app.models.topic_model import Topic
+from app.models.user_course_model import UserCourse
 from app.models.user_course_progress_model import UserCourseProgress, ProgressStatus
+from app.schemas.lesson_schema import LessonCompleteResponseSchema
 from app.schemas.user_course_progress_schema import (
     UserCourseProgressCreate,
     UserCourseProgressUpdate,
@@ -14,6 +21,150 @@ from app.schemas.user_course_progress_schema import (
     LessonProgressSummary,
 )
 
+# Các cột của uq_user_course_progress_lesson, xác định một progress record
+PROGRESS_KEY_COLUMNS = ("user_course_id", "topic_id", "lesson_id")
+
+
+def total_lessons_subquery(course_id):
+    """Scalar subquery đếm số lesson hiện có của khóa học"""
+    return (
+        select(func.count(Lesson.id))
+        .join(Topic, Topic.id == Lesson.topic_id)
+        .where(Topic.course_id == course_id)
+        .scalar_subquery()
+    )
+
+
+def completion_percentage(completed_lessons: int, total_lessons: int) -> float:
+    """
+    Phần trăm hoàn thành tính lúc đọc từ số bài đã hoàn thành và số bài hiện có,
+    nên không bị lệch khi khóa học được thêm/bớt bài sau khi bộ đếm được ghi
+
+    Returns:
+        float: Phần trăm (0-100) làm tròn 2 chữ số
+    """
+    if not total_lessons:
+        return 0.0
+    return round(min(completed_lessons, total_lessons) * 100.0 / total_lessons, 2)
+
+
+def _stale_enrollments_condition(lesson_ids: Iterable[int], topic_ids: Iterable[int]):
+    """
+    Điều kiện trên UserCourse: bộ đếm của lần đăng ký có thể đổi khi các lesson
+    ``lesson_ids`` và mọi lesson của các topic ``topic_ids`` được thêm, xóa hoặc đổi
+    vị trí
+
+    - Có progress trên lesson thay đổi: số bài đã hoàn thành/đang học có thể đổi
+    - Bài học hiện tại là lesson/topic thay đổi, không còn hoặc chưa có
+    - Khóa học có lesson thay đổi đứng trước bài học hiện tại (bài chưa hoàn thành
+      đầu tiên), hoặc bài học hiện tại đã hoàn thành (đã học hết khóa học)
+
+    Các lần đăng ký khác giữ nguyên bộ đếm nên không cần tính lại.
+    """
+    lesson_ids = list(lesson_ids)
+    topic_ids = list(topic_ids)
+    changed_progress = exists().where(
+        UserCourseProgress.user_course_id == UserCourse.id,
+        or_(
+            UserCourseProgress.lesson_id.in_(lesson_ids),
+            UserCourseProgress.topic_id.in_(topic_ids),
+        ),
+    )
+
+    changed, changed_topic = aliased(Lesson), aliased(Topic)
+    current, current_topic = aliased(Lesson), aliased(Topic)
+    current_completed = (
+        exists()
+        .where(
+            UserCourseProgress.user_course_id == UserCourse.id,
+            UserCourseProgress.lesson_id == current.id,
+            UserCourseProgress.status == ProgressStatus.COMPLETED,
+        )
+        .correlate(UserCourse, current)
+    )
+    changed_before_current = exists(
+        select(changed.id)
+        .join(changed_topic, changed_topic.id == changed.topic_id)
+        .outerjoin(current, current.id == UserCourse.current_lesson)
+        .outerjoin(current_topic, current_topic.id == current.topic_id)
+        .where(
+            changed_topic.course_id == UserCourse.course_id,
+            or_(changed.id.in_(lesson_ids), changed.topic_id.in_(topic_ids)),
+            or_(
+                current.id.is_(None),
+                tuple_(*lesson_sequence_order_by(changed, changed_topic))
+                < tuple_(*lesson_sequence_order_by(current, current_topic)),
+                current_completed,
+            ),
+        )
+    )
+
+    return or_(
+        changed_progress,
+        UserCourse.current_lesson.in_(lesson_ids),
+        UserCourse.current_topic.in_(topic_ids),
+        changed_before_current,
+    )
+
+
+def progress_counters_statement(
+    user_course_ids: Optional[Iterable[int]] = None,
+    lesson_ids: Optional[Iterable[int]] = None,
+    topic_ids: Optional[Iterable[int]] = None,
+):
+    """
+    Câu UPDATE ... FROM tính lại bộ đếm tiến độ trên user_courses từ
+    user_course_progress
+
+    Args:
+        user_course_ids: Chỉ tính lại các user course này
+        lesson_ids: Các lesson vừa được thêm, xóa hoặc đổi vị trí
+        topic_ids: Các topic vừa đổi vị trí hoặc khóa học (mọi lesson của topic đổi
+            vị trí). Khi có ``lesson_ids``/``topic_ids``, chỉ tính lại các lần đăng
+            ký có bộ đếm bị ảnh hưởng; không chỉ định cả ba để tính tất cả
+
+    Returns:
+        Update: Câu UPDATE, chạy được trên cả session async và sync
+    """
+    enrollments = select(UserCourse.id.label("user_course_id"), UserCourse.course_id)
+    if user_course_ids is not None:
+        enrollments = enrollments.where(UserCourse.id.in_(list(user_course_ids)))
+    if lesson_ids is not None or topic_ids is not None:
+        enrollments = enrollments.where(
+            _stale_enrollments_condition(lesson_ids or (), topic_ids or ())
+        )
+    enrollments = enrollments.subquery()
+
+    stats = UserCourseProgressService._lesson_progress_statement(enrollments).subquery()
+    counters = (
+        select(
+            enrollments.c.user_course_id,
+            func.coalesce(stats.c.completed_lessons, 0).label("completed_lessons"),
+            func.coalesce(stats.c.in_progress_lessons, 0).label(
+                "in_progress_lessons"
+            ),
+            stats.c.current_topic_id,
+            stats.c.current_lesson_id,
+            stats.c.last_activity_at,
+        )
+        .select_from(enrollments)
+        .outerjoin(stats, stats.c.user_course_id == enrollments.c.user_course_id)
+        .subquery()
+    )
+
+    return (
+        update(UserCourse)
+        .where(UserCourse.id == counters.c.user_course_id)
+        .values(
+            completed_lessons=counters.c.completed_lessons,
+            in_progress_lessons=counters.c.in_progress_lessons,
+            current_topic=counters.c.current_topic_id,
+            current_lesson=counters.c.current_lesson_id,
+            last_activity_at=counters.c.last_activity_at,
+        )
+        .execution_options(synchronize_session=False)
+    )
+
 
 class UserCourseProgressService:
     """
@@ -22,6 +173,7 @@ class UserCourseProgressService:
 
     def __init__(self, db: AsyncSession):
         self.db = db
+        self.repository = Repository(UserCourseProgress, db)
 
     async def create_progress_record(
         self, progress_data: UserCourseProgressCreate
@@ -29,25 +181,21 @@ class UserCourseProgressService:
         """
         Tạo một record tiến độ mới cho user trong lesson
         """
-        # Kiểm tra xem đã có record cho lesson này chưa
-        existing_record = await self.get_progress_by_user_course_and_lesson(
-            progress_data.user_course_id,
-            progress_data.topic_id,
-            progress_data.lesson_id,
+        # DO NOTHING khi đã có record, không RETURNING dòng nào nghĩa là đã tồn tại
+        records = await self.repository.bulk_upsert(
+            [progress_data.model_dump()],
+            conflict_columns=PROGRESS_KEY_COLUMNS,
+            update_columns=[],
+            returning=UserCourseProgress,
         )
 
-        if existing_record:
+        if not records:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Progress record already exists for this lesson",
             )
 
-        db_progress = UserCourseProgress(**progress_data.model_dump())
-        self.db.add(db_progress)
-        await self.db.commit()
-        await self.db.refresh(db_progress)
-
-        return UserCourseProgressResponse.model_validate(db_progress)
+        return UserCourseProgressResponse.model_validate(records[0])
 
     async def get_progress_by_user_course_and_lesson(
         self, user_course_id: int, topic_id: int, lesson_id: int
@@ -77,55 +225,369 @@ class UserCourseProgressService:
         progress_update: UserCourseProgressUpdate,
     ) -> UserCourseProgressResponse:
         """
-        Cập nhật tiến độ học tập của user cho một lesson
+        Cập nhật tiến độ học tập của user cho một lesson, tạo record mới nếu chưa có
+
+        Dùng một câu INSERT ... ON CONFLICT nên hai request đồng thời không tạo
+        record trùng.
         """
-        # Tìm record hiện tại
-        stmt = select(UserCourseProgress).where(
-            and_(
-                UserCourseProgress.user_course_id == user_course_id,
-                UserCourseProgress.topic_id == topic_id,
-                UserCourseProgress.lesson_id == lesson_id,
+        # Khóa dòng user_courses để các thay đổi tiến độ của cùng một lần đăng ký
+        # cập nhật bộ đếm lần lượt, đồng thời lấy status cũ của lesson
+        enrollment = (
+            await self.db.execute(
+                select(UserCourse.course_id, UserCourseProgress.status)
+                .outerjoin(
+                    UserCourseProgress,
+                    and_(
+                        UserCourseProgress.user_course_id == UserCourse.id,
+                        UserCourseProgress.topic_id == topic_id,
+                        UserCourseProgress.lesson_id == lesson_id,
+                    ),
+                )
+                .where(UserCourse.id == user_course_id)
+                .with_for_update(of=UserCourse)
+            )
+        ).first()
+        if enrollment is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="User course not found",
             )
+
+        return await self._write_progress(
+            user_course_id,
+            enrollment.course_id,
+            topic_id,
+            lesson_id,
+            progress_update,
+            old_status=enrollment.status,
         )
-        result = await self.db.execute(stmt)
-        progress = result.scalar_one_or_none()
 
-        if not progress:
-            # Tạo record mới nếu chưa có
-            create_data = UserCourseProgressCreate(
-                user_course_id=user_course_id,
-                topic_id=topic_id,
-                lesson_id=lesson_id,
-                status=progress_update.status or ProgressStatus.NOT_STARTED,
+    async def complete_lesson(
+        self, user_id: int, lesson_id: int
+    ) -> LessonCompleteResponseSchema:
+        """
+        Đánh dấu hoàn thành bài học và trả về bài học tiếp theo
+
+        Một câu truy vấn lấy topic, bài học tiếp theo (chỉ mục điều hướng
+        ``next_lesson_id``), lần đăng ký của user (khóa FOR UPDATE) và status cũ;
+        sau đó upsert tiến độ và bộ đếm trong một transaction.
+
+        Args:
+            user_id: ID của user
+            lesson_id: ID của bài học vừa hoàn thành
+
+        Returns:
+            LessonCompleteResponseSchema: Bài học tiếp theo nếu có
+        """
+        lookup = (
+            await self.db.execute(
+                select(
+                    Lesson.topic_id,
+                    Lesson.next_lesson_id,
+                    UserCourse.id.label("user_course_id"),
+                    UserCourse.course_id,
+                    UserCourseProgress.status,
+                )
+                .join(Topic, Topic.id == Lesson.topic_id)
+                .join(
+                    UserCourse,
+                    and_(
+                        UserCourse.course_id == Topic.course_id,
+                        UserCourse.user_id == user_id,
+                    ),
+                )
+                .outerjoin(
+                    UserCourseProgress,
+                    and_(
+                        UserCourseProgress.user_course_id == UserCourse.id,
+                        UserCourseProgress.topic_id == Lesson.topic_id,
+                        UserCourseProgress.lesson_id == Lesson.id,
+                    ),
+                )
+                .where(Lesson.id == lesson_id)
+                .with_for_update(of=UserCourse)
+            )
+        ).first()
+        if lookup is None:
+            # Chỉ chạy khi lỗi, để trả về thông báo như trước
+            lesson_exists = await self.db.scalar(
+                select(exists().where(Lesson.id == lesson_id))
+            )
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="User state not found" if lesson_exists else "Lesson not found",
             )
-            return await self.create_progress_record(create_data)
 
-        # Cập nhật các field được cung cấp
-        update_data = progress_update.model_dump(exclude_unset=True)
+        await self._write_progress(
+            lookup.user_course_id,
+            lookup.course_id,
+            lookup.topic_id,
+            lesson_id,
+            UserCourseProgressUpdate(
+                status=ProgressStatus.COMPLETED, completed_at=datetime.now()
+            ),
+            old_status=lookup.status,
+        )
 
-        for field, value in update_data.items():
-            setattr(progress, field, value)
+        if lookup.next_lesson_id:
+            next_lesson_id = int(lookup.next_lesson_id)
+            return LessonCompleteResponseSchema(
+                lesson_id=next_lesson_id,
+                next_lesson_id=next_lesson_id,
+                is_completed=True,
+            )
 
-        # Tự động set completed_at khi status = COMPLETED
-        if (
-            progress_update.status == ProgressStatus.COMPLETED
-            and not progress.completed_at
-        ):
-            progress.completed_at = datetime.utcnow()
+        return LessonCompleteResponseSchema(
+            lesson_id=lesson_id, next_lesson_id=None, is_completed=True
+        )
 
-        # Reset completed_at nếu status không phải COMPLETED
-        if (
-            progress_update.status
-            and progress_update.status != ProgressStatus.COMPLETED
-        ):
-            progress.completed_at = None
+    async def _write_progress(
+        self,
+        user_course_id: int,
+        course_id: int,
+        topic_id: int,
+        lesson_id: int,
+        progress_update: UserCourseProgressUpdate,
+        old_status: Optional[ProgressStatus],
+    ) -> UserCourseProgressResponse:
+        """
+        Upsert progress record và cập nhật bộ đếm của user_courses trong một
+        transaction. Dòng user_courses phải được khóa trước đó.
+        """
+        values = progress_update.model_dump(exclude_unset=True)
+        if values.get("status") is None:
+            values.pop("status", None)
+        excluded = self.repository.excluded
+        update_columns = {field: excluded[field] for field in values}
+
+        if progress_update.status == ProgressStatus.COMPLETED:
+            # Giữ thời điểm hoàn thành cũ nếu không truyền completed_at
+            if "completed_at" not in values:
+                values["completed_at"] = datetime.utcnow()
+                update_columns["completed_at"] = func.coalesce(
+                    UserCourseProgress.completed_at, excluded.completed_at
+                )
+        elif progress_update.status:
+            # Reset completed_at nếu status không phải COMPLETED
+            values["completed_at"] = None
+            update_columns["completed_at"] = None
+
+        update_columns["updated_at"] = func.now()
+
+        async with self.repository.unit_of_work():
+            records = await self.repository.bulk_upsert(
+                [
+                    {
+                        "user_course_id": user_course_id,
+                        "topic_id": topic_id,
+                        "lesson_id": lesson_id,
+                        **values,
+                        "status": progress_update.status
+                        or ProgressStatus.NOT_STARTED,
+                    }
+                ],
+                conflict_columns=PROGRESS_KEY_COLUMNS,
+                update_columns=update_columns,
+                returning=UserCourseProgress,
+            )
+            await self._apply_progress_change(
+                user_course_id,
+                course_id,
+                old_status=old_status,
+                new_status=records[0].status,
+            )
 
-        progress.updated_at = datetime.utcnow()
+        return UserCourseProgressResponse.model_validate(records[0])
 
-        await self.db.commit()
-        await self.db.refresh(progress)
+    async def _apply_progress_change(
+        self,
+        user_course_id: int,
+        course_id: int,
+        old_status: Optional[ProgressStatus],
+        new_status: Optional[ProgressStatus],
+    ) -> None:
+        """
+        Cập nhật bộ đếm tiến độ trên user_courses theo thay đổi status của một lesson
+
+        Số lesson đã hoàn thành/đang học được cộng trừ theo chênh lệch, không đếm
+        lại user_course_progress. Bài học hiện tại chỉ tính lại khi số lesson đã
+        hoàn thành thay đổi.
+
+        Args:
+            user_course_id: ID của user course
+            course_id: ID của khóa học
+            old_status: Status trước khi cập nhật, None nếu chưa có record
+            new_status: Status sau khi cập nhật, None nếu record bị xóa
+        """
+        completed_delta = int(new_status == ProgressStatus.COMPLETED) - int(
+            old_status == ProgressStatus.COMPLETED
+        )
+        in_progress_delta = int(new_status == ProgressStatus.IN_PROGRESS) - int(
+            old_status == ProgressStatus.IN_PROGRESS
+        )
+
+        values = {"last_activity_at": func.now()}
+        if in_progress_delta:
+            values["in_progress_lessons"] = (
+                UserCourse.in_progress_lessons + in_progress_delta
+            )
+        if completed_delta:
+            values["completed_lessons"] = (
+                UserCourse.completed_lessons + completed_delta
+            )
+            (
+                values["current_topic"],
+                values["current_lesson"],
+            ) = await self._find_current_lesson(user_course_id, course_id)
+
+        await self.db.execute(
+            update(UserCourse).where(UserCourse.id == user_course_id).values(**values)
+        )
+
+    async def _find_current_lesson(
+        self, user_course_id: int, course_id: int
+    ) -> Tuple[Optional[int], Optional[int]]:
+        """
+        Tìm bài học hiện tại: bài đầu tiên chưa hoàn thành theo thứ tự khóa học,
+        nếu đã hoàn thành hết thì là bài cuối cùng
+
+        Returns:
+            Tuple[Optional[int], Optional[int]]: (topic_id, lesson_id), (None, None)
+            nếu khóa học chưa có lesson
+        """
+        lesson_order = lesson_sequence_order_by()
+        lessons = (
+            select(Lesson.topic_id, Lesson.id)
+            .join(Topic, Topic.id == Lesson.topic_id)
+            .where(Topic.course_id == course_id)
+        )
+        completed = exists().where(
+            UserCourseProgress.user_course_id == user_course_id,
+            UserCourseProgress.lesson_id == Lesson.id,
+            UserCourseProgress.status == ProgressStatus.COMPLETED,
+        )
 
-        return UserCourseProgressResponse.model_validate(progress)
+        row = (
+            await self.db.execute(
+                lessons.where(~completed).order_by(*lesson_order).limit(1)
+            )
+        ).first()
+        if row is None:
+            row = (
+                await self.db.execute(
+                    lessons.order_by(
+                        *[column.desc() for column in lesson_order]
+                    ).limit(1)
+                )
+            ).first()
+        return (row.topic_id, row.id) if row else (None, None)
+
+    async def recompute_progress_counters(
+        self, user_course_ids: Optional[Iterable[int]] = None
+    ) -> int:
+        """
+        Tính lại bộ đếm tiến độ trên user_courses từ user_course_progress
+
+        Dùng để sửa bộ đếm bị lệch (dữ liệu cũ). Khi lesson/topic của khóa học thay
+        đổi, bộ đếm được tính lại tự động trước khi commit (xem
+        app/database/lesson_navigation.py). Toàn bộ được tính và ghi bằng một câu
+        UPDATE ... FROM.
+
+        Args:
+            user_course_ids: Chỉ tính lại các user course này, None để tính tất cả
+
+        Returns:
+            int: Số user course đã cập nhật
+        """
+        async with Repository(UserCourse, self.db).unit_of_work():
+            result = await self.db.execute(
+                progress_counters_statement(user_course_ids)
+            )
+        return result.rowcount
+
+    @staticmethod
+    def _lesson_progress_statement(enrollments):
+        """
+        Câu truy vấn gom theo lần đăng ký: tổng số bài, số bài đã hoàn thành/đang
+        học, bài học hiện tại và hoạt động gần nhất của mỗi user course trong
+        ``enrollments``. Chỉ tính progress của các lesson còn trong khóa học.
+
+        Args:
+            enrollments: Subquery (user_course_id, course_id)
+
+        Returns:
+            Select: Mỗi dòng gồm user_course_id, total_lessons, completed_lessons,
+                in_progress_lessons, current_topic_id, current_lesson_id,
+                last_activity_at
+        """
+        completed = case(
+            (UserCourseProgress.status == ProgressStatus.COMPLETED, 1), else_=0
+        )
+        in_progress = case(
+            (UserCourseProgress.status == ProgressStatus.IN_PROGRESS, 1), else_=0
+        )
+        lesson_order = lesson_sequence_order_by()
+        enrollment = enrollments.c.user_course_id
+
+        lessons = (
+            select(
+                enrollment,
+                Topic.id.label("topic_id"),
+                Lesson.id.label("lesson_id"),
+                completed.label("completed"),
+                func.count().over(partition_by=enrollment).label("total_lessons"),
+                func.sum(completed)
+                .over(partition_by=enrollment)
+                .label("completed_lessons"),
+                func.sum(in_progress)
+                .over(partition_by=enrollment)
+                .label("in_progress_lessons"),
+                func.max(UserCourseProgress.updated_at)
+                .over(partition_by=enrollment)
+                .label("last_activity_at"),
+                # Thứ tự trong nhóm bài chưa/đã hoàn thành của lần đăng ký
+                func.row_number()
+                .over(partition_by=(enrollment, completed), order_by=lesson_order)
+                .label("position"),
+                func.row_number()
+                .over(
+                    partition_by=enrollment,
+                    order_by=[column.desc() for column in lesson_order],
+                )
+                .label("position_from_end"),
+            )
+            .select_from(Lesson)
+            .join(Topic, Topic.id == Lesson.topic_id)
+            .join(enrollments, enrollments.c.course_id == Topic.course_id)
+            .outerjoin(
+                UserCourseProgress,
+                and_(
+                    UserCourseProgress.user_course_id == enrollment,
+                    UserCourseProgress.topic_id == Topic.id,
+                    UserCourseProgress.lesson_id == Lesson.id,
+                ),
+            )
+            .subquery()
+        )
+
+        # Bài đầu tiên chưa hoàn thành, nếu không có thì bài cuối cùng
+        first_incomplete = and_(lessons.c.completed == 0, lessons.c.position == 1)
+        last_lesson = lessons.c.position_from_end == 1
+        return select(
+            lessons.c.user_course_id,
+            func.max(lessons.c.total_lessons).label("total_lessons"),
+            func.max(lessons.c.completed_lessons).label("completed_lessons"),
+            func.max(lessons.c.in_progress_lessons).label("in_progress_lessons"),
+            func.coalesce(
+                func.max(case((first_incomplete, lessons.c.topic_id))),
+                func.max(case((last_lesson, lessons.c.topic_id))),
+            ).label("current_topic_id"),
+            func.coalesce(
+                func.max(case((first_incomplete, lessons.c.lesson_id))),
+                func.max(case((last_lesson, lessons.c.lesson_id))),
+            ).label("current_lesson_id"),
+            func.max(lessons.c.last_activity_at).label("last_activity_at"),
+        ).group_by(lessons.c.user_course_id)
 
     async def mark_lesson_viewed(
         self, user_course_id: int, topic_id: int, lesson_id: int
@@ -161,27 +623,23 @@ class UserCourseProgressService:
         self, user_course_id: int
     ) -> CourseProgressSummary:
         """
-        Lấy tóm tắt tiến độ học tập cho một khóa học
-        """
-        # Đếm số lesson theo status
-        stmt = select(
-            func.count().label("total"),
-            func.count()
-            .filter(UserCourseProgress.status == ProgressStatus.COMPLETED)
-            .label("completed"),
-            func.count()
-            .filter(UserCourseProgress.status == ProgressStatus.IN_PROGRESS)
-            .label("in_progress"),
-            func.count()
-            .filter(UserCourseProgress.status == ProgressStatus.NOT_STARTED)
-            .label("not_started"),
-            func.max(UserCourseProgress.last_viewed_at).label("last_activity"),
-        ).where(UserCourseProgress.user_course_id == user_course_id)
+        Lấy tóm tắt tiến độ học tập cho một khóa học từ bộ đếm trên user_courses
 
-        result = await self.db.execute(stmt)
-        stats = result.first()
+        Phần trăm hoàn thành tính theo số bài hiện có của khóa học.
+        """
+        result = await self.db.execute(
+            select(
+                UserCourse.completed_lessons,
+                UserCourse.in_progress_lessons,
+                UserCourse.current_topic,
+                UserCourse.current_lesson,
+                UserCourse.last_activity_at,
+                total_lessons_subquery(UserCourse.course_id).label("total_lessons"),
+            ).where(UserCourse.id == user_course_id)
+        )
+        counters = result.first()
 
-        if not stats or stats.total == 0:
+        if counters is None:
             return CourseProgressSummary(
                 user_course_id=user_course_id,
                 total_lessons=0,
@@ -194,38 +652,23 @@ class UserCourseProgressService:
                 last_activity_at=None,
             )
 
-        # Tìm lesson hiện tại (lesson IN_PROGRESS gần nhất hoặc lesson COMPLETED gần nhất)
-        current_lesson_stmt = (
-            select(UserCourseProgress.topic_id, UserCourseProgress.lesson_id)
-            .where(
-                and_(
-                    UserCourseProgress.user_course_id == user_course_id,
-                    UserCourseProgress.status.in_(
-                        [ProgressStatus.IN_PROGRESS, ProgressStatus.COMPLETED]
-                    ),
-                )
-            )
-            .order_by(UserCourseProgress.last_viewed_at.desc())
-            .limit(1)
-        )
-
-        current_result = await self.db.execute(current_lesson_stmt)
-        current_lesson = current_result.first()
-
-        completion_percentage = (
-            (stats.completed / stats.total) * 100 if stats.total > 0 else 0
-        )
-
         return CourseProgressSummary(
             user_course_id=user_course_id,
-            total_lessons=stats.total,
-            completed_lessons=stats.completed or 0,
-            in_progress_lessons=stats.in_progress or 0,
-            not_started_lessons=stats.not_started or 0,
-            completion_percentage=round(completion_percentage, 2),
-            current_topic_id=current_lesson.topic_id if current_lesson else None,
-            current_lesson_id=current_lesson.lesson_id if current_lesson else None,
-            last_activity_at=stats.last_activity,
+            total_lessons=counters.total_lessons,
+            completed_lessons=counters.completed_lessons,
+            in_progress_lessons=counters.in_progress_lessons,
+            not_started_lessons=max(
+                counters.total_lessons
+                - counters.completed_lessons
+                - counters.in_progress_lessons,
+                0,
+            ),
+            completion_percentage=completion_percentage(
+                counters.completed_lessons, counters.total_lessons
+            ),
+            current_topic_id=counters.current_topic,
+            current_lesson_id=counters.current_lesson,
+            last_activity_at=counters.last_activity_at,
         )
 
     async def get_lessons_progress_by_topic(
@@ -295,21 +738,31 @@ class UserCourseProgressService:
         """
         Xóa một progress record
         """
-        stmt = select(UserCourseProgress).where(
-            and_(
-                UserCourseProgress.user_course_id == user_course_id,
-                UserCourseProgress.topic_id == topic_id,
-                UserCourseProgress.lesson_id == lesson_id,
+        stmt = (
+            select(UserCourse.course_id, UserCourseProgress)
+            .join(UserCourseProgress, UserCourseProgress.user_course_id == UserCourse.id)
+            .where(
+                and_(
+                    UserCourseProgress.user_course_id == user_course_id,
+                    UserCourseProgress.topic_id == topic_id,
+                    UserCourseProgress.lesson_id == lesson_id,
+                )
             )
+            .with_for_update(of=UserCourse)
         )
         result = await self.db.execute(stmt)
-        progress = result.scalar_one_or_none()
+        row = result.first()
 
-        if not progress:
+        if not row:
             return False
 
-        await self.db.delete(progress)
-        await self.db.commit()
+        course_id, progress = row
+        async with self.repository.unit_of_work():
+            await self.db.delete(progress)
+            await self.db.flush()
+            await self._apply_progress_change(
+                user_course_id, course_id, old_status=progress.status, new_status=None
+            )
         return True
 
 
@@ -1,15 +1,16 @@
 import random
-from functools import lru_cache
 from datetime import datetime
 from sqlalchemy import select
 from typing import Optional, Dict, Any, List
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from fastapi import Depends, HTTPException, status
-from passlib.context import CryptContext
 
+from app.utils.password_hasher import password_hasher, pwd_context
+from app.utils.principal_cache import invalidate_principal
 from app.utils.string import remove_vi_accents
 from app.database.database import get_async_db
+from app.database.pagination import KeysetPage, paginate_keyset
 
 from app.models.user_model import User
 from app.models.user_state_model import UserState
@@ -17,9 +18,8 @@ from app.schemas.auth_schema import UserRegister
 from app.schemas.user_profile_schema import UserUpdate
 
 
-@lru_cache(maxsize=1)
 def get_password_context():
-    return CryptContext(schemes=["bcrypt"], deprecated="auto")
+    return pwd_context
 
 
 def get_user_service(db: AsyncSession = Depends(get_async_db)):
@@ -100,6 +100,33 @@ class UserService:
         pwd_context = get_password_context()
         return pwd_context.hash(password)
 
+    async def verify_password_async(
+        self, plain_password: str, hashed_password: str
+    ) -> bool:
+        """
+        Kiểm tra mật khẩu trong thread pool hash, không chặn event loop
+
+        Args:
+            plain_password (str): Mật khẩu gốc
+            hashed_password (str): Mật khẩu đã mã hóa
+
+        Returns:
+            bool: True nếu mật khẩu đúng, ngược lại là False
+        """
+        return await password_hasher.verify(plain_password, hashed_password)
+
+    async def get_password_hash_async(self, password: str) -> str:
+        """
+        Mã hóa mật khẩu trong thread pool hash, không chặn event loop
+
+        Args:
+            password (str): Mật khẩu gốc
+
+        Returns:
+            str: Mật khẩu đã mã hóa
+        """
+        return await password_hasher.hash(password)
+
     async def create_user(self, user_data: UserRegister) -> User:
         """
         Tạo người dùng mới
@@ -126,7 +153,7 @@ class UserService:
         )
 
         # Mã hóa mật khẩu
-        hashed_password = self.get_password_hash(user_data.password)
+        hashed_password = await self.get_password_hash_async(user_data.password)
 
         new_user = User(
             email=user_data.email,
@@ -175,7 +202,7 @@ class UserService:
             return False
 
         # Mã hóa mật khẩu mới
-        hashed_password = self.get_password_hash(new_password)
+        hashed_password = await self.get_password_hash_async(new_password)
 
         # Cập nhật mật khẩu
         user.hashed_password = hashed_password
@@ -183,6 +210,7 @@ class UserService:
 
         # Lưu vào database
         await self.db.commit()
+        invalidate_principal(user_id)
 
         return True
 
@@ -212,6 +240,7 @@ class UserService:
         # Lưu vào database
         await self.db.commit()
         await self.db.refresh(user)
+        invalidate_principal(user_id)
 
         return user
 
@@ -554,10 +583,30 @@ class UserService:
         from sqlalchemy import select
 
         result = await self.db.execute(
-            select(User).offset(skip).limit(limit).order_by(User.created_at.desc())
+            select(User)
+            .offset(skip)
+            .limit(limit)
+            .order_by(User.created_at.desc(), User.id.desc())
         )
         return list(result.scalars().all())
 
+    async def get_users_page(
+        self, limit: int = 100, cursor: Optional[str] = None
+    ) -> KeysetPage[User]:
+        """
+        Lấy danh sách người dùng mới nhất trước với phân trang keyset
+
+        Args:
+            limit (int): Số bản ghi mỗi trang
+            cursor (Optional[str]): Cursor từ trang trước, None để lấy trang đầu
+
+        Returns:
+            KeysetPage[User]: Trang người dùng kèm cursor trang trước/sau
+        """
+        return await paginate_keyset(
+            self.db, select(User), User, limit=limit, cursor=cursor
+        )
+
     async def update_user_admin_info(
         self,
         user_id: int,
@@ -588,6 +637,7 @@ class UserService:
         self.db.add(user)
         await self.db.commit()
         await self.db.refresh(user)
+        invalidate_principal(user_id)
         return user
 
     async def update_user_admin(
@@ -629,6 +679,7 @@ class UserService:
         self.db.add(user)
         await self.db.commit()
         await self.db.refresh(user)
+        invalidate_principal(user_id)
         return user
 
     async def deactivate_user(self, user_id: int) -> Optional[User]:
@@ -650,6 +701,7 @@ class UserService:
         self.db.add(user)
         await self.db.commit()
         await self.db.refresh(user)
+        invalidate_principal(user_id)
         return user
 
     async def activate_user(self, user_id: int) -> Optional[User]:
@@ -671,6 +723,7 @@ class UserService:
         self.db.add(user)
         await self.db.commit()
         await self.db.refresh(user)
+        invalidate_principal(user_id)
         return user
 
     async def delete_user(self, user_id: int, force: bool = False) -> bool:
@@ -697,6 +750,7 @@ class UserService:
         try:
             await self.db.delete(user)
             await self.db.commit()
+            invalidate_principal(user_id)
             return True
         except Exception:
             await self.db.rollback()
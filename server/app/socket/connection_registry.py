@@ -0,0 +1,234 @@
+"""
+Registry kết nối WebSocket dùng chung giữa các worker uvicorn
+"""
+
+import asyncio
+import logging
+from typing import Any, Dict, Iterable, Optional
+from uuid import uuid4
+
+from bidict import bidict
+from fastapi import WebSocket, status
+
+from app.core.config import settings
+from app.socket.pubsub import (
+    InMemoryPubSubBackend,
+    PostgresPubSubBackend,
+    PubSubBackend,
+)
+
+logger = logging.getLogger(__name__)
+
+MESSAGE_CLAIM = "claim"
+MESSAGE_SEND = "send"
+
+
+class ConnectionRegistry:
+    """
+    Quản lý kết nối WebSocket của worker hiện tại và định tuyến message qua pub/sub
+
+    - Mỗi user chỉ có một kết nối trên toàn bộ các worker: khi user kết nối mới,
+      worker publish message ``claim`` và worker đang giữ kết nối cũ sẽ đóng nó.
+    - ``send_to_user``/``send_to_users`` gửi trực tiếp cho các socket nằm trên worker
+      hiện tại, phần còn lại được gộp vào một lần publish duy nhất.
+
+    Attributes:
+        backend (PubSubBackend): Backend pub/sub giữa các worker
+        worker_id (str): ID của worker, dùng để bỏ qua message do chính nó gửi
+        connections (bidict[str, WebSocket]): user_id -> WebSocket trên worker này
+    """
+
+    def __init__(self, backend: PubSubBackend, worker_id: Optional[str] = None):
+        self.backend = backend
+        self.worker_id = worker_id or uuid4().hex
+        self.connections: bidict[str, WebSocket] = bidict()
+        self._started = False
+        self._start_lock = asyncio.Lock()
+
+    async def start(self) -> None:
+        """Subscribe backend pub/sub (chỉ chạy một lần, gọi lại nếu lần trước lỗi)"""
+        if self._started:
+            return
+        async with self._start_lock:
+            if self._started:
+                return
+            try:
+                await self.backend.start(self._on_message)
+                self._started = True
+            except Exception:
+                logger.exception(
+                    "Không thể kết nối backend pub/sub, WebSocket chỉ hoạt động trong worker hiện tại"
+                )
+
+    async def stop(self) -> None:
+        """Hủy subscribe backend pub/sub"""
+        if self._started:
+            await self.backend.stop()
+            self._started = False
+
+    def get_user_id(self, websocket: WebSocket) -> Optional[str]:
+        """
+        Lấy user_id của một kết nối trên worker hiện tại
+
+        Args:
+            websocket (WebSocket): Kết nối WebSocket
+
+        Returns:
+            Optional[str]: user_id hoặc None nếu kết nối chưa được đăng ký
+        """
+        return self.connections.inverse.get(websocket)
+
+    async def connect(self, user_id: str, websocket: WebSocket) -> None:
+        """
+        Đăng ký kết nối mới của user và đóng kết nối cũ ở bất kỳ worker nào
+
+        Args:
+            user_id (str): ID của user
+            websocket (WebSocket): Kết nối mới
+        """
+        await self.start()
+        await self._close_local(user_id)
+        self.connections.put(user_id, websocket)
+        await self._publish(
+            {"type": MESSAGE_CLAIM, "user_id": user_id, "worker_id": self.worker_id}
+        )
+
+    def disconnect(self, user_id: str, websocket: WebSocket) -> None:
+        """
+        Hủy đăng ký kết nối (chỉ khi user vẫn đang gắn với đúng kết nối này)
+
+        Args:
+            user_id (str): ID của user
+            websocket (WebSocket): Kết nối đã đóng
+        """
+        if self.connections.get(user_id) is websocket:
+            self.connections.pop(user_id)
+
+    async def send_to_user(self, user_id: int | str, payload: Dict[str, Any]) -> None:
+        """
+        Gửi message tới user, bất kể socket của user nằm ở worker nào
+
+        Args:
+            user_id (int | str): ID của user
+            payload (Dict[str, Any]): Nội dung gửi qua WebSocket
+        """
+        await self.send_to_users([user_id], payload)
+
+    async def send_to_users(
+        self, user_ids: Iterable[int | str], payload: Dict[str, Any]
+    ) -> None:
+        """
+        Gửi cùng một message tới nhiều user
+
+        User có socket trên worker hiện tại được gửi trực tiếp; các user còn lại
+        được gộp vào một message pub/sub thay vì publish riêng từng user.
+
+        Args:
+            user_ids (Iterable[int | str]): Danh sách ID của user
+            payload (Dict[str, Any]): Nội dung gửi qua WebSocket
+        """
+        remote_user_ids = []
+        for user_id in dict.fromkeys(str(user_id) for user_id in user_ids):
+            websocket = self.connections.get(user_id)
+            if websocket is None:
+                remote_user_ids.append(user_id)
+            else:
+                await self._deliver(user_id, websocket, payload)
+
+        if remote_user_ids:
+            await self._publish(
+                {
+                    "type": MESSAGE_SEND,
+                    "user_ids": remote_user_ids,
+                    "payload": payload,
+                    "worker_id": self.worker_id,
+                }
+            )
+
+    async def broadcast(self, payload: Dict[str, Any]) -> None:
+        """
+        Gửi message tới mọi user đang kết nối trên tất cả worker
+
+        Args:
+            payload (Dict[str, Any]): Nội dung gửi qua WebSocket
+        """
+        for user_id, websocket in list(self.connections.items()):
+            await self._deliver(user_id, websocket, payload)
+        await self._publish(
+            {
+                "type": MESSAGE_SEND,
+                "user_ids": None,
+                "payload": payload,
+                "worker_id": self.worker_id,
+            }
+        )
+
+    async def _publish(self, message: Dict[str, Any]) -> None:
+        await self.start()
+        if not self._started:
+            return
+        try:
+            for part in self.backend.split_message(message):
+                await self.backend.publish(part)
+        except Exception:
+            logger.exception("Không thể publish message WebSocket %s", message["type"])
+
+    async def _on_message(self, message: Dict[str, Any]) -> None:
+        if message.get("worker_id") == self.worker_id:
+            return
+
+        message_type = message.get("type")
+        if message_type == MESSAGE_CLAIM:
+            await self._close_local(message["user_id"])
+        elif message_type == MESSAGE_SEND:
+            user_ids = message.get("user_ids")
+            if user_ids is None:
+                user_ids = list(self.connections.keys())
+            for user_id in user_ids:
+                websocket = self.connections.get(user_id)
+                if websocket is not None:
+                    await self._deliver(user_id, websocket, message["payload"])
+
+    async def _deliver(
+        self, user_id: str, websocket: WebSocket, payload: Dict[str, Any]
+    ) -> None:
+        try:
+            await websocket.send_json(payload)
+        except Exception:
+            logger.warning("Không gửi được message tới user %s, hủy kết nối", user_id)
+            self.disconnect(user_id, websocket)
+
+    async def _close_local(self, user_id: str) -> None:
+        websocket = self.connections.pop(user_id, None)
+        if websocket is None:
+            return
+        try:
+            await websocket.close(
+                code=status.WS_1000_NORMAL_CLOSURE,
+                reason="New connection from same user",
+            )
+        except Exception as e:
+            logger.debug("Đóng kết nối cũ của user %s thất bại: %s", user_id, e)
+
+
+def create_connection_registry() -> ConnectionRegistry:
+    """
+    Tạo registry theo cấu hình WEBSOCKET_REGISTRY_BACKEND
+
+    Returns:
+        ConnectionRegistry: Registry cho worker hiện tại
+    """
+    if settings.WEBSOCKET_REGISTRY_BACKEND == "memory":
+        backend: PubSubBackend = InMemoryPubSubBackend()
+    elif settings.WEBSOCKET_REGISTRY_BACKEND == "postgres":
+        backend = PostgresPubSubBackend(
+            settings.DATABASE_URI, settings.WEBSOCKET_REGISTRY_CHANNEL
+        )
+    else:
+        raise ValueError(
+            f"WEBSOCKET_REGISTRY_BACKEND không hợp lệ: {settings.WEBSOCKET_REGISTRY_BACKEND}"
+        )
+    return ConnectionRegistry(backend)
+
+
+connection_registry = create_connection_registry()
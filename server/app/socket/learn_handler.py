@@ -1,5 +1,6 @@
 from app.socket.base_handler import BaseWebSocketHandler
-from app.services.lesson_service import get_lesson_service
+from app.socket.connection_registry import connection_registry
+from app.services.user_course_progress_service import UserCourseProgressService
 from app.database.database import get_independent_db_session
 from fastapi import WebSocket, HTTPException
 from typing import Any
@@ -9,10 +10,8 @@ import inspect
 class LearnConnectionHandler(BaseWebSocketHandler):
 
     async def handle(self, websocket: WebSocket, message: Any, next: Any):
-        from app.routers.websocket_router import active_connections
-
         message_type = message.get("type", "")
-        user_id_str = active_connections.inverse.get(websocket)
+        user_id_str = connection_registry.get_user_id(websocket)
         if not user_id_str:
             # Handle case where user is not found
             await self.send_json(
@@ -30,10 +29,11 @@ class LearnConnectionHandler(BaseWebSocketHandler):
                 return
 
             async with get_independent_db_session() as db_session:
-                lesson_service = get_lesson_service(db_session)
+                # Không qua LessonService để khỏi khởi tạo agent sinh bài học
+                progress_service = UserCourseProgressService(db_session)
                 try:
-                    result = await lesson_service.complete_lesson(
-                        lesson_id=lesson_id, user_id=user_id
+                    result = await progress_service.complete_lesson(
+                        user_id=user_id, lesson_id=lesson_id
                     )
                 except HTTPException as e:
                     await self.send_json(
@@ -42,7 +42,9 @@ class LearnConnectionHandler(BaseWebSocketHandler):
                     return
 
                 if result is not None:
-                    await self.send_json(websocket, result)
+                    await self.send_json(
+                        websocket, result.model_dump(mode="json", by_alias=True)
+                    )
 
         if inspect.iscoroutinefunction(next):
             await next()
@@ -0,0 +1,236 @@
+"""
+Backend pub/sub để các worker trao đổi message của WebSocket registry
+"""
+
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from app.utils.case_utils import json_dumps, json_loads
+
+logger = logging.getLogger(__name__)
+
+MessageHandler = Callable[[Dict[str, Any]], Awaitable[None]]
+
+# Giới hạn payload của NOTIFY trong Postgres là 8000 bytes
+POSTGRES_NOTIFY_MAX_BYTES = 7999
+
+
+class PubSubBackend(ABC):
+    """
+    Interface của backend pub/sub
+
+    Mọi worker subscribe cùng một kênh; message publish bởi một worker được
+    giao cho tất cả worker (kể cả chính nó).
+    """
+
+    @abstractmethod
+    async def start(self, handler: MessageHandler) -> None:
+        """
+        Bắt đầu nhận message
+
+        Args:
+            handler (MessageHandler): Hàm xử lý mỗi message nhận được
+        """
+
+    @abstractmethod
+    async def publish(self, message: Dict[str, Any]) -> None:
+        """
+        Gửi message tới mọi worker
+
+        Args:
+            message (Dict[str, Any]): Message dạng JSON
+        """
+
+    @abstractmethod
+    async def stop(self) -> None:
+        """Ngừng nhận message và giải phóng kết nối"""
+
+    def split_message(self, message: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Chia message thành các message nhỏ hơn nếu backend giới hạn kích thước
+
+        Args:
+            message (Dict[str, Any]): Message cần gửi
+
+        Returns:
+            List[Dict[str, Any]]: Các message sẽ được publish
+        """
+        return [message]
+
+
+class InMemoryBus:
+    """
+    Kênh pub/sub trong bộ nhớ, dùng chung giữa nhiều InMemoryPubSubBackend
+    để giả lập nhiều worker trong cùng một process (test, chạy 1 worker)
+
+    Attributes:
+        published (int): Số lần publish
+    """
+
+    def __init__(self):
+        self.handlers: List[MessageHandler] = []
+        self.published = 0
+
+    async def publish(self, message: Dict[str, Any]) -> None:
+        self.published += 1
+        # Encode/decode như backend thật để message không bị chia sẻ tham chiếu
+        data = json_dumps(message)
+        for handler in list(self.handlers):
+            await handler(json_loads(data))
+
+
+class InMemoryPubSubBackend(PubSubBackend):
+    """Backend pub/sub trong bộ nhớ"""
+
+    def __init__(self, bus: Optional[InMemoryBus] = None):
+        self.bus = bus or InMemoryBus()
+        self._handler: Optional[MessageHandler] = None
+
+    async def start(self, handler: MessageHandler) -> None:
+        self._handler = handler
+        self.bus.handlers.append(handler)
+
+    async def publish(self, message: Dict[str, Any]) -> None:
+        await self.bus.publish(message)
+
+    async def stop(self) -> None:
+        if self._handler in self.bus.handlers:
+            self.bus.handlers.remove(self._handler)
+        self._handler = None
+
+
+class PostgresPubSubBackend(PubSubBackend):
+    """
+    Backend pub/sub dùng LISTEN/NOTIFY của Postgres
+
+    Dùng một kết nối asyncpg riêng (ngoài pool của SQLAlchemy) cho mỗi worker,
+    vừa LISTEN vừa NOTIFY. Khi kết nối bị đóng, một task nền kết nối lại (và LISTEN
+    lại) với backoff tăng dần, để worker không chỉ nghe lại khi có publish tiếp theo.
+    NOTIFY gửi trong lúc mất kết nối bị mất.
+
+    Attributes:
+        reconnect_delay (float): Thời gian chờ (giây) trước lần kết nối lại đầu tiên,
+            tăng gấp đôi sau mỗi lần lỗi
+        max_reconnect_delay (float): Thời gian chờ tối đa giữa hai lần kết nối lại
+        reconnects (int): Số lần đã kết nối lại thành công
+    """
+
+    def __init__(
+        self,
+        dsn: str,
+        channel: str,
+        reconnect_delay: float = 0.5,
+        max_reconnect_delay: float = 30.0,
+        connect: Optional[Callable[[str], Awaitable[Any]]] = None,
+    ):
+        self.dsn = dsn
+        self.channel = channel
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.reconnects = 0
+        self._connect = connect
+        self._connection = None
+        self._handler: Optional[MessageHandler] = None
+        self._lock = asyncio.Lock()
+        self._tasks: set[asyncio.Task] = set()
+        self._reconnect_task: Optional[asyncio.Task] = None
+
+    async def start(self, handler: MessageHandler) -> None:
+        self._handler = handler
+        await self._ensure_connection()
+
+    async def _ensure_connection(self):
+        async with self._lock:
+            if self._connection is not None and not self._connection.is_closed():
+                return self._connection
+
+            connect = self._connect
+            if connect is None:
+                import asyncpg
+
+                connect = asyncpg.connect
+
+            connection = await connect(self.dsn)
+            await connection.add_listener(self.channel, self._on_notify)
+            connection.add_termination_listener(self._on_terminate)
+            self._connection = connection
+            logger.info("Listening on Postgres channel %s", self.channel)
+            return connection
+
+    def _on_notify(self, connection, pid: int, channel: str, payload: str) -> None:
+        if self._handler is None:
+            return
+        try:
+            message = json_loads(payload)
+        except ValueError:
+            logger.warning("Bỏ qua NOTIFY không phải JSON trên kênh %s", channel)
+            return
+
+        task = asyncio.create_task(self._handler(message))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _on_terminate(self, connection) -> None:
+        if connection is not self._connection:
+            return
+        self._connection = None
+        if self._handler is None:
+            return
+        logger.warning("Mất kết nối LISTEN tới Postgres, đang kết nối lại")
+        if self._reconnect_task is None or self._reconnect_task.done():
+            self._reconnect_task = asyncio.create_task(self._reconnect())
+
+    async def _reconnect(self) -> None:
+        """Kết nối lại tới khi thành công hoặc backend bị dừng"""
+        delay = self.reconnect_delay
+        while self._handler is not None:
+            try:
+                await self._ensure_connection()
+            except Exception as e:
+                logger.warning(
+                    "Kết nối lại kênh %s thất bại, thử lại sau %.1fs: %s",
+                    self.channel,
+                    delay,
+                    e,
+                )
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.max_reconnect_delay)
+            else:
+                self.reconnects += 1
+                return
+
+    async def publish(self, message: Dict[str, Any]) -> None:
+        connection = await self._ensure_connection()
+        await connection.execute(
+            "SELECT pg_notify($1, $2)", self.channel, json_dumps(message).decode()
+        )
+
+    async def stop(self) -> None:
+        self._handler = None
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+            self._reconnect_task = None
+        if self._connection is not None and not self._connection.is_closed():
+            await self._connection.close()
+        self._connection = None
+
+    def split_message(self, message: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Chia danh sách ``user_ids`` của message để mỗi NOTIFY nằm trong giới hạn 8000 bytes
+
+        Raises:
+            ValueError: Nếu payload cho một user vẫn vượt quá giới hạn
+        """
+        if len(json_dumps(message)) <= POSTGRES_NOTIFY_MAX_BYTES:
+            return [message]
+
+        user_ids = message.get("user_ids")
+        if not user_ids or len(user_ids) == 1:
+            raise ValueError("Message WebSocket vượt quá giới hạn NOTIFY của Postgres")
+
+        middle = len(user_ids) // 2
+        return self.split_message(
+            {**message, "user_ids": user_ids[:middle]}
+        ) + self.split_message({**message, "user_ids": user_ids[middle:]})
@@ -2,10 +2,25 @@
 Utility functions để xử lý chuyển đổi định dạng snake_case và camelCase
 """
 
+import json
 import re
-from typing import Any, Dict
+from functools import lru_cache
+from typing import Any, Callable, Optional
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson là dependency tùy chọn
+    orjson = None
 
+# Số key tối đa được ghi nhớ cho mỗi chiều chuyển đổi. Tập key của API rất nhỏ
+# và lặp lại liên tục, nên cache có giới hạn là đủ mà không bị phình bộ nhớ.
+KEY_CACHE_SIZE = 4096
+
+_FIRST_CAP_RE = re.compile("(.)([A-Z][a-z]+)")
+_ALL_CAP_RE = re.compile("([a-z0-9])([A-Z])")
+
+
+@lru_cache(maxsize=KEY_CACHE_SIZE)
 def to_camel_case(snake_str: str) -> str:
     """
     Chuyển đổi string từ snake_case sang camelCase
@@ -14,8 +29,8 @@ def to_camel_case(snake_str: str) -> str:
     Returns:
         String ở dạng camelCase
     """
-    # Xử lý các trường hợp đặc biệt như chuỗi rỗng
-    if not snake_str:
+    # Xử lý các trường hợp đặc biệt như chuỗi rỗng hoặc không có "_"
+    if not snake_str or "_" not in snake_str:
         return snake_str
 
     # Chuyển đổi từ snake_case sang camelCase
@@ -24,6 +39,7 @@ def to_camel_case(snake_str: str) -> str:
     return components[0] + "".join(x.title() for x in components[1:])
 
 
+@lru_cache(maxsize=KEY_CACHE_SIZE)
 def to_snake_case(camel_str: str) -> str:
     """
     Chuyển đổi string từ camelCase sang snake_case
@@ -40,9 +56,23 @@ def to_snake_case(camel_str: str) -> str:
 
     # Sử dụng regex để tách các từ bắt đầu bằng chữ hoa
     # Đầu tiên thay thế chữ cái viết hoa (không phải đầu chuỗi) với '_' và chữ đó
-    s1 = re.sub("(.)([A-Z][a-z]+)", r"\1_\2", camel_str)
+    s1 = _FIRST_CAP_RE.sub(r"\1_\2", camel_str)
     # Tiếp theo xử lý các chữ cái viết hoa liên tiếp
-    return re.sub("([a-z0-9])([A-Z])", r"\1_\2", s1).lower()
+    return _ALL_CAP_RE.sub(r"\1_\2", s1).lower()
+
+
+def _convert_keys(obj: Any, convert_key: Callable[[str], str]) -> Any:
+    """Chuyển đổi đệ quy key của dict/list bằng hàm convert_key"""
+    if isinstance(obj, dict):
+        return {
+            convert_key(key) if isinstance(key, str) else key: _convert_keys(
+                value, convert_key
+            )
+            for key, value in obj.items()
+        }
+    if isinstance(obj, list):
+        return [_convert_keys(item, convert_key) for item in obj]
+    return obj
 
 
 def convert_dict_to_camel_case(obj: Any) -> Any:
@@ -55,20 +85,7 @@ def convert_dict_to_camel_case(obj: Any) -> Any:
     Returns:
         Đối tượng với các key đã chuyển sang camelCase
     """
-    if isinstance(obj, dict):
-        new_dict: Dict[str, Any] = {}
-        for key, value in obj.items():
-            # Chuyển đổi key sang camelCase
-            new_key = to_camel_case(key)
-            # Chuyển đổi đệ quy value
-            new_dict[new_key] = convert_dict_to_camel_case(value)
-        return new_dict
-    elif isinstance(obj, list):
-        # Xử lý từng phần tử trong danh sách
-        return [convert_dict_to_camel_case(item) for item in obj]
-    else:
-        # Trả về nguyên giá trị nếu không phải dict hoặc list
-        return obj
+    return _convert_keys(obj, to_camel_case)
 
 
 def convert_dict_to_snake_case(obj: Any) -> Any:
@@ -81,17 +98,50 @@ def convert_dict_to_snake_case(obj: Any) -> Any:
     Returns:
         Đối tượng với các key đã chuyển sang snake_case
     """
-    if isinstance(obj, dict):
-        new_dict: Dict[str, Any] = {}
-        for key, value in obj.items():
-            # Chuyển đổi key sang snake_case
-            new_key = to_snake_case(key)
-            # Chuyển đổi đệ quy value
-            new_dict[new_key] = convert_dict_to_snake_case(value)
-        return new_dict
-    elif isinstance(obj, list):
-        # Xử lý từng phần tử trong danh sách
-        return [convert_dict_to_snake_case(item) for item in obj]
-    else:
-        # Trả về nguyên giá trị nếu không phải dict hoặc list
-        return obj
+    return _convert_keys(obj, to_snake_case)
+
+
+def json_loads(data: bytes | str) -> Any:
+    """
+    Parse JSON, dùng orjson nếu có cài đặt
+
+    Raises:
+        json.JSONDecodeError: Nếu dữ liệu không phải JSON hợp lệ
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # orjson chặt hơn stdlib (NaN, Infinity...), thử lại với json
+            pass
+    return json.loads(data)
+
+
+def json_dumps(obj: Any) -> bytes:
+    """
+    Encode object ra JSON bytes (UTF-8), dùng orjson nếu có cài đặt
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj)
+        except TypeError:
+            # Số nguyên vượt 64 bit hoặc kiểu orjson không hỗ trợ
+            pass
+    return json.dumps(obj, ensure_ascii=False).encode()
+
+
+def transform_json_bytes(body: bytes, converter: Callable[[Any], Any]) -> Optional[bytes]:
+    """
+    Parse body JSON, chuyển đổi key và encode lại
+
+    Args:
+        body: Body JSON dạng bytes
+        converter: convert_dict_to_camel_case hoặc convert_dict_to_snake_case
+
+    Returns:
+        Optional[bytes]: Body mới, hoặc None nếu body không phải JSON hợp lệ
+    """
+    try:
+        return json_dumps(converter(json_loads(body)))
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return None
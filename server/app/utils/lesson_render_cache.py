@@ -0,0 +1,144 @@
+"""
+Cache in-process cho JSON đã serialize của bài học (LessonWithChildSchema)
+"""
+
+from collections import OrderedDict
+from typing import Dict, Optional, Set, Tuple
+
+from app.core.config import settings
+
+RenderKey = Tuple[int, str]
+
+
+class LessonRenderCache:
+    """
+    Cache LRU giới hạn theo tổng số byte, key là (lesson_id, version)
+
+    ``version`` thay đổi mỗi khi bài học được sửa (xem LessonRenderService), nên
+    entry cũ không bao giờ được trả về; ``invalidate`` chỉ để giải phóng bộ nhớ
+    sớm. Mỗi worker có một instance riêng, các thao tác không có ``await`` bên
+    trong nên an toàn khi dùng chung trong một event loop.
+
+    Attributes:
+        max_bytes (int): Tổng số byte tối đa, vượt quá sẽ loại entry ít dùng nhất
+        hits (int): Số lần lấy được bài học từ cache của worker
+        misses (int): Số lần không có trong cache của worker
+        shared_hits (int): Số lần lấy được từ tầng cache dùng chung
+        renders (int): Số bài học phải render lại
+        evictions (int): Số entry bị loại do vượt giới hạn byte
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.shared_hits = 0
+        self.renders = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[RenderKey, bytes]" = OrderedDict()
+        self._keys_by_lesson: Dict[int, Set[RenderKey]] = {}
+        self._bytes = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def get(self, lesson_id: int, version: str) -> Optional[bytes]:
+        """
+        Lấy JSON của bài học trong cache
+
+        Args:
+            lesson_id (int): ID của bài học
+            version (str): Phiên bản hiện tại của bài học
+
+        Returns:
+            Optional[bytes]: JSON nếu có đúng phiên bản, ngược lại None
+        """
+        key = (lesson_id, version)
+        body = self._entries.get(key)
+        if body is None:
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return body
+
+    def set(self, lesson_id: int, version: str, body: bytes) -> None:
+        """
+        Lưu JSON của bài học, các phiên bản cũ hơn của bài học bị xóa
+
+        Args:
+            lesson_id (int): ID của bài học
+            version (str): Phiên bản của bài học
+            body (bytes): JSON đã serialize
+        """
+        if not self.enabled or len(body) > self.max_bytes:
+            return
+
+        self.invalidate(lesson_id)
+        key = (lesson_id, version)
+        self._entries[key] = body
+        self._keys_by_lesson.setdefault(lesson_id, set()).add(key)
+        self._bytes += len(body)
+
+        while self._bytes > self.max_bytes:
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+            self.evictions += 1
+
+    def invalidate(self, lesson_id: int) -> None:
+        """
+        Xóa mọi phiên bản của một bài học (gọi khi bài học được sửa hoặc xóa)
+
+        Args:
+            lesson_id (int): ID của bài học
+        """
+        for key in list(self._keys_by_lesson.get(lesson_id, ())):
+            self._remove(key)
+
+    def clear(self) -> None:
+        """Xóa toàn bộ cache và reset bộ đếm"""
+        self._entries.clear()
+        self._keys_by_lesson.clear()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.shared_hits = 0
+        self.renders = 0
+        self.evictions = 0
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Thống kê cache
+
+        Returns:
+            Dict[str, float]: hits, misses, hit_rate, shared_hits, renders,
+                evictions, số entry và tổng số byte hiện tại
+        """
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            "shared_hits": self.shared_hits,
+            "renders": self.renders,
+            "evictions": self.evictions,
+            "size": len(self._entries),
+            "bytes": self._bytes,
+        }
+
+    def _remove(self, key: RenderKey) -> None:
+        body = self._entries.pop(key, None)
+        if body is not None:
+            self._bytes -= len(body)
+        lesson_keys = self._keys_by_lesson.get(key[0])
+        if lesson_keys is not None:
+            lesson_keys.discard(key)
+            if not lesson_keys:
+                del self._keys_by_lesson[key[0]]
+
+
+lesson_render_cache = LessonRenderCache(
+    max_bytes=settings.LESSON_RENDER_CACHE_MAX_BYTES,
+)
@@ -4,6 +4,7 @@ from app.schemas.lesson_schema import (
     ExerciseResponse,
     Options,
 )
+from sqlalchemy import inspect
 from sqlalchemy.orm import Session
 from typing import Optional
 
@@ -11,7 +12,13 @@ from app.models.lesson_model import Lesson
 
 
 def model_to_dict(instance):
-    return {c.name: getattr(instance, c.name) for c in instance.__table__.columns}
+    # Bỏ qua cột chưa nạp (deferred, ví dụ search_vector) để không lazy load
+    unloaded = inspect(instance).unloaded
+    return {
+        c.name: getattr(instance, c.name)
+        for c in instance.__table__.columns
+        if c.key not in unloaded
+    }
 
 
 def convert_lesson_to_schema(
@@ -42,12 +49,13 @@ def convert_lesson_to_schema(
         # Xử lý options nếu có
         if section.options and isinstance(section.options, dict):
             if all(key in section.options for key in ["A", "B", "C", "D"]):
+                # Field options là dict giữ nguyên key, không nhận trực tiếp model Options
                 section_data["options"] = Options(
                     A=section.options["A"],
                     B=section.options["B"],
                     C=section.options["C"],
                     D=section.options["D"],
-                )
+                ).model_dump()
 
         sections_data.append(LessonSectionResponse(**section_data))
 
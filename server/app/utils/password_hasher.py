@@ -0,0 +1,154 @@
+"""
+Hash/verify mật khẩu bcrypt ngoài event loop bằng thread pool có giới hạn
+"""
+
+import asyncio
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from typing import Callable, Dict, TypeVar
+
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def create_password_context(rounds: int) -> CryptContext:
+    """
+    Tạo CryptContext bcrypt với work factor cho trước
+
+    Hash có số rounds nhỏ hơn ``rounds`` bị coi là lỗi thời
+    (``needs_update`` trả về True) để được hash lại khi đăng nhập.
+
+    Args:
+        rounds (int): Work factor (log2 số vòng lặp) của bcrypt
+
+    Returns:
+        CryptContext: Context dùng để hash/verify mật khẩu
+    """
+    return CryptContext(
+        schemes=["bcrypt"],
+        deprecated="auto",
+        bcrypt__default_rounds=rounds,
+        bcrypt__min_rounds=rounds,
+    )
+
+
+pwd_context = create_password_context(settings.PASSWORD_BCRYPT_ROUNDS)
+
+
+class PasswordHasher:
+    """
+    Chạy bcrypt trong thread pool riêng để không chặn event loop
+
+    bcrypt nhả GIL trong lúc tính hash nên thread pool đủ để tận dụng nhiều core.
+    Số tác vụ đang chạy và đang chờ bị giới hạn: khi vượt quá, request bị từ chối
+    ngay với 503 thay vì xếp hàng vô hạn.
+
+    Attributes:
+        max_workers (int): Số thread tính hash song song
+        max_queue (int): Số tác vụ tối đa được phép chờ khi mọi thread đều bận
+        pending (int): Số tác vụ đang chạy hoặc đang chờ
+        rejected (int): Số tác vụ đã bị từ chối do quá tải
+    """
+
+    def __init__(self, context: CryptContext, max_workers: int, max_queue: int):
+        self.context = context
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.pending = 0
+        self.rejected = 0
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="password-hasher"
+        )
+
+    async def _run(self, func: Callable[..., T], *args) -> T:
+        if self.pending >= self.max_workers + self.max_queue:
+            self.rejected += 1
+            logger.warning(
+                "Password hasher quá tải (%d tác vụ đang chờ), từ chối request",
+                self.pending,
+            )
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Hệ thống đang bận, vui lòng thử lại sau",
+                headers={"Retry-After": "1"},
+            )
+
+        with self._lock:
+            self.pending += 1
+        # Giảm pending khi thread thực sự xong (hoặc tác vụ bị hủy khi còn chờ), không
+        # phải khi caller bị hủy: thread bcrypt vẫn chạy tiếp và vẫn chiếm chỗ
+        future = self._executor.submit(partial(func, *args))
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def _release(self, future: Future) -> None:
+        with self._lock:
+            self.pending -= 1
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """
+        Xác thực mật khẩu
+
+        Args:
+            plain_password (str): Mật khẩu gốc
+            hashed_password (str): Mật khẩu đã được hash
+
+        Returns:
+            bool: True nếu mật khẩu đúng, False nếu sai
+
+        Raises:
+            HTTPException: 503 nếu hàng đợi đã đầy
+        """
+        return await self._run(self.context.verify, plain_password, hashed_password)
+
+    async def hash(self, password: str) -> str:
+        """
+        Hash mật khẩu với work factor hiện tại
+
+        Args:
+            password (str): Mật khẩu cần hash
+
+        Returns:
+            str: Mật khẩu đã được hash
+
+        Raises:
+            HTTPException: 503 nếu hàng đợi đã đầy
+        """
+        return await self._run(self.context.hash, password)
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        """
+        Kiểm tra hash có dùng work factor lỗi thời hay không (không tốn CPU)
+
+        Args:
+            hashed_password (str): Mật khẩu đã được hash
+
+        Returns:
+            bool: True nếu nên hash lại
+        """
+        return self.context.needs_update(hashed_password)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Thống kê hàng đợi
+
+        Returns:
+            Dict[str, int]: Số tác vụ đang chờ và số tác vụ đã bị từ chối
+        """
+        return {"pending": self.pending, "rejected": self.rejected}
+
+
+password_hasher = PasswordHasher(
+    pwd_context,
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+)
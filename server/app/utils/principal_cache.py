@@ -0,0 +1,145 @@
+"""
+Cache in-process cho principal (user đã xác thực) của get_current_user
+"""
+
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Set, Tuple
+
+from app.core.config import settings
+from app.schemas.user_profile_schema import UserExcludeSecret
+
+PrincipalKey = Tuple[int, int]
+
+
+class PrincipalCache:
+    """
+    Cache TTL + LRU cho UserExcludeSecret, key là (user_id, iat của token)
+
+    Mỗi worker có một instance riêng. Các thao tác không có ``await`` bên trong
+    nên an toàn khi dùng chung trong một event loop.
+
+    Attributes:
+        ttl_seconds (float): Thời gian sống của một entry
+        max_size (int): Số entry tối đa, vượt quá sẽ loại entry ít dùng nhất
+        hits (int): Số lần lấy được principal từ cache
+        misses (int): Số lần phải truy vấn database
+    """
+
+    def __init__(self, ttl_seconds: float, max_size: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[PrincipalKey, Tuple[float, UserExcludeSecret]]" = (
+            OrderedDict()
+        )
+        self._keys_by_user: Dict[int, Set[PrincipalKey]] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and self.max_size > 0
+
+    def get(self, user_id: int, iat: int) -> Optional[UserExcludeSecret]:
+        """
+        Lấy principal trong cache
+
+        Args:
+            user_id (int): ID của user
+            iat (int): Thời điểm phát hành token
+
+        Returns:
+            Optional[UserExcludeSecret]: Principal nếu còn hạn, ngược lại None
+        """
+        key = (user_id, iat)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, principal = entry
+        if expires_at <= time.monotonic():
+            self._remove(key)
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return principal
+
+    def set(self, user_id: int, iat: int, principal: UserExcludeSecret) -> None:
+        """
+        Lưu principal vào cache
+
+        Args:
+            user_id (int): ID của user
+            iat (int): Thời điểm phát hành token
+            principal (UserExcludeSecret): Thông tin user
+        """
+        if not self.enabled:
+            return
+
+        key = (user_id, iat)
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, principal)
+        self._entries.move_to_end(key)
+        self._keys_by_user.setdefault(user_id, set()).add(key)
+
+        while len(self._entries) > self.max_size:
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+
+    def invalidate_user(self, user_id: int) -> None:
+        """
+        Xóa mọi entry của một user (gọi khi thông tin user thay đổi)
+
+        Args:
+            user_id (int): ID của user
+        """
+        for key in self._keys_by_user.pop(user_id, set()):
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Xóa toàn bộ cache và reset bộ đếm"""
+        self._entries.clear()
+        self._keys_by_user.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Thống kê cache
+
+        Returns:
+            Dict[str, float]: hits, misses, hit_rate và số entry hiện tại
+        """
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            "size": len(self._entries),
+        }
+
+    def _remove(self, key: PrincipalKey) -> None:
+        self._entries.pop(key, None)
+        user_keys = self._keys_by_user.get(key[0])
+        if user_keys is not None:
+            user_keys.discard(key)
+            if not user_keys:
+                del self._keys_by_user[key[0]]
+
+
+principal_cache = PrincipalCache(
+    ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+    max_size=settings.PRINCIPAL_CACHE_MAX_SIZE,
+)
+
+
+def invalidate_principal(user_id: int) -> None:
+    """
+    Hook gọi sau khi thông tin user được thay đổi hoặc user bị xóa
+
+    Args:
+        user_id (int): ID của user
+    """
+    principal_cache.invalidate_user(user_id)
@@ -3,7 +3,6 @@ from datetime import datetime, timedelta
 
 from fastapi import Depends, HTTPException, status, Response
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
@@ -11,13 +10,13 @@ from app.core.config import settings
 from app.models.user_model import User
 from app.schemas.user_profile_schema import UserExcludeSecret
 from app.utils.oauth2 import OAuth2PasswordCookie
+from app.utils.password_hasher import password_hasher, pwd_context
+from app.utils.principal_cache import principal_cache
 from app.database.database import get_async_db
 
 # Cấu hình bảo mật
 ALGORITHM = "HS256"
 
-# Cấu hình mã hóa mật khẩu
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 # Tạo instance mới sử dụng cookie
 oauth2_cookie_scheme = OAuth2PasswordCookie(tokenUrl="auth/token")
 # Tạo instance mới sử dụng cookie với auto_error=False để không bắt buộc phải đăng nhập
@@ -55,6 +54,52 @@ def password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    Xác thực mật khẩu trong thread pool, không chặn event loop
+
+    Args:
+        plain_password (str): Mật khẩu gốc
+        hashed_password (str): Mật khẩu đã được hash
+
+    Returns:
+        bool: True nếu mật khẩu đúng, False nếu sai
+
+    Raises:
+        HTTPException: 503 nếu hàng đợi hash đã đầy
+    """
+    return await password_hasher.verify(plain_password, hashed_password)
+
+
+async def password_hash_async(password: str) -> str:
+    """
+    Hash mật khẩu trong thread pool, không chặn event loop
+
+    Args:
+        password (str): Mật khẩu cần hash
+
+    Returns:
+        str: Mật khẩu đã được hash
+
+    Raises:
+        HTTPException: 503 nếu hàng đợi hash đã đầy
+    """
+    return await password_hasher.hash(password)
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """
+    Kiểm tra mật khẩu có được hash với work factor lỗi thời hay không
+
+    Args:
+        hashed_password (str): Mật khẩu đã được hash
+
+    Returns:
+        bool: True nếu nên hash lại theo cấu hình hiện tại
+    """
+    return password_hasher.needs_rehash(hashed_password)
+
+
 def create_access_token(data: dict) -> str:
     """
     Tạo JWT token
@@ -115,13 +160,21 @@ async def get_current_user(
         logger.error(f"JWTError: {e}")
         raise credentials_exception
 
+    # Principal đã xác thực gần đây thì không cần truy vấn lại database
+    iat = payload.get("iat") or 0
+    cached_user = principal_cache.get(user_id, iat)
+    if cached_user is not None:
+        return cached_user
+
     result = await db.execute(select(User).filter(User.id == user_id))
     user = result.scalars().first()
     if user is None:
         raise HTTPException(status_code=404, detail="Không tìm thấy người dùng")
 
     # convert user to UserSchema
-    return UserExcludeSecret.model_validate(user)
+    current_user = UserExcludeSecret.model_validate(user)
+    principal_cache.set(user_id, iat, current_user)
+    return current_user
 
 
 async def get_current_user_optional(
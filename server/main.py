@@ -1,13 +1,33 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.core.agents.components.agent_registry import warm_up_agents
 from app.core.config import settings
+from app.database.pagination import NEXT_CURSOR_HEADER, PREV_CURSOR_HEADER
 from app.exceptions.exception_handler import add_exception_handlers
 from app.middleware.camel_case_middleware import CamelCaseMiddleware
+from app.middleware.read_your_writes_middleware import ReadYourWritesMiddleware
+from app.middleware.request_context_middleware import RequestContextMiddleware
 from app.routers.router import register_router
+from app.socket.connection_registry import connection_registry
 from app.socket.socker_chain import add_handler
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Subscribe pub/sub ngay khi worker khởi động để nhận message từ worker khác
+    await connection_registry.start()
+    if settings.AGENT_WARMUP_ON_STARTUP:
+        # Tạo agent nền để worker nhận request ngay
+        app.state.agent_warmup = asyncio.create_task(warm_up_agents())
+    yield
+    await connection_registry.stop()
+
+
+app = FastAPI(lifespan=lifespan)
 
 # Cấu hình CORS
 app.add_middleware(
@@ -16,11 +36,19 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["POST", "GET", "PUT", "DELETE", "OPTIONS"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, PREV_CURSOR_HEADER],
 )
 
 # Thêm middleware để chuyển đổi response sang camelCase
 app.add_middleware(CamelCaseMiddleware)
 
+# Đọc từ primary ngay sau khi client ghi dữ liệu (khi dùng read replica)
+if settings.ASYNC_REPLICA_DATABASE_URI:
+    app.add_middleware(ReadYourWritesMiddleware)
+
+# Ghi nhận request hiện tại cho telemetry connection pool và read-your-writes
+app.add_middleware(RequestContextMiddleware)
+
 # Register routes and exception handlers
 register_router(app)
 add_handler()
@@ -0,0 +1,140 @@
+"""
+Benchmark thời gian tạo agent khi khởi động và chi phí mỗi request khi dùng agent
+dùng chung so với tạo agent cho từng request.
+
+- startup: thời gian (và bộ nhớ cấp phát) tạo lần đầu từng agent đã đăng ký trong
+  agent_registry, và thời gian lấy lại agent đã tạo.
+- per-request: thời gian và bộ nhớ cấp phát (tracemalloc) để dựng dependency của
+  một request theo cách cũ (tạo agent mỗi request) và cách mới (agent dùng chung,
+  service chỉ lấy agent khi cần).
+
+Mặc định chạy offline: vector store Pinecone được thay bằng InMemoryVectorStore,
+mỗi lần gọi get_vector_store chờ ``--vector-store-latency`` giây để mô phỏng round
+trip list_indexes tới Pinecone. Dùng ``--pinecone`` để đo với Pinecone thật.
+
+Cách sử dụng:
+    python -m scripts.benchmark_agents
+    python -m scripts.benchmark_agents --requests 50 --vector-store-latency 0.2
+"""
+
+import argparse
+import logging
+import statistics
+import time
+import tracemalloc
+from typing import Callable, Dict
+
+from app.core.agents import (
+    exercise_agent,
+    input_test_agent,
+    lesson_generating_agent,
+    tutor_agent,
+)
+from app.core.agents.components.agent_registry import registered_agents
+from app.services.exercise_service import ExerciseService, get_exercise_service
+from app.services.lesson_service import LessonService, get_lesson_service
+from app.services.topic_service import TopicService
+
+# Thiết lập logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def use_offline_vector_stores(latency: float) -> None:
+    """Thay get_vector_store của các agent bằng vector store trong bộ nhớ"""
+    from langchain_core.embeddings import DeterministicFakeEmbedding
+    from langchain_core.vectorstores import InMemoryVectorStore
+
+    def get_vector_store(index_name):
+        time.sleep(latency)
+        return InMemoryVectorStore(DeterministicFakeEmbedding(size=768))
+
+    for module in (exercise_agent, lesson_generating_agent):
+        module.get_vector_store = get_vector_store
+
+
+def measure(build: Callable[[], object], repeat: int) -> Dict[str, float]:
+    """
+    Gọi ``build`` ``repeat`` lần
+
+    Returns:
+        Dict[str, float]: Thời gian trung vị (ms) và bộ nhớ cấp phát đỉnh trung bình (KiB)
+    """
+    timings, allocated = [], []
+    for _ in range(repeat):
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        started = time.perf_counter()
+        build()
+        timings.append((time.perf_counter() - started) * 1000)
+        allocated.append((tracemalloc.get_traced_memory()[1] - baseline) / 1024)
+    return {"ms": statistics.median(timings), "kib": statistics.mean(allocated)}
+
+
+def benchmark_startup() -> None:
+    """In thời gian tạo lần đầu và lấy lại của từng agent dùng chung"""
+    logger.info(f"{'agent':<22}{'cold':>12}{'alloc':>14}{'warm':>12}")
+    for name, singleton in registered_agents().items():
+        singleton.cache_clear()
+        cold = measure(singleton, 1)
+        warm = measure(singleton, 1000)
+        logger.info(
+            f"{name:<22}{cold['ms']:>10.1f}ms{cold['kib']:>11.0f}KiB"
+            f"{warm['ms'] * 1000:>10.2f}µs"
+        )
+
+
+def benchmark_per_request(requests: int) -> None:
+    """In chi phí dựng dependency mỗi request: tạo agent mới so với agent dùng chung"""
+    cases = {
+        "GET /exercises/{id}": (
+            lambda: ExerciseService(
+                exercise_agent.GenerateExerciseQuestionAgent(), TopicService(None), None
+            ),
+            lambda: get_exercise_service(db=None, topic_service=TopicService(None)),
+        ),
+        "complete_lesson": (
+            lambda: LessonService(
+                None,
+                TopicService(None),
+                agent=lesson_generating_agent.LessonGeneratingAgent(),
+            ),
+            lambda: get_lesson_service(
+                db=None, topic_service=TopicService(None), read_db=None
+            ),
+        ),
+        "POST /tutor/chat": (
+            lambda: tutor_agent.TutorAgent().agent,
+            lambda: tutor_agent.get_tutor_agent().agent,
+        ),
+        "input test generation": (
+            lambda: input_test_agent.InputTestAgent().agent_executor,
+            lambda: input_test_agent.get_input_test_agent().agent_executor,
+        ),
+    }
+
+    logger.info(
+        f"{'request':<24}{'per-request agent':>28}{'shared agent':>28}"
+    )
+    for name, (per_request, shared) in cases.items():
+        shared()  # Agent dùng chung đã được tạo lúc khởi động
+        old = measure(per_request, requests)
+        new = measure(shared, requests)
+        logger.info(
+            f"{name:<24}{old['ms']:>12.2f}ms{old['kib']:>12.0f}KiB"
+            f"{new['ms']:>12.3f}ms{new['kib']:>12.1f}KiB"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--vector-store-latency", type=float, default=0.1)
+    parser.add_argument("--pinecone", action="store_true")
+    args = parser.parse_args()
+
+    if not args.pinecone:
+        use_offline_vector_stores(args.vector_store_latency)
+    tracemalloc.start()
+    benchmark_startup()
+    benchmark_per_request(args.requests)
@@ -0,0 +1,125 @@
+"""
+Benchmark thời gian soạn bài học cho cả khóa học theo số topic chạy song song.
+
+Dùng TopicLessonGenerator với agent giả: mỗi topic gọi ``--calls`` lần một chat
+model giả có độ trễ ``--latency`` giây (chờ bất đồng bộ như client Gemini), giống
+một lượt ReAct (tra cứu tài liệu, tạo cấu trúc, trả kết quả). Bài học được giữ trong bộ nhớ
+thay vì ghi database, nên script chỉ đo phần sinh bài học và không cần
+PostgreSQL, Pinecone hay Gemini. concurrency=1 tương đương vòng lặp tuần tự cũ.
+
+Cách sử dụng:
+    python -m scripts.benchmark_lesson_generation
+    python -m scripts.benchmark_lesson_generation --topics 12 --latency 0.5 --concurrency 1 4 12
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+from types import SimpleNamespace
+from typing import List, Sequence
+
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from app.core.agents.course_composition_agent import TopicLessonGenerator
+from app.schemas.lesson_schema import CreateLessonSchema, LessonSectionSchema
+
+# Thiết lập logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class LatencyChatModel(FakeListChatModel):
+    """
+    Chat model giả chờ ``sleep`` giây bằng asyncio.sleep
+
+    FakeListChatModel chờ bằng time.sleep trong thread pool nên số lần gọi song song
+    bị giới hạn bởi số thread, không giống client async của Gemini.
+    """
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        await asyncio.sleep(self.sleep or 0)
+        message = AIMessage(content=self.responses[0])
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+class LatencyLessonAgent:
+    """Agent sinh bài học giả, mỗi lần gọi LLM chờ đúng độ trễ của chat model giả"""
+
+    def __init__(self, latency: float, calls: int):
+        self.llm = LatencyChatModel(responses=["ok"], sleep=latency)
+        self.calls = calls
+
+    async def act(self, **kwargs) -> List[CreateLessonSchema]:
+        for _ in range(self.calls):
+            await self.llm.ainvoke(kwargs["topic_name"])
+        return [
+            CreateLessonSchema(
+                external_id=f"{kwargs['topic_name']}-{order}",
+                title=f"{kwargs['lesson_title']} {order}",
+                description="",
+                topic_id=0,
+                order=order,
+                sections=[LessonSectionSchema(type="text", content="...", order=1)],
+            )
+            for order in (1, 2, 3)
+        ]
+
+
+class InMemoryTopicLessonGenerator(TopicLessonGenerator):
+    """Giữ bài học đã sinh trong bộ nhớ thay vì ghi database"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.saved: List[CreateLessonSchema] = []
+
+    async def _save(self, lessons: Sequence[CreateLessonSchema]) -> None:
+        self.saved.extend(lessons)
+
+
+async def benchmark_lesson_generation(
+    topics: int, latency: float, calls: int, concurrency_levels: Sequence[int]
+) -> None:
+    """
+    In thời gian sinh bài học cho ``topics`` topic với từng mức song song
+
+    Args:
+        topics: Số topic của khóa học giả lập
+        latency: Độ trễ (giây) của mỗi lần gọi LLM
+        calls: Số lần gọi LLM mỗi topic
+        concurrency_levels: Các mức số topic chạy cùng lúc cần đo
+    """
+    course_topics = [
+        SimpleNamespace(id=topic_id, name=f"Topic {topic_id}", description="")
+        for topic_id in range(1, topics + 1)
+    ]
+    agent = LatencyLessonAgent(latency, calls)
+    baseline = None
+
+    logger.info(f"{'concurrency':>12}{'wall':>10}{'speedup':>10}{'lessons':>10}")
+    for concurrency in concurrency_levels:
+        generator = InMemoryTopicLessonGenerator(agent, concurrency=concurrency)
+        started = time.perf_counter()
+        failed = await generator.run(course_topics, "beginner", "benchmark")
+        elapsed = time.perf_counter() - started
+        baseline = baseline or elapsed
+        logger.info(
+            f"{concurrency:>12}{elapsed:>9.2f}s{baseline / elapsed:>9.1f}x"
+            f"{len(generator.saved):>10}" + (f"  lỗi: {failed}" if failed else "")
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--topics", type=int, default=12)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--calls", type=int, default=3)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8, 12])
+    args = parser.parse_args()
+    asyncio.run(
+        benchmark_lesson_generation(
+            args.topics, args.latency, args.calls, args.concurrency
+        )
+    )
@@ -0,0 +1,170 @@
+"""
+Benchmark tìm kiếm toàn văn (tsvector + GIN) so với ILIKE '%từ%' trên bảng
+lesson_sections giả lập.
+
+Script tạo bảng TEMP (mất khi đóng kết nối, không đụng tới dữ liệu thật) với
+``--rows`` dòng nội dung tiếng Việt ngẫu nhiên, tạo search_vector bằng cấu hình
+``vietnamese_unaccent`` và GIN index, rồi đo thời gian các câu truy vấn.
+Cần chạy migration e5a9c3d7b1f2 trước (extension unaccent và cấu hình text search).
+
+Cách sử dụng:
+    python -m scripts.benchmark_search                  # 1.000.000 dòng
+    python -m scripts.benchmark_search --rows 200000 --repeat 3
+"""
+
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+
+from sqlalchemy import text
+
+from app.database.database import async_engine
+from app.services.search_service import build_prefix_tsquery
+
+# Thiết lập logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+WORDS = [
+    "thuật", "toán", "sắp", "xếp", "nhanh", "trộn", "chèn", "đồ", "thị", "cây",
+    "nhị", "phân", "tìm", "kiếm", "quy", "hoạch", "động", "ngăn", "xếp", "hàng",
+    "đợi", "danh", "sách", "liên", "kết", "mảng", "băm", "độ", "phức", "tạp",
+    "đường", "đi", "ngắn", "nhất", "duyệt", "chiều", "rộng", "sâu", "đỉnh",
+    "cạnh", "trọng", "số", "tham", "lam", "chia", "để", "trị", "đệ", "quy",
+    "biến", "vòng", "lặp", "hàm", "con", "trỏ", "bộ", "nhớ", "dữ", "liệu",
+    "cấu", "trúc", "ví", "dụ", "bài", "tập", "giải", "thích", "minh", "họa",
+]
+
+# Chuỗi người dùng nhập, dùng nguyên văn cho ILIKE '%...%' như tìm kiếm hiện tại
+QUERIES = ["sắp xếp", "đồ thị", "quy hoạch động", "dijkstra"]
+
+SETUP_SQL = [
+    """
+    CREATE TEMP TABLE bench_lesson_sections (
+        id integer PRIMARY KEY,
+        content text NOT NULL,
+        search_vector tsvector
+    )
+    """,
+    """
+    INSERT INTO bench_lesson_sections (id, content)
+    SELECT g, (
+        SELECT string_agg(
+            (CAST(:words AS text[]))[
+                1 + floor(random() * array_length(CAST(:words AS text[]), 1))::int
+            ],
+            ' '
+        )
+        FROM generate_series(1, 40) AS w
+        WHERE g > 0
+    )
+    FROM generate_series(1, :rows) AS g
+    """,
+    # Một số ít dòng chứa từ hiếm để đo trường hợp ILIKE phải quét hết bảng
+    """
+    UPDATE bench_lesson_sections
+    SET content = content || ' thuật toán Dijkstra'
+    WHERE id % 5000 = 0
+    """,
+    """
+    UPDATE bench_lesson_sections
+    SET search_vector = setweight(
+        to_tsvector('vietnamese_unaccent', content), 'C'
+    )
+    """,
+    """
+    CREATE INDEX ix_bench_lesson_sections_search_vector
+    ON bench_lesson_sections USING gin (search_vector)
+    """,
+    "ANALYZE bench_lesson_sections",
+]
+
+ILIKE_SQL = """
+    SELECT id, content FROM bench_lesson_sections
+    WHERE content ILIKE :pattern
+    ORDER BY id
+    LIMIT 20
+"""
+
+ILIKE_COUNT_SQL = """
+    SELECT count(*) FROM bench_lesson_sections WHERE content ILIKE :pattern
+"""
+
+SEARCH_SQL = """
+    SELECT id, ts_headline('vietnamese_unaccent', content, query) AS snippet, rank
+    FROM (
+        SELECT id, content, query, ts_rank_cd(search_vector, query) AS rank
+        FROM bench_lesson_sections,
+            to_tsquery('vietnamese_unaccent', :tsquery) AS query
+        WHERE search_vector @@ query
+        ORDER BY rank DESC, id
+        LIMIT 20
+    ) AS top
+"""
+
+SEARCH_COUNT_SQL = """
+    SELECT count(*) FROM bench_lesson_sections
+    WHERE search_vector @@ to_tsquery('vietnamese_unaccent', :tsquery)
+"""
+
+
+async def _measure(connection, statement: str, params: dict, repeat: int) -> float:
+    """
+    Chạy câu truy vấn ``repeat`` lần, trả về thời gian trung vị (ms)
+    """
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = await connection.execute(text(statement), params)
+        result.all()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+async def benchmark_search(rows: int, repeat: int) -> None:
+    """
+    Tạo dữ liệu giả lập và in thời gian của ILIKE so với tìm kiếm toàn văn
+
+    Args:
+        rows: Số dòng lesson_sections giả lập
+        repeat: Số lần chạy mỗi câu truy vấn
+    """
+    async with async_engine.connect() as connection:
+        started = time.perf_counter()
+        params = {"rows": rows, "words": WORDS}
+        for statement in SETUP_SQL:
+            await connection.execute(
+                text(statement),
+                {key: value for key, value in params.items() if f":{key}" in statement},
+            )
+        logger.info(
+            f"Đã tạo {rows} dòng và GIN index trong {time.perf_counter() - started:.1f}s"
+        )
+
+        columns = ["ilike top20", "ilike count", "fts top20", "fts count"]
+        logger.info(f"{'query':<18}" + "".join(f"{column:>14}" for column in columns))
+        for query in QUERIES:
+            pattern = {"pattern": f"%{query}%"}
+            tsquery = {"tsquery": build_prefix_tsquery(query)}
+            timings = [
+                await _measure(connection, ILIKE_SQL, pattern, repeat),
+                await _measure(connection, ILIKE_COUNT_SQL, pattern, repeat),
+                await _measure(connection, SEARCH_SQL, tsquery, repeat),
+                await _measure(connection, SEARCH_COUNT_SQL, tsquery, repeat),
+            ]
+            logger.info(
+                f"{query:<18}" + "".join(f"{timing:>12.1f}ms" for timing in timings)
+            )
+
+        await connection.rollback()
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(benchmark_search(args.rows, args.repeat))
@@ -0,0 +1,175 @@
+"""
+Benchmark recall và độ trễ của vector store local (LocalVectorIndex) so với ground
+truth brute-force float32.
+
+Dữ liệu giả lập: ``--vectors`` vector 768 chiều chia cụm (giống embedding của các
+đoạn tài liệu cùng chủ đề), truy vấn là vector dữ liệu có nhiễu. Với mỗi kiểu lưu
+(float32, int8) đo thời gian thêm vector, dung lượng trên đĩa, độ trễ p50/p95 và
+recall@k của brute-force, IVF với từng số cụm quét (``--probes``) và tìm kiếm có
+filter metadata. Index được tạo trong thư mục tạm và xóa khi kết thúc.
+
+Cách sử dụng:
+    python -m scripts.benchmark_vector_store
+    python -m scripts.benchmark_vector_store --vectors 200000 --queries 500 --spread 3 --probes 4 8 16 32 64
+"""
+
+import argparse
+import logging
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Sequence, Set
+
+import numpy as np
+
+from app.core.agents.components.document_store import EMBEDDING_DIMENSION
+from app.core.agents.components.local_vector_store import LocalVectorIndex
+
+# Thiết lập logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 10000
+
+
+def make_dataset(vectors: int, queries: int, clusters: int, spread: float, seed: int = 0):
+    """
+    Sinh vector dữ liệu chia cụm và truy vấn là vector dữ liệu có nhiễu
+
+    ``spread`` là độ lệch chuẩn quanh tâm cụm (tâm cụm có độ lệch chuẩn 1): càng lớn
+    thì dữ liệu càng ít cấu trúc cụm và IVF càng cần quét nhiều cụm.
+    """
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, EMBEDDING_DIMENSION)).astype(np.float32)
+    labels = rng.integers(clusters, size=vectors)
+    data = centers[labels] + spread * rng.normal(size=(vectors, EMBEDDING_DIMENSION)).astype(
+        np.float32
+    )
+    picks = rng.choice(vectors, size=queries, replace=False)
+    noise = 1.0 * rng.normal(size=(queries, EMBEDDING_DIMENSION)).astype(np.float32)
+    return data, data[picks] + noise
+
+
+def build_index(path: Path, data: np.ndarray, dtype: str, ivf: bool) -> LocalVectorIndex:
+    """Thêm ``data`` theo lô vào index mới, metadata ``group`` dùng để đo filter"""
+    index = LocalVectorIndex(path, dtype=dtype, ivf_min_vectors=0)
+    started = time.perf_counter()
+    for start in range(0, len(data), BATCH_SIZE):
+        batch = data[start : start + BATCH_SIZE]
+        rows = range(start, start + len(batch))
+        index.add(
+            [str(row) for row in rows], batch, [{"group": row % 10} for row in rows]
+        )
+    added = time.perf_counter() - started
+    trained = 0.0
+    if ivf:
+        started = time.perf_counter()
+        index.build_ivf()
+        trained = time.perf_counter() - started
+    size = sum(file.stat().st_size for file in path.iterdir()) / 1024 / 1024
+    logger.info(
+        f"{dtype}: thêm {len(data)} vector {added:.1f}s, dựng IVF {trained:.1f}s, "
+        f"{size:.0f} MiB trên đĩa"
+    )
+    return index
+
+
+def measure(
+    search: Callable[[np.ndarray], List], queries: np.ndarray, truth: List[Set[int]], k: int
+) -> Dict[str, float]:
+    """
+    Chạy ``search`` cho từng truy vấn
+
+    Returns:
+        Dict[str, float]: Độ trễ p50/p95 (ms) và recall@k trung bình so với ``truth``
+    """
+    timings, recall = [], []
+    for query, expected in zip(queries, truth):
+        started = time.perf_counter()
+        hits = search(query)
+        timings.append((time.perf_counter() - started) * 1000)
+        recall.append(len(expected & {row for row, _ in hits}) / k)
+    timings.sort()
+    return {
+        "p50": statistics.median(timings),
+        "p95": timings[int(len(timings) * 0.95) - 1],
+        "recall": statistics.mean(recall),
+    }
+
+
+def log_result(name: str, result: Dict[str, float]) -> None:
+    logger.info(
+        f"{name:<28}{result['p50']:>9.2f}ms{result['p95']:>9.2f}ms{result['recall']:>10.3f}"
+    )
+
+
+def benchmark_vector_store(
+    vectors: int,
+    queries: int,
+    clusters: int,
+    spread: float,
+    k: int,
+    probes: Sequence[int],
+) -> None:
+    """
+    In recall@k và độ trễ của từng cách tìm kiếm trên dữ liệu giả lập
+
+    Args:
+        vectors: Số vector trong index
+        queries: Số truy vấn
+        clusters: Số cụm của dữ liệu giả lập
+        spread: Độ lệch chuẩn quanh tâm cụm
+        k: Số kết quả mỗi truy vấn
+        probes: Các số cụm IVF được quét cần đo
+    """
+    data, query_vectors = make_dataset(vectors, queries, clusters, spread)
+
+    with tempfile.TemporaryDirectory() as directory:
+        exact = build_index(Path(directory) / "float32", data, "float32", ivf=True)
+        truth = [
+            {row for row, _ in exact.search(query, k, exact=True)} for query in query_vectors
+        ]
+        filtered_truth = [
+            {row for row, _ in exact.search(query, k, filter={"group": 3}, exact=True)}
+            for query in query_vectors
+        ]
+        indexes = {
+            "float32": exact,
+            "int8": build_index(Path(directory) / "int8", data, "int8", ivf=True),
+        }
+
+        logger.info(f"{'search':<28}{'p50':>11}{'p95':>11}{'recall@' + str(k):>10}")
+        for dtype, index in indexes.items():
+            log_result(
+                f"{dtype} brute-force",
+                measure(lambda q: index.search(q, k, exact=True), query_vectors, truth, k),
+            )
+            for probe in probes:
+                log_result(
+                    f"{dtype} IVF probes={probe}",
+                    measure(lambda q: index.search(q, k, probes=probe), query_vectors, truth, k),
+                )
+            log_result(
+                f"{dtype} filter brute-force",
+                measure(
+                    lambda q: index.search(q, k, filter={"group": 3}, exact=True),
+                    query_vectors,
+                    filtered_truth,
+                    k,
+                ),
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--vectors", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--clusters", type=int, default=1000)
+    parser.add_argument("--spread", type=float, default=1.5)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--probes", type=int, nargs="+", default=[4, 8, 16, 32, 64])
+    args = parser.parse_args()
+    benchmark_vector_store(
+        args.vectors, args.queries, args.clusters, args.spread, args.k, args.probes
+    )
@@ -0,0 +1,43 @@
+"""
+Tạo các index Pinecone ứng dụng cần (document, exercise) nếu chưa có và kiểm tra số
+chiều, metric của các index đã có.
+
+Ứng dụng không tạo index trong request: chạy script này một lần khi triển khai
+(hoặc khi đổi project Pinecone) trước khi khởi động worker. Cloud và region của
+index mới lấy từ PINECONE_CLOUD và PINECONE_REGION.
+
+Cách sử dụng:
+    python -m scripts.bootstrap_vector_indexes
+    python -m scripts.bootstrap_vector_indexes document
+"""
+
+import argparse
+import logging
+import sys
+
+from app.core.agents.components.document_store import (
+    INDEX_NAMES,
+    VectorStoreUnavailableError,
+    bootstrap_indexes,
+)
+
+# Thiết lập logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("indexes", nargs="*", metavar="index", help=", ".join(INDEX_NAMES))
+    args = parser.parse_args()
+
+    unknown = set(args.indexes) - set(INDEX_NAMES)
+    if unknown:
+        parser.error(f"index không hợp lệ: {', '.join(sorted(unknown))}")
+    try:
+        result = bootstrap_indexes(args.indexes or INDEX_NAMES)
+    except VectorStoreUnavailableError as e:
+        logger.error(e)
+        sys.exit(1)
+    for index_name, state in result.items():
+        logger.info(f"{index_name}: {state}")
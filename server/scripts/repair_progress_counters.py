@@ -0,0 +1,44 @@
+"""
+Script tính lại bộ đếm tiến độ (số bài đã hoàn thành/đang học, bài học hiện
+tại, hoạt động gần nhất) trên bảng user_courses.
+
+Cách sử dụng:
+    python -m scripts.repair_progress_counters            # tất cả lần đăng ký
+    python -m scripts.repair_progress_counters 12 34 56   # chỉ các user_course id này
+"""
+
+import asyncio
+import logging
+import sys
+from typing import List, Optional
+
+from app.database.database import AsyncSessionLocal
+from app.services.user_course_progress_service import UserCourseProgressService
+
+# Thiết lập logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+async def repair_progress_counters(
+    user_course_ids: Optional[List[int]] = None,
+) -> int:
+    """
+    Tính lại bộ đếm tiến độ bằng một câu UPDATE
+
+    Args:
+        user_course_ids: Các user_course id cần tính lại, None để tính tất cả
+
+    Returns:
+        int: Số lần đăng ký đã cập nhật
+    """
+    async with AsyncSessionLocal() as session:
+        return await UserCourseProgressService(session).recompute_progress_counters(
+            user_course_ids
+        )
+
+
+if __name__ == "__main__":
+    ids = [int(arg) for arg in sys.argv[1:]] or None
+    updated = asyncio.run(repair_progress_counters(ids))
+    logger.info(f"Đã tính lại bộ đếm tiến độ cho {updated} lần đăng ký")
@@ -5,7 +5,10 @@ Fixtures cho pytest để sử dụng trong các test case.
 import pytest
 from typing import Generator, AsyncGenerator
 from fastapi.testclient import TestClient
+from sqlalchemy import ARRAY
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy.ext.compiler import compiles
 
 from app.database.database import get_async_db
 from app.models.user_model import User
@@ -159,3 +162,94 @@ def superuser_client(client, superuser_token) -> TestClient:
     """
     client.headers = {**client.headers, "Authorization": f"Bearer {superuser_token}"}
     return client
+
+
+class SQLiteAsyncSession:
+    """
+    Bọc Session đồng bộ trên SQLite in-memory thành API async mà các service dùng,
+    để test logic truy vấn khi không có PostgreSQL. Đếm số câu SQL đã gửi.
+    """
+
+    def __init__(self, session):
+        self.sync_session = session
+        self.query_count = 0
+
+    def __getattr__(self, name):
+        return getattr(self.sync_session, name)
+
+    async def execute(self, *args, **kwargs):
+        return self.sync_session.execute(*args, **kwargs)
+
+    async def scalars(self, *args, **kwargs):
+        return self.sync_session.scalars(*args, **kwargs)
+
+    async def scalar(self, *args, **kwargs):
+        return self.sync_session.scalar(*args, **kwargs)
+
+    async def get(self, *args, **kwargs):
+        return self.sync_session.get(*args, **kwargs)
+
+    async def flush(self, *args, **kwargs):
+        self.sync_session.flush(*args, **kwargs)
+
+    async def commit(self):
+        self.sync_session.commit()
+
+    async def rollback(self):
+        self.sync_session.rollback()
+
+    async def refresh(self, *args, **kwargs):
+        self.sync_session.refresh(*args, **kwargs)
+
+    async def delete(self, instance):
+        self.sync_session.delete(instance)
+
+
+@compiles(ARRAY, "sqlite")
+def _compile_array_sqlite(type_, compiler, **kw):
+    # Cột ARRAY của PostgreSQL (ví dụ topics.prerequisites) tạo dạng JSON trên SQLite
+    return "JSON"
+
+
+@compiles(TSVECTOR, "sqlite")
+def _compile_tsvector_sqlite(type_, compiler, **kw):
+    # Cột search_vector chỉ có ý nghĩa trên PostgreSQL, trên SQLite là TEXT
+    return "TEXT"
+
+
+@pytest.fixture(scope="function")
+def sqlite_db():
+    """
+    Fixture tạo SQLiteAsyncSession cho các model chỉ định.
+
+    Cách dùng: ``db = sqlite_db(Course, UserCourse)``; ``db.query_count`` là số câu
+    SQL đã chạy. ``session_class`` để dùng Session có gắn event riêng.
+    """
+    from sqlalchemy import create_engine, event
+    from sqlalchemy.orm import Session
+    from sqlalchemy.pool import StaticPool
+
+    sessions = []
+
+    def factory(*models, session_class=Session) -> SQLiteAsyncSession:
+        engine = create_engine(
+            "sqlite://",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+        tables = [model.__table__ for model in models]
+        tables[0].metadata.create_all(engine, tables=tables)
+
+        session = SQLiteAsyncSession(session_class(engine, expire_on_commit=False))
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def count_query(*args):
+            session.query_count += 1
+
+        sessions.append(session)
+        return session
+
+    yield factory
+
+    for session in sessions:
+        session.sync_session.close()
@@ -0,0 +1,108 @@
+"""
+Tests cho agent dùng chung trong worker (agent_registry) và việc các service chỉ
+lấy agent khi thật sự cần.
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.core.agents.components import agent_registry
+from app.core.agents.components.agent_registry import AgentSingleton, warm_up_agents
+from app.services import exercise_service, lesson_service
+
+
+class TestAgentSingleton:
+    def test_built_once_lazily(self):
+        built = []
+        singleton = AgentSingleton("fake", lambda: built.append(object()) or built[-1])
+
+        assert not singleton.built
+        assert singleton() is singleton()
+        assert len(built) == 1
+
+        singleton.cache_clear()
+        assert singleton() is built[1]
+
+    def test_concurrent_first_calls_build_once(self):
+        calls = []
+
+        def slow_factory():
+            calls.append(1)
+            time.sleep(0.05)
+            return object()
+
+        singleton = AgentSingleton("slow", slow_factory)
+        barrier = threading.Barrier(8)
+        instances = []
+
+        def worker():
+            barrier.wait()
+            instances.append(singleton())
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(calls) == 1
+        assert len({id(instance) for instance in instances}) == 1
+
+    def test_warm_up_skips_failing_agents(self, monkeypatch):
+        def broken():
+            raise RuntimeError("Pinecone không khả dụng")
+
+        ok = AgentSingleton("ok", object)
+        monkeypatch.setattr(
+            agent_registry,
+            "_registry",
+            {"ok": ok, "broken": AgentSingleton("broken", broken)},
+        )
+
+        timings = asyncio.run(warm_up_agents())
+
+        assert list(timings) == ["ok"]
+        assert ok.built
+
+    def test_agents_are_registered(self):
+        import app.core.agents.input_test_agent  # noqa: F401
+        import app.core.agents.tutor_agent  # noqa: F401
+
+        assert {"lesson_generating", "exercise_generating", "input_test", "tutor"} <= set(
+            agent_registry.registered_agents()
+        )
+
+
+class TestServicesResolveAgentsLazily:
+    @pytest.fixture
+    def built(self, monkeypatch):
+        built = []
+        monkeypatch.setattr(
+            lesson_service,
+            "get_lesson_generating_agent",
+            lambda: built.append("lesson") or "lesson-agent",
+        )
+        monkeypatch.setattr(
+            exercise_service,
+            "get_exercise_agent",
+            lambda: built.append("exercise") or "exercise-agent",
+        )
+        return built
+
+    def test_lesson_service(self, built):
+        service = lesson_service.get_lesson_service(db=None, read_db=None, topic_service=None)
+
+        assert built == []
+        assert service.agent == "lesson-agent"
+        assert service.agent == "lesson-agent"
+        assert built == ["lesson"]
+
+    def test_exercise_service(self, built):
+        service = exercise_service.get_exercise_service(db=None, topic_service=None)
+
+        assert built == []
+        assert service.exercise_agent == "exercise-agent"
+        assert built == ["exercise"]
@@ -0,0 +1,163 @@
+"""
+Tests cho CourseService.bulk_delete_courses: số câu truy vấn cố định theo số ID,
+xóa bằng một câu DELETE và vẫn báo lỗi theo từng khóa học.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import OperationalError
+
+from app.services.course_service import CourseService
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def all(self):
+        return self.rows
+
+    def scalars(self):
+        return self
+
+
+class FakeSession:
+    """Session giả trả về dòng thống kê và ID bị xóa, ghi lại các câu lệnh"""
+
+    def __init__(self, stats, removed_ids=None, fail_on_delete=False):
+        self.stats = stats
+        self.removed_ids = removed_ids
+        self.fail_on_delete = fail_on_delete
+        self.statements = []
+        self.commits = 0
+        self.rollbacks = 0
+
+    async def execute(self, statement, params=None, **kwargs):
+        self.statements.append(statement)
+        if len(self.statements) == 1:
+            return FakeResult(
+                [
+                    SimpleNamespace(id=course_id, **row)
+                    for course_id, row in self.stats.items()
+                ]
+            )
+        if self.fail_on_delete:
+            raise OperationalError("DELETE", {}, Exception("connection lost"))
+        if self.removed_ids is not None:
+            return FakeResult(self.removed_ids)
+        return FakeResult(
+            [
+                course_id
+                for course_id, row in self.stats.items()
+                if row["enrollment_count"] == 0
+            ]
+        )
+
+    async def commit(self):
+        self.commits += 1
+
+    async def rollback(self):
+        self.rollbacks += 1
+
+
+def stats_row(enrollment_count=0, topic_count=0, lesson_count=0, section_count=0):
+    return {
+        "enrollment_count": enrollment_count,
+        "topic_count": topic_count,
+        "lesson_count": lesson_count,
+        "section_count": section_count,
+    }
+
+
+def compile_sql(statement) -> str:
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+def bulk_delete(session, course_ids):
+    return asyncio.run(CourseService(session).bulk_delete_courses(course_ids))
+
+
+class TestBulkDeleteCourses:
+    """Xóa hàng loạt bằng câu lệnh theo tập hợp"""
+
+    def test_constant_round_trips(self):
+        for count in (3, 2000):
+            stats = {course_id: stats_row(topic_count=1) for course_id in range(count)}
+            session = FakeSession(stats)
+
+            response = bulk_delete(session, list(range(count)))
+
+            assert len(session.statements) == 2
+            assert session.commits == 1
+            assert response.deleted_count == count
+            assert response.deleted_items["topics"] == count
+
+    def test_statements_use_array_parameter(self):
+        session = FakeSession({1: stats_row()})
+
+        bulk_delete(session, [1, 2])
+
+        stats_sql, delete_sql = (compile_sql(stmt) for stmt in session.statements)
+        assert "WITH course_enrollments AS" in stats_sql
+        assert "= ANY (%(course_ids)s::INTEGER[])" in stats_sql
+        assert delete_sql.startswith("DELETE FROM courses")
+        assert "= ANY (%(course_ids)s::INTEGER[])" in delete_sql
+        assert "NOT (EXISTS" in delete_sql
+        assert "RETURNING courses.id" in delete_sql
+        # Danh sách ID được gửi một lần dưới dạng mảng
+        assert session.statements[1].compile().params["course_ids"] == [1, 2]
+
+    def test_per_course_failures_are_reported(self):
+        session = FakeSession(
+            {
+                1: stats_row(topic_count=2, lesson_count=3, section_count=7),
+                2: stats_row(enrollment_count=4),
+                4: stats_row(topic_count=1, lesson_count=1),
+            }
+        )
+
+        response = bulk_delete(session, [1, 2, 3, 4, 1])
+
+        assert response.deleted_courses == [1, 4]
+        assert response.failed_courses == [2, 3]
+        assert response.errors == [
+            "Khóa học 2 đang có 4 học viên đăng ký, không thể xóa",
+            "Không tìm thấy khóa học với ID 3",
+        ]
+        assert response.deleted_items == {
+            "courses": 2,
+            "topics": 3,
+            "lessons": 4,
+            "lesson_sections": 7,
+        }
+
+    def test_course_enrolled_after_stats_is_not_deleted(self):
+        session = FakeSession({1: stats_row(), 2: stats_row()}, removed_ids=[1])
+
+        response = bulk_delete(session, [1, 2])
+
+        assert response.deleted_courses == [1]
+        assert response.failed_courses == [2]
+        assert response.errors == ["Khóa học 2 đang có học viên đăng ký, không thể xóa"]
+
+    def test_nothing_to_delete_skips_delete_statement(self):
+        session = FakeSession({1: stats_row(enrollment_count=1)})
+
+        response = bulk_delete(session, [1, 2])
+
+        assert len(session.statements) == 1
+        assert session.commits == 0
+        assert response.failed_count == 2
+
+    def test_database_error_fails_all_courses(self):
+        session = FakeSession({1: stats_row(), 2: stats_row()}, fail_on_delete=True)
+
+        response = bulk_delete(session, [1, 2, 3])
+
+        assert session.rollbacks == 1
+        assert response.deleted_count == 0
+        assert response.failed_courses == [1, 2, 3]
+        assert response.deleted_items["courses"] == 0
+        assert response.errors[-1].startswith("Lỗi khi xóa khóa học:")
@@ -0,0 +1,235 @@
+"""
+Tests cho CamelCaseMiddleware và schema camelCase (CamelCaseModel).
+"""
+
+import time
+from datetime import datetime
+from typing import Optional
+
+from fastapi import Body, FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.middleware.camel_case_middleware import CamelCaseMiddleware
+from app.models.user_course_progress_model import ProgressStatus
+from app.schemas.base_schema import CamelCaseModel, is_camel_case_native
+from app.schemas.course_schema import (
+    CourseCreate,
+    CourseDetailWithProgressResponse,
+    CourseOnlyResponse,
+)
+from app.schemas.lesson_schema import LessonSectionResponse
+
+
+def build_course_detail(
+    topics: int = 20, lessons_per_topic: int = 15
+) -> CourseDetailWithProgressResponse:
+    """Tạo payload giống /courses/{id} của một khóa học lớn."""
+    now = datetime(2024, 1, 1)
+    topic_items = []
+    for t in range(topics):
+        lessons = [
+            {
+                "id": t * 100 + i,
+                "external_id": f"lesson-{t}-{i}",
+                "title": f"Bài học {i} của chủ đề {t}",
+                "description": "Mô tả bài học " * 10,
+                "order": i,
+                "sections": [],
+                "exercises": [],
+                "is_completed": i % 2 == 0,
+                "last_viewed_at": now,
+                "completion_percentage": 100.0 if i % 2 == 0 else 0.0,
+            }
+            for i in range(lessons_per_topic)
+        ]
+        topic_items.append(
+            {
+                "id": t,
+                "external_id": f"topic-{t}",
+                "name": f"Chủ đề {t}",
+                "description": "Mô tả chủ đề " * 10,
+                "order": t,
+                "lessons": lessons,
+                "topic_completion_percentage": 50.0,
+                "completed_lessons": lessons_per_topic // 2,
+                "total_lessons": lessons_per_topic,
+            }
+        )
+
+    return CourseDetailWithProgressResponse(
+        id=1,
+        title="Cấu trúc dữ liệu và giải thuật",
+        description="Khóa học lớn",
+        created_at=now,
+        updated_at=now,
+        is_enrolled=True,
+        topics=topic_items,
+        user_course_id=1,
+        total_topics=topics,
+        total_lessons=topics * lessons_per_topic,
+        current_topic_id=0,
+        current_lesson_id=1,
+        current_lesson={
+            "id": 1,
+            "external_id": "lesson-0-1",
+            "title": "Bài học 1",
+            "description": None,
+            "order": 1,
+            "topic_id": 0,
+        },
+    )
+
+
+def create_app(max_buffer_bytes: Optional[int] = None) -> FastAPI:
+    course = build_course_detail()
+    app = FastAPI()
+    app.add_middleware(CamelCaseMiddleware, max_buffer_bytes=max_buffer_bytes)
+
+    @app.get("/native/courses/{course_id}", response_model=CourseDetailWithProgressResponse)
+    async def native_course(course_id: int):
+        return course
+
+    # Cùng response_model nhưng serialize snake_case, middleware phải chuyển đổi
+    @app.get(
+        "/legacy/courses/{course_id}",
+        response_model=CourseDetailWithProgressResponse,
+        response_model_by_alias=False,
+    )
+    async def legacy_course(course_id: int):
+        return course
+
+    @app.post("/native/courses", response_model=CourseOnlyResponse)
+    async def native_create(data: CourseCreate):
+        return data
+
+    @app.post("/legacy/enroll")
+    async def legacy_enroll(data: dict = Body(...)):
+        return {"received_keys": sorted(data.keys()), "course_id": data.get("course_id")}
+
+    # JSON gửi thành nhiều message http.response.body (more_body=True)
+    @app.get("/legacy/chunked")
+    async def legacy_chunked():
+        async def chunks():
+            yield b'{"user_name": "a", '
+            yield b'"items": [{"lesson_id": 1}, '
+            yield b'{"lesson_id": 2}]}'
+
+        return StreamingResponse(chunks(), media_type="application/json")
+
+    return app
+
+
+class TestCamelCaseModel:
+    """Tests cho CamelCaseModel."""
+
+    def test_serialize_by_alias(self):
+        """Schema serialize ra camelCase khi dùng by_alias."""
+        section = LessonSectionResponse(
+            id=1, type="quiz", content="?", order=1, options={"A": "1", "B": "2"}
+        )
+        data = section.model_dump(by_alias=True)
+        assert data["options"] == {"A": "1", "B": "2"}
+
+        course = CourseCreate(title="Giải thuật", thumbnail_url="a.png")
+        assert course.model_dump(by_alias=True)["thumbnailUrl"] == "a.png"
+        assert course.model_dump()["thumbnail_url"] == "a.png"
+
+    def test_accepts_camel_and_snake_input(self):
+        """Schema nhận được input ở cả camelCase lẫn snake_case."""
+        assert CourseCreate(thumbnailUrl="a.png", title="abc").thumbnail_url == "a.png"
+        assert CourseCreate(thumbnail_url="b.png", title="abc").thumbnail_url == "b.png"
+
+    def test_is_camel_case_native(self):
+        """Dict hoặc BaseModel thường làm schema không còn là native."""
+
+        class WithDict(CamelCaseModel):
+            data: dict
+
+        class WithOptionalChild(CamelCaseModel):
+            child: Optional[CourseCreate] = None
+            status: ProgressStatus = ProgressStatus.NOT_STARTED
+
+        assert is_camel_case_native(CourseDetailWithProgressResponse)
+        assert is_camel_case_native(list[CourseOnlyResponse])
+        assert is_camel_case_native(WithOptionalChild)
+        assert not is_camel_case_native(WithDict)
+        assert not is_camel_case_native(dict)
+
+
+class TestCamelCaseMiddleware:
+    """Tests cho middleware với route native và route cũ."""
+
+    def test_native_and_legacy_responses_match(self):
+        """Route native và route được middleware chuyển đổi trả về cùng JSON."""
+        client = TestClient(create_app())
+        native = client.get("/native/courses/1").json()
+        legacy = client.get("/legacy/courses/1").json()
+
+        assert native == legacy
+        assert "currentLesson" in native
+        assert native["currentLesson"]["topicId"] == 0
+        assert native["topics"][0]["lessons"][0]["completionPercentage"] == 100.0
+
+    def test_native_request_body(self):
+        """Body camelCase được FastAPI parse trực tiếp qua alias."""
+        client = TestClient(create_app())
+        response = client.post(
+            "/native/courses",
+            json={"title": "Giải thuật", "thumbnailUrl": "a.png", "isPublished": True},
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["thumbnailUrl"] == "a.png"
+        assert data["isPublished"] is True
+
+    def test_legacy_request_body_is_converted(self):
+        """Route nhận dict vẫn nhận key snake_case như trước."""
+        client = TestClient(create_app())
+        response = client.post("/legacy/enroll", json={"courseId": 5, "userNote": "x"})
+        assert response.json() == {
+            "receivedKeys": ["course_id", "user_note"],
+            "courseId": 5,
+        }
+
+    def test_multi_chunk_json_is_converted(self):
+        """Body JSON nhiều chunk được gom lại rồi mới chuyển đổi."""
+        client = TestClient(create_app())
+        response = client.get("/legacy/chunked")
+        assert response.json() == {
+            "userName": "a",
+            "items": [{"lessonId": 1}, {"lessonId": 2}],
+        }
+        assert int(response.headers["content-length"]) == len(response.content)
+
+    def test_body_over_buffer_cap_is_streamed_untouched(self):
+        """Body vượt quá giới hạn buffer được stream nguyên vẹn."""
+        client = TestClient(create_app(max_buffer_bytes=16))
+        response = client.get("/legacy/chunked")
+        assert response.json() == {
+            "user_name": "a",
+            "items": [{"lesson_id": 1}, {"lesson_id": 2}],
+        }
+
+    def test_benchmark_course_detail_cpu(self):
+        """
+        Benchmark CPU mỗi request cho /courses/{id}: so sánh route được middleware
+        decode/chuyển đổi/encode lại với route serialize camelCase trực tiếp.
+        """
+        client = TestClient(create_app())
+        rounds = 30
+
+        def measure(path: str) -> float:
+            client.get(path)  # warm up
+            start = time.process_time()
+            for _ in range(rounds):
+                client.get(path)
+            return (time.process_time() - start) / rounds
+
+        legacy = measure("/legacy/courses/1")
+        native = measure("/native/courses/1")
+        print(
+            f"\n/courses/{{id}} CPU/request: legacy={legacy * 1000:.2f}ms "
+            f"native={native * 1000:.2f}ms saved={(legacy - native) * 1000:.2f}ms"
+        )
+        assert native < legacy
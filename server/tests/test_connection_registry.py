@@ -0,0 +1,267 @@
+"""
+Tests cho registry kết nối WebSocket giữa nhiều worker.
+"""
+
+import asyncio
+
+import pytest
+
+from app.socket.connection_registry import ConnectionRegistry
+from app.socket.pubsub import (
+    POSTGRES_NOTIFY_MAX_BYTES,
+    InMemoryBus,
+    InMemoryPubSubBackend,
+    PostgresPubSubBackend,
+    PubSubBackend,
+)
+from app.utils.case_utils import json_dumps
+
+
+class FakeWebSocket:
+    """WebSocket giả ghi lại message đã gửi và trạng thái đóng."""
+
+    def __init__(self):
+        self.sent = []
+        self.closed_with = None
+
+    async def send_json(self, data):
+        self.sent.append(data)
+
+    async def close(self, code: int = 1000, reason: str | None = None):
+        self.closed_with = (code, reason)
+
+
+def create_workers(count: int):
+    """Tạo nhiều registry dùng chung một bus, giả lập nhiều worker uvicorn."""
+    bus = InMemoryBus()
+    workers = [
+        ConnectionRegistry(InMemoryPubSubBackend(bus), worker_id=f"worker-{i}")
+        for i in range(count)
+    ]
+    return bus, workers
+
+
+class TestConnectionRegistry:
+    """Tests cho ConnectionRegistry với backend in-memory."""
+
+    def test_send_to_user_on_another_worker(self):
+        """Message được chuyển tới worker đang giữ socket của user."""
+        bus, (worker_a, worker_b) = create_workers(2)
+        socket = FakeWebSocket()
+
+        async def run():
+            await worker_b.start()
+            await worker_a.connect("1", socket)
+            await worker_b.send_to_user(1, {"type": "learn.lesson_completed"})
+
+        asyncio.run(run())
+        assert socket.sent == [{"type": "learn.lesson_completed"}]
+        assert worker_a.get_user_id(socket) == "1"
+
+    def test_local_user_does_not_publish(self):
+        """User trên cùng worker được gửi trực tiếp, không qua pub/sub."""
+        bus, (worker,) = create_workers(1)
+        socket = FakeWebSocket()
+
+        async def run():
+            await worker.connect("1", socket)
+            published = bus.published
+            await worker.send_to_user("1", {"type": "ping"})
+            return published
+
+        published_before_send = asyncio.run(run())
+        assert bus.published == published_before_send
+        assert socket.sent == [{"type": "ping"}]
+
+    def test_single_session_across_workers(self):
+        """Kết nối mới ở worker khác đóng kết nối cũ của cùng user."""
+        _, (worker_a, worker_b) = create_workers(2)
+        old_socket, new_socket = FakeWebSocket(), FakeWebSocket()
+
+        async def run():
+            await worker_a.connect("1", old_socket)
+            await worker_b.connect("1", new_socket)
+            await worker_b.send_to_user("1", {"type": "ping"})
+
+        asyncio.run(run())
+        assert old_socket.closed_with == (1000, "New connection from same user")
+        assert worker_a.get_user_id(old_socket) is None
+        assert new_socket.closed_with is None
+        assert new_socket.sent == [{"type": "ping"}]
+        assert old_socket.sent == []
+
+    def test_disconnect_keeps_newer_connection(self):
+        """Socket cũ ngắt kết nối sau không được xóa kết nối mới của user."""
+        _, (worker,) = create_workers(1)
+        old_socket, new_socket = FakeWebSocket(), FakeWebSocket()
+
+        async def run():
+            await worker.connect("1", old_socket)
+            await worker.connect("1", new_socket)
+
+        asyncio.run(run())
+        worker.disconnect("1", old_socket)
+        assert worker.get_user_id(new_socket) == "1"
+
+    def test_fan_out_is_one_publish(self):
+        """Gửi tới N user trên nhiều worker chỉ tốn một lần publish."""
+        bus, (sender, worker_a, worker_b) = create_workers(3)
+        sockets = {str(i): FakeWebSocket() for i in range(100)}
+
+        async def run():
+            for user_id, socket in sockets.items():
+                worker = worker_a if int(user_id) % 2 else worker_b
+                await worker.connect(user_id, socket)
+            await sender.start()
+            published = bus.published
+            await sender.send_to_users(range(100), {"type": "notification"})
+            return bus.published - published
+
+        assert asyncio.run(run()) == 1
+        assert all(s.sent == [{"type": "notification"}] for s in sockets.values())
+
+    def test_broadcast_reaches_all_workers(self):
+        bus, (worker_a, worker_b) = create_workers(2)
+        socket_a, socket_b = FakeWebSocket(), FakeWebSocket()
+
+        async def run():
+            await worker_a.connect("1", socket_a)
+            await worker_b.connect("2", socket_b)
+            await worker_a.broadcast({"type": "announcement"})
+
+        asyncio.run(run())
+        assert socket_a.sent == [{"type": "announcement"}]
+        assert socket_b.sent == [{"type": "announcement"}]
+
+
+class FakeConnection:
+    """Kết nối asyncpg giả: ghi lại listener, NOTIFY gửi tới listener của chính nó."""
+
+    def __init__(self):
+        self.listeners = {}
+        self.termination_listeners = []
+        self.closed = False
+
+    async def add_listener(self, channel, callback):
+        self.listeners[channel] = callback
+
+    def add_termination_listener(self, callback):
+        self.termination_listeners.append(callback)
+
+    def is_closed(self):
+        return self.closed
+
+    async def close(self):
+        self.closed = True
+
+    async def execute(self, query, channel, payload):
+        self.listeners[channel](self, 1, channel, payload)
+
+    def terminate(self):
+        """Giả lập Postgres đóng kết nối (restart, failover)."""
+        self.closed = True
+        for callback in self.termination_listeners:
+            callback(self)
+
+
+class FakeConnect:
+    """Thay asyncpg.connect: lỗi ``failures`` lần đầu rồi trả về FakeConnection."""
+
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.connections = []
+
+    async def __call__(self, dsn):
+        if self.failures > 0:
+            self.failures -= 1
+            raise OSError("connection refused")
+        self.connections.append(FakeConnection())
+        return self.connections[-1]
+
+
+async def wait_until(predicate, timeout=2.0):
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while not predicate():
+        assert loop.time() < deadline
+        await asyncio.sleep(0.01)
+
+
+class TestPostgresPubSubBackend:
+    """Tests cho backend LISTEN/NOTIFY với kết nối asyncpg giả."""
+
+    def test_backend_interface_is_abstract(self):
+        with pytest.raises(TypeError):
+            PubSubBackend()
+
+    def test_reconnects_and_listens_again_after_termination(self):
+        """Mất kết nối LISTEN thì tự kết nối lại, không chờ publish tiếp theo."""
+        connect = FakeConnect()
+        backend = PostgresPubSubBackend(
+            "postgresql://unused", "ws_registry", reconnect_delay=0.01, connect=connect
+        )
+        received = []
+
+        async def handler(message):
+            received.append(message)
+
+        async def run():
+            await backend.start(handler)
+            connect.failures = 2
+            connect.connections[0].terminate()
+
+            await wait_until(lambda: backend.reconnects == 1)
+            assert len(connect.connections) == 2
+            assert "ws_registry" in connect.connections[1].listeners
+
+            await backend.publish({"type": "claim", "user_id": "1"})
+            await wait_until(lambda: received)
+            await backend.stop()
+
+        asyncio.run(run())
+        assert received == [{"type": "claim", "user_id": "1"}]
+        assert connect.connections[1].closed
+
+    def test_stop_cancels_reconnect(self):
+        connect = FakeConnect()
+        backend = PostgresPubSubBackend(
+            "postgresql://unused", "ws_registry", reconnect_delay=0.01, connect=connect
+        )
+
+        async def handler(message):
+            pass
+
+        async def run():
+            await backend.start(handler)
+            connect.failures = 1000
+            connect.connections[0].terminate()
+            await asyncio.sleep(0.05)
+            await backend.stop()
+            failures = connect.failures
+            await asyncio.sleep(0.05)
+            return failures
+
+        failures = asyncio.run(run())
+        assert connect.failures == failures
+        assert backend.reconnects == 0
+
+    def test_split_message_respects_notify_limit(self):
+        """Message fan-out lớn được chia nhỏ theo user_ids để vừa NOTIFY."""
+        backend = PostgresPubSubBackend("postgresql://unused", "ws_registry")
+        message = {
+            "type": "send",
+            "user_ids": [str(100000 + i) for i in range(3000)],
+            "payload": {"type": "notification", "message": "x" * 200},
+            "worker_id": "worker-0",
+        }
+
+        parts = backend.split_message(message)
+
+        assert len(parts) > 1
+        assert all(len(json_dumps(part)) <= POSTGRES_NOTIFY_MAX_BYTES for part in parts)
+        assert [u for part in parts for u in part["user_ids"]] == message["user_ids"]
+
+    def test_small_message_is_not_split(self):
+        backend = PostgresPubSubBackend("postgresql://unused", "ws_registry")
+        message = {"type": "claim", "user_id": "1", "worker_id": "worker-0"}
+        assert backend.split_message(message) == [message]
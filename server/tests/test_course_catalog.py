@@ -0,0 +1,93 @@
+"""
+Tests cho danh sách khóa học (catalog) kèm trạng thái đăng ký trong một câu truy vấn.
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.models.course_model import Course
+from app.models.user_course_model import UserCourse
+from app.services.course_service import CourseService
+
+PUBLISHED_COURSES = 25
+
+
+@pytest.fixture
+def catalog_db(sqlite_db):
+    db = sqlite_db(Course, UserCourse)
+    start = datetime(2024, 1, 1)
+    for i in range(1, PUBLISHED_COURSES + 4):
+        db.add(
+            Course(
+                id=i,
+                title=f"Course {i}",
+                # 3 khóa học cuối chưa công khai
+                is_published=i <= PUBLISHED_COURSES,
+                created_at=start + timedelta(days=i),
+                updated_at=start + timedelta(days=i),
+            )
+        )
+    db.sync_session.commit()
+    return db
+
+
+def enroll(db, user_id: int, course_ids):
+    for course_id in course_ids:
+        db.add(UserCourse(user_id=user_id, course_id=course_id))
+    db.sync_session.commit()
+
+
+def get_catalog(db, **kwargs):
+    return asyncio.run(CourseService(db).get_course_catalog(**kwargs))
+
+
+class TestCourseCatalog:
+    """get_course_catalog trả về trang, tổng số thật và is_enrolled"""
+
+    def test_anonymous_first_page(self, catalog_db):
+        response = get_catalog(catalog_db, limit=10)
+
+        assert [item.id for item in response.items] == list(range(25, 15, -1))
+        assert response.total == PUBLISHED_COURSES
+        assert response.totalPages == 3
+        assert not any(item.is_enrolled for item in response.items)
+        assert response.next_cursor is not None
+
+    def test_is_enrolled_per_item(self, catalog_db):
+        # Đăng ký trùng một khóa học không được nhân đôi dòng trong trang
+        enroll(catalog_db, user_id=1, course_ids=[24, 20, 20])
+        enroll(catalog_db, user_id=2, course_ids=[23])
+
+        response = get_catalog(catalog_db, user_id=1, limit=10)
+
+        enrolled = {item.id for item in response.items if item.is_enrolled}
+        assert enrolled == {24, 20}
+        assert len(response.items) == 10
+        assert response.total == PUBLISHED_COURSES
+
+    def test_offset_and_cursor_pages_match(self, catalog_db):
+        first_page = get_catalog(catalog_db, limit=10)
+        by_cursor = get_catalog(catalog_db, limit=10, cursor=first_page.next_cursor)
+        by_offset = get_catalog(catalog_db, limit=10, page=2)
+
+        assert [item.id for item in by_cursor.items] == [
+            item.id for item in by_offset.items
+        ]
+        assert by_cursor.total == by_offset.total == PUBLISHED_COURSES
+
+    def test_page_past_end_keeps_total(self, catalog_db):
+        response = get_catalog(catalog_db, limit=10, page=10)
+
+        assert response.items == []
+        assert response.total == PUBLISHED_COURSES
+
+    def test_single_query_regardless_of_enrollments(self, catalog_db):
+        enroll(catalog_db, user_id=1, course_ids=range(1, PUBLISHED_COURSES + 1))
+
+        catalog_db.query_count = 0
+        response = get_catalog(catalog_db, user_id=1, limit=10)
+
+        assert catalog_db.query_count == 1
+        assert all(item.is_enrolled for item in response.items)
@@ -0,0 +1,124 @@
+"""
+Tests cho CourseService.get_course: mục lục (outline) chọn cột, không nạp sections;
+dạng đầy đủ chỉ khi include_sections.
+"""
+
+import asyncio
+from itertools import count
+
+import pytest
+from fastapi import HTTPException
+
+from app.models.course_model import Course
+from app.models.lesson_model import Lesson, LessonSection
+from app.models.topic_model import Topic
+from app.models.user_course_model import UserCourse
+from app.schemas.course_schema import CourseDetailResponse, CourseOutlineResponse
+from app.services.course_service import CourseService
+
+USER_ID = 1
+
+_ids = count(1)
+
+
+@pytest.fixture
+def db(sqlite_db):
+    return sqlite_db(Course, Topic, Lesson, LessonSection, UserCourse)
+
+
+def add_course(db, topics):
+    """
+    Tạo khóa học, ``topics`` là danh sách số section của từng lesson theo topic
+
+    Returns:
+        Course: Khóa học vừa tạo
+    """
+    course = Course(id=next(_ids), title="Course", is_published=True)
+    db.add(course)
+    # Thêm topic/lesson theo thứ tự ngược để không phụ thuộc thứ tự id
+    for topic_order, lessons in reversed(list(enumerate(topics, start=1))):
+        topic = Topic(
+            id=next(_ids),
+            course_id=course.id,
+            name=f"Topic {topic_order}",
+            description="",
+            order=topic_order,
+        )
+        db.add(topic)
+        for lesson_order, section_count in reversed(
+            list(enumerate(lessons, start=1))
+        ):
+            lesson = Lesson(
+                id=next(_ids),
+                external_id=f"lesson-{topic.id}-{lesson_order}",
+                topic_id=topic.id,
+                title=f"Lesson {topic_order}.{lesson_order}",
+                description="",
+                order=lesson_order,
+            )
+            db.add(lesson)
+            db.add_all(
+                LessonSection(
+                    lesson_id=lesson.id, type="text", content="...", order=order
+                )
+                for order in range(section_count, 0, -1)
+            )
+    db.sync_session.commit()
+    return course
+
+
+def get_course(db, course_id, **kwargs):
+    return asyncio.run(CourseService(db).get_course(course_id, **kwargs))
+
+
+class TestCourseOutline:
+    """Mục lục chỉ có id, tiêu đề, thứ tự và số lượng"""
+
+    def test_outline_order_and_counts(self, db):
+        course = add_course(db, [[2, 0], [], [3]])
+        db.add(UserCourse(user_id=USER_ID, course_id=course.id))
+        db.sync_session.commit()
+
+        outline = get_course(db, course.id, user_id=USER_ID)
+
+        assert isinstance(outline, CourseOutlineResponse)
+        assert outline.is_enrolled is True
+        assert [topic.name for topic in outline.topics] == [
+            "Topic 1",
+            "Topic 2",
+            "Topic 3",
+        ]
+        assert [topic.lesson_count for topic in outline.topics] == [2, 0, 1]
+        assert [
+            (lesson.title, lesson.section_count)
+            for topic in outline.topics
+            for lesson in topic.lessons
+        ] == [("Lesson 1.1", 2), ("Lesson 1.2", 0), ("Lesson 3.1", 3)]
+
+    def test_outline_uses_two_queries_without_sections(self, db):
+        course = add_course(db, [[5] * 10] * 5)
+        db.sync_session.expunge_all()
+
+        db.query_count = 0
+        outline = get_course(db, course.id, user_id=USER_ID)
+
+        assert db.query_count == 2
+        assert outline.is_enrolled is False
+        assert "sections" not in outline.model_dump()["topics"][0]["lessons"][0]
+        # Không có entity nào được nạp vào session
+        assert list(db.sync_session.identity_map.values()) == []
+
+    def test_include_sections_returns_full_form(self, db):
+        course = add_course(db, [[2], [1]])
+
+        detail = get_course(db, course.id, include_sections=True)
+
+        assert isinstance(detail, CourseDetailResponse)
+        sections = detail.topics[0].lessons[0].sections
+        assert [section.order for section in sections] == [1, 2]
+        assert detail.topics[1].lessons[0].sections[0].content == "..."
+
+    def test_missing_course_is_not_found(self, db):
+        with pytest.raises(HTTPException) as exc_info:
+            get_course(db, 10**6)
+        assert exc_info.value.status_code == 404
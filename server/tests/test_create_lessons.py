@@ -0,0 +1,145 @@
+"""
+Tests cho tạo bài học hàng loạt (LessonService.create_lessons): số câu SQL cố định,
+response dựng từ dữ liệu vừa chèn và điều hướng được tính trong cùng transaction.
+"""
+
+import asyncio
+
+import pytest
+from sqlalchemy import func, select
+
+from app.models.course_model import Course
+from app.models.exercise_model import Exercise
+from app.models.exercise_test_case_model import ExerciseTestCase
+from app.models.lesson_model import Lesson, LessonSection
+from app.models.topic_model import Topic
+from app.models.user_course_model import UserCourse
+from app.models.user_course_progress_model import UserCourseProgress
+from app.schemas.lesson_schema import CreateLessonSchema, LessonSectionSchema, Options
+from app.services.lesson_service import LessonService
+from app.utils.model_utils import convert_lesson_to_schema
+
+
+def lesson_payload(external_id, topic_id, order, section_count=2):
+    sections = [
+        LessonSectionSchema(type="text", content=f"Nội dung {index}", order=index)
+        for index in range(1, section_count)
+    ]
+    sections.append(
+        LessonSectionSchema(
+            type="quiz",
+            content="Câu hỏi",
+            order=section_count,
+            options=Options(A="1", B="2", C="3", D="4"),
+            answer="B",
+            explanation="Vì 2",
+        )
+    )
+    return CreateLessonSchema(
+        external_id=external_id,
+        title=f"Bài {external_id}",
+        description="Mô tả",
+        topic_id=topic_id,
+        order=order,
+        sections=sections,
+    )
+
+
+@pytest.fixture
+def db(sqlite_db):
+    db = sqlite_db(
+        Course,
+        Topic,
+        Lesson,
+        LessonSection,
+        Exercise,
+        ExerciseTestCase,
+        UserCourse,
+        UserCourseProgress,
+    )
+    db.add(Course(id=1, title="Course 1"))
+    db.add_all(
+        [
+            Topic(id=10, course_id=1, name="Topic 1", description="", order=1),
+            Topic(id=11, course_id=1, name="Topic 2", description="", order=2),
+        ]
+    )
+    db.add(
+        Lesson(
+            id=500,
+            external_id="500",
+            topic_id=11,
+            title="Bài có sẵn",
+            description="",
+            order=1,
+        )
+    )
+    db.sync_session.commit()
+    return db
+
+
+@pytest.fixture
+def service(db):
+    # Không gọi __init__: khởi tạo agent sinh bài học cần kết nối dịch vụ ngoài,
+    # create_lessons chỉ dùng session
+    service = object.__new__(LessonService)
+    service.db = db
+    return service
+
+
+def reload(db, lesson_id):
+    db.sync_session.expire_all()
+    return convert_lesson_to_schema(db.sync_session.get(Lesson, lesson_id))
+
+
+class TestCreateLessons:
+    def test_statement_count_does_not_grow_with_lessons(self, db, service, monkeypatch):
+        payloads = [lesson_payload(f"t10-{order}", 10, order, 4) for order in range(1, 21)]
+        statements = []
+        execute = db.execute
+
+        async def counting_execute(statement, *args, **kwargs):
+            statements.append(statement)
+            return await execute(statement, *args, **kwargs)
+
+        # Đếm số lần gọi execute của service: PostgreSQL gộp executemany ... RETURNING
+        # thành một câu nhiều VALUES, SQLite thì chạy từng dòng
+        monkeypatch.setattr(db, "execute", counting_execute)
+        lessons = asyncio.run(service.create_lessons(payloads))
+
+        # INSERT lessons, INSERT sections, UPDATE điều hướng, UPDATE bộ đếm tiến độ
+        assert len(statements) == 4
+        assert len(lessons) == 20
+        assert db.sync_session.scalar(
+            select(func.count(LessonSection.id)).where(
+                LessonSection.lesson_id.in_([lesson.id for lesson in lessons])
+            )
+        ) == 80
+
+    def test_response_matches_stored_lesson(self, db, service):
+        lessons = asyncio.run(
+            service.create_lessons(
+                [lesson_payload("a", 10, 1), lesson_payload("b", 10, 2, 3)]
+            )
+        )
+
+        for lesson in lessons:
+            assert lesson.model_dump() == reload(db, lesson.id).model_dump()
+        assert [len(lesson.sections) for lesson in lessons] == [2, 3]
+        assert lessons[0].sections[-1].options == {"A": "1", "B": "2", "C": "3", "D": "4"}
+
+    def test_navigation_computed_in_same_transaction(self, db, service):
+        first, second = asyncio.run(
+            service.create_lessons([lesson_payload("a", 10, 1), lesson_payload("b", 10, 2)])
+        )
+
+        assert (first.prev_lesson_id, first.next_lesson_id) == (None, str(second.id))
+        assert (second.prev_lesson_id, second.next_lesson_id) == (str(first.id), "500")
+        assert reload(db, 500).prev_lesson_id == str(second.id)
+
+    def test_single_lesson_and_empty_batch(self, db, service):
+        lesson = asyncio.run(service.create_lesson(lesson_payload("x", 11, 2, 1)))
+
+        assert lesson.prev_lesson_id == "500"
+        assert lesson.model_dump() == reload(db, lesson.id).model_dump()
+        assert asyncio.run(service.create_lessons([])) == []
@@ -0,0 +1,142 @@
+"""
+Tests cho cache embedding theo nội dung (CachedEmbeddings trên SQLite): tra cứu
+theo lô, một lần gọi model cho các nội dung còn thiếu, int8, loại bớt entry.
+"""
+
+import asyncio
+
+import pytest
+from langchain_core.embeddings import Embeddings
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.pool import StaticPool
+
+from app.core.agents.components.embedding_cache import (
+    CachedEmbeddings,
+    EmbeddingCacheStats,
+    EmbeddingCacheStore,
+    decode_vector,
+    encode_vector,
+)
+from app.models.embedding_cache_model import EmbeddingCacheEntry
+
+
+class CountingEmbeddings(Embeddings):
+    """Model embedding giả, ghi lại các lần gọi"""
+
+    def __init__(self):
+        self.document_calls = []
+        self.query_calls = []
+
+    @staticmethod
+    def vector(text):
+        return [float(len(text)), float(sum(map(ord, text)) % 97), 0.5]
+
+    def embed_documents(self, texts):
+        self.document_calls.append(list(texts))
+        return [self.vector(text) for text in texts]
+
+    def embed_query(self, text):
+        self.query_calls.append(text)
+        return [-value for value in self.vector(text)]
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    EmbeddingCacheEntry.metadata.create_all(engine, tables=[EmbeddingCacheEntry.__table__])
+    return engine
+
+
+@pytest.fixture
+def model():
+    return CountingEmbeddings()
+
+
+@pytest.fixture
+def stats():
+    return EmbeddingCacheStats()
+
+
+def cached(engine, model, stats, **store_kwargs):
+    store = EmbeddingCacheStore(engine=engine, **store_kwargs)
+    return CachedEmbeddings(model, "text-embedding-004", store, stats=stats)
+
+
+def count_entries(engine):
+    with engine.connect() as connection:
+        return connection.scalar(select(func.count()).select_from(EmbeddingCacheEntry))
+
+
+class TestCachedEmbeddings:
+    def test_only_missing_texts_sent_in_one_call(self, engine, model, stats):
+        embeddings = cached(engine, model, stats)
+
+        first = embeddings.embed_documents(["a", "bb", "a"])
+        second = embeddings.embed_documents(["bb", "ccc", "a"])
+
+        assert model.document_calls == [["a", "bb"], ["ccc"]]
+        assert first == [model.vector(text) for text in ["a", "bb", "a"]]
+        assert second == [model.vector(text) for text in ["bb", "ccc", "a"]]
+
+        counters = stats.stats()
+        assert (counters["hits"], counters["misses"], counters["embedded"]) == (2, 4, 3)
+        assert counters["hit_rate"] == round(2 / 6, 4)
+        assert counters["vectors"] == 6
+        assert counters["vectors_per_second"] > 0
+
+    def test_query_and_document_keys_differ(self, engine, model, stats):
+        embeddings = cached(engine, model, stats)
+        embeddings.embed_documents(["sắp xếp"])
+
+        assert embeddings.embed_query("sắp xếp") == model.embed_query("sắp xếp")
+        assert asyncio.run(embeddings.aembed_query("sắp xếp")) == model.embed_query(
+            "sắp xếp"
+        )
+        # Lần gọi model thật: 1 lần miss của cache và 2 lần tính kết quả mong đợi
+        assert len(model.query_calls) == 3
+
+    def test_int8_vectors(self, engine, model, stats):
+        embeddings = cached(engine, model, stats, quantize=True)
+        expected = model.vector("abcd")
+
+        embeddings.embed_documents(["abcd"])
+        restored = cached(engine, model, stats).embed_documents(["abcd"])[0]
+
+        assert restored == pytest.approx(expected, abs=max(expected) / 127)
+        with engine.connect() as connection:
+            assert len(connection.scalar(select(EmbeddingCacheEntry.vector))) == 3
+
+    def test_least_recently_used_evicted(self, engine, model, stats):
+        embeddings = cached(engine, model, stats, max_entries=2)
+
+        embeddings.embed_documents(["a", "b"])
+        embeddings.embed_documents(["a"])
+        embeddings.embed_documents(["c"])
+        embeddings.embed_documents(["a"])
+
+        assert count_entries(engine) == 2
+        assert stats.stats()["evictions"] == 1
+        assert model.document_calls == [["a", "b"], ["c"]]
+
+    def test_store_errors_fall_back_to_model(self, model, stats):
+        embeddings = cached(create_engine("sqlite://"), model, stats)
+
+        assert embeddings.embed_documents(["a"]) == [model.vector("a")]
+        assert stats.stats()["errors"] == 2
+
+
+def test_vector_encoding_round_trip():
+    vector = [0.25, -1.5, 3.0, 0.0]
+
+    data, scale = encode_vector(vector, quantize=False)
+    assert (len(data), scale) == (16, None)
+    assert decode_vector(data, scale) == vector
+
+    data, scale = encode_vector(vector, quantize=True)
+    assert len(data) == 4
+    assert decode_vector(data, scale) == pytest.approx(vector, abs=scale)
+    assert decode_vector(*encode_vector([0.0, 0.0], quantize=True)) == [0.0, 0.0]
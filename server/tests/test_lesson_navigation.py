@@ -0,0 +1,169 @@
+"""
+Tests cho chỉ mục điều hướng bài học (next_lesson_id/prev_lesson_id được tính lại
+khi commit) và complete_lesson dùng chỉ mục này.
+"""
+
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from app.database.lesson_navigation import maintain_lesson_navigation
+from app.models.course_model import Course
+from app.models.lesson_model import Lesson
+from app.models.topic_model import Topic
+from app.models.user_course_model import UserCourse
+from app.models.user_course_progress_model import ProgressStatus, UserCourseProgress
+from app.services.user_course_progress_service import UserCourseProgressService
+
+
+class NavigationSession(Session):
+    """Session có gắn event duy trì điều hướng bài học như PrimarySession"""
+
+
+maintain_lesson_navigation(NavigationSession)
+
+
+def new_lesson(lesson_id, topic_id, order):
+    return Lesson(
+        id=lesson_id,
+        external_id=str(lesson_id),
+        topic_id=topic_id,
+        title=f"Lesson {lesson_id}",
+        description="",
+        order=order,
+    )
+
+
+@pytest.fixture
+def db(sqlite_db):
+    db = sqlite_db(
+        Course,
+        Topic,
+        Lesson,
+        UserCourse,
+        UserCourseProgress,
+        session_class=NavigationSession,
+    )
+    # Khóa học 1: topic 10 (order 1) có lesson 100, 101; topic 11 (order 2) có 110
+    db.add_all([Course(id=1, title="Course 1"), Course(id=2, title="Course 2")])
+    db.add_all(
+        [
+            Topic(id=11, course_id=1, name="Topic 2", description="", order=2),
+            Topic(id=10, course_id=1, name="Topic 1", description="", order=1),
+        ]
+    )
+    db.add_all([new_lesson(110, 11, 1), new_lesson(101, 10, 2), new_lesson(100, 10, 1)])
+    db.sync_session.commit()
+    return db
+
+
+def navigation(db, *lesson_ids):
+    db.sync_session.expire_all()
+    return [
+        (lesson.prev_lesson_id, lesson.next_lesson_id)
+        for lesson in (db.sync_session.get(Lesson, lesson_id) for lesson_id in lesson_ids)
+    ]
+
+
+def complete(db, user_id, lesson_id):
+    return asyncio.run(UserCourseProgressService(db).complete_lesson(user_id, lesson_id))
+
+
+class TestNavigationMaintenance:
+    """Điều hướng được tính lại trong transaction khi topic/lesson thay đổi"""
+
+    def test_sequence_crosses_topics(self, db):
+        assert navigation(db, 100, 101, 110) == [
+            (None, "101"),
+            ("100", "110"),
+            ("101", None),
+        ]
+
+    def test_insert_reorder_and_delete(self, db):
+        session = db.sync_session
+
+        session.add(new_lesson(102, 10, 3))
+        session.commit()
+        assert navigation(db, 101, 102, 110) == [
+            ("100", "102"),
+            ("101", "110"),
+            ("102", None),
+        ]
+
+        session.get(Topic, 11).order = 0
+        session.commit()
+        assert navigation(db, 110, 100, 102) == [
+            (None, "100"),
+            ("110", "101"),
+            ("101", None),
+        ]
+
+        session.delete(session.get(Lesson, 101))
+        session.commit()
+        assert navigation(db, 100, 102) == [("110", "102"), ("100", None)]
+
+    def test_topic_moved_to_other_course(self, db):
+        session = db.sync_session
+
+        session.get(Topic, 10).course_id = 2
+        session.commit()
+
+        assert navigation(db, 100, 101, 110) == [
+            (None, "101"),
+            ("100", None),
+            (None, None),
+        ]
+
+    def test_unrelated_changes_do_not_rewrite(self, db):
+        session = db.sync_session
+
+        lesson = session.get(Lesson, 100)
+
+        db.query_count = 0
+        lesson.title = "Renamed"
+        session.commit()
+
+        # UPDATE lessons SET title, không tính lại điều hướng
+        assert db.query_count == 1
+
+
+class TestCompleteLesson:
+    """Hoàn thành bài học: một câu tra cứu rồi upsert trong một transaction"""
+
+    def test_returns_next_lesson_across_topics(self, db):
+        db.add(UserCourse(id=1, user_id=7, course_id=1))
+        db.sync_session.commit()
+
+        db.query_count = 0
+        response = complete(db, 7, 101)
+
+        assert response.next_lesson_id == 110
+        assert response.lesson_id == 110
+        # Tra cứu + upsert progress + tìm bài học hiện tại + cập nhật bộ đếm
+        assert db.query_count == 4
+
+        progress = db.sync_session.query(UserCourseProgress).one()
+        assert (progress.lesson_id, progress.status) == (101, ProgressStatus.COMPLETED)
+        user_course = db.sync_session.get(UserCourse, 1, populate_existing=True)
+        assert user_course.completed_lessons == 1
+
+    def test_last_lesson_has_no_next(self, db):
+        db.add(UserCourse(id=1, user_id=7, course_id=1))
+        db.sync_session.commit()
+
+        response = complete(db, 7, 110)
+
+        assert response.next_lesson_id is None
+        assert response.lesson_id == 110
+
+    @pytest.mark.parametrize(
+        "lesson_id, detail", [(999, "Lesson not found"), (100, "User state not found")]
+    )
+    def test_not_found(self, db, lesson_id, detail):
+        with pytest.raises(HTTPException) as exc_info:
+            complete(db, 7, lesson_id)
+
+        assert exc_info.value.status_code == 404
+        assert exc_info.value.detail == detail
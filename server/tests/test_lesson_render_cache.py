@@ -0,0 +1,260 @@
+"""
+Tests cho cache JSON đã render của bài học (LessonRenderCache) và
+LessonRenderService trả JSON theo phiên bản bài học.
+"""
+
+import asyncio
+import json
+from datetime import datetime
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.models.exercise_model import Exercise
+from app.models.exercise_test_case_model import ExerciseTestCase
+from app.models.lesson_model import Lesson, LessonSection
+from app.models.topic_model import Topic
+from app.schemas.topic_schema import TopicResponse
+from app.services.lesson_render_service import (
+    LessonRenderService,
+    SharedLessonRenderStore,
+)
+from app.utils.lesson_render_cache import LessonRenderCache
+from app.utils.model_utils import convert_lesson_to_schema
+
+
+class TestLessonRenderCache:
+    """LRU giới hạn theo byte, key (lesson_id, version)"""
+
+    def test_version_mismatch_is_miss(self):
+        cache = LessonRenderCache(max_bytes=1000)
+        cache.set(1, "v1", b"{}")
+
+        assert cache.get(1, "v1") == b"{}"
+        assert cache.get(1, "v2") is None
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_new_version_replaces_old(self):
+        cache = LessonRenderCache(max_bytes=1000)
+        cache.set(1, "v1", b"x" * 10)
+        cache.set(1, "v2", b"y" * 20)
+
+        assert cache.get(1, "v1") is None
+        assert cache.stats()["size"] == 1
+        assert cache.stats()["bytes"] == 20
+
+    def test_evicts_least_recently_used_by_bytes(self):
+        cache = LessonRenderCache(max_bytes=100)
+        cache.set(1, "v", b"a" * 40)
+        cache.set(2, "v", b"b" * 40)
+        cache.get(1, "v")
+        cache.set(3, "v", b"c" * 40)
+
+        assert cache.get(2, "v") is None
+        assert cache.get(1, "v") is not None
+        assert cache.get(3, "v") is not None
+        assert cache.stats()["evictions"] == 1
+        assert cache.stats()["bytes"] == 80
+
+    def test_oversized_and_disabled(self):
+        cache = LessonRenderCache(max_bytes=10)
+        cache.set(1, "v", b"z" * 11)
+        assert cache.stats()["size"] == 0
+
+        disabled = LessonRenderCache(max_bytes=0)
+        disabled.set(1, "v", b"{}")
+        assert disabled.get(1, "v") is None
+
+    def test_invalidate(self):
+        cache = LessonRenderCache(max_bytes=1000)
+        cache.set(1, "v", b"{}")
+        cache.set(2, "v", b"[]")
+        cache.invalidate(1)
+
+        assert cache.get(1, "v") is None
+        assert cache.get(2, "v") == b"[]"
+        assert cache.stats()["bytes"] == 2
+
+
+class FakeSharedStore:
+    """Tầng cache dùng chung trong bộ nhớ, cùng giao diện SharedLessonRenderStore"""
+
+    def __init__(self):
+        self.rows = {}
+
+    async def get_many(self, versions):
+        return {
+            lesson_id: self.rows[lesson_id][1]
+            for lesson_id, version in versions.items()
+            if self.rows.get(lesson_id, (None,))[0] == version
+        }
+
+    async def put_many(self, entries):
+        self.rows.update(entries)
+
+
+@pytest.fixture
+def db(sqlite_db):
+    db = sqlite_db(Topic, Lesson, LessonSection, Exercise, ExerciseTestCase)
+    db.add(Topic(id=10, course_id=1, name="Sắp xếp", description="", order=1))
+    db.add_all(
+        [
+            Lesson(
+                id=lesson_id,
+                external_id=str(lesson_id),
+                topic_id=10,
+                title=f"Bài {lesson_id}",
+                description="Mô tả",
+                order=order,
+            )
+            for lesson_id, order in [(101, 2), (100, 1)]
+        ]
+    )
+    db.add_all(
+        [
+            LessonSection(
+                id=1, lesson_id=100, type="text", content="Nội dung", order=1
+            ),
+            LessonSection(
+                id=2,
+                lesson_id=100,
+                type="quiz",
+                content="Câu hỏi",
+                order=2,
+                options={"A": "1", "B": "2", "C": "3", "D": "4"},
+                answer="A",
+            ),
+            Exercise(
+                id=7,
+                lesson_id=100,
+                title="Bài tập",
+                description="",
+                difficulty="easy",
+            ),
+        ]
+    )
+    db.sync_session.commit()
+    return db
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+def expected_lesson_json(db, lesson_id):
+    db.sync_session.expire_all()
+    lesson = db.sync_session.get(Lesson, lesson_id)
+    return json.loads(convert_lesson_to_schema(lesson).model_dump_json(by_alias=True))
+
+
+class TestLessonRenderService:
+    """JSON giống convert_lesson_to_schema, chỉ render lại khi đổi phiên bản"""
+
+    def test_lesson_json_matches_schema(self, db):
+        service = LessonRenderService(db, cache=LessonRenderCache(max_bytes=10**6))
+
+        body = run(service.get_lesson_json(100))
+
+        assert json.loads(body) == expected_lesson_json(db, 100)
+        assert json.loads(body)["sections"][1]["options"] == {
+            "A": "1",
+            "B": "2",
+            "C": "3",
+            "D": "4",
+        }
+        assert run(service.get_lesson_json(999)) is None
+
+    def test_warm_request_is_single_query(self, db):
+        cache = LessonRenderCache(max_bytes=10**6)
+        service = LessonRenderService(db, cache=cache)
+        first = run(service.get_topic_lessons_json(10))
+
+        db.query_count = 0
+        second = run(service.get_topic_lessons_json(10))
+
+        assert second == first
+        assert db.query_count == 1
+        assert [lesson["id"] for lesson in json.loads(second)] == [100, 101]
+        assert cache.stats()["renders"] == 2
+        assert cache.stats()["hits"] == 2
+
+    def test_changed_lesson_is_rerendered(self, db):
+        cache = LessonRenderCache(max_bytes=10**6)
+        service = LessonRenderService(db, cache=cache)
+        run(service.get_topic_lessons_json(10))
+
+        section = db.sync_session.get(LessonSection, 1)
+        section.content = "Nội dung mới"
+        section.updated_at = datetime(2030, 1, 1)
+        db.sync_session.commit()
+
+        lessons = json.loads(run(service.get_topic_lessons_json(10)))
+
+        assert lessons[0]["sections"][0]["content"] == "Nội dung mới"
+        assert cache.stats()["renders"] == 3
+
+        db.sync_session.delete(db.sync_session.get(Exercise, 7))
+        db.sync_session.commit()
+
+        lessons = json.loads(run(service.get_topic_lessons_json(10)))
+        assert lessons[0]["exercises"] == []
+
+    def test_course_topics_splice_lessons(self, db):
+        service = LessonRenderService(db, cache=LessonRenderCache(max_bytes=10**6))
+
+        topics = json.loads(run(service.get_course_topics_json(1)))
+
+        topic = db.sync_session.get(Topic, 10)
+        expected = json.loads(
+            TopicResponse.model_validate(
+                {
+                    field: getattr(topic, field, None)
+                    for field in TopicResponse.model_fields
+                    if field != "lessons"
+                }
+            ).model_dump_json(by_alias=True)
+        )
+        expected["lessons"] = [
+            expected_lesson_json(db, 100),
+            expected_lesson_json(db, 101),
+        ]
+        assert topics == [expected]
+        assert run(service.get_course_topics_json(2)) == b"[]"
+
+    def test_shared_tier_fills_other_workers(self, db):
+        shared = FakeSharedStore()
+        first_worker = LessonRenderCache(max_bytes=10**6)
+        second_worker = LessonRenderCache(max_bytes=10**6)
+
+        body = run(
+            LessonRenderService(
+                db, cache=first_worker, shared_store=shared
+            ).get_lesson_json(100)
+        )
+        assert (
+            run(
+                LessonRenderService(
+                    db, cache=second_worker, shared_store=shared
+                ).get_lesson_json(100)
+            )
+            == body
+        )
+        assert second_worker.stats()["shared_hits"] == 1
+        assert second_worker.stats()["renders"] == 0
+
+
+def test_shared_store_statements():
+    select_sql = str(
+        SharedLessonRenderStore.select_statement({1: "v1", 2: "v2"}).compile(
+            dialect=postgresql.dialect()
+        )
+    )
+    upsert_sql = str(
+        SharedLessonRenderStore.upsert_statement({1: ("v1", b"{}")}).compile(
+            dialect=postgresql.dialect()
+        )
+    )
+
+    assert "(lesson_render_cache.lesson_id, lesson_render_cache.version) IN" in select_sql
+    assert "ON CONFLICT (lesson_id) DO UPDATE SET version = excluded.version" in upsert_sql
@@ -0,0 +1,162 @@
+"""
+Tests cho cache response LLM (tầng exact trên SQLite, tầng semantic, TTL, giới hạn
+số entry, bật/tắt theo agent và temperature). Dùng chat model giả của LangChain
+nên không gọi Gemini.
+"""
+
+import asyncio
+
+import pytest
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_core.load import dumps
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.pool import StaticPool
+
+from app.core.agents.components import llm_cache
+from app.core.agents.components.llm_cache import (
+    LLMCacheStats,
+    LLMCacheStore,
+    LLMResponseCache,
+    get_llm_cache,
+    prompt_text,
+)
+from app.core.config import settings
+from app.models.llm_cache_model import LLMCacheEntry
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    LLMCacheEntry.metadata.create_all(engine, tables=[LLMCacheEntry.__table__])
+    return engine
+
+
+@pytest.fixture
+def stats():
+    return LLMCacheStats()
+
+
+def make_cache(engine, stats, embedder=None, **store_kwargs):
+    store = LLMCacheStore(engine=engine, **store_kwargs)
+    return LLMResponseCache(
+        "lesson_generating",
+        store,
+        embedder=embedder,
+        semantic_threshold=0.9,
+        stats=stats,
+    )
+
+
+def make_model(cache, responses=("một", "hai", "ba")):
+    return FakeListChatModel(responses=list(responses), cache=cache)
+
+
+def count_entries(engine):
+    with engine.connect() as connection:
+        return connection.scalar(select(func.count()).select_from(LLMCacheEntry))
+
+
+class TestExactTier:
+    def test_identical_prompt_hits(self, engine, stats):
+        model = make_model(make_cache(engine, stats))
+
+        assert model.invoke("Tạo bài giảng về sắp xếp").content == "một"
+        assert model.invoke("Tạo bài giảng về sắp xếp").content == "một"
+        assert model.invoke("Tạo bài giảng về đồ thị").content == "hai"
+
+        counters = stats.stats()["lesson_generating"]
+        assert (counters["exact_hits"], counters["misses"], counters["writes"]) == (1, 2, 2)
+        assert counters["hit_rate"] == round(1 / 3, 4)
+        assert stats.stats()["total"]["exact_hits"] == 1
+
+    def test_async_path_and_params_in_key(self, engine, stats):
+        model = make_model(make_cache(engine, stats))
+
+        assert asyncio.run(model.ainvoke("prompt")).content == "một"
+        assert asyncio.run(model.ainvoke("prompt")).content == "một"
+        # Tham số gọi khác (stop) là một llm_string khác
+        assert model.bind(stop=["\n"]).invoke("prompt").content == "hai"
+
+    def test_expired_entries_are_missed_and_purged(self, engine, stats):
+        model = make_model(make_cache(engine, stats, ttl_seconds=-1))
+
+        model.invoke("a")
+        assert model.invoke("a").content == "hai"
+        # Lần ghi thứ hai xóa luôn entry đã hết hạn (kể cả entry vừa ghi)
+        assert count_entries(engine) == 0
+
+    def test_least_recently_used_evicted_over_max_entries(self, engine, stats):
+        model = make_model(make_cache(engine, stats, max_entries=2), ["1", "2", "3", "4"])
+
+        model.invoke("a")
+        model.invoke("b")
+        model.invoke("a")
+        model.invoke("c")
+
+        assert count_entries(engine) == 2
+        assert stats.stats()["lesson_generating"]["evictions"] == 1
+        assert model.invoke("a").content == "1"
+        assert model.invoke("b").content == "4"
+
+    def test_store_errors_fall_back_to_model(self, stats):
+        broken = create_engine("sqlite://")  # Không có bảng llm_cache_entries
+        model = make_model(make_cache(broken, stats))
+
+        assert model.invoke("a").content == "một"
+        assert stats.stats()["lesson_generating"]["errors"] == 2
+
+
+def bag_of_words(text):
+    vocabulary = ["sắp", "xếp", "nhanh", "đồ", "thị", "bài", "giảng"]
+    words = text.lower().replace(".", " ").split()
+    return [float(words.count(word)) for word in vocabulary]
+
+
+class TestSemanticTier:
+    def test_near_identical_prompt_reuses_response(self, engine, stats):
+        model = make_model(make_cache(engine, stats, embedder=bag_of_words))
+
+        assert model.invoke("bài giảng sắp xếp nhanh").content == "một"
+        assert model.invoke("Bài giảng sắp xếp nhanh.").content == "một"
+        assert model.invoke("bài giảng đồ thị").content == "hai"
+
+        counters = stats.stats()["lesson_generating"]
+        assert (counters["semantic_hits"], counters["misses"]) == (1, 2)
+
+    def test_prompt_text_ignores_message_envelope(self):
+        prompt = dumps(
+            [
+                SystemMessage(content="Bạn là giáo viên"),
+                HumanMessage(content=[{"type": "text", "text": "Sắp xếp"}]),
+            ]
+        )
+
+        assert prompt_text(prompt) == "Bạn là giáo viên\nSắp xếp"
+
+
+class TestGetLLMCache:
+    @pytest.fixture(autouse=True)
+    def isolated(self, monkeypatch, engine):
+        monkeypatch.setattr(llm_cache, "_store", LLMCacheStore(engine=engine))
+        monkeypatch.setattr(llm_cache, "_caches", {})
+        monkeypatch.setattr(settings, "LLM_CACHE_ENABLED", True)
+        monkeypatch.setattr(settings, "LLM_CACHE_DISABLED_AGENTS", ["input_test"])
+        monkeypatch.setattr(settings, "LLM_CACHE_MAX_TEMPERATURE", 0.5)
+
+    def test_opt_in_per_agent(self):
+        cache = get_llm_cache("lesson_generating", temperature=0.1)
+
+        assert cache is get_llm_cache("lesson_generating", temperature=0.2)
+        assert get_llm_cache(None) is None
+        assert get_llm_cache("input_test") is None
+
+    def test_high_temperature_and_global_switch_bypass(self, monkeypatch):
+        assert get_llm_cache("lesson_generating", temperature=0.9) is None
+
+        monkeypatch.setattr(settings, "LLM_CACHE_ENABLED", False)
+        assert get_llm_cache("lesson_generating", temperature=0.1) is None
@@ -0,0 +1,293 @@
+"""
+Tests cho điều phối gọi LLM (LLMScheduler): token bucket theo model, thứ tự ưu tiên
+interactive > assessment > background, ngân sách thử lại dùng chung và metrics. Dùng
+chat model giả của LangChain và đồng hồ giả nên không gọi Gemini.
+"""
+
+import asyncio
+import threading
+import time
+from typing import Any
+
+import pytest
+from google.api_core.exceptions import ResourceExhausted, ServiceUnavailable
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from app.core.agents.assessment_agent import AssessmentAgent
+from app.core.agents.components.llm_model import create_chat_model
+from app.core.agents.components.llm_scheduler import (
+    ASSESSMENT,
+    BACKGROUND,
+    INTERACTIVE,
+    LLMScheduler,
+    RetryBudget,
+    ScheduledChatModelMixin,
+)
+from app.core.agents.tutor_agent import TutorAgent
+from app.core.config import settings
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class ScheduledFakeChatModel(ScheduledChatModelMixin, FakeListChatModel):
+    """Chat model giả đi qua scheduler, ghi lại thứ tự được gọi vào ``calls``"""
+
+    calls: Any = None
+
+    def _call(self, *args, **kwargs):
+        if self.calls is not None:
+            self.calls.append(self.scheduler_priority)
+        return super()._call(*args, **kwargs)
+
+
+MODEL = ScheduledFakeChatModel.__name__
+
+
+def make_scheduler(clock=None, requests_per_minute=60000, **kwargs):
+    """1000 request/giây, không có burst: mỗi 1ms đồng hồ giả cấp đúng một lượt"""
+    kwargs.setdefault("retry_budget", RetryBudget(0.2, 0, capacity=10))
+    return LLMScheduler(
+        default_requests_per_minute=requests_per_minute,
+        burst_seconds=0,
+        base_delay=0,
+        clock=clock or time.monotonic,
+        **kwargs,
+    )
+
+
+def queue_depth(scheduler, model="fake"):
+    stats = scheduler.stats()["models"].get(model)
+    if stats is None:
+        return 0
+    return sum(p["queue_depth"] for p in stats["priorities"].values())
+
+
+async def wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline
+        await asyncio.sleep(0.001)
+
+
+class TestPriority:
+    def test_interactive_overtakes_queued_background(self):
+        clock = FakeClock()
+        scheduler = make_scheduler(clock, aging_seconds=0)
+        calls = []
+
+        def model(priority):
+            return ScheduledFakeChatModel(
+                responses=["ok"], scheduler=scheduler, scheduler_priority=priority, calls=calls
+            )
+
+        async def run():
+            # Lượt đầu dùng token có sẵn, các request sau phải xếp hàng
+            await model(BACKGROUND).ainvoke("khởi động")
+            tasks = [asyncio.create_task(model(BACKGROUND).ainvoke("sinh bài học")) for _ in range(5)]
+            await wait_for(lambda: queue_depth(scheduler, MODEL) == 5)
+            tasks += [asyncio.create_task(model(ASSESSMENT).ainvoke("đánh giá")) for _ in range(2)]
+            tasks += [asyncio.create_task(model(INTERACTIVE).ainvoke("hỏi tutor")) for _ in range(3)]
+            await wait_for(lambda: queue_depth(scheduler, MODEL) == 10)
+
+            for served in range(2, 12):
+                clock.now += 0.001
+                await wait_for(lambda: len(calls) == served)
+            await asyncio.gather(*tasks)
+
+        asyncio.run(run())
+
+        assert calls[1:] == [INTERACTIVE] * 3 + [ASSESSMENT] * 2 + [BACKGROUND] * 5
+        stats = scheduler.stats()["models"][MODEL]["priorities"]
+        assert stats[BACKGROUND]["requests"] == 6
+        assert stats[INTERACTIVE]["requests"] == 3
+        assert stats[BACKGROUND]["max_wait_seconds"] > stats[INTERACTIVE]["max_wait_seconds"]
+
+    def test_waiting_background_is_aged_ahead_of_new_interactive(self):
+        clock = FakeClock()
+        scheduler = make_scheduler(clock, requests_per_minute=60, aging_seconds=0.1)
+        order = []
+
+        def request(priority):
+            scheduler.acquire("fake", priority)
+            order.append(priority)
+
+        scheduler.acquire("fake", BACKGROUND)
+        background = threading.Thread(target=request, args=(BACKGROUND,), daemon=True)
+        background.start()
+        asyncio.run(wait_for(lambda: queue_depth(scheduler) == 1))
+        clock.now = 0.3  # background đã chờ đủ 2 bậc ưu tiên, chưa có token mới
+        interactive = threading.Thread(target=request, args=(INTERACTIVE,), daemon=True)
+        interactive.start()
+        asyncio.run(wait_for(lambda: queue_depth(scheduler) == 2))
+
+        clock.now = 1.0
+        asyncio.run(wait_for(lambda: len(order) == 1))
+        clock.now = 2.0
+        asyncio.run(wait_for(lambda: len(order) == 2))
+
+        assert order == [BACKGROUND, INTERACTIVE]
+
+    def test_cancelled_waiter_does_not_use_quota(self):
+        clock = FakeClock()
+        scheduler = make_scheduler(clock)
+
+        async def run():
+            await scheduler.aacquire("fake", BACKGROUND)
+            cancelled = asyncio.create_task(scheduler.aacquire("fake", INTERACTIVE))
+            waiting = asyncio.create_task(scheduler.aacquire("fake", BACKGROUND))
+            await wait_for(lambda: queue_depth(scheduler) == 2)
+
+            cancelled.cancel()
+            clock.now += 0.001
+            await asyncio.wait_for(waiting, 2)
+            return cancelled
+
+        assert asyncio.run(run()).cancelled()
+        assert queue_depth(scheduler) == 0
+
+
+class TestRateLimit:
+    def test_token_bucket_limits_requests_per_model(self):
+        scheduler = LLMScheduler(
+            requests_per_minute={"fast": 0}, default_requests_per_minute=1200, burst_seconds=0.1
+        )
+        started = time.monotonic()
+        for _ in range(10):
+            scheduler.acquire("slow", BACKGROUND)
+        elapsed = time.monotonic() - started
+        for _ in range(100):
+            scheduler.acquire("fast", BACKGROUND)
+
+        # 20 request/giây, burst 2: 8 lượt còn lại cần khoảng 0.4 giây
+        assert 0.3 < elapsed < 1.5
+        assert scheduler.stats()["models"]["slow"]["priorities"][BACKGROUND]["wait_seconds"] > 0
+        assert scheduler.stats()["models"]["fast"]["tokens"] is None
+
+    def test_quota_error_drains_bucket(self):
+        clock = FakeClock()
+        scheduler = make_scheduler(clock, requests_per_minute=60, max_attempts=1)
+        scheduler.burst_seconds = 10
+
+        with pytest.raises(ResourceExhausted):
+            scheduler.call("fake", BACKGROUND, lambda: (_ for _ in ()).throw(ResourceExhausted("429")))
+
+        assert scheduler.stats()["models"]["fake"]["tokens"] == 0
+
+
+class TestRetryBudget:
+    def failing(self, failures, error=ServiceUnavailable):
+        calls = []
+
+        def fn():
+            calls.append(1)
+            if len(calls) <= failures:
+                raise error("lỗi tạm thời")
+            return "ok"
+
+        return fn, calls
+
+    def test_transient_errors_are_retried(self):
+        scheduler = make_scheduler()
+        fn, calls = self.failing(2)
+
+        assert scheduler.call("fake", INTERACTIVE, fn) == "ok"
+        assert len(calls) == 3
+        assert scheduler.stats()["retries"] == 2
+        assert scheduler.stats()["retry_budget"] == pytest.approx(8.2)
+
+    def test_max_attempts(self):
+        scheduler = make_scheduler(max_attempts=3)
+        fn, calls = self.failing(10)
+
+        with pytest.raises(ServiceUnavailable):
+            scheduler.call("fake", INTERACTIVE, fn)
+        assert len(calls) == 3
+
+    def test_retries_stop_when_budget_is_spent(self):
+        scheduler = make_scheduler(retry_budget=RetryBudget(0.5, 0, capacity=1))
+
+        fn, calls = self.failing(1)
+        assert scheduler.call("fake", BACKGROUND, fn) == "ok"
+        fn, calls = self.failing(10)
+        with pytest.raises(ServiceUnavailable):
+            scheduler.call("fake", BACKGROUND, fn)
+
+        # Thành công nạp 0.5 lượt, chưa đủ một lần thử lại
+        assert len(calls) == 1
+        assert scheduler.stats()["retries_denied"] == 1
+
+    def test_other_errors_are_not_retried(self):
+        scheduler = make_scheduler()
+        fn, calls = self.failing(1, error=ValueError)
+
+        with pytest.raises(ValueError):
+            scheduler.call("fake", BACKGROUND, fn)
+        assert len(calls) == 1
+
+    def test_backoff_has_jitter_and_cap(self):
+        scheduler = LLMScheduler(base_delay=1.0, max_delay=5.0)
+
+        delays = [scheduler.backoff(attempt) for attempt in range(10) for _ in range(20)]
+
+        assert all(0 <= delay <= 5.0 for delay in delays)
+        assert len(set(delays)) > 1
+
+    def test_stream_retries_only_before_first_chunk(self):
+        scheduler = make_scheduler()
+        attempts = []
+
+        async def stream(fail_after):
+            attempts.append(1)
+            for i in range(3):
+                if i == fail_after and len(attempts) == 1:
+                    raise ServiceUnavailable("lỗi tạm thời")
+                yield i
+
+        async def collect(fail_after):
+            return [c async for c in scheduler.astream("fake", INTERACTIVE, lambda: stream(fail_after))]
+
+        assert asyncio.run(collect(0)) == [0, 1, 2]
+        assert len(attempts) == 2
+
+        attempts.clear()
+        with pytest.raises(ServiceUnavailable):
+            asyncio.run(collect(1))
+        assert len(attempts) == 1
+
+
+class TestScheduledChatModel:
+    def test_sync_and_async_calls_are_scheduled_once(self):
+        scheduler = make_scheduler(requests_per_minute=0)
+        model = ScheduledFakeChatModel(
+            responses=["một", "hai", "ba"], scheduler=scheduler, scheduler_priority=INTERACTIVE
+        )
+
+        assert model.invoke("a").content == "một"
+        assert asyncio.run(model.ainvoke("b")).content == "hai"
+        assert "".join(c.content for c in model.stream("c")) == "ba"
+
+        stats = scheduler.stats()["models"][MODEL]
+        assert stats["priorities"][INTERACTIVE]["requests"] == 3
+
+    def test_create_chat_model(self, monkeypatch):
+        monkeypatch.setattr(settings, "LLM_SCHEDULER_ENABLED", True)
+        model = create_chat_model(INTERACTIVE, model="gemini-2.0-flash", google_api_key="key")
+        assert isinstance(model, ScheduledChatModelMixin)
+        assert model.max_retries == 1
+        assert model.scheduler_priority == INTERACTIVE
+        assert model._scheduler_model == "gemini-2.0-flash"
+
+        monkeypatch.setattr(settings, "LLM_SCHEDULER_ENABLED", False)
+        model = create_chat_model(INTERACTIVE, model="gemini-2.0-flash", google_api_key="key")
+        assert not isinstance(model, ScheduledChatModelMixin)
+        assert model.max_retries == 6
+
+    def test_agent_priorities(self):
+        assert TutorAgent.llm_priority == INTERACTIVE
+        assert AssessmentAgent.llm_priority == ASSESSMENT
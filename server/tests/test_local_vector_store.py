@@ -0,0 +1,194 @@
+"""
+Tests cho vector store chạy trong process (LocalVectorStore): cùng ngữ nghĩa
+add_documents/similarity_search/as_retriever như Pinecone, filter metadata, lưu trên
+đĩa, int8 và IVF so với brute-force.
+"""
+
+import zlib
+
+import numpy as np
+import pytest
+from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from app.core.agents.components.document_store import (
+    VectorStoreRegistry,
+    create_vector_store_backend,
+)
+from app.core.agents.components.local_vector_store import (
+    LocalVectorIndex,
+    LocalVectorStore,
+    LocalVectorStoreBackend,
+)
+from app.core.config import settings
+
+DIMENSION = 64
+
+
+class KeywordEmbedding(DeterministicFakeEmbedding):
+    """Embedding giả: văn bản có chung từ thì gần nhau"""
+
+    def _get_embedding(self, seed=None):
+        raise NotImplementedError
+
+    def embed_documents(self, texts):
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text):
+        vector = np.zeros(self.size)
+        for word in text.lower().split():
+            vector[zlib.crc32(word.encode()) % self.size] += 1
+        return vector.tolist()
+
+
+def make_store(path, dtype="float32"):
+    index = LocalVectorIndex(path, dimension=DIMENSION, dtype=dtype, ivf_min_vectors=0)
+    return LocalVectorStore(index, KeywordEmbedding(size=DIMENSION))
+
+
+def clustered_vectors(n, clusters=20, seed=0):
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, DIMENSION))
+    return centers[rng.integers(clusters, size=n)] + 0.3 * rng.normal(size=(n, DIMENSION))
+
+
+DOCUMENTS = [
+    Document(page_content="sap xep noi bot", metadata={"topic": "sort", "level": 1}),
+    Document(page_content="sap xep nhanh", metadata={"topic": "sort", "level": 2}),
+    Document(page_content="tim kiem nhi phan", metadata={"topic": "search", "level": 1}),
+    Document(page_content="do thi duyet theo chieu rong", metadata={"topic": "graph", "level": 3}),
+]
+
+
+class TestLocalVectorStore:
+    def test_add_documents_and_similarity_search(self, tmp_path):
+        store = make_store(tmp_path)
+        ids = store.add_documents(DOCUMENTS)
+
+        results = store.similarity_search_with_score("sap xep nhanh", k=2)
+
+        assert [doc.page_content for doc, _ in results] == ["sap xep nhanh", "sap xep noi bot"]
+        assert results[0][0].metadata == {"topic": "sort", "level": 2}
+        assert results[0][0].id == ids[1]
+        assert results[0][1] == pytest.approx(1.0)
+        assert results[0][1] > results[1][1]
+
+    def test_as_retriever(self, tmp_path):
+        store = make_store(tmp_path)
+        store.add_documents(DOCUMENTS)
+
+        retriever = store.as_retriever(search_kwargs={"k": 1})
+
+        assert retriever.invoke("tim kiem")[0].page_content == "tim kiem nhi phan"
+        mmr = store.as_retriever(search_type="mmr", search_kwargs={"k": 2, "fetch_k": 4})
+        assert len(mmr.invoke("sap xep")) == 2
+
+    @pytest.mark.parametrize(
+        "filter, expected",
+        [
+            ({"topic": "sort"}, {"sap xep noi bot", "sap xep nhanh"}),
+            ({"level": {"$gte": 2}}, {"sap xep nhanh", "do thi duyet theo chieu rong"}),
+            ({"topic": {"$in": ["search", "graph"]}}, {"tim kiem nhi phan", "do thi duyet theo chieu rong"}),
+            ({"$or": [{"level": 3}, {"topic": "search"}]}, {"tim kiem nhi phan", "do thi duyet theo chieu rong"}),
+            ({"$and": [{"topic": "sort"}, {"level": {"$ne": 1}}]}, {"sap xep nhanh"}),
+        ],
+    )
+    def test_metadata_filter(self, tmp_path, filter, expected):
+        store = make_store(tmp_path)
+        store.add_documents(DOCUMENTS)
+
+        results = store.similarity_search("sap xep", k=10, filter=filter)
+
+        assert {doc.page_content for doc in results} == expected
+
+    def test_upsert_and_delete_by_id(self, tmp_path):
+        store = make_store(tmp_path)
+        store.add_texts(["sap xep noi bot", "tim kiem"], ids=["a", "b"])
+
+        store.add_texts(["do thi"], ids=["a"])
+        store.delete(["b"])
+
+        assert [doc.page_content for doc in store.get_by_ids(["a", "b"])] == ["do thi"]
+        assert len(store.index) == 1
+        assert [doc.id for doc in store.similarity_search("sap xep", k=5)] == ["a"]
+
+    def test_persisted_and_reopened(self, tmp_path):
+        store = make_store(tmp_path)
+        store.add_documents(DOCUMENTS)
+        store.add_texts([f"bai {i}" for i in range(2000)])  # vượt capacity ban đầu
+        store.delete([store.similarity_search("tim kiem nhi phan", k=1)[0].id])
+
+        reopened = make_store(tmp_path)
+
+        assert len(reopened.index) == len(store.index) == 2003
+        assert reopened.similarity_search("sap xep nhanh", k=1)[0].page_content == "sap xep nhanh"
+        assert reopened.similarity_search("tim kiem nhi phan", k=1)[0].page_content != "tim kiem nhi phan"
+
+    def test_partial_write_is_ignored_on_reopen(self, tmp_path):
+        store = make_store(tmp_path)
+        store.add_documents(DOCUMENTS)
+        with open(tmp_path / "records.jsonl", "a") as file:
+            file.write('{"id": "dang-ghi-d')
+
+        reopened = make_store(tmp_path)
+        reopened.add_texts(["moi"], ids=["moi"])
+
+        assert len(make_store(tmp_path).index) == 5
+
+    def test_int8_matches_float32_ranking(self, tmp_path):
+        vectors = clustered_vectors(500)
+        float_index = LocalVectorIndex(tmp_path / "f", DIMENSION, "float32", ivf_min_vectors=0)
+        int8_index = LocalVectorIndex(tmp_path / "q", DIMENSION, "int8", ivf_min_vectors=0)
+        ids = [str(i) for i in range(len(vectors))]
+        for index in (float_index, int8_index):
+            index.add(ids, vectors, [{} for _ in ids])
+
+        recall = []
+        for query in vectors[:50]:
+            expected = {row for row, _ in float_index.search(query, 10)}
+            recall.append(len(expected & {row for row, _ in int8_index.search(query, 10)}) / 10)
+
+        assert np.mean(recall) >= 0.9
+
+    def test_ivf_recall_against_brute_force(self, tmp_path):
+        vectors = clustered_vectors(4000)
+        index = LocalVectorIndex(tmp_path, DIMENSION, ivf_min_vectors=1000, ivf_probes=8)
+        ids = [str(i) for i in range(len(vectors))]
+        index.add(ids[:2000], vectors[:2000], [{} for _ in range(2000)])
+        assert index.ivf_trained
+        index.add(ids[2000:], vectors[2000:], [{"half": 2} for _ in range(2000)])
+
+        recall = []
+        for query in vectors[:100] + 0.1:
+            expected = {row for row, _ in index.search(query, 10, exact=True)}
+            recall.append(len(expected & {row for row, _ in index.search(query, 10)}) / 10)
+        assert np.mean(recall) >= 0.9
+
+        filtered = index.search(vectors[0], 10, filter={"half": 2})
+        assert all(row >= 2000 for row, _ in filtered)
+        reopened = LocalVectorIndex(tmp_path, DIMENSION, ivf_min_vectors=1000, ivf_probes=8)
+        assert reopened.ivf_trained
+        assert reopened.search(vectors[0], 10) == index.search(vectors[0], 10)
+
+
+class TestLocalBackend:
+    def test_registry_uses_local_backend_from_settings(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(settings, "VECTOR_STORE_BACKEND", "local")
+        monkeypatch.setattr(settings, "VECTOR_STORE_LOCAL_PATH", str(tmp_path))
+        registry = VectorStoreRegistry(
+            create_vector_store_backend(),
+            embedding_factory=lambda: KeywordEmbedding(size=768),
+        )
+
+        store = registry.get_vector_store("document")
+        store.add_texts(["sap xep"])
+
+        assert isinstance(registry.backend, LocalVectorStoreBackend)
+        assert registry.get_vector_store("document") is store
+        assert registry.get_vector_store("document", namespace="khac").index is not store.index
+        assert (tmp_path / "document" / "__default__" / "vectors.npy").exists()
+        assert registry.stats()["indexes"]["document/"]["vectors"] == 1
+
+    def test_unknown_backend(self):
+        with pytest.raises(ValueError):
+            create_vector_store_backend("faiss")
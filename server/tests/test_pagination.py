@@ -0,0 +1,162 @@
+"""
+Tests và benchmark cho phân trang keyset theo (created_at, id).
+
+Benchmark chạy trên SQLite in-memory (cùng cấu trúc index như PostgreSQL):
+trang 5000 bằng OFFSET phải bỏ qua ~100k dòng, keyset đi thẳng tới vị trí cursor.
+"""
+
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import Index, create_engine, insert, select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import DeclarativeBase, Mapped, Session, mapped_column
+
+from app.database.pagination import (
+    build_keyset_page,
+    decode_cursor,
+    encode_cursor,
+    keyset_statement,
+)
+
+PAGE_SIZE = 20
+DEEP_PAGE = 5000
+ROW_COUNT = PAGE_SIZE * DEEP_PAGE + PAGE_SIZE
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+class Item(Base):
+    __tablename__ = "items"
+    __table_args__ = (Index("ix_items_created_at_id", "created_at", "id"),)
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    created_at: Mapped[datetime]
+
+
+def create_session(row_count: int) -> Session:
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    start = datetime(2024, 1, 1)
+    with engine.begin() as conn:
+        # Mỗi created_at dùng cho 3 dòng để kiểm tra id phân định thứ tự
+        conn.execute(
+            insert(Item),
+            [
+                {"id": i, "created_at": start + timedelta(seconds=i // 3)}
+                for i in range(1, row_count + 1)
+            ],
+        )
+    return Session(engine)
+
+
+def fetch_page(session: Session, limit: int, cursor=None, descending=True):
+    stmt = keyset_statement(
+        select(Item), Item, limit=limit, cursor=cursor, descending=descending
+    )
+    rows = session.scalars(stmt).all()
+    return build_keyset_page(rows, limit=limit, cursor=cursor)
+
+
+class TestCursor:
+    """Mã hóa/giải mã cursor"""
+
+    def test_round_trip(self):
+        created_at = datetime(2024, 5, 6, 7, 8, 9, 123456)
+        cursor = encode_cursor(created_at, 42, "prev")
+
+        assert decode_cursor(cursor) == (created_at, 42, "prev")
+
+    @pytest.mark.parametrize("cursor", ["abc", "eyJ4IjoxfQ", "!!!"])
+    def test_invalid_cursor_is_bad_request(self, cursor):
+        with pytest.raises(HTTPException) as exc_info:
+            decode_cursor(cursor)
+        assert exc_info.value.status_code == 400
+
+    def test_statement_uses_row_comparison(self):
+        cursor = encode_cursor(datetime(2024, 1, 1), 10)
+        sql = str(
+            keyset_statement(select(Item), Item, limit=10, cursor=cursor).compile(
+                dialect=postgresql.dialect()
+            )
+        )
+
+        assert "(items.created_at, items.id) < (" in sql
+        assert "ORDER BY items.created_at DESC, items.id DESC" in sql
+        assert "OFFSET" not in sql
+
+
+class TestKeysetPagination:
+    """Duyệt hết danh sách bằng cursor cho kết quả giống OFFSET"""
+
+    @pytest.mark.parametrize("descending", [True, False])
+    def test_forward_and_backward(self, descending):
+        session = create_session(47)
+        order = (
+            (Item.created_at.desc(), Item.id.desc())
+            if descending
+            else (Item.created_at.asc(), Item.id.asc())
+        )
+        expected = session.scalars(select(Item.id).order_by(*order)).all()
+
+        pages = [fetch_page(session, 10, descending=descending)]
+        assert pages[0].prev_cursor is None
+        while pages[-1].next_cursor:
+            pages.append(
+                fetch_page(session, 10, pages[-1].next_cursor, descending)
+            )
+
+        assert [item.id for page in pages for item in page.items] == expected
+        assert len(pages) == 5
+
+        # Lùi lại từ trang cuối cho đúng các trang đã đi qua
+        page = pages[-1]
+        for previous in reversed(pages[:-1]):
+            page = fetch_page(session, 10, page.prev_cursor, descending)
+            assert [item.id for item in page.items] == [
+                item.id for item in previous.items
+            ]
+        assert page.prev_cursor is None
+
+
+class TestDeepPageBenchmark:
+    """Benchmark trang 5000 trước (OFFSET) và sau (keyset)"""
+
+    def test_deep_page_keyset_faster_than_offset(self):
+        session = create_session(ROW_COUNT)
+        offset = PAGE_SIZE * (DEEP_PAGE - 1)
+        order = (Item.created_at.desc(), Item.id.desc())
+
+        # Cursor trỏ tới bản ghi cuối của trang 4999, như client nhận từ trang trước
+        boundary = session.scalars(
+            select(Item).order_by(*order).offset(offset - 1).limit(1)
+        ).one()
+        cursor = encode_cursor(boundary.created_at, boundary.id)
+
+        def best_of(func, repeat=20):
+            timings = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                result = func()
+                timings.append(time.perf_counter() - started)
+            return min(timings), result
+
+        offset_time, offset_items = best_of(
+            lambda: session.scalars(
+                select(Item).order_by(*order).offset(offset).limit(PAGE_SIZE)
+            ).all()
+        )
+        keyset_time, keyset_page = best_of(
+            lambda: fetch_page(session, PAGE_SIZE, cursor)
+        )
+
+        print(
+            f"\nTrang {DEEP_PAGE} ({ROW_COUNT} dòng): "
+            f"OFFSET {offset_time * 1000:.2f} ms, keyset {keyset_time * 1000:.2f} ms"
+        )
+        assert keyset_page.items == list(offset_items)
+        assert keyset_time < offset_time
@@ -0,0 +1,262 @@
+"""
+Tests cho hash mật khẩu ngoài event loop (PasswordHasher) và luồng đăng nhập.
+"""
+
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from fastapi import FastAPI, HTTPException
+
+from app.database.database import get_async_db
+from app.routers import auth_router
+from app.utils import utils
+from app.utils.password_hasher import PasswordHasher, create_password_context
+
+# Work factor thấp để test chạy nhanh, vẫn đủ tốn CPU để thấy event loop bị chặn
+TEST_ROUNDS = 6
+
+
+class FakeResult:
+    def __init__(self, user):
+        self._user = user
+
+    def scalars(self):
+        return self
+
+    def first(self):
+        return self._user
+
+
+class FakeSession:
+    """Session giả chỉ hỗ trợ những gì route login cần."""
+
+    def __init__(self, user):
+        self.user = user
+        self.commits = 0
+
+    async def execute(self, statement):
+        return FakeResult(self.user)
+
+    async def commit(self):
+        self.commits += 1
+
+
+def make_user(hashed_password: str):
+    return SimpleNamespace(
+        id=1,
+        email="user@example.com",
+        username="user",
+        is_admin=False,
+        is_active=True,
+        hashed_password=hashed_password,
+    )
+
+
+def create_app(session: FakeSession) -> FastAPI:
+    app = FastAPI()
+    app.include_router(auth_router.router)
+
+    async def override_db():
+        yield session
+
+    app.dependency_overrides[get_async_db] = override_db
+    return app
+
+
+@pytest.fixture
+def hasher(monkeypatch):
+    hasher = PasswordHasher(
+        create_password_context(TEST_ROUNDS), max_workers=2, max_queue=256
+    )
+    monkeypatch.setattr(utils, "password_hasher", hasher)
+    return hasher
+
+
+class TestPasswordHasher:
+    """Tests cho PasswordHasher."""
+
+    def test_hash_and_verify(self, hasher):
+        """Hash/verify async cho kết quả giống bản đồng bộ."""
+
+        async def run():
+            hashed = await utils.password_hash_async("secret")
+            return (
+                await utils.verify_password_async("secret", hashed),
+                await utils.verify_password_async("wrong", hashed),
+            )
+
+        assert asyncio.run(run()) == (True, False)
+        assert hasher.stats() == {"pending": 0, "rejected": 0}
+
+    def test_needs_rehash_when_work_factor_is_outdated(self):
+        """Hash có work factor thấp hơn cấu hình bị đánh dấu cần hash lại."""
+        old_hash = create_password_context(4).hash("secret")
+        current = PasswordHasher(create_password_context(5), 1, 1)
+
+        assert current.needs_rehash(old_hash) is True
+        assert current.needs_rehash(current.context.hash("secret")) is False
+
+    def test_queue_full_returns_503(self):
+        """Vượt quá giới hạn hàng đợi thì bị từ chối với 503."""
+        hasher = PasswordHasher(create_password_context(TEST_ROUNDS), 1, 1)
+        hashed = hasher.context.hash("secret")
+
+        async def run():
+            return await asyncio.gather(
+                *(hasher.verify("secret", hashed) for _ in range(5)),
+                return_exceptions=True,
+            )
+
+        results = asyncio.run(run())
+        rejected = [r for r in results if isinstance(r, HTTPException)]
+        assert results.count(True) == 2
+        assert len(rejected) == 3
+        assert all(r.status_code == 503 for r in rejected)
+        assert hasher.stats() == {"pending": 0, "rejected": 3}
+
+    def test_cancelled_caller_keeps_slot_until_thread_finishes(self):
+        """Caller bị hủy không trả chỗ trong hàng đợi khi thread bcrypt còn chạy."""
+        release = threading.Event()
+        context = SimpleNamespace(verify=lambda *args: release.wait(5))
+        hasher = PasswordHasher(context, max_workers=1, max_queue=1)
+
+        async def run():
+            running = asyncio.create_task(hasher.verify("secret", "hash"))
+            queued = asyncio.create_task(hasher.verify("secret", "hash"))
+            await asyncio.sleep(0.05)
+            running.cancel()
+            queued.cancel()
+            await asyncio.gather(running, queued, return_exceptions=True)
+
+            # Tác vụ còn chờ được hủy hẳn, tác vụ đang chạy vẫn chiếm thread
+            assert hasher.stats()["pending"] == 1
+            hasher.max_queue = 0
+            with pytest.raises(HTTPException):
+                await hasher.verify("secret", "hash")
+
+            release.set()
+            while hasher.stats()["pending"]:
+                await asyncio.sleep(0.01)
+            return await hasher.verify("secret", "hash")
+
+        assert asyncio.run(run()) is True
+        assert hasher.stats() == {"pending": 0, "rejected": 1}
+
+
+class TestLogin:
+    """Tests cho route đăng nhập."""
+
+    def post_login(self, app: FastAPI, password: str = "secret"):
+        async def run():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(
+                transport=transport, base_url="http://test"
+            ) as client:
+                return await client.post(
+                    "/auth/login",
+                    json={"username": "user", "password": password, "rememberMe": False},
+                )
+
+        return asyncio.run(run())
+
+    def test_login_rehashes_outdated_password(self, hasher):
+        """Đăng nhập thành công với hash cũ sẽ lưu lại hash theo work factor mới."""
+        old_hash = create_password_context(4).hash("secret")
+        session = FakeSession(make_user(old_hash))
+
+        response = self.post_login(create_app(session))
+
+        assert response.status_code == 200
+        assert session.commits == 1
+        assert session.user.hashed_password != old_hash
+        assert not hasher.needs_rehash(session.user.hashed_password)
+        assert hasher.context.verify("secret", session.user.hashed_password)
+
+    def test_login_wrong_password_does_not_rehash(self, hasher):
+        old_hash = create_password_context(4).hash("secret")
+        session = FakeSession(make_user(old_hash))
+
+        response = self.post_login(create_app(session), password="wrong")
+
+        assert response.status_code == 400
+        assert session.commits == 0
+        assert session.user.hashed_password == old_hash
+
+    def test_login_inactive_user_does_not_rehash(self, hasher):
+        old_hash = create_password_context(4).hash("secret")
+        user = make_user(old_hash)
+        user.is_active = False
+        session = FakeSession(user)
+
+        response = self.post_login(create_app(session))
+
+        assert response.status_code == 401
+        assert session.commits == 0
+        assert session.user.hashed_password == old_hash
+
+    def test_benchmark_event_loop_lag_concurrent_logins(self, hasher, monkeypatch):
+        """
+        Benchmark độ trễ event loop khi có 200 request đăng nhập đồng thời:
+        so sánh bcrypt chạy trực tiếp trên event loop với chạy trong thread pool.
+        """
+        concurrency = 200
+        hashed = hasher.context.hash("secret")
+
+        async def measure() -> tuple[float, float]:
+            app = create_app(FakeSession(make_user(hashed)))
+            transport = httpx.ASGITransport(app=app)
+            max_lag = 0.0
+            done = False
+
+            async def ticker():
+                nonlocal max_lag
+                interval = 0.001
+                while not done:
+                    start = time.perf_counter()
+                    await asyncio.sleep(interval)
+                    max_lag = max(max_lag, time.perf_counter() - start - interval)
+
+            tick_task = asyncio.create_task(ticker())
+            async with httpx.AsyncClient(
+                transport=transport, base_url="http://test"
+            ) as client:
+                start = time.perf_counter()
+                responses = await asyncio.gather(
+                    *(
+                        client.post(
+                            "/auth/login",
+                            json={
+                                "username": "user",
+                                "password": "secret",
+                                "rememberMe": False,
+                            },
+                        )
+                        for _ in range(concurrency)
+                    )
+                )
+                elapsed = time.perf_counter() - start
+            done = True
+            await tick_task
+
+            assert all(r.status_code == 200 for r in responses)
+            return max_lag, elapsed
+
+        async def blocking_verify(plain_password: str, hashed_password: str) -> bool:
+            # Hành vi cũ: bcrypt chạy đồng bộ ngay trên event loop
+            return hasher.context.verify(plain_password, hashed_password)
+
+        offloaded_lag, offloaded_time = asyncio.run(measure())
+
+        monkeypatch.setattr(auth_router, "verify_password_async", blocking_verify)
+        blocking_lag, blocking_time = asyncio.run(measure())
+
+        print(
+            f"\n{concurrency} concurrent logins: "
+            f"blocking max_lag={blocking_lag * 1000:.1f}ms total={blocking_time:.2f}s | "
+            f"offloaded max_lag={offloaded_lag * 1000:.1f}ms total={offloaded_time:.2f}s"
+        )
+        assert offloaded_lag < blocking_lag
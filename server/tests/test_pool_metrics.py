@@ -0,0 +1,122 @@
+"""
+Tests cho telemetry của connection pool và endpoint metrics.
+"""
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+from app.core.config import settings
+from app.database.pool_metrics import PoolTelemetry, instrumented_pool_class
+from app.middleware.request_context_middleware import (
+    RequestContextMiddleware,
+    get_current_route_label,
+)
+from app.routers import admin_health_router
+
+
+class FakeDBAPIConnection:
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def create_pool(telemetry: PoolTelemetry, pool_size: int = 2, max_overflow: int = 1):
+    pool_class = instrumented_pool_class(QueuePool, telemetry)
+    return pool_class(
+        FakeDBAPIConnection,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        timeout=0.01,
+    )
+
+
+class TestPoolTelemetry:
+    """Tests cho PoolTelemetry với QueuePool dùng kết nối giả."""
+
+    def test_checkout_and_overflow(self):
+        """Đếm kết nối đang dùng, overflow và kết nối giữ lâu nhất."""
+        telemetry = PoolTelemetry("test")
+        pool = create_pool(telemetry)
+
+        connections = [pool.connect() for _ in range(3)]
+        snapshot = telemetry.snapshot(pool)
+
+        assert snapshot["checked_out"] == 3
+        assert snapshot["overflow"] == 1
+        assert snapshot["checkouts_total"] == 3
+        assert snapshot["wait_ms"]["count"] == 3
+        assert snapshot["wait_ms"]["buckets"]["+Inf"] == 3
+        assert snapshot["longest_held"]["route"] == "background"
+
+        for connection in connections:
+            connection.close()
+        snapshot = telemetry.snapshot(pool)
+        assert snapshot["checked_out"] == 0
+        assert snapshot["longest_held"] is None
+
+    def test_timeout_is_counted(self):
+        """Lấy kết nối khi pool đã cạn được ghi nhận là timeout."""
+        telemetry = PoolTelemetry("test")
+        pool = create_pool(telemetry, pool_size=1, max_overflow=0)
+
+        held = pool.connect()
+        with pytest.raises(PoolTimeoutError):
+            pool.connect()
+        held.close()
+
+        assert telemetry.timeouts == 1
+        assert telemetry.wait_count == 2
+
+    def test_render_prometheus(self):
+        telemetry = PoolTelemetry("primary")
+        pool = create_pool(telemetry)
+        connection = pool.connect()
+
+        text = telemetry.render_prometheus(pool, {"pid": "1"})
+        connection.close()
+
+        assert 'db_pool_checked_out{pool="primary",pid="1"} 1' in text
+        assert 'db_pool_wait_seconds_bucket{pool="primary",pid="1",le="+Inf"} 1' in text
+        assert 'db_pool_longest_held_seconds{pool="primary",pid="1",route="background"}' in text
+
+
+class TestRequestContextMiddleware:
+    """Tests cho nhãn route dùng trong telemetry."""
+
+    def test_route_label_uses_path_template(self):
+        app = FastAPI()
+        app.add_middleware(RequestContextMiddleware)
+
+        @app.get("/courses/{course_id}")
+        async def get_course(course_id: int):
+            return {"route": get_current_route_label()}
+
+        response = TestClient(app).get("/courses/42")
+        assert response.json() == {"route": "GET /courses/{course_id}"}
+
+
+class TestMetricsEndpoint:
+    """/admin/health/metrics xác thực bằng scrape token, không cần đăng nhập admin."""
+
+    def get(self, headers=None):
+        app = FastAPI()
+        app.include_router(admin_health_router.router)
+        return TestClient(app).get("/admin/health/metrics", headers=headers or {})
+
+    def test_disabled_without_token(self, monkeypatch):
+        monkeypatch.setattr(settings, "METRICS_SCRAPE_TOKEN", None)
+        assert self.get({"Authorization": "Bearer x"}).status_code == 404
+
+    def test_scrape_token(self, monkeypatch):
+        monkeypatch.setattr(settings, "METRICS_SCRAPE_TOKEN", "scrape-secret")
+
+        assert self.get().status_code == 401
+        assert self.get({"Authorization": "Bearer sai"}).status_code == 401
+        response = self.get({"Authorization": "Bearer scrape-secret"})
+        assert response.status_code == 200
+        assert "principal_cache_hits_total" in response.text
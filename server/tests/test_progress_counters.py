@@ -0,0 +1,375 @@
+"""
+Tests cho bộ đếm tiến độ trên user_courses: cập nhật theo chênh lệch khi tiến độ
+thay đổi, job tính lại bằng SQL, tính lại khi khóa học thêm/bớt bài và các đường
+đọc dùng bộ đếm.
+"""
+
+import asyncio
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.database.lesson_navigation import maintain_lesson_navigation
+
+from app.models.course_model import Course
+from app.models.lesson_model import Lesson
+from app.models.topic_model import Topic
+from app.models.user_course_model import UserCourse
+from app.models.user_course_progress_model import ProgressStatus, UserCourseProgress
+from app.schemas.user_course_progress_schema import UserCourseProgressUpdate
+from app.schemas.lesson_schema import CreateLessonSchema
+from app.services.lesson_service import LessonService
+from app.services.user_course_progress_service import (
+    UserCourseProgressService,
+    completion_percentage,
+    progress_counters_statement,
+    total_lessons_subquery,
+)
+
+COMPLETED = ProgressStatus.COMPLETED
+IN_PROGRESS = ProgressStatus.IN_PROGRESS
+NOT_STARTED = ProgressStatus.NOT_STARTED
+
+
+class CountersSession(Session):
+    """Session có gắn event tính lại điều hướng và bộ đếm như PrimarySession"""
+
+
+maintain_lesson_navigation(CountersSession)
+
+
+@pytest.fixture
+def db(sqlite_db):
+    db = sqlite_db(
+        Course,
+        Topic,
+        Lesson,
+        UserCourse,
+        UserCourseProgress,
+        session_class=CountersSession,
+    )
+    # Khóa học 1: topic 10 (lesson 100, 101), topic 11 (lesson 110)
+    # Khóa học 2: chưa có lesson
+    db.add_all([Course(id=1, title="Course 1"), Course(id=2, title="Course 2")])
+    db.add_all(
+        [
+            Topic(id=11, course_id=1, name="Topic 2", description="", order=2),
+            Topic(id=10, course_id=1, name="Topic 1", description="", order=1),
+        ]
+    )
+    db.add_all(
+        Lesson(
+            id=lesson_id,
+            external_id=str(lesson_id),
+            topic_id=topic_id,
+            title="Lesson",
+            description="",
+            order=order,
+        )
+        for lesson_id, topic_id, order in [(110, 11, 1), (101, 10, 2), (100, 10, 1)]
+    )
+    db.add_all(
+        [
+            UserCourse(id=1, user_id=1, course_id=1),
+            UserCourse(id=2, user_id=2, course_id=1),
+            UserCourse(id=3, user_id=1, course_id=2),
+        ]
+    )
+    db.sync_session.commit()
+    return db
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+def counters(db, user_course_id):
+    user_course = db.sync_session.get(UserCourse, user_course_id, populate_existing=True)
+    total_lessons = db.sync_session.scalar(
+        total_lessons_subquery(user_course.course_id).element
+    )
+    return (
+        user_course.completed_lessons,
+        user_course.in_progress_lessons,
+        completion_percentage(user_course.completed_lessons, total_lessons),
+        user_course.current_topic,
+        user_course.current_lesson,
+    )
+
+
+def set_status(db, user_course_id, topic_id, lesson_id, status):
+    return run(
+        UserCourseProgressService(db).update_progress(
+            user_course_id,
+            topic_id,
+            lesson_id,
+            UserCourseProgressUpdate(status=status),
+        )
+    )
+
+
+class TestIncrementalCounters:
+    """update_progress/delete_progress_record cập nhật bộ đếm trong cùng transaction"""
+
+    def test_counters_follow_status_changes(self, db):
+        service = UserCourseProgressService(db)
+        run(service.recompute_progress_counters())
+        assert counters(db, 1) == (0, 0, 0.0, 10, 100)
+
+        steps = [
+            ((10, 100, IN_PROGRESS), (0, 1, 0.0, 10, 100)),
+            ((10, 100, COMPLETED), (1, 0, 33.33, 10, 101)),
+            # Hoàn thành lại không đếm hai lần
+            ((10, 100, COMPLETED), (1, 0, 33.33, 10, 101)),
+            ((11, 110, COMPLETED), (2, 0, 66.67, 10, 101)),
+            ((10, 101, COMPLETED), (3, 0, 100.0, 11, 110)),
+            ((10, 100, NOT_STARTED), (2, 0, 66.67, 10, 100)),
+        ]
+        for (topic_id, lesson_id, status), expected in steps:
+            set_status(db, 1, topic_id, lesson_id, status)
+            assert counters(db, 1) == expected
+
+            # Job tính lại cho cùng kết quả với cập nhật theo chênh lệch
+            run(service.recompute_progress_counters([1]))
+            assert counters(db, 1) == expected
+
+        assert run(service.delete_progress_record(1, 11, 110)) is True
+        assert counters(db, 1) == (1, 0, 33.33, 10, 100)
+
+        # Lần đăng ký khác không bị ảnh hưởng
+        assert counters(db, 2) == (0, 0, 0.0, 10, 100)
+
+    def test_update_without_completion_change_skips_lesson_lookup(self, db):
+        run(UserCourseProgressService(db).recompute_progress_counters())
+
+        db.query_count = 0
+        set_status(db, 1, 10, 100, IN_PROGRESS)
+
+        # Khóa user_course + upsert progress + cập nhật bộ đếm
+        assert db.query_count == 3
+        assert db.sync_session.get(UserCourse, 1).last_activity_at is not None
+
+
+class TestRecomputeCounters:
+    """Job tính lại bộ đếm từ user_course_progress"""
+
+    def test_repairs_drifted_counters(self, db):
+        db.add_all(
+            [
+                UserCourseProgress(
+                    user_course_id=1, topic_id=10, lesson_id=100, status=COMPLETED
+                ),
+                UserCourseProgress(
+                    user_course_id=1, topic_id=10, lesson_id=101, status=IN_PROGRESS
+                ),
+                # Progress của lesson không còn trong khóa học không được tính
+                UserCourseProgress(
+                    user_course_id=1, topic_id=10, lesson_id=999, status=COMPLETED
+                ),
+            ]
+        )
+        user_course = db.sync_session.get(UserCourse, 3)
+        user_course.completed_lessons = 7
+        db.sync_session.commit()
+
+        db.query_count = 0
+        updated = run(UserCourseProgressService(db).recompute_progress_counters())
+
+        assert updated == 3
+        assert db.query_count == 1
+        assert counters(db, 1) == (1, 1, 33.33, 10, 101)
+        assert counters(db, 2) == (0, 0, 0.0, 10, 100)
+        # Khóa học chưa có lesson
+        assert counters(db, 3) == (0, 0, 0.0, None, None)
+
+    def test_only_given_enrollments(self, db):
+        for user_course_id in (1, 2):
+            user_course = db.sync_session.get(UserCourse, user_course_id)
+            user_course.current_topic, user_course.current_lesson = 1, 1
+        db.sync_session.commit()
+
+        updated = run(UserCourseProgressService(db).recompute_progress_counters([2]))
+
+        assert updated == 1
+        assert counters(db, 2)[3:] == (10, 100)
+        # Giá trị lệch của lần đăng ký khác chưa được tính lại
+        assert counters(db, 1)[3:] == (1, 1)
+
+
+class TestProgressSummary:
+    """Tóm tắt tiến độ đọc từ bộ đếm bằng một câu truy vấn"""
+
+    def test_summary_reads_counters(self, db):
+        service = UserCourseProgressService(db)
+        run(service.recompute_progress_counters())
+        set_status(db, 1, 10, 100, COMPLETED)
+        set_status(db, 1, 11, 110, IN_PROGRESS)
+
+        db.query_count = 0
+        summary = run(service.get_user_course_progress_summary(1))
+
+        assert db.query_count == 1
+        assert summary.total_lessons == 3
+        assert summary.completed_lessons == 1
+        assert summary.in_progress_lessons == 1
+        assert summary.not_started_lessons == 1
+        assert summary.completion_percentage == 33.33
+        assert (summary.current_topic_id, summary.current_lesson_id) == (10, 101)
+        assert summary.last_activity_at is not None
+
+    def test_unknown_enrollment_is_empty(self, db):
+        summary = run(UserCourseProgressService(db).get_user_course_progress_summary(42))
+
+        assert summary.total_lessons == 0
+        assert summary.current_lesson_id is None
+
+
+class TestLessonChanges:
+    """Thêm/xóa bài học tính lại bộ đếm của các lần đăng ký trong cùng transaction"""
+
+    def complete_all(self, db):
+        for topic_id, lesson_id in [(10, 100), (10, 101), (11, 110)]:
+            set_status(db, 1, topic_id, lesson_id, COMPLETED)
+        assert counters(db, 1) == (3, 0, 100.0, 11, 110)
+
+    def summary(self, db, user_course_id=1):
+        return run(
+            UserCourseProgressService(db).get_user_course_progress_summary(user_course_id)
+        )
+
+    def test_lesson_added_after_completion(self, db):
+        self.complete_all(db)
+
+        db.add(
+            Lesson(
+                id=111, external_id="111", topic_id=11, title="Lesson", description="", order=2
+            )
+        )
+        db.sync_session.commit()
+
+        summary = self.summary(db)
+        assert summary.total_lessons == 4
+        assert summary.completed_lessons == 3
+        assert summary.not_started_lessons == 1
+        assert summary.completion_percentage == 75.0
+        assert (summary.current_topic_id, summary.current_lesson_id) == (11, 111)
+        assert counters(db, 1) == (3, 0, 75.0, 11, 111)
+
+    def test_lessons_created_in_bulk(self, db):
+        self.complete_all(db)
+        service = object.__new__(LessonService)
+        service.db = db
+
+        run(
+            service.create_lessons(
+                [
+                    CreateLessonSchema(
+                        external_id="moi", title="Bài mới", description="", topic_id=10, order=3, sections=[]
+                    )
+                ]
+            )
+        )
+
+        summary = self.summary(db)
+        assert summary.completion_percentage == 75.0
+        assert summary.current_topic_id == 10
+        assert counters(db, 1)[:3] == (3, 0, 75.0)
+
+    def test_completed_lesson_deleted(self, db):
+        self.complete_all(db)
+        set_status(db, 2, 10, 100, COMPLETED)
+
+        db.sync_session.delete(db.sync_session.get(Lesson, 100))
+        db.sync_session.commit()
+
+        assert self.summary(db).completion_percentage == 100.0
+        assert counters(db, 1) == (2, 0, 100.0, 11, 110)
+        assert counters(db, 2) == (0, 0, 0.0, 10, 101)
+
+    def add_lesson(self, db, lesson_id, topic_id, order):
+        db.add(
+            Lesson(
+                id=lesson_id,
+                external_id=str(lesson_id),
+                topic_id=topic_id,
+                title="Lesson",
+                description="",
+                order=order,
+            )
+        )
+        db.sync_session.commit()
+
+    def affected(self, db, **changes):
+        return db.sync_session.execute(progress_counters_statement(**changes)).rowcount
+
+    def test_only_affected_enrollments_are_recomputed(self, db):
+        self.complete_all(db)
+        set_status(db, 2, 10, 100, COMPLETED)
+
+        # Bài mới ở cuối khóa học: chỉ lần đăng ký đã học hết bị ảnh hưởng
+        self.add_lesson(db, 111, 11, 2)
+        assert self.affected(db, lesson_ids=[111]) == 1
+        assert counters(db, 1)[3:] == (11, 111)
+        assert counters(db, 2)[3:] == (10, 101)
+
+        # Bài mới đứng trước bài hiện tại của lần đăng ký 2
+        self.add_lesson(db, 99, 10, 0)
+        assert self.affected(db, lesson_ids=[99]) == 2
+        assert counters(db, 2)[3:] == (10, 99)
+
+        # Không có lesson thay đổi thì không tính lại
+        assert self.affected(db, lesson_ids=[], topic_ids=[]) == 0
+
+    def test_topic_moved_before_current_lesson(self, db):
+        set_status(db, 2, 10, 100, COMPLETED)
+        assert counters(db, 2)[3:] == (10, 101)
+
+        db.sync_session.get(Topic, 11).order = 0
+        db.sync_session.commit()
+
+        assert counters(db, 2) == (1, 0, 33.33, 11, 110)
+        assert counters(db, 1) == (0, 0, 0.0, 11, 110)
+
+
+class TestLessonOrder:
+    """Bài học hiện tại đi theo cùng thứ tự với next_lesson_id/prev_lesson_id"""
+
+    def test_null_and_tied_topic_order(self, db):
+        # Khóa học 2: topic 20 chưa có order, topic 21 và 22 cùng order 1
+        db.add_all(
+            [
+                Topic(id=22, course_id=2, name="T22", description="", order=1),
+                Topic(id=21, course_id=2, name="T21", description="", order=1),
+                Topic(id=20, course_id=2, name="T20", description="", order=None),
+            ]
+        )
+        db.add_all(
+            Lesson(
+                id=lesson_id,
+                external_id=str(lesson_id),
+                topic_id=topic_id,
+                title="Lesson",
+                description="",
+                order=order,
+            )
+            for lesson_id, topic_id, order in [
+                (220, 22, 1),
+                (211, 21, 2),
+                (210, 21, 1),
+                (200, 20, 1),
+            ]
+        )
+        db.sync_session.commit()
+
+        sequence = [(20, 200), (21, 210), (21, 211), (22, 220)]
+        for (_, lesson_id), (_, next_id) in zip(sequence, sequence[1:]):
+            assert db.sync_session.get(Lesson, lesson_id).next_lesson_id == str(next_id)
+        assert counters(db, 3)[3:] == sequence[0]
+
+        service = UserCourseProgressService(db)
+        for done, expected in zip(sequence, sequence[1:]):
+            set_status(db, 3, *done, COMPLETED)
+            assert counters(db, 3)[3:] == expected
+
+            run(service.recompute_progress_counters([3]))
+            assert counters(db, 3)[3:] == expected
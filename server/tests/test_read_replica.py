@@ -0,0 +1,222 @@
+"""
+Tests cho định tuyến truy vấn chỉ đọc sang read replica.
+"""
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import DeclarativeBase, Mapped, Session, mapped_column
+from sqlalchemy.pool import StaticPool
+
+from app.database import database
+from app.database.read_replica import (
+    READ_YOUR_WRITES_COOKIE,
+    ReplicaLagMonitor,
+    is_pinned_to_primary,
+    read_only,
+    track_primary_writes,
+)
+from app.middleware.read_your_writes_middleware import ReadYourWritesMiddleware
+from app.middleware.request_context_middleware import RequestContextMiddleware
+
+
+class FakeService:
+    def __init__(self, db, read_db=None):
+        self.db = db
+        self.read_db = read_db
+
+    @read_only
+    async def which_db(self):
+        return self.db
+
+    async def write_db(self):
+        return self.db
+
+
+class FakeConnection:
+    def __init__(self, lag):
+        self.lag = lag
+
+    async def __aenter__(self):
+        if isinstance(self.lag, Exception):
+            raise self.lag
+        return self
+
+    async def __aexit__(self, *args):
+        return False
+
+    async def execute(self, statement):
+        return SimpleNamespace(scalar=lambda: self.lag)
+
+
+class FakeEngine:
+    def __init__(self, lag):
+        self.lag = lag
+        self.checks = 0
+
+    def connect(self):
+        self.checks += 1
+        return FakeConnection(self.lag)
+
+
+class TestReadOnlyDecorator:
+    """Tests cho decorator read_only."""
+
+    def test_read_only_method_uses_read_db(self):
+        service = FakeService(db="primary", read_db="replica")
+
+        assert asyncio.run(service.which_db()) == "replica"
+        # Service gốc và method ghi vẫn dùng primary
+        assert service.db == "primary"
+        assert asyncio.run(service.write_db()) == "primary"
+
+    def test_without_read_db_uses_primary(self):
+        assert asyncio.run(FakeService(db="primary").which_db()) == "primary"
+
+
+class TestReplicaLagMonitor:
+    """Tests cho ReplicaLagMonitor với engine giả."""
+
+    def test_usable_when_lag_is_small(self):
+        monitor = ReplicaLagMonitor(
+            FakeEngine(0.5), max_lag_seconds=5, check_interval_seconds=60
+        )
+        assert asyncio.run(monitor.is_usable()) is True
+        assert monitor.lag_seconds == 0.5
+
+    def test_not_usable_when_lagging_or_down(self):
+        lagging = ReplicaLagMonitor(
+            FakeEngine(30), max_lag_seconds=5, check_interval_seconds=60
+        )
+        down = ReplicaLagMonitor(
+            FakeEngine(ConnectionRefusedError()),
+            max_lag_seconds=5,
+            check_interval_seconds=60,
+        )
+        assert asyncio.run(lagging.is_usable()) is False
+        assert asyncio.run(down.is_usable()) is False
+        assert down.lag_seconds is None
+
+    def test_result_is_cached(self):
+        engine = FakeEngine(0)
+        monitor = ReplicaLagMonitor(
+            engine, max_lag_seconds=5, check_interval_seconds=60
+        )
+
+        async def run():
+            await asyncio.gather(*(monitor.is_usable() for _ in range(10)))
+
+        asyncio.run(run())
+        assert engine.checks == 1
+
+
+class TestGetAsyncReadDb:
+    """Tests cho dependency get_async_read_db."""
+
+    def read_session(self, cookies=None):
+        async def run():
+            request = SimpleNamespace(cookies=cookies or {})
+            generator = database.get_async_read_db(request, db="primary")
+            session = await generator.__anext__()
+            await generator.aclose()
+            return session
+
+        return asyncio.run(run())
+
+    def test_without_replica_reuses_primary_session(self, monkeypatch):
+        monkeypatch.setattr(database, "AsyncReadSessionLocal", None)
+        assert self.read_session() == "primary"
+
+    def test_replica_and_read_your_writes(self, monkeypatch):
+        class FakeSessionFactory:
+            def __call__(self):
+                return self
+
+            async def __aenter__(self):
+                return "replica"
+
+            async def __aexit__(self, *args):
+                return False
+
+        monitor = ReplicaLagMonitor(
+            FakeEngine(0), max_lag_seconds=5, check_interval_seconds=60
+        )
+        monkeypatch.setattr(database, "AsyncReadSessionLocal", FakeSessionFactory())
+        monkeypatch.setattr(database, "replica_monitor", monitor)
+
+        assert self.read_session() == "replica"
+        pinned = {READ_YOUR_WRITES_COOKIE: str(time.time() + 10)}
+        assert self.read_session(pinned) == "primary"
+        expired = {READ_YOUR_WRITES_COOKIE: str(time.time() - 1)}
+        assert self.read_session(expired) == "replica"
+
+    def test_is_pinned_to_primary_ignores_invalid_cookie(self):
+        assert is_pinned_to_primary({READ_YOUR_WRITES_COOKIE: "abc"}) is False
+        assert is_pinned_to_primary({}) is False
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+class Note(Base):
+    __tablename__ = "notes"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    content: Mapped[str]
+
+
+class TrackedSession(Session):
+    pass
+
+
+track_primary_writes(TrackedSession)
+
+
+class TestReadYourWritesMiddleware:
+    """Request commit thay đổi được gắn cookie để các lần đọc sau vào primary."""
+
+    def create_app(self) -> FastAPI:
+        engine = create_engine(
+            "sqlite://",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+        Base.metadata.create_all(engine)
+
+        app = FastAPI()
+        app.add_middleware(ReadYourWritesMiddleware, window_seconds=10)
+        app.add_middleware(RequestContextMiddleware)
+
+        @app.post("/notes")
+        def create_note():
+            with TrackedSession(engine) as session:
+                session.add(Note(content="x"))
+                session.commit()
+            return {"ok": True}
+
+        @app.get("/notes")
+        def list_notes():
+            with TrackedSession(engine) as session:
+                session.query(Note).all()
+                session.commit()
+            return {"ok": True}
+
+        return app
+
+    def test_write_sets_cookie(self):
+        client = TestClient(self.create_app())
+
+        response = client.post("/notes")
+        until = float(response.cookies[READ_YOUR_WRITES_COOKIE])
+        assert time.time() < until <= time.time() + 10
+
+    def test_read_does_not_set_cookie(self):
+        client = TestClient(self.create_app())
+
+        response = client.get("/notes")
+        assert READ_YOUR_WRITES_COOKIE not in response.cookies
@@ -0,0 +1,206 @@
+"""
+Tests cho bulk_insert, bulk_upsert và unit_of_work của BaseRepository.
+"""
+
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import func
+from sqlalchemy.dialects import postgresql
+
+from app.database.repository import Repository
+from app.models.user_course_progress_model import ProgressStatus, UserCourseProgress
+from app.services.user_course_progress_service import PROGRESS_KEY_COLUMNS
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def all(self):
+        return self.rows
+
+
+class FakeSession:
+    """Session giả ghi lại câu lệnh, số lần flush/commit/rollback"""
+
+    def __init__(self, fail_on_execute=False):
+        self.info = {}
+        self.statements = []
+        self.flushes = 0
+        self.commits = 0
+        self.rollbacks = 0
+        self.fail_on_execute = fail_on_execute
+
+    async def execute(self, statement, params=None, **kwargs):
+        if self.fail_on_execute:
+            raise RuntimeError("database error")
+        self.statements.append((statement, params))
+        return FakeResult([(index,) for index, _ in enumerate(params or [])])
+
+    async def scalars(self, statement, params=None, **kwargs):
+        return await self.execute(statement, params)
+
+    def add(self, obj):
+        pass
+
+    async def refresh(self, obj):
+        pass
+
+    async def flush(self):
+        self.flushes += 1
+
+    async def commit(self):
+        self.commits += 1
+
+    async def rollback(self):
+        self.rollbacks += 1
+
+
+def compile_sql(statement) -> str:
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+def progress_row(lesson_id: int) -> dict:
+    return {
+        "user_course_id": 1,
+        "topic_id": 1,
+        "lesson_id": lesson_id,
+        "status": ProgressStatus.COMPLETED,
+    }
+
+
+class TestBuildUpsertStatement:
+    """Câu INSERT ... ON CONFLICT được tạo đúng"""
+
+    def setup_method(self):
+        self.repository = Repository(UserCourseProgress, FakeSession())
+
+    def test_default_updates_non_conflict_columns(self):
+        stmt = self.repository.build_upsert_statement(
+            conflict_columns=PROGRESS_KEY_COLUMNS,
+            columns=[*PROGRESS_KEY_COLUMNS, "status"],
+        )
+        sql = compile_sql(stmt)
+
+        assert "ON CONFLICT (user_course_id, topic_id, lesson_id) DO UPDATE" in sql
+        assert "SET status = excluded.status" in sql
+        assert "lesson_id = excluded.lesson_id" not in sql
+
+    def test_update_expressions_and_constraint(self):
+        stmt = self.repository.build_upsert_statement(
+            constraint="uq_user_course_progress_lesson",
+            update_columns={
+                "completed_at": func.coalesce(
+                    UserCourseProgress.completed_at,
+                    self.repository.excluded.completed_at,
+                ),
+                "updated_at": func.now(),
+            },
+        )
+        sql = compile_sql(stmt)
+
+        assert "ON CONFLICT ON CONSTRAINT uq_user_course_progress_lesson" in sql
+        assert "coalesce(user_course_progress.completed_at, excluded.completed_at)" in sql
+        assert "updated_at = now()" in sql
+
+    def test_empty_update_columns_does_nothing(self):
+        stmt = self.repository.build_upsert_statement(
+            conflict_columns=PROGRESS_KEY_COLUMNS, update_columns=[]
+        )
+        assert "DO NOTHING" in compile_sql(stmt)
+
+    def test_requires_conflict_target(self):
+        with pytest.raises(ValueError):
+            self.repository.build_upsert_statement(update_columns=["status"])
+
+
+class TestBulkOperations:
+    """bulk_insert/bulk_upsert gửi một câu lệnh cho nhiều bản ghi"""
+
+    def test_bulk_upsert_single_statement_with_returning(self):
+        session = FakeSession()
+        repository = Repository(UserCourseProgress, session)
+        rows = [progress_row(lesson_id) for lesson_id in range(50)]
+
+        result = asyncio.run(
+            repository.bulk_upsert(
+                rows,
+                conflict_columns=PROGRESS_KEY_COLUMNS,
+                returning=[UserCourseProgress.id],
+            )
+        )
+
+        assert len(session.statements) == 1
+        statement, params = session.statements[0]
+        assert params == rows
+        assert "RETURNING user_course_progress.id" in compile_sql(statement)
+        assert len(result) == 50
+        assert session.commits == 1
+
+    def test_bulk_insert_without_rows_skips_database(self):
+        session = FakeSession()
+        repository = Repository(UserCourseProgress, session)
+
+        assert asyncio.run(repository.bulk_insert([])) == []
+        assert session.statements == []
+        assert session.commits == 0
+
+
+class TestUnitOfWork:
+    """unit_of_work gom các thao tác ghi vào một lần commit"""
+
+    def test_commits_once_for_many_mutations(self):
+        session = FakeSession()
+        repository = Repository(UserCourseProgress, session)
+
+        async def run():
+            async with repository.unit_of_work():
+                await repository.bulk_insert([progress_row(1)])
+                await repository.bulk_upsert(
+                    [progress_row(2)], conflict_columns=PROGRESS_KEY_COLUMNS
+                )
+                await repository.save(UserCourseProgress())
+                # Repository khác dùng chung session cũng nằm trong transaction
+                async with Repository(UserCourseProgress, session).unit_of_work():
+                    await Repository(UserCourseProgress, session).create(
+                        UserCourseProgress()
+                    )
+
+        asyncio.run(run())
+
+        assert session.commits == 1
+        assert session.flushes == 4
+        assert session.rollbacks == 0
+        assert not repository.in_unit_of_work
+
+    def test_rolls_back_on_error(self):
+        session = FakeSession(fail_on_execute=True)
+        repository = Repository(UserCourseProgress, session)
+
+        async def run():
+            async with repository.unit_of_work():
+                await repository.bulk_insert([progress_row(1)])
+
+        with pytest.raises(HTTPException) as exc_info:
+            asyncio.run(run())
+
+        assert exc_info.value.status_code == 500
+        assert session.commits == 0
+        assert session.rollbacks == 1
+        assert not repository.in_unit_of_work
+
+    def test_http_exception_is_preserved(self):
+        session = FakeSession()
+        repository = Repository(UserCourseProgress, session)
+
+        async def run():
+            async with repository.unit_of_work():
+                raise HTTPException(status_code=404, detail="Lesson not found")
+
+        with pytest.raises(HTTPException) as exc_info:
+            asyncio.run(run())
+
+        assert exc_info.value.status_code == 404
+        assert session.rollbacks == 1
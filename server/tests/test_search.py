@@ -0,0 +1,136 @@
+"""
+Tests cho tìm kiếm toàn văn: chuẩn hóa chuỗi tìm kiếm (bỏ dấu tiếng Việt),
+câu truy vấn dùng search_vector và nhóm kết quả.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.models.course_model import Course
+from app.models.lesson_model import Lesson, LessonSection
+from app.services.search_service import SearchService, build_prefix_tsquery
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def all(self):
+        return self.rows
+
+
+class FakeSession:
+    """Session giả trả về các dòng cho trước và ghi lại câu lệnh"""
+
+    def __init__(self, rows=()):
+        self.rows = list(rows)
+        self.statements = []
+
+    async def execute(self, statement, params=None, **kwargs):
+        self.statements.append(statement)
+        return FakeResult(self.rows)
+
+
+def hit_row(kind, id, rank, course_id=1, lesson_id=None):
+    return SimpleNamespace(
+        kind=kind,
+        id=id,
+        title=f"{kind} {id}",
+        snippet=f"... <mark>{kind}</mark> ...",
+        rank=rank,
+        course_id=course_id,
+        lesson_id=lesson_id,
+    )
+
+
+def search(session, query, **kwargs):
+    return asyncio.run(SearchService(session).search(query, **kwargs))
+
+
+class TestBuildPrefixTsquery:
+    """Chuỗi tìm kiếm được bỏ dấu và chuyển thành tsquery tiền tố hợp lệ"""
+
+    @pytest.mark.parametrize(
+        "query, expected",
+        [
+            ("Thuật toán", "thuat:* & toan:*"),
+            ("ĐỒ THỊ có hướng", "do:* & thi:* & co:* & huong:*"),
+            ("quick-sort O(n log n)!", "quick:* & sort:* & o:* & n:* & log:*"),
+            ("a & b | !c:*", "a:* & b:* & c:*"),
+        ],
+    )
+    def test_terms(self, query, expected):
+        assert build_prefix_tsquery(query) == expected
+
+    @pytest.mark.parametrize("query", ["", "   ", "&|!():*", "—"])
+    def test_no_terms(self, query):
+        assert build_prefix_tsquery(query) is None
+
+    def test_limits_number_of_terms(self):
+        tsquery = build_prefix_tsquery(" ".join(f"w{i}" for i in range(20)))
+        assert tsquery.count(":*") == 8
+
+
+class TestSearchService:
+    """Một câu truy vấn trả về ba nhóm kết quả"""
+
+    def test_blank_query_skips_database(self):
+        session = FakeSession()
+
+        response = search(session, "?!")
+
+        assert session.statements == []
+        assert response.courses == response.lessons == response.sections == []
+
+    def test_results_are_grouped_and_ranked(self):
+        session = FakeSession(
+            [
+                hit_row("section", 7, 0.2, lesson_id=3),
+                hit_row("course", 1, 0.5),
+                hit_row("section", 5, 0.9, lesson_id=3),
+                hit_row("lesson", 3, 0.1, lesson_id=3),
+            ]
+        )
+
+        response = search(session, "đồ thị")
+
+        assert len(session.statements) == 1
+        assert [hit.id for hit in response.courses] == [1]
+        assert [hit.id for hit in response.lessons] == [3]
+        assert [hit.id for hit in response.sections] == [5, 7]
+        assert response.sections[0].lesson_id == 3
+        assert response.model_dump(by_alias=True)["sections"][0]["courseId"] == 1
+
+    def test_statement_uses_search_vectors(self):
+        session = FakeSession()
+
+        search(session, "Sắp xếp", limit=5)
+
+        statement = session.statements[0]
+        sql = str(statement.compile(dialect=postgresql.dialect()))
+        for table in ("courses", "lessons", "lesson_sections"):
+            assert f"{table}.search_vector @@ to_tsquery(" in sql
+        assert sql.count("UNION ALL") == 2
+        assert sql.count("ts_headline(") == 3
+        assert "ILIKE" not in sql.upper()
+        params = statement.compile(dialect=postgresql.dialect()).params
+        assert "sap:* & xep:*" in params.values()
+        assert 5 in params.values()
+
+
+class TestSearchVectorColumns:
+    """search_vector có GIN index và không được nạp cùng entity"""
+
+    @pytest.mark.parametrize("model", [Course, Lesson, LessonSection])
+    def test_gin_index_and_deferred(self, model):
+        indexes = {
+            index.name: index
+            for index in model.__table__.indexes
+            if "search_vector" in index.columns
+        }
+        index = indexes[f"ix_{model.__tablename__}_search_vector"]
+        assert index.dialect_options["postgresql"]["using"] == "gin"
+        assert model.search_vector.property.deferred is True
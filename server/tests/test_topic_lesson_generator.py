@@ -0,0 +1,134 @@
+"""
+Tests cho sinh bài học song song theo topic khi soạn khóa học
+(TopicLessonGenerator): giới hạn đồng thời, session riêng cho mỗi topic, thử lại
+và cô lập lỗi của từng topic.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+from sqlalchemy import select
+
+from app.core.agents.course_composition_agent import TopicLessonGenerator
+from app.models.course_model import Course
+from app.models.exercise_model import Exercise
+from app.models.exercise_test_case_model import ExerciseTestCase
+from app.models.lesson_model import Lesson, LessonSection
+from app.models.topic_model import Topic
+from app.models.user_course_model import UserCourse
+from app.models.user_course_progress_model import UserCourseProgress
+from app.schemas.lesson_schema import CreateLessonSchema, LessonSectionSchema
+
+
+class FakeLessonAgent:
+    """Agent sinh bài học giả: chờ ``latency`` giây, lỗi ``failures[tên topic]`` lần đầu"""
+
+    def __init__(self, latency=0.01, failures=None):
+        self.latency = latency
+        self.failures = dict(failures or {})
+        self.calls = []
+        self.running = 0
+        self.max_running = 0
+
+    async def act(self, **kwargs):
+        topic_name = kwargs["topic_name"]
+        self.calls.append(topic_name)
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            await asyncio.sleep(self.latency)
+            if self.failures.get(topic_name, 0) > 0:
+                self.failures[topic_name] -= 1
+                raise RuntimeError(f"LLM lỗi với {topic_name}")
+        finally:
+            self.running -= 1
+
+        return [
+            CreateLessonSchema(
+                external_id=f"{topic_name}-{order}",
+                title=f"{kwargs['lesson_title']} {order}",
+                description="",
+                topic_id=0,
+                order=order,
+                sections=[LessonSectionSchema(type="text", content="Nội dung", order=1)],
+            )
+            for order in (1, 2)
+        ]
+
+
+@pytest.fixture
+def db(sqlite_db):
+    db = sqlite_db(
+        Course,
+        Topic,
+        Lesson,
+        LessonSection,
+        Exercise,
+        ExerciseTestCase,
+        UserCourse,
+        UserCourseProgress,
+    )
+    db.add(Course(id=1, title="Course 1"))
+    db.add_all(
+        [
+            Topic(id=topic_id, course_id=1, name=f"T{topic_id}", description="", order=topic_id)
+            for topic_id in range(1, 7)
+        ]
+    )
+    db.sync_session.commit()
+    return db
+
+
+@pytest.fixture
+def sessions(db):
+    opened = []
+
+    @asynccontextmanager
+    async def session_factory():
+        opened.append(db)
+        yield db
+
+    session_factory.opened = opened
+    return session_factory
+
+
+def topics(db):
+    return db.sync_session.scalars(select(Topic).order_by(Topic.id)).all()
+
+
+def lesson_topics(db):
+    return db.sync_session.scalars(select(Lesson.topic_id).order_by(Lesson.topic_id)).all()
+
+
+class TestTopicLessonGenerator:
+    def test_runs_topics_concurrently_up_to_limit(self, db, sessions):
+        agent = FakeLessonAgent()
+        generator = TopicLessonGenerator(agent, sessions, concurrency=3, retry_delay=0)
+
+        failed = asyncio.run(generator.run(topics(db), "beginner", "session"))
+
+        assert failed == {}
+        assert agent.max_running == 3
+        assert len(sessions.opened) == 6
+        assert lesson_topics(db) == [1, 1, 2, 2, 3, 3, 4, 4, 5, 5, 6, 6]
+
+    def test_failed_topic_is_retried(self, db, sessions):
+        agent = FakeLessonAgent(failures={"T2": 2})
+        generator = TopicLessonGenerator(agent, sessions, retries=2, retry_delay=0)
+
+        failed = asyncio.run(generator.run(topics(db)[:3], "beginner", "session"))
+
+        assert failed == {}
+        assert agent.calls.count("T2") == 3
+        assert lesson_topics(db) == [1, 1, 2, 2, 3, 3]
+
+    def test_failures_are_isolated(self, db, sessions):
+        agent = FakeLessonAgent(failures={"T1": 5})
+        generator = TopicLessonGenerator(agent, sessions, retries=1, retry_delay=0)
+
+        failed = asyncio.run(generator.run(topics(db)[:3], "beginner", "session"))
+
+        assert failed == {1: "LLM lỗi với T1"}
+        assert agent.calls.count("T1") == 2
+        assert lesson_topics(db) == [2, 2, 3, 3]
@@ -0,0 +1,152 @@
+"""
+Tests cho CourseService.get_user_courses: progress đọc từ bộ đếm trên user_courses,
+số câu truy vấn không tăng theo số khóa học đã đăng ký.
+"""
+
+import asyncio
+from itertools import count
+
+import pytest
+
+from app.models.course_model import Course
+from app.models.lesson_model import Lesson
+from app.models.topic_model import Topic
+from app.models.user_course_model import UserCourse
+from app.models.user_course_progress_model import ProgressStatus, UserCourseProgress
+from app.services.course_service import CourseService
+from app.services.user_course_progress_service import UserCourseProgressService
+
+USER_ID = 1
+OTHER_USER_ID = 2
+
+
+@pytest.fixture
+def db(sqlite_db):
+    return sqlite_db(Course, Topic, Lesson, UserCourse, UserCourseProgress)
+
+
+_ids = count(1)
+
+
+def add_course(db, topics):
+    """
+    Tạo khóa học, ``topics`` là danh sách số bài học của từng topic (theo thứ tự)
+
+    Returns:
+        Tuple[Course, List[List[Lesson]]]: Khóa học và lessons theo từng topic
+    """
+    course = Course(id=next(_ids), title="Course", is_published=True)
+    db.add(course)
+    lessons_by_topic = []
+    # Thêm topic theo thứ tự ngược để không phụ thuộc thứ tự id
+    for topic_order, lesson_count in reversed(list(enumerate(topics, start=1))):
+        topic = Topic(
+            id=next(_ids),
+            course_id=course.id,
+            name="Topic",
+            description="",
+            order=topic_order,
+        )
+        db.add(topic)
+        lessons = [
+            Lesson(
+                id=next(_ids),
+                external_id=f"lesson-{topic.id}-{order}",
+                topic_id=topic.id,
+                title="Lesson",
+                description="",
+                order=order,
+            )
+            for order in range(1, lesson_count + 1)
+        ]
+        db.add_all(lessons)
+        lessons_by_topic.insert(0, lessons)
+    db.sync_session.commit()
+    return course, lessons_by_topic
+
+
+def enroll(db, user_id, course, completed_lessons=()):
+    user_course = UserCourse(user_id=user_id, course_id=course.id)
+    db.add(user_course)
+    db.sync_session.flush()
+    for lesson in completed_lessons:
+        db.add(
+            UserCourseProgress(
+                user_course_id=user_course.id,
+                topic_id=lesson.topic_id,
+                lesson_id=lesson.id,
+                status=ProgressStatus.COMPLETED,
+            )
+        )
+    db.sync_session.commit()
+    asyncio.run(
+        UserCourseProgressService(db).recompute_progress_counters([user_course.id])
+    )
+    return user_course
+
+
+def get_user_courses(db, user_id=USER_ID):
+    items = asyncio.run(CourseService(db).get_user_courses(user_id))
+    return {item.id: item for item in items}
+
+
+class TestUserCoursesProgress:
+    """Progress và bài học hiện tại của từng khóa học"""
+
+    def test_progress_and_current_lesson(self, db):
+        partial, partial_lessons = add_course(db, [2, 1])
+        done, done_lessons = add_course(db, [1, 2])
+        fresh, fresh_lessons = add_course(db, [3])
+        empty, _ = add_course(db, [])
+
+        enroll(db, USER_ID, partial, [partial_lessons[0][0]])
+        enroll(
+            db, USER_ID, done, [lesson for topic in done_lessons for lesson in topic]
+        )
+        enroll(db, USER_ID, fresh)
+        enroll(db, USER_ID, empty)
+        # Tiến độ của người khác không được tính
+        enroll(db, OTHER_USER_ID, fresh, fresh_lessons[0])
+
+        items = get_user_courses(db)
+
+        assert set(items) == {partial.id, done.id, fresh.id, empty.id}
+
+        assert items[partial.id].progress == 33.33
+        assert items[partial.id].current_topic_id == partial_lessons[0][1].topic_id
+        assert items[partial.id].current_lesson_id == partial_lessons[0][1].id
+
+        # Hoàn thành hết thì bài hiện tại là bài cuối của topic cuối
+        assert items[done.id].progress == 100.0
+        assert items[done.id].current_lesson_id == done_lessons[1][1].id
+
+        assert items[fresh.id].progress == 0.0
+        assert items[fresh.id].current_lesson_id == fresh_lessons[0][0].id
+
+        assert items[empty.id].progress == 0.0
+        assert items[empty.id].current_lesson_id is None
+
+    def test_not_enrolled_returns_empty(self, db):
+        add_course(db, [1])
+        assert get_user_courses(db) == {}
+
+
+class TestUserCoursesQueryCount:
+    """Số câu truy vấn không đổi khi số khóa học đã đăng ký tăng"""
+
+    def count_queries(self, db, enrollments):
+        for _ in range(enrollments):
+            course, lessons = add_course(db, [3, 3])
+            enroll(db, USER_ID, course, lessons[0][:2])
+
+        db.query_count = 0
+        items = get_user_courses(db)
+        assert len(items) == enrollments
+        return db.query_count
+
+    def test_query_count_is_constant(self, sqlite_db):
+        models = (Course, Topic, Lesson, UserCourse, UserCourseProgress)
+        few = self.count_queries(sqlite_db(*models), 2)
+        many = self.count_queries(sqlite_db(*models), 40)
+
+        assert few == many == 1
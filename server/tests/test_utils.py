@@ -2,6 +2,9 @@
 Tests cho các utility functions trong ứng dụng.
 """
 
+import json
+import re
+import time
 from datetime import datetime, timedelta
 from jose import jwt
 
@@ -16,7 +19,12 @@ from app.utils.case_utils import (
     to_snake_case,
     convert_dict_to_camel_case,
     convert_dict_to_snake_case,
+    json_dumps,
+    json_loads,
+    transform_json_bytes,
 )
+from app.utils.principal_cache import PrincipalCache
+from app.schemas.user_profile_schema import UserExcludeSecret
 from app.core.config import settings
 
 
@@ -178,3 +186,188 @@ class TestCaseUtils:
         assert (
             convert_dict_to_snake_case(nested_camel_dict) == expected_nested_snake_dict
         )
+
+    def test_key_conversion_is_memoized(self):
+        """Test key đã chuyển đổi được ghi nhớ trong bảng có giới hạn."""
+        to_camel_case.cache_clear()
+        to_camel_case("memo_key")
+        to_camel_case("memo_key")
+        info = to_camel_case.cache_info()
+        assert info.hits == 1
+        assert info.maxsize is not None
+
+    def test_transform_json_bytes(self):
+        """Test parse, chuyển đổi và encode lại body JSON."""
+        body = json.dumps({"user_name": "Nguyễn", "big_number": 2**70}).encode()
+        result = json_loads(transform_json_bytes(body, convert_dict_to_camel_case))
+        assert result == {"userName": "Nguyễn", "bigNumber": 2**70}
+
+        assert transform_json_bytes(b"not json", convert_dict_to_camel_case) is None
+        assert json_loads(json_dumps({"nan": 1})) == {"nan": 1}
+        assert json_loads("[NaN]")[0] != json_loads("[NaN]")[0]
+
+
+class TestPrincipalCache:
+    """Tests cho cache principal của get_current_user."""
+
+    @staticmethod
+    def _principal(user_id: int) -> UserExcludeSecret:
+        now = datetime.now()
+        return UserExcludeSecret(
+            id=user_id,
+            email=f"user{user_id}@example.com",
+            is_active=True,
+            created_at=now,
+            updated_at=now,
+        )
+
+    def test_hit_miss_and_invalidate(self):
+        """Test đếm hit/miss và xóa entry khi user thay đổi."""
+        cache = PrincipalCache(ttl_seconds=60, max_size=10)
+        assert cache.get(1, 100) is None
+
+        cache.set(1, 100, self._principal(1))
+        cache.set(1, 200, self._principal(1))
+        assert cache.get(1, 100).id == 1
+        assert cache.get(1, 300) is None
+
+        cache.invalidate_user(1)
+        assert cache.get(1, 200) is None
+        assert cache.stats() == {"hits": 1, "misses": 3, "hit_rate": 0.25, "size": 0}
+
+    def test_lru_and_ttl_eviction(self):
+        """Test loại entry ít dùng nhất và entry hết hạn."""
+        cache = PrincipalCache(ttl_seconds=60, max_size=2)
+        cache.set(1, 1, self._principal(1))
+        cache.set(2, 1, self._principal(2))
+        cache.get(1, 1)
+        cache.set(3, 1, self._principal(3))
+        assert cache.get(2, 1) is None
+        assert cache.get(1, 1) is not None
+
+        expired = PrincipalCache(ttl_seconds=0.01, max_size=2)
+        expired.set(1, 1, self._principal(1))
+        time.sleep(0.02)
+        assert expired.get(1, 1) is None
+        assert expired.stats()["size"] == 0
+
+
+def _legacy_to_camel_case(snake_str: str) -> str:
+    """Bản cũ: split/title cho mỗi key, không cache."""
+    if not snake_str:
+        return snake_str
+    components = snake_str.split("_")
+    return components[0] + "".join(x.title() for x in components[1:])
+
+
+def _legacy_to_snake_case(camel_str: str) -> str:
+    """Bản cũ: hai lần re.sub cho mỗi key, không cache."""
+    if not camel_str:
+        return camel_str
+    s1 = re.sub("(.)([A-Z][a-z]+)", r"\1_\2", camel_str)
+    return re.sub("([a-z0-9])([A-Z])", r"\1_\2", s1).lower()
+
+
+def _legacy_convert(obj, convert_key):
+    if isinstance(obj, dict):
+        return {convert_key(k): _legacy_convert(v, convert_key) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [_legacy_convert(item, convert_key) for item in obj]
+    return obj
+
+
+def _build_course_payload(target_bytes: int = 1024 * 1024) -> dict:
+    """Tạo payload chi tiết khóa học (snake_case) kích thước khoảng target_bytes."""
+    topics = []
+    topic_id = 0
+    payload = {"id": 1, "title": "Giải thuật", "is_enrolled": True, "topics": topics}
+    size = 0
+    while size < target_bytes:
+        lessons = [
+            {
+                "id": topic_id * 100 + i,
+                "external_id": f"lesson-{topic_id}-{i}",
+                "title": f"Bài học {i}",
+                "description": "Mô tả bài học về cấu trúc dữ liệu",
+                "order": i,
+                "is_completed": False,
+                "completion_percentage": 0.0,
+                "last_viewed_at": None,
+                "sections": [
+                    {
+                        "id": j,
+                        "type": "text",
+                        "content": "Nội dung",
+                        "order": j,
+                        "options": None,
+                    }
+                    for j in range(5)
+                ],
+            }
+            for i in range(10)
+        ]
+        topics.append(
+            {
+                "id": topic_id,
+                "name": f"Chủ đề {topic_id}",
+                "topic_completion_percentage": 0.0,
+                "completed_lessons": 0,
+                "total_lessons": len(lessons),
+                "lessons": lessons,
+            }
+        )
+        topic_id += 1
+        size = len(json.dumps(payload))
+    return payload
+
+
+class TestCaseUtilsBenchmark:
+    """Microbenchmark: engine cũ (json + re.sub/title) và mới (orjson + memo)."""
+
+    def test_benchmark_1mb_course_payload(self):
+        """So sánh throughput chuyển đổi một payload khóa học 1 MB."""
+        snake_body = json.dumps(_build_course_payload()).encode()
+        camel_body = json.dumps(
+            _legacy_convert(json.loads(snake_body), _legacy_to_camel_case)
+        ).encode()
+        rounds = 5
+
+        def legacy_camel():
+            return json.dumps(
+                _legacy_convert(json.loads(snake_body), _legacy_to_camel_case)
+            ).encode()
+
+        def legacy_snake():
+            return json.dumps(
+                _legacy_convert(json.loads(camel_body), _legacy_to_snake_case)
+            ).encode()
+
+        def new_camel():
+            return transform_json_bytes(snake_body, convert_dict_to_camel_case)
+
+        def new_snake():
+            return transform_json_bytes(camel_body, convert_dict_to_snake_case)
+
+        def throughput(fn) -> float:
+            fn()  # warm up
+            start = time.perf_counter()
+            for _ in range(rounds):
+                fn()
+            elapsed = time.perf_counter() - start
+            return len(snake_body) * rounds / elapsed / (1024 * 1024)
+
+        assert json_loads(new_camel()) == json.loads(legacy_camel())
+        assert json_loads(new_snake()) == json.loads(snake_body)
+
+        results = {
+            "camel legacy": throughput(legacy_camel),
+            "camel new": throughput(new_camel),
+            "snake legacy": throughput(legacy_snake),
+            "snake new": throughput(new_snake),
+        }
+        print()
+        for name, mb_per_sec in results.items():
+            print(f"{name:>13}: {mb_per_sec:8.1f} MB/s")
+
+        assert results["camel new"] > results["camel legacy"]
+        assert results["snake new"] > results["snake legacy"]
@@ -0,0 +1,198 @@
+"""
+Tests cho index handle và vector store Pinecone dùng chung (VectorStoreRegistry):
+kiểm tra index một lần mỗi worker, cache theo (index, namespace), thử lại nền khi
+lỗi và lệnh bootstrap tạo index.
+"""
+
+import runpy
+import sys
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from pinecone.exceptions import NotFoundException
+
+from app.core.agents.components import document_store
+from app.core.agents.components.document_store import (
+    PineconeBackend,
+    VectorStoreRegistry,
+    VectorStoreUnavailableError,
+    bootstrap_indexes,
+)
+
+
+class FakePinecone:
+    """Pinecone client giả, đếm số lần gọi mạng"""
+
+    def __init__(self, indexes=None, failures=0):
+        self.indexes = dict(indexes or {"document": 768, "exercise": 768})
+        self.failures = failures
+        self.describe_calls = []
+        self.created = []
+
+    def describe_index(self, name):
+        self.describe_calls.append(name)
+        time.sleep(0.01)
+        if self.failures > 0:
+            self.failures -= 1
+            raise ConnectionError("timeout")
+        if name not in self.indexes:
+            raise NotFoundException(status=404, reason="Not Found")
+        return SimpleNamespace(
+            name=name,
+            host=f"{name}.pinecone.io",
+            dimension=self.indexes[name],
+            metric="cosine",
+        )
+
+    def Index(self, host):
+        return SimpleNamespace(host=host, config=SimpleNamespace(host=host, api_key="key"))
+
+    def list_indexes(self):
+        return [SimpleNamespace(name=name) for name in self.indexes]
+
+    def create_index(self, name, dimension, metric, spec):
+        self.created.append((name, dimension, metric))
+        self.indexes[name] = dimension
+
+
+def make_registry(client, refresh_interval=0.01):
+    return VectorStoreRegistry(
+        PineconeBackend(lambda: client, refresh_interval=refresh_interval),
+        embedding_factory=lambda: DeterministicFakeEmbedding(size=768),
+    )
+
+
+def wait_until(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+class TestVectorStoreRegistry:
+    def test_index_resolved_once_and_store_cached_per_namespace(self):
+        client = FakePinecone()
+        registry = make_registry(client)
+
+        store = registry.get_vector_store("document")
+        for _ in range(10):
+            assert registry.get_vector_store("document") is store
+        other = registry.get_vector_store("document", namespace="lessons")
+        registry.get_vector_store("exercise")
+
+        assert other is not store
+        assert other._namespace == "lessons"
+        assert other._index is store._index
+        assert client.describe_calls == ["document", "exercise"]
+        assert registry.stats()["stores"] == 3
+
+    def test_concurrent_first_calls_resolve_once(self):
+        client = FakePinecone()
+        registry = make_registry(client)
+        barrier = threading.Barrier(8)
+        stores = []
+
+        def worker():
+            barrier.wait()
+            stores.append(registry.get_vector_store("document"))
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert client.describe_calls == ["document"]
+        assert len({id(store) for store in stores}) == 1
+
+    def test_wrong_dimension_is_rejected(self):
+        registry = make_registry(FakePinecone({"document": 1536}), refresh_interval=60)
+
+        with pytest.raises(VectorStoreUnavailableError, match="dimension=1536"):
+            registry.backend.get_index("document")
+
+    def test_missing_index_points_to_bootstrap(self):
+        client = FakePinecone({"document": 768})
+        registry = make_registry(client, refresh_interval=60)
+
+        with pytest.raises(VectorStoreUnavailableError, match="bootstrap_vector_indexes"):
+            registry.backend.get_index("exercise")
+        assert client.created == []
+
+    def test_failure_is_refreshed_in_background(self):
+        client = FakePinecone(failures=2)
+        registry = make_registry(client)
+
+        with pytest.raises(VectorStoreUnavailableError, match="timeout"):
+            registry.backend.get_index("document")
+        # Đang thử lại nền: báo lỗi ngay, không gọi mạng trong request
+        calls = len(client.describe_calls)
+        with pytest.raises(VectorStoreUnavailableError):
+            registry.backend.get_index("document")
+        assert len(client.describe_calls) <= calls + 1
+
+        wait_until(lambda: "document" in registry.stats()["ready"])
+        assert registry.backend.get_index("document").host == "document.pinecone.io"
+        assert registry.stats()["errors"] == {}
+        assert len(client.describe_calls) == 3
+
+    def test_invalidate_resolves_again(self):
+        client = FakePinecone()
+        registry = make_registry(client)
+        store = registry.get_vector_store("document")
+
+        registry.invalidate("document")
+
+        assert registry.get_vector_store("document") is not store
+        assert client.describe_calls == ["document", "document"]
+
+
+class TestBootstrapIndexes:
+    def test_creates_missing_indexes(self):
+        client = FakePinecone({"document": 768})
+
+        result = bootstrap_indexes(client=client)
+
+        assert result == {"document": "exists", "exercise": "created"}
+        assert client.created == [("exercise", 768, "cosine")]
+
+    def test_rejects_misconfigured_index(self):
+        client = FakePinecone({"document": 1536, "exercise": 768})
+
+        with pytest.raises(VectorStoreUnavailableError):
+            bootstrap_indexes(client=client)
+
+
+class TestBootstrapCommand:
+    @pytest.fixture
+    def bootstrapped(self, monkeypatch):
+        calls = []
+        monkeypatch.setattr(
+            document_store,
+            "bootstrap_indexes",
+            lambda index_names: calls.append(tuple(index_names))
+            or {name: "exists" for name in index_names},
+        )
+        return calls
+
+    def run(self, monkeypatch, *args):
+        monkeypatch.setattr(sys, "argv", ["bootstrap_vector_indexes", *args])
+        runpy.run_module("scripts.bootstrap_vector_indexes", run_name="__main__")
+
+    def test_no_arguments_bootstraps_all_indexes(self, monkeypatch, bootstrapped):
+        self.run(monkeypatch)
+
+        assert bootstrapped == [("document", "exercise")]
+
+    def test_selected_index(self, monkeypatch, bootstrapped):
+        self.run(monkeypatch, "document")
+
+        assert bootstrapped == [("document",)]
+
+    def test_unknown_index_is_rejected(self, monkeypatch, bootstrapped):
+        with pytest.raises(SystemExit):
+            self.run(monkeypatch, "lesson")
+        assert bootstrapped == []